@@ -3,24 +3,40 @@ package com.acme-banking-qa.api.base;
 import io.restassured.RestAssured;
 import io.restassured.builder.RequestSpecBuilder;
 import io.restassured.builder.ResponseSpecBuilder;
+import io.restassured.config.HttpClientConfig;
 import io.restassured.specification.RequestSpecification;
 import io.restassured.specification.ResponseSpecification;
-import org.junit.jupiter.api.BeforeAll;
-import org.junit.jupiter.api.BeforeEach;
+import org.apache.http.client.HttpClient;
+import org.apache.http.impl.client.DefaultHttpClient;
+import org.apache.http.impl.conn.PoolingClientConnectionManager;
 
-import static io.restassured.RestAssured.given;
+import java.util.HashMap;
+import java.util.Map;
 
 public abstract class ApiTest {
     
-    protected static RequestSpecification requestSpec;
-    protected static ResponseSpecification responseSpec;
+    // Sized for JUnit's dynamic parallelism so concurrent tests never wait on a connection
+    private static final int MAX_CONNECTIONS = Math.max(16, Runtime.getRuntime().availableProcessors() * 4);
     
-    @BeforeAll
-    static void setup() {
+    private static final Object TOKEN_LOCK = new Object();
+    private static volatile String cachedToken;
+    
+    protected static final RequestSpecification requestSpec;
+    protected static final ResponseSpecification responseSpec;
+    
+    // Runs once per JVM, before any test class; JUnit may run classes concurrently
+    static {
         String baseUrl = System.getenv().getOrDefault("BASE_URL", "https://api.example.com");
         RestAssured.baseURI = baseUrl;
         
-        // Common request specification
+        // One pooled, keep-alive client shared by all threads instead of a client per request
+        RestAssured.config = RestAssured.config().httpClient(
+            HttpClientConfig.httpClientConfig()
+                .reuseHttpClientInstance()
+                .httpClientFactory(ApiTest::pooledHttpClient)
+        );
+        
+        // Common request specification; read-only after this point
         requestSpec = new RequestSpecBuilder()
             .addHeader("Content-Type", "application/json")
             .addHeader("Accept", "application/json")
@@ -34,26 +50,67 @@ public abstract class ApiTest {
             .build();
     }
     
-    @BeforeEach
-    void setUp() {
-        // Reset to default state before each test
-        RestAssured.reset();
+    private static HttpClient pooledHttpClient() {
+        PoolingClientConnectionManager pool = new PoolingClientConnectionManager();
+        pool.setMaxTotal(MAX_CONNECTIONS);
+        pool.setDefaultMaxPerRoute(MAX_CONNECTIONS);
+        return new DefaultHttpClient(pool);
     }
     
     protected RequestSpecification given() {
         return RestAssured.given().spec(requestSpec);
     }
     
-    protected String getAuthToken() {
-        // Implement authentication logic here
-        // This is a placeholder - implement based on your auth strategy
-        return System.getenv().getOrDefault("API_TOKEN", "");
+    /** Request that carries the shared bearer token. */
+    protected RequestSpecification authenticated() {
+        RequestSpecification spec = given();
+        String token = getAuthToken();
+        if (!token.isEmpty()) {
+            spec.header("Authorization", "Bearer " + token);
+        }
+        return spec;
     }
     
-    protected void setAuthHeader() {
-        String token = getAuthToken();
-        if (token != null && !token.isEmpty()) {
-            requestSpec.header("Authorization", "Bearer " + token);
+    /** Bearer token, obtained at most once per test run and shared by all threads. */
+    protected static String getAuthToken() {
+        String token = cachedToken;
+        if (token == null) {
+            synchronized (TOKEN_LOCK) {
+                token = cachedToken;
+                if (token == null) {
+                    token = login();
+                    cachedToken = token;
+                }
+            }
         }
+        return token;
+    }
+    
+    private static String login() {
+        String preset = System.getenv("API_TOKEN");
+        if (preset != null && !preset.isEmpty()) {
+            return preset;
+        }
+        
+        String username = System.getenv("API_USERNAME");
+        String password = System.getenv("API_PASSWORD");
+        if (username == null || password == null) {
+            return "";
+        }
+        
+        Map<String, String> credentials = new HashMap<>();
+        credentials.put("username", username);
+        credentials.put("password", password);
+        
+        String token = RestAssured.given()
+            .spec(requestSpec)
+            .body(credentials)
+        .when()
+            .post("/auth/login")
+        .then()
+            .statusCode(200)
+            .extract()
+            .path("token");
+        return token == null ? "" : token;
     }
 }
\ No newline at end of file
@@ -0,0 +1,77 @@
+package com.acme-banking-qa.api.base;
+
+import com.fasterxml.jackson.core.JsonProcessingException;
+import com.fasterxml.jackson.databind.ObjectMapper;
+import com.networknt.schema.JsonSchema;
+import com.networknt.schema.JsonSchemaFactory;
+import com.networknt.schema.SpecVersion;
+import com.networknt.schema.ValidationMessage;
+import org.hamcrest.Description;
+import org.hamcrest.Matcher;
+import org.hamcrest.TypeSafeMatcher;
+
+import java.net.URI;
+import java.util.Map;
+import java.util.Set;
+import java.util.concurrent.ConcurrentHashMap;
+import java.util.stream.Collectors;
+
+/**
+ * Validates response bodies against the JSON Schemas generated from the OpenAPI spec
+ * into src/test/resources/schemas. Each schema is loaded and compiled once per run and
+ * shared by every test and thread; assertions only walk the compiled validators.
+ */
+public final class SchemaValidator {
+
+    private static final ObjectMapper MAPPER = new ObjectMapper();
+    private static final JsonSchemaFactory FACTORY = JsonSchemaFactory.getInstance(SpecVersion.VersionFlag.V7);
+    private static final Map<String, JsonSchema> SCHEMAS = new ConcurrentHashMap<>();
+
+    private SchemaValidator() {
+    }
+
+    /** The compiled schema for a component (e.g. "HealthResponse") or an inline "operationId-status" schema */
+    public static JsonSchema schema(String name) {
+        return SCHEMAS.computeIfAbsent(name, key -> {
+            // Relative $refs such as "Account.json" resolve against this classpath location
+            JsonSchema schema = FACTORY.getSchema(URI.create("classpath:schemas/" + key + ".json"));
+            // Resolve every $ref now rather than on the first assertion that reaches it
+            schema.initializeValidators();
+            return schema;
+        });
+    }
+
+    public static Set<ValidationMessage> validate(String name, String body) {
+        try {
+            return schema(name).validate(MAPPER.readTree(body));
+        } catch (JsonProcessingException e) {
+            throw new AssertionError("Response body is not JSON: " + e.getOriginalMessage(), e);
+        }
+    }
+
+    /** Hamcrest matcher for {@code .then().body(matchesSchema("HealthResponse"))} */
+    public static Matcher<String> matchesSchema(String name) {
+        return new TypeSafeMatcher<String>() {
+            private Set<ValidationMessage> violations = Set.of();
+
+            @Override
+            protected boolean matchesSafely(String body) {
+                violations = validate(name, body);
+                return violations.isEmpty();
+            }
+
+            @Override
+            public void describeTo(Description description) {
+                description.appendText("a body matching schema ").appendValue(name);
+            }
+
+            @Override
+            protected void describeMismatchSafely(String body, Description description) {
+                description.appendText(violations.stream()
+                    .map(ValidationMessage::getMessage)
+                    .sorted()
+                    .collect(Collectors.joining("; ")));
+            }
+        };
+    }
+}
\ No newline at end of file
@@ -10,6 +10,7 @@ import org.junit.jupiter.api.Test;
 import org.junit.jupiter.params.ParameterizedTest;
 import org.junit.jupiter.params.provider.ValueSource;
 
+import static com.acme-banking-qa.api.base.SchemaValidator.matchesSchema;
 import static io.restassured.RestAssured.given;
 import static org.hamcrest.Matchers.*;
 
@@ -22,14 +23,15 @@ public class CreatetransferTest extends ApiTest {
     @Description("Test POST /transfers endpoint")
     @Story("createTransfer")
     void testCreatetransferTest() {
-        given()
+        authenticated()
             .spec(requestSpec)
             .body("{}") // TODO: Add proper request body based on schema
         .when()
             .request("POST", "/transfers")
         .then()
             .statusCode(201)
-            .contentType("application/json");
+            .contentType("application/json")
+            .body(matchesSchema("TransferResponse"));
     }
     
     @Test
@@ -37,13 +39,14 @@ public class CreatetransferTest extends ApiTest {
     @Description("Test POST /transfers with invalid data")
     @Story("createTransfer - Negative")
     void testCreatetransferTestInvalidRequest() {
-        given()
+        authenticated()
             .spec(requestSpec)
             .body("invalid_data")
         .when()
             .request("POST", "/transfers")
         .then()
-            .statusCode(400);
+            .statusCode(400)
+            .body(matchesSchema("ErrorResponse"));
     }
     
 }
\ No newline at end of file
@@ -0,0 +1,84 @@
+package com.acme-banking-qa.api.specs;
+
+import com.acme-banking-qa.api.base.ApiTest;
+import com.fasterxml.jackson.databind.JsonNode;
+import com.fasterxml.jackson.databind.ObjectMapper;
+import io.qameta.allure.Epic;
+import io.qameta.allure.Feature;
+import io.restassured.specification.RequestSpecification;
+import org.junit.jupiter.api.DynamicTest;
+import org.junit.jupiter.api.TestFactory;
+
+import java.io.IOException;
+import java.io.InputStream;
+import java.util.ArrayList;
+import java.util.Iterator;
+import java.util.List;
+import java.util.Map;
+import java.util.stream.Stream;
+
+import static org.hamcrest.MatcherAssert.assertThat;
+import static org.hamcrest.Matchers.*;
+
+/**
+ * Replays the minimized failures the fuzzer saved to src/test/resources/fuzz-regressions.json.
+ * Each entry becomes one test; the corpus is read at runtime, so saving new cases needs no
+ * regeneration and oversized payloads never end up in Java string literals.
+ */
+@Epic("acme-banking-qa API")
+@Feature("Fuzz regressions")
+public class FuzzRegressionTest extends ApiTest {
+    
+    private static final ObjectMapper MAPPER = new ObjectMapper();
+    private static final String CORPUS = "fuzz-regressions.json";
+    
+    @TestFactory
+    Stream<DynamicTest> fuzzRegressions() throws IOException {
+        List<DynamicTest> tests = new ArrayList<>();
+        for (JsonNode entry : corpus()) {
+            String name = entry.path("operation_id").asText() + ": " + entry.path("reason").asText()
+                + " [" + entry.path("kind").asText() + " " + entry.path("target").asText() + "]";
+            tests.add(DynamicTest.dynamicTest(name, () -> replay(entry)));
+        }
+        return tests.stream();
+    }
+    
+    private static JsonNode corpus() throws IOException {
+        try (InputStream in = FuzzRegressionTest.class.getClassLoader().getResourceAsStream(CORPUS)) {
+            return in == null ? MAPPER.createArrayNode() : MAPPER.readTree(in);
+        }
+    }
+    
+    private void replay(JsonNode entry) throws IOException {
+        RequestSpecification request = entry.path("secured").asBoolean() ? authenticated() : given();
+        for (Iterator<Map.Entry<String, JsonNode>> it = entry.path("path_params").fields(); it.hasNext(); ) {
+            Map.Entry<String, JsonNode> param = it.next();
+            request.pathParam(param.getKey(), param.getValue().asText());
+        }
+        for (Iterator<Map.Entry<String, JsonNode>> it = entry.path("query").fields(); it.hasNext(); ) {
+            Map.Entry<String, JsonNode> param = it.next();
+            request.queryParam(param.getKey(), param.getValue().isTextual()
+                ? param.getValue().asText() : param.getValue().toString());
+        }
+        if (entry.hasNonNull("raw_body")) {
+            request.body(entry.path("raw_body").asText());
+        } else if (entry.path("has_body").asBoolean()) {
+            request.body(MAPPER.writeValueAsString(entry.path("body")));
+        }
+        
+        String expect = entry.path("expect").asText();
+        int status = request
+            .when()
+                .request(entry.path("method").asText(), entry.path("path").asText())
+            .then()
+                .statusCode(lessThan(500))
+                .extract().statusCode();
+        if ("reject".equals(expect)) {
+            assertThat("invalid request must be rejected", status,
+                allOf(greaterThanOrEqualTo(400), lessThan(500)));
+        } else if ("accept".equals(expect)) {
+            assertThat("valid request must pass validation", status,
+                not(anyOf(equalTo(400), equalTo(422))));
+        }
+    }
+}
\ No newline at end of file
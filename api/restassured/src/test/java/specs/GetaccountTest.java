@@ -10,6 +10,7 @@ import org.junit.jupiter.api.Test;
 import org.junit.jupiter.params.ParameterizedTest;
 import org.junit.jupiter.params.provider.ValueSource;
 
+import static com.acme-banking-qa.api.base.SchemaValidator.matchesSchema;
 import static io.restassured.RestAssured.given;
 import static org.hamcrest.Matchers.*;
 
@@ -22,14 +23,15 @@ public class GetaccountTest extends ApiTest {
     @Description("Test GET /accounts/{accountId} endpoint")
     @Story("getAccount")
     void testGetaccountTest() {
-        given()
+        authenticated()
             .spec(requestSpec)
             .pathParam("accountId", "test_accountId")
         .when()
             .request("GET", "/accounts/{accountId}")
         .then()
             .statusCode(200)
-            .contentType("application/json");
+            .contentType("application/json")
+            .body(matchesSchema("Account"));
     }
     
     @Test
@@ -37,7 +39,7 @@ public class GetaccountTest extends ApiTest {
     @Description("Test GET /accounts/{accountId} with invalid data")
     @Story("getAccount - Negative")
     void testGetaccountTestInvalidRequest() {
-        given()
+        authenticated()
             .spec(requestSpec)
             .body("invalid_data")
         .when()
@@ -51,7 +53,7 @@ public class GetaccountTest extends ApiTest {
     @Description("Verify response structure for GET /accounts/{accountId}")
     @Story("getAccount - Validation")
     void testGetaccountTestResponseStructure() {
-        given()
+        authenticated()
             .spec(requestSpec)
         .when()
             .request("GET", "/accounts/{accountId}")
@@ -10,6 +10,7 @@ import org.junit.jupiter.api.Test;
 import org.junit.jupiter.params.ParameterizedTest;
 import org.junit.jupiter.params.provider.ValueSource;
 
+import static com.acme-banking-qa.api.base.SchemaValidator.matchesSchema;
 import static io.restassured.RestAssured.given;
 import static org.hamcrest.Matchers.*;
 
@@ -22,14 +23,15 @@ public class GetaccountbalanceTest extends ApiTest {
     @Description("Test GET /accounts/{accountId}/balance endpoint")
     @Story("getAccountBalance")
     void testGetaccountbalanceTest() {
-        given()
+        authenticated()
             .spec(requestSpec)
             .pathParam("accountId", "test_accountId")
         .when()
             .request("GET", "/accounts/{accountId}/balance")
         .then()
             .statusCode(200)
-            .contentType("application/json");
+            .contentType("application/json")
+            .body(matchesSchema("BalanceResponse"));
     }
     
     @Test
@@ -37,7 +39,7 @@ public class GetaccountbalanceTest extends ApiTest {
     @Description("Test GET /accounts/{accountId}/balance with invalid data")
     @Story("getAccountBalance - Negative")
     void testGetaccountbalanceTestInvalidRequest() {
-        given()
+        authenticated()
             .spec(requestSpec)
             .body("invalid_data")
         .when()
@@ -51,7 +53,7 @@ public class GetaccountbalanceTest extends ApiTest {
     @Description("Verify response structure for GET /accounts/{accountId}/balance")
     @Story("getAccountBalance - Validation")
     void testGetaccountbalanceTestResponseStructure() {
-        given()
+        authenticated()
             .spec(requestSpec)
         .when()
             .request("GET", "/accounts/{accountId}/balance")
@@ -10,6 +10,7 @@ import org.junit.jupiter.api.Test;
 import org.junit.jupiter.params.ParameterizedTest;
 import org.junit.jupiter.params.provider.ValueSource;
 
+import static com.acme-banking-qa.api.base.SchemaValidator.matchesSchema;
 import static io.restassured.RestAssured.given;
 import static org.hamcrest.Matchers.*;
 
@@ -22,7 +23,7 @@ public class GetaccountsTest extends ApiTest {
     @Description("Test GET /accounts endpoint")
     @Story("getAccounts")
     void testGetaccountsTest() {
-        given()
+        authenticated()
             .spec(requestSpec)
             .queryParam("type", "test_type")
             .queryParam("status", "test_status")
@@ -30,7 +31,8 @@ public class GetaccountsTest extends ApiTest {
             .request("GET", "/accounts")
         .then()
             .statusCode(200)
-            .contentType("application/json");
+            .contentType("application/json")
+            .body(matchesSchema("getAccounts-200"));
     }
     
     @Test
@@ -38,7 +40,7 @@ public class GetaccountsTest extends ApiTest {
     @Description("Test GET /accounts with invalid data")
     @Story("getAccounts - Negative")
     void testGetaccountsTestInvalidRequest() {
-        given()
+        authenticated()
             .spec(requestSpec)
             .body("invalid_data")
         .when()
@@ -52,7 +54,7 @@ public class GetaccountsTest extends ApiTest {
     @Description("Verify response structure for GET /accounts")
     @Story("getAccounts - Validation")
     void testGetaccountsTestResponseStructure() {
-        given()
+        authenticated()
             .spec(requestSpec)
         .when()
             .request("GET", "/accounts")
@@ -10,6 +10,7 @@ import org.junit.jupiter.api.Test;
 import org.junit.jupiter.params.ParameterizedTest;
 import org.junit.jupiter.params.provider.ValueSource;
 
+import static com.acme-banking-qa.api.base.SchemaValidator.matchesSchema;
 import static io.restassured.RestAssured.given;
 import static org.hamcrest.Matchers.*;
 
@@ -22,13 +23,14 @@ public class GethealthTest extends ApiTest {
     @Description("Test GET /health endpoint")
     @Story("getHealth")
     void testGethealthTest() {
-        given()
+        authenticated()
             .spec(requestSpec)
         .when()
             .request("GET", "/health")
         .then()
             .statusCode(200)
-            .contentType("application/json");
+            .contentType("application/json")
+            .body(matchesSchema("HealthResponse"));
     }
     
     @Test
@@ -36,7 +38,7 @@ public class GethealthTest extends ApiTest {
     @Description("Test GET /health with invalid data")
     @Story("getHealth - Negative")
     void testGethealthTestInvalidRequest() {
-        given()
+        authenticated()
             .spec(requestSpec)
             .body("invalid_data")
         .when()
@@ -50,7 +52,7 @@ public class GethealthTest extends ApiTest {
     @Description("Verify response structure for GET /health")
     @Story("getHealth - Validation")
     void testGethealthTestResponseStructure() {
-        given()
+        authenticated()
             .spec(requestSpec)
         .when()
             .request("GET", "/health")
@@ -10,6 +10,7 @@ import org.junit.jupiter.api.Test;
 import org.junit.jupiter.params.ParameterizedTest;
 import org.junit.jupiter.params.provider.ValueSource;
 
+import static com.acme-banking-qa.api.base.SchemaValidator.matchesSchema;
 import static io.restassured.RestAssured.given;
 import static org.hamcrest.Matchers.*;
 
@@ -22,7 +23,7 @@ public class GettransactionsTest extends ApiTest {
     @Description("Test GET /transactions endpoint")
     @Story("getTransactions")
     void testGettransactionsTest() {
-        given()
+        authenticated()
             .spec(requestSpec)
             .queryParam("accountId", "test_accountId")
             .queryParam("fromDate", "test_fromDate")
@@ -33,7 +34,8 @@ public class GettransactionsTest extends ApiTest {
             .request("GET", "/transactions")
         .then()
             .statusCode(200)
-            .contentType("application/json");
+            .contentType("application/json")
+            .body(matchesSchema("TransactionList"));
     }
     
     @Test
@@ -41,7 +43,7 @@ public class GettransactionsTest extends ApiTest {
     @Description("Test GET /transactions with invalid data")
     @Story("getTransactions - Negative")
     void testGettransactionsTestInvalidRequest() {
-        given()
+        authenticated()
             .spec(requestSpec)
             .body("invalid_data")
         .when()
@@ -55,7 +57,7 @@ public class GettransactionsTest extends ApiTest {
     @Description("Verify response structure for GET /transactions")
     @Story("getTransactions - Validation")
     void testGettransactionsTestResponseStructure() {
-        given()
+        authenticated()
             .spec(requestSpec)
         .when()
             .request("GET", "/transactions")
@@ -10,6 +10,7 @@ import org.junit.jupiter.api.Test;
 import org.junit.jupiter.params.ParameterizedTest;
 import org.junit.jupiter.params.provider.ValueSource;
 
+import static com.acme-banking-qa.api.base.SchemaValidator.matchesSchema;
 import static io.restassured.RestAssured.given;
 import static org.hamcrest.Matchers.*;
 
@@ -22,14 +23,15 @@ public class GettransferTest extends ApiTest {
     @Description("Test GET /transfers/{transferId} endpoint")
     @Story("getTransfer")
     void testGettransferTest() {
-        given()
+        authenticated()
             .spec(requestSpec)
             .pathParam("transferId", "test_transferId")
         .when()
             .request("GET", "/transfers/{transferId}")
         .then()
             .statusCode(200)
-            .contentType("application/json");
+            .contentType("application/json")
+            .body(matchesSchema("Transfer"));
     }
     
     @Test
@@ -37,7 +39,7 @@ public class GettransferTest extends ApiTest {
     @Description("Test GET /transfers/{transferId} with invalid data")
     @Story("getTransfer - Negative")
     void testGettransferTestInvalidRequest() {
-        given()
+        authenticated()
             .spec(requestSpec)
             .body("invalid_data")
         .when()
@@ -51,7 +53,7 @@ public class GettransferTest extends ApiTest {
     @Description("Verify response structure for GET /transfers/{transferId}")
     @Story("getTransfer - Validation")
     void testGettransferTestResponseStructure() {
-        given()
+        authenticated()
             .spec(requestSpec)
         .when()
             .request("GET", "/transfers/{transferId}")
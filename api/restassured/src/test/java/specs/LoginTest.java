@@ -10,6 +10,7 @@ import org.junit.jupiter.api.Test;
 import org.junit.jupiter.params.ParameterizedTest;
 import org.junit.jupiter.params.provider.ValueSource;
 
+import static com.acme-banking-qa.api.base.SchemaValidator.matchesSchema;
 import static io.restassured.RestAssured.given;
 import static org.hamcrest.Matchers.*;
 
@@ -29,7 +30,8 @@ public class LoginTest extends ApiTest {
             .request("POST", "/auth/login")
         .then()
             .statusCode(200)
-            .contentType("application/json");
+            .contentType("application/json")
+            .body(matchesSchema("LoginResponse"));
     }
     
     @Test
@@ -43,7 +45,8 @@ public class LoginTest extends ApiTest {
         .when()
             .request("POST", "/auth/login")
         .then()
-            .statusCode(400);
+            .statusCode(400)
+            .body(matchesSchema("ErrorResponse"));
     }
     
 }
\ No newline at end of file
@@ -22,7 +22,7 @@ public class LogoutTest extends ApiTest {
     @Description("Test POST /auth/logout endpoint")
     @Story("logout")
     void testLogoutTest() {
-        given()
+        authenticated()
             .spec(requestSpec)
         .when()
             .request("POST", "/auth/logout")
@@ -36,7 +36,7 @@ public class LogoutTest extends ApiTest {
     @Description("Test POST /auth/logout with invalid data")
     @Story("logout - Negative")
     void testLogoutTestInvalidRequest() {
-        given()
+        authenticated()
             .spec(requestSpec)
             .body("invalid_data")
         .when()
@@ -5,14 +5,27 @@ Pytest configuration and fixtures for acme-banking-qa backend tests
 import os
 import pytest
 import requests
-from typing import Generator, Dict, Any
+from typing import TYPE_CHECKING, Generator, Dict, Any, Mapping
 from pathlib import Path
 import yaml
 from dotenv import load_dotenv
 
+if TYPE_CHECKING:
+    # Imported for annotations only: pytest_plugins must import it first for assert rewriting
+    from plugins.data_store import TestDataStore
+
 # Load environment variables
 load_dotenv()
 
+pytest_plugins = [
+    "plugins.latency",
+    "plugins.data_store",
+    "plugins.redis_store",
+    "plugins.load",
+    "plugins.schemas",
+    "plugins.async_db",
+]
+
 # Test configuration
 TEST_CONFIG = {
     "base_url": os.getenv("BASE_URL", "https://api.example.com"),
@@ -20,6 +33,15 @@ TEST_CONFIG = {
     "redis_uri": os.getenv("REDIS_URI", "redis://localhost:6379/0"),
     "timeout": int(os.getenv("TIMEOUT", "30")),
     "retries": int(os.getenv("RETRIES", "3")),
+    "latency_iterations": int(os.getenv("LATENCY_ITERATIONS", "30")),
+    "latency_warmup": int(os.getenv("LATENCY_WARMUP", "5")),
+    # Per-endpoint budgets in ms, overridable from env/config.<env>.yaml
+    "latency_budgets": {"default": {"p95": 1000.0}},
+    "load_engine": os.getenv("LOAD_ENGINE", "thread"),
+    "load_profile": os.getenv("LOAD_PROFILE", "constant"),
+    "load_concurrency": int(os.getenv("LOAD_CONCURRENCY", "10")),
+    "load_duration": float(os.getenv("LOAD_DURATION", "5")),
+    "async_db_pool_size": int(os.getenv("ASYNC_DB_POOL_SIZE", "20")),
 }
 
 def load_env_config(environment: str = None) -> Dict[str, Any]:
@@ -77,19 +99,6 @@ def db_connection(config: Dict[str, Any]):
     except Exception as e:
         pytest.skip(f"Database connection failed: {e}")
 
-@pytest.fixture(scope="session")
-def redis_connection(config: Dict[str, Any]):
-    """Redis connection fixture"""
-    try:
-        import redis
-        r = redis.from_url(config["redis_uri"])
-        yield r
-        r.close()
-    except ImportError:
-        pytest.skip("redis not available")
-    except Exception as e:
-        pytest.skip(f"Redis connection failed: {e}")
-
 @pytest.fixture(autouse=True)
 def setup_test_environment(config: Dict[str, Any]):
     """Setup test environment before each test"""
@@ -103,29 +112,13 @@ def setup_test_environment(config: Dict[str, Any]):
     if "TESTING" in os.environ:
         del os.environ["TESTING"]
 
-@pytest.fixture
-def test_data() -> Dict[str, Any]:
-    """Load test data from files"""
-    data_dir = Path(__file__).parent.parent.parent / "data"
-    
-    test_data = {}
-    
-    # Load CSV data
-    users_file = data_dir / "users.csv"
-    if users_file.exists():
-        import csv
-        with open(users_file, 'r') as f:
-            reader = csv.DictReader(f)
-            test_data["users"] = list(reader)
-    
-    # Load JSON data
-    products_file = data_dir / "products.json"
-    if products_file.exists():
-        import json
-        with open(products_file, 'r') as f:
-            test_data["products"] = json.load(f)
-    
-    return test_data
+@pytest.fixture(scope="session")
+def test_data(test_data_store: "TestDataStore") -> Mapping[str, Any]:
+    """Test data documents as in their files (read-only), loaded lazily and shared across the session
+
+    Indexed row lookups are on ``test_data_store``.
+    """
+    return test_data_store.documents
 
 def pytest_configure(config):
     """Configure pytest with custom markers"""
@@ -0,0 +1,3 @@
+"""
+Pytest plugins for acme-banking-qa backend tests
+"""
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""
+Asyncio Postgres fixtures for acme-banking-qa backend tests
+
+An asyncpg pool driven by pytest-asyncio lets one event loop run hundreds
+of concurrent queries over a handful of connections, where the psycopg2
+fixtures need an OS thread and a connection per simulated client. Both
+libraries are optional: without them the fixtures skip.
+"""
+
+import asyncio
+import re
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence
+
+import pytest
+
+from plugins.load import PostgresQueryTarget
+
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None
+
+try:
+    import pytest_asyncio
+except ImportError:
+    pytest_asyncio = None  # type: ignore[assignment]
+
+DEFAULT_POOL_SIZE = 20
+
+# psycopg2 "%s" placeholders, skipping "%%" escapes
+_PLACEHOLDER = re.compile(r"%%|%s")
+
+
+def numbered(query: str) -> str:
+    """Rewrite psycopg2 ``%s`` placeholders as asyncpg ``$1, $2, ...``"""
+    counter = iter(range(1, query.count("%s") + 1))
+    return _PLACEHOLDER.sub(lambda m: "%" if m.group() == "%%" else f"${next(counter)}", query)
+
+
+class AsyncDatabase:
+    """An asyncpg pool with helpers for fanning work out across its connections"""
+
+    def __init__(self, pool: Any):
+        self.pool = pool
+
+    async def fetchval(self, query: str, *args: Any) -> Any:
+        return await self.pool.fetchval(query, *args)
+
+    async def run_concurrently(self, count: int,
+                               func: Callable[[Any, int], Awaitable[Any]]) -> List[Any]:
+        """Run ``func(connection, i)`` for ``i`` in ``range(count)`` as concurrent tasks.
+
+        Each task holds a pool connection only while it runs, so ``count`` may be far
+        larger than the pool; results are returned in order and exceptions are
+        returned in place of results rather than raised.
+        """
+        async def one(i: int) -> Any:
+            async with self.pool.acquire() as conn:
+                return await func(conn, i)
+
+        return list(await asyncio.gather(*(one(i) for i in range(count)), return_exceptions=True))
+
+    async def gather(self, count: int, query: str, *args: Any) -> List[Any]:
+        """Run the same single-value query ``count`` times concurrently"""
+        return await self.run_concurrently(count, lambda conn, i: conn.fetchval(query, *args))
+
+
+class AsyncPostgresQueryTarget(PostgresQueryTarget):
+    """Load target whose ``acall`` runs the query on a shared asyncpg pool
+
+    The asyncio engine drives every simulated client from one event loop; the
+    thread engine still falls back to the per-thread psycopg2 connections.
+    """
+
+    def __init__(self, dsn: str, query: str, params: Sequence[Any] = (),
+                 expect: Optional[Sequence[Any]] = None, name: Optional[str] = None,
+                 pool_size: int = DEFAULT_POOL_SIZE):
+        super().__init__(dsn, query, params, expect, name)
+        self.async_query = numbered(query)
+        self.pool_size = pool_size
+        self._pool_task: Optional["asyncio.Future[Any]"] = None
+
+    async def acall(self) -> Any:
+        if self._pool_task is None:
+            # Created on first use so the pool belongs to the engine's event loop
+            self._pool_task = asyncio.ensure_future(
+                asyncpg.create_pool(self.dsn, min_size=1, max_size=self.pool_size))
+        pool = await self._pool_task
+        row = await pool.fetchrow(self.async_query, *self.params)
+        if self.expect is not None and tuple(row or ()) != self.expect:
+            raise AssertionError(f"Unexpected row {row!r}, expected {self.expect!r}")
+        return row
+
+    async def aclose(self) -> None:
+        if self._pool_task is not None:
+            task, self._pool_task = self._pool_task, None
+            try:
+                pool = await task
+            except Exception:
+                return
+            await pool.close()
+
+
+async def _create_pool(config: Dict[str, Any]) -> Any:
+    if asyncpg is None:
+        pytest.skip("asyncpg not available")
+    try:
+        return await asyncpg.create_pool(
+            config["db_uri"], min_size=1,
+            max_size=int(config.get("async_db_pool_size", DEFAULT_POOL_SIZE)))
+    except Exception as e:
+        pytest.skip(f"Database connection failed: {e}")
+
+
+if pytest_asyncio is not None:
+
+    @pytest_asyncio.fixture
+    async def async_db_pool(config: Dict[str, Any]) -> AsyncIterator[Any]:
+        """asyncpg pool sized by ``async_db_pool_size``, closed after the test"""
+        pool = await _create_pool(config)
+        yield pool
+        await pool.close()
+
+    @pytest_asyncio.fixture
+    async def async_db(async_db_pool: Any) -> AsyncDatabase:
+        """Concurrency helpers over ``async_db_pool``"""
+        return AsyncDatabase(async_db_pool)
+
+    @pytest_asyncio.fixture
+    async def async_db_connection(async_db_pool: Any) -> AsyncIterator[Any]:
+        """One pooled connection, for tests that need session state such as temp tables"""
+        async with async_db_pool.acquire() as conn:
+            yield conn
+
+else:
+
+    @pytest.fixture  # type: ignore[unreachable]
+    def async_db_pool() -> None:
+        pytest.skip("pytest-asyncio not available")
+
+    @pytest.fixture
+    def async_db(async_db_pool: Any) -> None:
+        pass
+
+    @pytest.fixture
+    def async_db_connection(async_db_pool: Any) -> None:
+        pass
+
+    def pytest_configure(config: pytest.Config) -> None:
+        # Keep --strict-markers happy for modules marked asyncio
+        config.addinivalue_line("markers", "asyncio: run the test on an asyncio event loop")
\ No newline at end of file
@@ -0,0 +1,168 @@
+"""
+Session-scoped test data store for acme-banking-qa backend tests
+
+Sources are loaded lazily on first access and handed out as read-only views
+with lookup indexes; each view keeps the document in the shape of its file.
+"""
+
+import csv
+import json
+import threading
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import pytest
+
+# source name -> (file name, key column)
+DEFAULT_SOURCES = {
+    "users": ("users.csv", "username"),
+    "products": ("products.json", "id"),
+}
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts/lists into read-only equivalents"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def _load_csv(path: Path) -> Tuple[Any, Tuple[Mapping, ...]]:
+    """(document, rows): a CSV document is its rows"""
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = tuple(freeze(row) for row in csv.DictReader(f))
+    return rows, rows
+
+
+def _load_json(path: Path) -> Tuple[Any, Tuple[Mapping, ...]]:
+    """(document, rows): the frozen document as written, and the rows it holds"""
+    with open(path, "rb") as f:
+        document = freeze(json.load(f))
+    rows = document
+    if isinstance(document, Mapping):
+        # {"products": [...]} style documents wrap the rows in a single key
+        lists = [v for v in document.values() if isinstance(v, tuple)]
+        rows = lists[0] if len(lists) == 1 else (document,)
+    return document, tuple(rows)
+
+
+LOADERS = {
+    ".csv": _load_csv,
+    ".json": _load_json,
+}
+
+
+class DataView(Sequence):
+    """Read-only rows of one data source with lazily built column indexes"""
+
+    def __init__(self, name: str, rows: Tuple[Mapping, ...], key: Optional[str] = None,
+                 document: Any = None):
+        self.name = name
+        self.key = key
+        # The source as loaded (read-only), e.g. {"products": (...)} for a wrapped JSON list
+        self.document = rows if document is None else document
+        self._rows = rows
+        self._indexes: Dict[str, Dict[Any, Tuple[Mapping, ...]]] = {}
+        self._lock = threading.Lock()
+        if key:
+            self.column_index(key)
+
+    def __getitem__(self, i: Any) -> Any:
+        return self._rows[i]
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def column_index(self, column: str) -> Mapping[Any, Tuple[Mapping, ...]]:
+        """Return (building once) the index of ``column`` value -> rows"""
+        idx = self._indexes.get(column)
+        if idx is None:
+            with self._lock:
+                idx = self._indexes.get(column)
+                if idx is None:
+                    grouped: Dict[Any, list] = {}
+                    for row in self._rows:
+                        if column in row:
+                            grouped.setdefault(row[column], []).append(row)
+                    idx = {k: tuple(v) for k, v in grouped.items()}
+                    self._indexes[column] = idx
+        return MappingProxyType(idx)
+
+    def lookup(self, column: str, value: Any) -> Tuple[Mapping, ...]:
+        """All rows where ``column`` equals ``value``"""
+        return self.column_index(column).get(value, ())
+
+    def get(self, value: Any, default: Any = None) -> Any:
+        """Row whose key column equals ``value``"""
+        if not self.key:
+            raise KeyError(f"Data source '{self.name}' has no key column")
+        rows = self.lookup(self.key, value)
+        if not rows and isinstance(value, str) and value.isdigit():
+            # JSON ids are numeric while callers often hold string ids
+            rows = self.lookup(self.key, int(value))
+        return rows[0] if rows else default
+
+
+class TestDataStore(Mapping):
+    """Lazy mapping of source name -> DataView, shared across the session"""
+
+    __test__ = False
+
+    def __init__(self, data_dir: Path, sources: Optional[Dict[str, Tuple[str, Optional[str]]]] = None):
+        self.data_dir = Path(data_dir)
+        self.sources = dict(DEFAULT_SOURCES if sources is None else sources)
+        self._views: Dict[str, DataView] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, name: str) -> Path:
+        return self.data_dir / self.sources[name][0]
+
+    def __getitem__(self, name: str) -> DataView:
+        view = self._views.get(name)
+        if view is not None:
+            return view
+        if name not in self.sources or not self._path(name).exists():
+            raise KeyError(name)
+        with self._lock:
+            if name not in self._views:
+                path = self._path(name)
+                document, rows = LOADERS[path.suffix.lower()](path)
+                self._views[name] = DataView(name, rows, self.sources[name][1], document)
+            return self._views[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return (name for name in self.sources if self._path(name).exists())
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    @property
+    def documents(self) -> "DocumentMap":
+        """Source name -> document in its file's shape, loaded on first access"""
+        return DocumentMap(self)
+
+
+class DocumentMap(Mapping):
+    """Read-only mapping of source name -> document, backed by a TestDataStore"""
+
+    def __init__(self, store: TestDataStore):
+        self._store = store
+
+    def __getitem__(self, name: str) -> Any:
+        return self._store[name].document
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._store)
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+
+@pytest.fixture(scope="session")
+def test_data_store() -> TestDataStore:
+    """Session-wide test data store backed by the data/ directory"""
+    return TestDataStore(Path(__file__).resolve().parents[3] / "data")
\ No newline at end of file
@@ -0,0 +1,199 @@
+"""
+Latency measurement plugin for acme-banking-qa backend tests
+
+Runs a measured block repeatedly with warmup, records samples in an
+HDR-style histogram and checks p50/p95/p99 against per-endpoint budgets.
+"""
+
+import json
+import math
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pytest
+
+PERCENTILES = (50.0, 95.0, 99.0)
+
+RESULTS = pytest.StashKey[List[Dict[str, Any]]]()
+ENVIRONMENT = pytest.StashKey[str]()
+
+
+class LatencyHistogram:
+    """Log-linear histogram of nanosecond samples (HdrHistogram bucketing).
+
+    Values below ``2 ** sub_bucket_bits`` are stored exactly; larger values
+    share a bucket with their neighbours so that the relative error stays
+    within ``10 ** -significant_digits``.
+    """
+
+    def __init__(self, significant_digits: int = 2):
+        largest_exact = 2 * 10 ** significant_digits
+        self._sub_bucket_bits = max(1, (largest_exact - 1).bit_length())
+        self._counts: Dict[Tuple[int, int], int] = {}
+        self.count = 0
+        self.total = 0
+        self.min: Optional[int] = None
+        self.max: Optional[int] = None
+
+    def _key(self, value: int) -> Tuple[int, int]:
+        shift = max(0, value.bit_length() - self._sub_bucket_bits)
+        return shift, value >> shift
+
+    def record(self, value: int) -> None:
+        """Record a single sample in nanoseconds"""
+        value = max(0, int(value))
+        key = self._key(value)
+        self._counts[key] = self._counts.get(key, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, pct: float) -> int:
+        """Return the value at the given percentile (highest equivalent value)"""
+        if not self.count or self.max is None:
+            return 0
+        target = max(1, math.ceil(pct / 100.0 * self.count))
+        seen = 0
+        for shift, sub_bucket in sorted(self._counts, key=lambda k: k[1] << k[0]):
+            seen += self._counts[(shift, sub_bucket)]
+            if seen >= target:
+                highest = ((sub_bucket + 1) << shift) - 1
+                return min(highest, self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class LatencyResult:
+    """Summary of one measured block"""
+
+    def __init__(self, name: str, histogram: LatencyHistogram, warmup: int):
+        self.name = name
+        self.histogram = histogram
+        self.warmup = warmup
+
+    def percentile_ms(self, pct: float) -> float:
+        return self.histogram.percentile(pct) / 1e6
+
+    @property
+    def p50(self) -> float:
+        return self.percentile_ms(50.0)
+
+    @property
+    def p95(self) -> float:
+        return self.percentile_ms(95.0)
+
+    @property
+    def p99(self) -> float:
+        return self.percentile_ms(99.0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        h = self.histogram
+        return {
+            "name": self.name,
+            "iterations": h.count,
+            "warmup": self.warmup,
+            "min_ms": (h.min or 0) / 1e6,
+            "mean_ms": h.mean / 1e6,
+            "max_ms": (h.max or 0) / 1e6,
+            **{f"p{int(p)}_ms": self.percentile_ms(p) for p in PERCENTILES},
+        }
+
+
+class LatencyRecorder:
+    """Measures blocks of code and checks them against configured budgets"""
+
+    def __init__(self, config: Dict[str, Any], results: List[Dict[str, Any]], nodeid: str):
+        self.iterations = int(config.get("latency_iterations", 30))
+        self.warmup = int(config.get("latency_warmup", 5))
+        self.budgets = config.get("latency_budgets") or {}
+        self._results = results
+        self._nodeid = nodeid
+
+    def budget_for(self, name: str) -> Dict[str, float]:
+        """Budget in milliseconds per percentile, e.g. {"p95": 500}"""
+        budget = dict(self.budgets.get("default", {}))
+        budget.update(self.budgets.get(name, {}))
+        return budget
+
+    def measure(
+        self,
+        name: str,
+        func: Callable[[], Any],
+        iterations: Optional[int] = None,
+        warmup: Optional[int] = None,
+        check_budget: bool = True,
+    ) -> LatencyResult:
+        """Run ``func`` ``warmup`` + ``iterations`` times and record each call"""
+        iterations = self.iterations if iterations is None else iterations
+        warmup = self.warmup if warmup is None else warmup
+
+        for _ in range(warmup):
+            func()
+
+        histogram = LatencyHistogram()
+        clock = time.perf_counter_ns
+        for _ in range(iterations):
+            start = clock()
+            func()
+            histogram.record(clock() - start)
+
+        result = LatencyResult(name, histogram, warmup)
+        entry = result.to_dict()
+        entry["test"] = self._nodeid
+        entry["budget_ms"] = self.budget_for(name)
+        self._results.append(entry)
+
+        if check_budget:
+            self.assert_within_budget(result)
+        return result
+
+    def assert_within_budget(self, result: LatencyResult) -> None:
+        """Fail the test if any budgeted percentile is exceeded"""
+        violations = []
+        for key, limit in self.budget_for(result.name).items():
+            actual = result.percentile_ms(float(key.lstrip("p")))
+            if actual > float(limit):
+                violations.append(f"{key}={actual:.2f}ms > {float(limit):.2f}ms")
+        assert not violations, f"{result.name} latency over budget: {', '.join(violations)}"
+
+
+def _report_path(session: pytest.Session) -> Path:
+    path = Path(os.getenv("LATENCY_REPORT", "test-results/latency.json"))
+    if not path.is_absolute():
+        path = Path(str(session.config.rootpath)) / path
+    worker = os.getenv("PYTEST_XDIST_WORKER")
+    if worker:
+        path = path.with_name(f"{path.stem}.{worker}{path.suffix}")
+    return path
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.stash[RESULTS] = []
+    config.stash[ENVIRONMENT] = os.getenv("TEST_ENV", "dev")
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    """Write collected latency results to JSON for trend tracking"""
+    results = session.config.stash.get(RESULTS, None)
+    if not results:
+        return
+    path = _report_path(session)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "environment": session.config.stash[ENVIRONMENT],
+        "results": results,
+    }
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+@pytest.fixture
+def latency(config: Dict[str, Any], request: pytest.FixtureRequest) -> LatencyRecorder:
+    """Measure latency distributions against per-endpoint budgets"""
+    return LatencyRecorder(config, request.config.stash[RESULTS], request.node.nodeid)
\ No newline at end of file
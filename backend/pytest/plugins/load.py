@@ -0,0 +1,589 @@
+"""
+Load-generation harness for acme-banking-qa backend tests
+
+Drives a pluggable target (Postgres query, Redis op, HTTP operation from
+the OpenAPI spec) with a thread-pool or asyncio engine under a constant,
+ramp or step arrival profile, and records throughput, error rate and
+latency percentiles.
+"""
+
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import (Any, Callable, Dict, List, Optional, Pattern, Protocol, Sequence, Set, Tuple,
+                    Type, Union)
+
+import pytest
+import yaml
+
+from plugins.latency import PERCENTILES, LatencyHistogram
+from plugins.redis_store import InProcessRedis
+
+SPEC_PATH = Path(__file__).resolve().parents[3] / "specs" / "api.yaml"
+
+RESULTS = pytest.StashKey[List[Dict[str, Any]]]()
+
+
+# ---------------------------------------------------------------------------
+# Arrival profiles
+# ---------------------------------------------------------------------------
+
+class ConstantProfile:
+    """Fixed arrival rate in ops/s; ``None`` runs closed-loop at full concurrency"""
+
+    def __init__(self, rate: Optional[float] = None):
+        self.rate = rate
+
+    def rate_at(self, elapsed: float, duration: float) -> Optional[float]:
+        return self.rate
+
+    def __repr__(self) -> str:
+        return f"constant:{self.rate or 'max'}"
+
+
+class RampProfile:
+    """Arrival rate ramping linearly from ``start`` to ``end`` ops/s"""
+
+    def __init__(self, start: float, end: float):
+        self.start = start
+        self.end = end
+
+    def rate_at(self, elapsed: float, duration: float) -> Optional[float]:
+        fraction = min(1.0, elapsed / duration) if duration else 1.0
+        return self.start + (self.end - self.start) * fraction
+
+    def __repr__(self) -> str:
+        return f"ramp:{self.start}-{self.end}"
+
+
+class StepProfile:
+    """Piecewise-constant arrival rate given as ``[(seconds, ops/s), ...]``"""
+
+    def __init__(self, steps: Sequence[Tuple[float, float]]):
+        self.steps = list(steps)
+
+    def rate_at(self, elapsed: float, duration: float) -> Optional[float]:
+        for seconds, rate in self.steps:
+            if elapsed < seconds:
+                return rate
+            elapsed -= seconds
+        return self.steps[-1][1] if self.steps else None
+
+    def __repr__(self) -> str:
+        return "step:" + ",".join(f"{rate}x{seconds}" for seconds, rate in self.steps)
+
+
+class Profile(Protocol):
+    """Arrival rate in ops/s at ``elapsed`` seconds into a run; ``None`` means closed-loop"""
+
+    def rate_at(self, elapsed: float, duration: float) -> Optional[float]:
+        ...
+
+
+def parse_profile(spec: str) -> Profile:
+    """Build a profile from ``constant[:RATE]``, ``ramp:START-END`` or ``step:RATExSECS,...``"""
+    kind, _, args = spec.partition(":")
+    kind = kind.strip().lower()
+    if kind == "constant":
+        return ConstantProfile(float(args) if args and args != "max" else None)
+    if kind == "ramp":
+        start, end = args.split("-", 1)
+        return RampProfile(float(start), float(end))
+    if kind == "step":
+        steps: List[Tuple[float, float]] = []
+        for part in args.split(","):
+            rate, seconds = part.split("x", 1)
+            steps.append((float(seconds), float(rate)))
+        return StepProfile(steps)
+    raise ValueError(f"Unknown load profile: {spec}")
+
+
+# ---------------------------------------------------------------------------
+# Targets
+# ---------------------------------------------------------------------------
+
+class Target(Protocol):
+    """Something the engines can call repeatedly; ``acall``/``aclose`` are optional extras"""
+
+    name: str
+
+    def setup(self) -> None:
+        ...
+
+    def call(self) -> Any:
+        ...
+
+    def teardown(self) -> None:
+        ...
+
+
+class CallableTarget:
+    """Wraps a plain function (and optional coroutine function) as a target"""
+
+    def __init__(self, name: str, func: Callable[[], Any],
+                 async_func: Optional[Callable[[], Any]] = None):
+        self.name = name
+        self._func = func
+        if async_func is not None:
+            self.acall = async_func
+
+    def setup(self) -> None:
+        pass
+
+    def call(self) -> Any:
+        return self._func()
+
+    def teardown(self) -> None:
+        pass
+
+
+class PostgresQueryTarget:
+    """Runs one query per call on a per-thread psycopg2 connection"""
+
+    def __init__(self, dsn: str, query: str, params: Sequence[Any] = (),
+                 expect: Optional[Sequence[Any]] = None, name: Optional[str] = None):
+        self.name = name or f"postgres:{query.split()[0].upper()}"
+        self.dsn = dsn
+        self.query = query
+        self.params = tuple(params)
+        self.expect = tuple(expect) if expect is not None else None
+        self._local = threading.local()
+        self._connections: List[Any] = []
+        self._lock = threading.Lock()
+
+    def _connection(self) -> Any:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            import psycopg2
+            conn = psycopg2.connect(self.dsn)
+            conn.autocommit = True
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def setup(self) -> None:
+        pass
+
+    def call(self) -> Any:
+        with self._connection().cursor() as cursor:
+            cursor.execute(self.query, self.params)
+            row = cursor.fetchone() if cursor.description else None
+        if self.expect is not None and tuple(row or ()) != self.expect:
+            raise AssertionError(f"Unexpected row {row!r}, expected {self.expect!r}")
+        return row
+
+    def teardown(self) -> None:
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+
+
+class RedisOpTarget:
+    """SET + GET round trip (or PING) against Redis or the in-process stand-in"""
+
+    def __init__(self, client: Any = None, op: str = "set_get", key_prefix: str = "load:"):
+        self.name = f"redis:{op}"
+        self.client = client if client is not None else InProcessRedis()
+        self.op = op
+        self.key_prefix = key_prefix
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def setup(self) -> None:
+        pass
+
+    def call(self) -> Any:
+        if self.op == "ping":
+            return self.client.ping()
+        with self._lock:
+            self._counter += 1
+            key = f"{self.key_prefix}{self._counter % 1000}"
+        self.client.set(key, "x", ex=60)
+        return self.client.get(key)
+
+    def teardown(self) -> None:
+        keys = list(self.client.scan_iter(match=f"{self.key_prefix}*", count=500))
+        if keys:
+            self.client.unlink(*keys)
+
+
+def find_operation(operation_id: str, spec_path: Path = SPEC_PATH) -> Tuple[str, str]:
+    """Return (METHOD, path) for an operationId in the OpenAPI spec"""
+    spec = yaml.safe_load(spec_path.read_text(encoding="utf-8"))
+    for path, operations in spec.get("paths", {}).items():
+        for method, operation in operations.items():
+            if isinstance(operation, dict) and operation.get("operationId") == operation_id:
+                return method.upper(), path
+    raise KeyError(f"operationId '{operation_id}' not found in {spec_path}")
+
+
+class HttpOperationTarget:
+    """Calls one HTTP operation; sync via requests, async via httpx when installed"""
+
+    def __init__(self, base_url: str, method: str, path: str,
+                 path_params: Optional[Dict[str, Any]] = None,
+                 expected_status: Optional[Sequence[int]] = None,
+                 headers: Optional[Dict[str, str]] = None, json_body: Any = None,
+                 timeout: float = 30.0, name: Optional[str] = None):
+        self.name = name or f"http:{method} {path}"
+        self.method = method.upper()
+        self.url = base_url.rstrip("/") + path.format(**(path_params or {}))
+        self.expected_status = tuple(expected_status or ())
+        self.headers = headers or {}
+        self.json_body = json_body
+        self.timeout = timeout
+        self._local = threading.local()
+        self._async_client: Any = None
+
+    @classmethod
+    def from_openapi(cls, base_url: str, operation_id: str,
+                     spec_path: Path = SPEC_PATH, **kwargs: Any) -> "HttpOperationTarget":
+        method, path = find_operation(operation_id, spec_path)
+        kwargs.setdefault("name", f"http:{operation_id}")
+        return cls(base_url, method, path, **kwargs)
+
+    def _check(self, status: int) -> None:
+        if self.expected_status and status not in self.expected_status:
+            raise AssertionError(f"HTTP {status} from {self.method} {self.url}")
+        if not self.expected_status and status >= 500:
+            raise AssertionError(f"HTTP {status} from {self.method} {self.url}")
+
+    def setup(self) -> None:
+        pass
+
+    def call(self) -> int:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            import requests
+            session = self._local.session = requests.Session()
+        response = session.request(self.method, self.url, headers=self.headers,
+                                   json=self.json_body, timeout=self.timeout)
+        self._check(response.status_code)
+        return int(response.status_code)
+
+    async def acall(self) -> int:
+        if self._async_client is None:
+            try:
+                import httpx
+            except ImportError:
+                return await asyncio.get_running_loop().run_in_executor(None, self.call)
+            self._async_client = httpx.AsyncClient(timeout=self.timeout)
+        response = await self._async_client.request(self.method, self.url, headers=self.headers,
+                                                    json=self.json_body)
+        self._check(response.status_code)
+        return int(response.status_code)
+
+    async def aclose(self) -> None:
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
+    def teardown(self) -> None:
+        pass
+
+
+class StubApiServer:
+    """Local stand-in that answers every spec operation with its first numeric documented status"""
+
+    def __init__(self, spec_path: Path = SPEC_PATH, host: str = "127.0.0.1", port: int = 0):
+        spec = yaml.safe_load(spec_path.read_text(encoding="utf-8"))
+        self.host = host
+        self.routes: List[Tuple[str, Pattern[str], int]] = []
+        for path, operations in spec.get("paths", {}).items():
+            pattern = _path_regex(path)
+            for method, operation in operations.items():
+                if isinstance(operation, dict) and "responses" in operation:
+                    # "default" and ranges such as "2XX" are not statuses a stub can send
+                    codes = [int(code) for code in operation["responses"] if str(code).isdigit()]
+                    status = codes[0] if codes else 200
+                    self.routes.append((method.upper(), pattern, status))
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self._server.server_port}"
+
+    def _handler(self) -> Type[BaseHTTPRequestHandler]:
+        routes = self.routes
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def _respond(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                path = self.path.split("?", 1)[0]
+                status = 404
+                for method, pattern, documented in routes:
+                    if pattern.match(path):
+                        status = documented if method == self.command else 405
+                        if method == self.command:
+                            break
+                body = b"{}" if status != 204 else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _respond
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        return Handler
+
+    def __enter__(self) -> "StubApiServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _path_regex(path: str) -> Pattern[str]:
+    parts = re.split(r"(\{[^}]+\})", path)
+    return re.compile("^" + "".join("[^/]+" if p.startswith("{") else re.escape(p) for p in parts) + "$")
+
+
+# ---------------------------------------------------------------------------
+# Engines and results
+# ---------------------------------------------------------------------------
+
+class LoadResult:
+    """Throughput, error and latency summary of one load run"""
+
+    def __init__(self, target: str, engine: str, profile: str, concurrency: int):
+        self.target = target
+        self.engine = engine
+        self.profile = profile
+        self.concurrency = concurrency
+        self.histogram = LatencyHistogram()
+        self.errors: "Counter[str]" = Counter()
+        self.elapsed = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latency_ns: int, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            self.histogram.record(latency_ns)
+            if error is not None:
+                self.errors[type(error).__name__] += 1
+
+    @property
+    def count(self) -> int:
+        return self.histogram.count
+
+    @property
+    def error_rate(self) -> float:
+        return sum(self.errors.values()) / self.count if self.count else 0.0
+
+    @property
+    def throughput(self) -> float:
+        return self.count / self.elapsed if self.elapsed else 0.0
+
+    def percentile_ms(self, pct: float) -> float:
+        return self.histogram.percentile(pct) / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "target": self.target,
+            "engine": self.engine,
+            "profile": self.profile,
+            "concurrency": self.concurrency,
+            "elapsed_s": round(self.elapsed, 3),
+            "requests": self.count,
+            "throughput_rps": round(self.throughput, 2),
+            "error_rate": round(self.error_rate, 4),
+            "errors": dict(self.errors),
+            **{f"p{int(p)}_ms": self.percentile_ms(p) for p in PERCENTILES},
+        }
+
+
+class ThreadPoolEngine:
+    """Dispatches calls onto a bounded thread pool"""
+
+    name = "thread"
+
+    def run(self, target: Target, profile: Profile, concurrency: int, duration: float) -> LoadResult:
+        result = LoadResult(target.name, self.name, repr(profile), concurrency)
+        slots = threading.BoundedSemaphore(concurrency)
+        clock = time.perf_counter_ns
+
+        def one() -> None:
+            start = clock()
+            try:
+                target.call()
+                result.record(clock() - start)
+            except Exception as e:
+                result.record(clock() - start, e)
+            finally:
+                slots.release()
+
+        target.setup()
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency) as pool:
+                started = time.perf_counter()
+                next_at = started
+                while True:
+                    now = time.perf_counter()
+                    elapsed = now - started
+                    if elapsed >= duration:
+                        break
+                    rate = profile.rate_at(elapsed, duration)
+                    if rate is not None:
+                        if rate <= 0:
+                            time.sleep(min(0.05, duration - elapsed))
+                            next_at = time.perf_counter()
+                            continue
+                        if now < next_at:
+                            time.sleep(min(next_at - now, duration - elapsed))
+                            continue
+                        next_at += 1.0 / rate
+                    if slots.acquire(timeout=max(0.0, duration - elapsed)):
+                        pool.submit(one)
+            result.elapsed = time.perf_counter() - started
+        finally:
+            target.teardown()
+        return result
+
+
+class AsyncioEngine:
+    """Dispatches calls as tasks on one event loop, bounded by a semaphore"""
+
+    name = "asyncio"
+
+    def run(self, target: Target, profile: Profile, concurrency: int, duration: float) -> LoadResult:
+        return asyncio.run(self._run(target, profile, concurrency, duration))
+
+    async def _run(self, target: Target, profile: Profile, concurrency: int, duration: float) -> LoadResult:
+        result = LoadResult(target.name, self.name, repr(profile), concurrency)
+        slots = asyncio.Semaphore(concurrency)
+        loop = asyncio.get_running_loop()
+        acall = getattr(target, "acall", None)
+        clock = time.perf_counter_ns
+        tasks: Set["asyncio.Future[None]"] = set()
+
+        async def one() -> None:
+            start = clock()
+            try:
+                if acall is not None:
+                    await acall()
+                else:
+                    await loop.run_in_executor(None, target.call)
+                result.record(clock() - start)
+            except Exception as e:
+                result.record(clock() - start, e)
+            finally:
+                slots.release()
+
+        target.setup()
+        try:
+            started = time.perf_counter()
+            next_at = started
+            while True:
+                now = time.perf_counter()
+                elapsed = now - started
+                if elapsed >= duration:
+                    break
+                rate = profile.rate_at(elapsed, duration)
+                if rate is not None:
+                    if rate <= 0:
+                        await asyncio.sleep(min(0.05, duration - elapsed))
+                        next_at = time.perf_counter()
+                        continue
+                    if now < next_at:
+                        await asyncio.sleep(min(next_at - now, duration - elapsed))
+                        continue
+                    next_at += 1.0 / rate
+                try:
+                    await asyncio.wait_for(slots.acquire(), timeout=max(0.001, duration - elapsed))
+                except asyncio.TimeoutError:
+                    break
+                task = asyncio.ensure_future(one())
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+            result.elapsed = time.perf_counter() - started
+        finally:
+            aclose = getattr(target, "aclose", None)
+            if aclose is not None:
+                await aclose()
+            target.teardown()
+        return result
+
+
+ENGINES: Dict[str, Union[Type[ThreadPoolEngine], Type[AsyncioEngine]]] = {
+    "thread": ThreadPoolEngine,
+    "asyncio": AsyncioEngine,
+}
+
+
+class LoadHarness:
+    """Runs targets with defaults taken from the test configuration"""
+
+    def __init__(self, config: Dict[str, Any], results: List[Dict[str, Any]], nodeid: str = ""):
+        self.concurrency = int(config.get("load_concurrency", 10))
+        self.duration = float(config.get("load_duration", 5.0))
+        self.profile = str(config.get("load_profile", "constant"))
+        self.engine = str(config.get("load_engine", "thread"))
+        self._results = results
+        self._nodeid = nodeid
+
+    def run(self, target: Target, engine: Optional[str] = None,
+            profile: Union[str, Profile, None] = None,
+            concurrency: Optional[int] = None, duration: Optional[float] = None) -> LoadResult:
+        profile = profile if profile is not None else self.profile
+        result = ENGINES[engine or self.engine]().run(
+            target,
+            parse_profile(profile) if isinstance(profile, str) else profile,
+            concurrency or self.concurrency,
+            duration if duration is not None else self.duration,
+        )
+        entry = result.to_dict()
+        entry["test"] = self._nodeid
+        self._results.append(entry)
+        return result
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.stash[RESULTS] = []
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    """Write load results next to the latency report"""
+    results = session.config.stash.get(RESULTS, None)
+    if not results:
+        return
+    path = Path(os.getenv("LOAD_REPORT", "test-results/load.json"))
+    if not path.is_absolute():
+        path = Path(str(session.config.rootpath)) / path
+    worker = os.getenv("PYTEST_XDIST_WORKER")
+    if worker:
+        path = path.with_name(f"{path.stem}.{worker}{path.suffix}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "results": results,
+    }
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+@pytest.fixture
+def load_harness(config: Dict[str, Any], request: pytest.FixtureRequest) -> LoadHarness:
+    """Configurable load harness (engine/profile/concurrency/duration from config)"""
+    return LoadHarness(config, request.config.stash[RESULTS], request.node.nodeid)
\ No newline at end of file
@@ -0,0 +1,248 @@
+"""
+Redis fixtures for acme-banking-qa backend tests
+
+Each test gets its own key namespace with pipelined batch helpers, and
+cleanup uses SCAN + UNLINK so teardown never blocks the server. When no
+Redis server is reachable an in-process stand-in is used instead.
+"""
+
+import fnmatch
+import os
+import threading
+import time
+import uuid
+import warnings
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, cast
+
+import pytest
+
+
+def _encode(value: Any) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    if isinstance(value, (int, float)):
+        return repr(value).encode()
+    return str(value).encode("utf-8")
+
+
+def _name(key: Any) -> str:
+    return key.decode("utf-8") if isinstance(key, bytes) else str(key)
+
+
+class InProcessPipeline:
+    """Buffers commands and replays them against an InProcessRedis"""
+
+    def __init__(self, client: "InProcessRedis"):
+        self._client = client
+        self._commands: List[Tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str) -> Callable[..., "InProcessPipeline"]:
+        if not hasattr(self._client, name):
+            raise AttributeError(name)
+
+        def queue(*args: Any, **kwargs: Any) -> "InProcessPipeline":
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self) -> List[Any]:
+        with self._client._lock:
+            results = [getattr(self._client, n)(*a, **kw) for n, a, kw in self._commands]
+        self._commands = []
+        return results
+
+    def __enter__(self) -> "InProcessPipeline":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self._commands = []
+
+
+class InProcessRedis:
+    """Minimal thread-safe stand-in for the redis-py client API used in tests"""
+
+    def __init__(self) -> None:
+        self._data: Dict[str, bytes] = {}
+        self._expires: Dict[str, float] = {}
+        self._lock = threading.RLock()
+
+    def _alive(self, key: str) -> bool:
+        key = _name(key)
+        deadline = self._expires.get(key)
+        if deadline is not None and deadline <= time.monotonic():
+            self._data.pop(key, None)
+            self._expires.pop(key, None)
+        return key in self._data
+
+    def ping(self) -> bool:
+        return True
+
+    def get(self, name: str) -> Optional[bytes]:
+        with self._lock:
+            return self._data[_name(name)] if self._alive(name) else None
+
+    def mget(self, keys: Iterable[str], *args: str) -> List[Optional[bytes]]:
+        names = [keys] if isinstance(keys, str) else list(keys)
+        return [self.get(k) for k in names + list(args)]
+
+    def set(self, name: str, value: Any, ex: Optional[float] = None, px: Optional[float] = None,
+            nx: bool = False, xx: bool = False) -> Optional[bool]:
+        name = _name(name)
+        with self._lock:
+            exists = self._alive(name)
+            if (nx and exists) or (xx and not exists):
+                return None
+            self._data[name] = _encode(value)
+            self._expires.pop(name, None)
+            if ex is not None or px is not None:
+                ttl = ex if ex is not None else float(px or 0) / 1000.0
+                self._expires[name] = time.monotonic() + ttl
+            return True
+
+    def incr(self, name: str, amount: int = 1) -> int:
+        name = _name(name)
+        with self._lock:
+            value = int(self.get(name) or 0) + amount
+            self._data[name] = _encode(value)
+            return value
+
+    def expire(self, name: str, time_seconds: float) -> bool:
+        with self._lock:
+            if not self._alive(name):
+                return False
+            self._expires[_name(name)] = time.monotonic() + time_seconds
+            return True
+
+    def exists(self, *names: str) -> int:
+        with self._lock:
+            return sum(1 for n in names if self._alive(n))
+
+    def delete(self, *names: str) -> int:
+        with self._lock:
+            removed = 0
+            for n in map(_name, names):
+                if self._alive(n):
+                    del self._data[n]
+                    self._expires.pop(n, None)
+                    removed += 1
+            return removed
+
+    unlink = delete
+
+    def scan_iter(self, match: Optional[str] = None, count: Optional[int] = None) -> Iterator[bytes]:
+        # Iterates a snapshot, so keys unlinked mid-scan never cause skips
+        with self._lock:
+            keys = sorted(k for k in list(self._data) if self._alive(k))
+        for key in keys:
+            if match is None or fnmatch.fnmatchcase(key, match):
+                yield key.encode()
+
+    def pipeline(self, transaction: bool = True) -> InProcessPipeline:
+        return InProcessPipeline(self)
+
+    def flushdb(self) -> bool:
+        with self._lock:
+            self._data.clear()
+            self._expires.clear()
+            return True
+
+    def close(self) -> None:
+        pass
+
+
+def connect_redis(uri: str) -> Any:
+    """Connect to Redis at ``uri``, or fall back to an in-process stand-in"""
+    try:
+        import redis
+        client = redis.from_url(uri, socket_connect_timeout=2)
+        client.ping()
+        return client
+    except ImportError:
+        reason = "redis not available"
+    except Exception as e:
+        reason = f"Redis connection failed: {e}"
+    warnings.warn(f"{reason}; using in-process Redis stand-in")
+    return InProcessRedis()
+
+
+class NamespacedRedis:
+    """Redis access scoped to one key prefix, with pipelined batch helpers"""
+
+    def __init__(self, client: Any, namespace: str, scan_count: int = 500):
+        self.client = client
+        self.namespace = namespace
+        self.scan_count = scan_count
+
+    def key(self, name: str) -> str:
+        return f"{self.namespace}{name}"
+
+    def set(self, name: str, value: Any, **kwargs: Any) -> Optional[bool]:
+        return cast(Optional[bool], self.client.set(self.key(name), value, **kwargs))
+
+    def get(self, name: str) -> Optional[bytes]:
+        return cast(Optional[bytes], self.client.get(self.key(name)))
+
+    def delete(self, *names: str) -> int:
+        return int(self.client.delete(*[self.key(n) for n in names]))
+
+    def pipeline(self) -> Any:
+        """Raw pipeline; use ``key()`` to stay inside the namespace"""
+        return self.client.pipeline(transaction=False)
+
+    def set_many(self, mapping: Dict[str, Any], ex: Optional[float] = None) -> List[Any]:
+        """Set many keys in a single round trip"""
+        pipe = self.pipeline()
+        for name, value in mapping.items():
+            pipe.set(self.key(name), value, ex=ex)
+        return list(pipe.execute())
+
+    def get_many(self, names: Iterable[str]) -> List[Optional[bytes]]:
+        """Fetch many keys in a single round trip"""
+        names = list(names)
+        if not names:
+            return []
+        return list(self.client.mget([self.key(n) for n in names]))
+
+    def delete_many(self, names: Iterable[str]) -> int:
+        """Unlink many keys in a single round trip"""
+        keys = [self.key(n) for n in names]
+        return int(self.client.unlink(*keys)) if keys else 0
+
+    def cleanup(self) -> int:
+        """Remove every key in the namespace without blocking the server"""
+        removed = 0
+        batch: List[bytes] = []
+        for key in self.client.scan_iter(match=f"{self.namespace}*", count=self.scan_count):
+            batch.append(key)
+            if len(batch) >= self.scan_count:
+                removed += self.client.unlink(*batch)
+                batch = []
+        if batch:
+            removed += self.client.unlink(*batch)
+        return removed
+
+
+@pytest.fixture(scope="session")
+def redis_connection(config: Dict[str, Any]) -> Iterator[Any]:
+    """Redis connection fixture, falling back to an in-process stand-in"""
+    r = connect_redis(config["redis_uri"])
+    yield r
+    r.close()
+
+
+@pytest.fixture(scope="session")
+def redis_server(redis_connection: Any) -> Any:
+    """The Redis server itself; skips tests that must not pass against the stand-in"""
+    if isinstance(redis_connection, InProcessRedis):
+        pytest.skip("Redis server not reachable; only the in-process stand-in is available")
+    return redis_connection
+
+
+@pytest.fixture
+def redis_ns(redis_connection: Any) -> Iterator[NamespacedRedis]:
+    """Per-test Redis namespace, cleaned up with SCAN + UNLINK on teardown"""
+    worker = os.getenv("PYTEST_XDIST_WORKER", "main")
+    ns = NamespacedRedis(redis_connection, f"test:{worker}:{uuid.uuid4().hex[:12]}:")
+    yield ns
+    ns.cleanup()
\ No newline at end of file
@@ -0,0 +1,163 @@
+"""
+Response schema validation for acme-banking-qa backend tests
+
+Schemas come from the OpenAPI spec. Each one is compiled into a
+jsonschema validator on first use and cached for the whole session, so an
+assertion only runs the compiled validator instead of re-parsing the schema.
+"""
+
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+from urllib.parse import urlsplit
+
+import pytest
+import yaml
+from jsonschema import Draft7Validator
+
+ROOT = Path(__file__).resolve().parents[3]
+
+# The solution's OpenAPI input, then the generator's default location
+SPEC_CANDIDATES = ["specs/banking.yaml", "specs/api.yaml"]
+
+SCHEMA_REF_PREFIX = "#/components/schemas/"
+
+# OpenAPI annotations that are not JSON Schema keywords
+OPENAPI_ONLY_KEYWORDS = ("nullable", "example", "xml", "externalDocs", "discriminator", "deprecated")
+
+# Keywords whose value maps names to subschemas, so its keys are never keywords themselves
+SCHEMA_MAPS = ("properties", "patternProperties", "definitions")
+
+# Violations listed in one failure message
+MAX_VIOLATIONS = 20
+
+
+class SchemaMismatch(AssertionError):
+    """A JSON document that does not match its schema, with every violation listed"""
+
+
+def to_json_schema(node: Any) -> Any:
+    """OpenAPI 3.0 schema object as draft-07 JSON Schema; $refs are left pointing at components"""
+    if isinstance(node, list):
+        return [to_json_schema(item) for item in node]
+    if not isinstance(node, dict):
+        return node
+    out: Dict[str, Any] = {}
+    for key, value in node.items():
+        if key in SCHEMA_MAPS and isinstance(value, dict):
+            out[key] = {name: to_json_schema(sub) for name, sub in value.items()}
+        elif key not in OPENAPI_ONLY_KEYWORDS:
+            out[key] = to_json_schema(value)
+    if node.get("nullable") is True:
+        if isinstance(out.get("type"), str):
+            out["type"] = [out["type"], "null"]
+        if isinstance(out.get("enum"), list) and None not in out["enum"]:
+            out["enum"] = [*out["enum"], None]
+    return out
+
+
+def _route(template: str) -> Pattern:
+    """Regex for a path template such as /accounts/{id}, allowing a base path in front"""
+    parts = re.split(r"\{[^/}]+\}", template)
+    return re.compile("^(?:/.*)?" + "[^/]+".join(re.escape(part) for part in parts) + "/?$")
+
+
+class SchemaRegistry:
+    """Validators for the spec's component and response schemas, compiled once and shared"""
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.spec = spec
+        self._schemas = spec.get("components", {}).get("schemas", {})
+        self._components = {"schemas": {name: to_json_schema(s) for name, s in self._schemas.items()}}
+        self._validators: Dict[str, Draft7Validator] = {}
+        self._lock = threading.Lock()
+        self._routes: List[Tuple[str, Pattern, str, Dict[str, Any]]] = []
+        for template, operations in spec.get("paths", {}).items():
+            for method, operation in operations.items():
+                if isinstance(operation, dict):
+                    self._routes.append((method.upper(), _route(template), template, operation))
+        # Literal segments win over parameters: /accounts/me before /accounts/{id}
+        self._routes.sort(key=lambda route: route[2].count("{"))
+
+    @classmethod
+    def from_file(cls, path: Path) -> "SchemaRegistry":
+        if not path.exists():
+            return cls({})
+        return cls(yaml.safe_load(path.read_text(encoding="utf-8")) or {})
+
+    def _compile(self, key: str, schema: Dict[str, Any]) -> Draft7Validator:
+        with self._lock:
+            validator = self._validators.get(key)
+            if validator is None:
+                # Component $refs resolve against the components carried in the same document
+                document = {**to_json_schema(schema), "components": self._components}
+                Draft7Validator.check_schema(document)
+                validator = Draft7Validator(document, format_checker=Draft7Validator.FORMAT_CHECKER)
+                self._validators[key] = validator
+            return validator
+
+    def validator(self, name: str) -> Draft7Validator:
+        """Compiled validator for a component schema such as HealthResponse"""
+        if name not in self._schemas:
+            raise KeyError(f"No schema named {name!r} in the OpenAPI spec")
+        return self._compile(name, self._schemas[name])
+
+    def operation(self, method: str, path: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """(path template, operation) serving a concrete request path"""
+        for route_method, pattern, template, operation in self._routes:
+            if route_method == method.upper() and pattern.match(path):
+                return template, operation
+        return None
+
+    def response_validator(self, method: str, path: str, status: int) -> Optional[Draft7Validator]:
+        """Validator for the JSON body declared for this status, or None if there is none"""
+        match = self.operation(method, path)
+        if match is None:
+            return None
+        template, operation = match
+        responses = operation.get("responses", {})
+        response = next((r for code, r in responses.items() if str(code) == str(status)),
+                        responses.get("default"))
+        schema = ((response or {}).get("content", {}).get("application/json") or {}).get("schema")
+        if not schema:
+            return None
+        return self._compile(f"{method.upper()} {template} {status}", schema)
+
+    def validate(self, instance: Any, name: str) -> None:
+        """Raise SchemaMismatch unless ``instance`` matches the named component schema"""
+        check(self.validator(name), instance, name)
+
+    def validate_response(self, response: Any) -> bool:
+        """Check a requests response against its operation's schema; False if none is declared"""
+        request = response.request
+        path = urlsplit(request.url).path
+        validator = self.response_validator(request.method, path, response.status_code)
+        if validator is None:
+            return False
+        check(validator, response.json(), f"{request.method} {path} -> {response.status_code}")
+        return True
+
+
+def check(validator: Draft7Validator, instance: Any, label: str) -> None:
+    errors = sorted(validator.iter_errors(instance), key=lambda e: [str(p) for p in e.absolute_path])
+    if errors:
+        lines = [f"  {'/'.join(str(p) for p in e.absolute_path) or '<root>'}: {e.message}"
+                 for e in errors[:MAX_VIOLATIONS]]
+        raise SchemaMismatch(f"{label} does not match its schema ({len(errors)} violations):\n" + "\n".join(lines))
+
+
+def find_spec(config: Dict[str, Any]) -> Path:
+    configured = config.get("openapi_spec")
+    if configured:
+        return ROOT / str(configured)
+    for candidate in SPEC_CANDIDATES:
+        if (ROOT / candidate).exists():
+            return ROOT / candidate
+    return ROOT / SPEC_CANDIDATES[-1]
+
+
+@pytest.fixture(scope="session")
+def schema_registry(config: Dict[str, Any]) -> SchemaRegistry:
+    """Response schemas from the OpenAPI spec, compiled on first use and shared by all tests"""
+    return SchemaRegistry.from_file(find_spec(config))
\ No newline at end of file
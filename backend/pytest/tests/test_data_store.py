@@ -0,0 +1,105 @@
+"""
+Test data store tests for acme-banking-qa backend services
+
+Every source is written to a temporary data directory, so these need no
+checked-in data files.
+"""
+
+import json
+from collections.abc import Mapping
+from pathlib import Path
+
+import pytest
+
+from plugins.data_store import DataView, TestDataStore
+
+USERS_CSV = "username,role,active\nalice,admin,yes\nbob,viewer,yes\ncarol,viewer,no\n"
+
+PRODUCTS = {"products": [{"id": 1, "name": "Checking", "tags": ["retail"]},
+                         {"id": 2, "name": "Savings", "tags": []}]}
+
+
+@pytest.fixture
+def store(tmp_path: Path) -> TestDataStore:
+    (tmp_path / "users.csv").write_text(USERS_CSV, encoding="utf-8")
+    (tmp_path / "products.json").write_text(json.dumps(PRODUCTS), encoding="utf-8")
+    return TestDataStore(tmp_path, {"users": ("users.csv", "username"),
+                                    "products": ("products.json", "id"),
+                                    "rates": ("rates.json", None)})
+
+
+class TestDataView:
+    """Rows are looked up through indexes built once per column"""
+
+    def test_key_lookup(self, store: TestDataStore) -> None:
+        users = store["users"]
+
+        assert users.get("bob")["role"] == "viewer"
+        assert users.get("dave") is None
+        assert users.get("dave", {}) == {}
+
+    def test_numeric_json_ids_match_string_ids(self, store: TestDataStore) -> None:
+        products = store["products"]
+
+        assert products.get(2)["name"] == "Savings"
+        assert products.get("2") is products.get(2)
+
+    def test_lookup_by_any_column(self, store: TestDataStore) -> None:
+        users = store["users"]
+
+        assert [row["username"] for row in users.lookup("role", "viewer")] == ["bob", "carol"]
+        assert users.lookup("role", "auditor") == ()
+        assert users.column_index("role") == users.column_index("role")
+        assert set(users.column_index("active")) == {"yes", "no"}
+
+    def test_sequence_of_rows(self, store: TestDataStore) -> None:
+        users = store["users"]
+
+        assert len(users) == 3
+        assert [row["username"] for row in users] == ["alice", "bob", "carol"]
+        assert users[-1]["username"] == "carol"
+
+    def test_get_needs_a_key_column(self) -> None:
+        view = DataView("rates", ({"currency": "EUR"},))
+
+        assert view.lookup("currency", "EUR") == ({"currency": "EUR"},)
+        with pytest.raises(KeyError):
+            view.get("EUR")
+
+
+class TestDataStoreSources:
+    """Sources load on first access, once, and only when their file exists"""
+
+    def test_views_are_shared(self, store: TestDataStore) -> None:
+        assert store["users"] is store["users"]
+
+    def test_missing_sources(self, store: TestDataStore) -> None:
+        assert sorted(store) == ["products", "users"]
+        assert len(store) == 2
+        with pytest.raises(KeyError):
+            store["rates"]
+        with pytest.raises(KeyError):
+            store["accounts"]
+
+
+class TestDocuments:
+    """``test_data`` hands out ``store.documents``: each file's shape, read-only"""
+
+    def test_documents_keep_the_file_shape(self, store: TestDataStore) -> None:
+        documents = store.documents
+
+        assert sorted(documents) == ["products", "users"]
+        assert isinstance(documents["products"], Mapping)
+        assert [p["name"] for p in documents["products"]["products"]] == ["Checking", "Savings"]
+        assert documents["products"]["products"][0]["tags"] == ("retail",)
+        assert [u["username"] for u in documents["users"]] == ["alice", "bob", "carol"]
+
+    def test_documents_are_read_only(self, store: TestDataStore) -> None:
+        products = store.documents["products"]
+
+        with pytest.raises(TypeError):
+            products["products"] = ()
+        with pytest.raises(TypeError):
+            products["products"][0]["name"] = "Loan"
+        with pytest.raises(TypeError):
+            store["users"][0]["role"] = "admin"
\ No newline at end of file
@@ -7,6 +7,8 @@ import psycopg2
 from typing import Dict, Any
 import json
 
+from plugins.load import PostgresQueryTarget
+
 @pytest.mark.integration
 class TestDatabaseOperations:
     """Test database operations and data integrity"""
@@ -109,7 +111,7 @@ class TestDatabaseOperations:
         finally:
             cursor.close()
     
-    def test_database_performance(self, db_connection):
+    def test_database_performance(self, db_connection, latency):
         """Test database query performance"""
         cursor = db_connection.cursor()
         
@@ -138,22 +140,19 @@ class TestDatabaseOperations:
                 ON test_performance(category)
             """)
             
-            # Measure query time
-            import time
-            start_time = time.time()
-            
-            cursor.execute("""
-                SELECT category, COUNT(*), AVG(value) 
-                FROM test_performance 
-                WHERE category = %s 
-                GROUP BY category
-            """, ("cat_5",))
+            def query():
+                cursor.execute("""
+                    SELECT category, COUNT(*), AVG(value) 
+                    FROM test_performance 
+                    WHERE category = %s 
+                    GROUP BY category
+                """, ("cat_5",))
+                return cursor.fetchone()
             
-            result = cursor.fetchone()
-            query_time = time.time() - start_time
+            # Query latency distribution should stay within budget
+            latency.measure("db.category_aggregate", query)
             
-            # Query should complete in reasonable time
-            assert query_time < 1.0, f"Query took {query_time:.2f}s, expected < 1.0s"
+            result = query()
             assert result is not None
             assert result[0] == "cat_5"
             assert result[1] == 100  # 1000 items / 10 categories
@@ -165,44 +164,10 @@ class TestDatabaseOperations:
 class TestDatabaseLoad:
     """Test database under load conditions"""
     
-    def test_concurrent_connections(self, db_connection):
+    def test_concurrent_connections(self, db_connection, load_harness):
         """Test multiple concurrent database connections"""
-        import threading
-        import queue
-        
-        results = queue.Queue()
-        
-        def worker(worker_id):
-            try:
-                conn = psycopg2.connect(db_connection.dsn)
-                cursor = conn.cursor()
-                cursor.execute("SELECT %s", (worker_id,))
-                result = cursor.fetchone()
-                results.put((worker_id, result[0]))
-                cursor.close()
-                conn.close()
-            except Exception as e:
-                results.put((worker_id, f"ERROR: {e}"))
-        
-        # Start multiple worker threads
-        threads = []
-        for i in range(10):
-            thread = threading.Thread(target=worker, args=(i,))
-            threads.append(thread)
-            thread.start()
-        
-        # Wait for all threads to complete
-        for thread in threads:
-            thread.join()
-        
-        # Verify all workers completed successfully
-        successful_results = []
-        while not results.empty():
-            worker_id, result = results.get()
-            if isinstance(result, str) and result.startswith("ERROR"):
-                pytest.fail(f"Worker {worker_id} failed: {result}")
-            successful_results.append((worker_id, result))
+        target = PostgresQueryTarget(db_connection.dsn, "SELECT %s", params=(42,), expect=(42,))
+        result = load_harness.run(target)
         
-        assert len(successful_results) == 10
-        for worker_id, result in successful_results:
-            assert result == worker_id
\ No newline at end of file
+        assert result.count > 0
+        assert result.error_rate == 0, f"Errors under load: {dict(result.errors)}"
\ No newline at end of file
@@ -0,0 +1,153 @@
+"""
+Asyncio database tests for acme-banking-qa backend services
+"""
+
+import uuid
+from typing import Any, Dict
+
+import pytest
+
+asyncpg = pytest.importorskip("asyncpg")
+pytest.importorskip("pytest_asyncio")
+
+from plugins.async_db import AsyncDatabase, AsyncPostgresQueryTarget
+from plugins.load import LoadHarness
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+class TestAsyncDatabaseOperations:
+    """Async counterparts of the transaction and constraint tests, under concurrency"""
+
+    async def test_async_concurrent_queries(self, async_db: AsyncDatabase,
+                                           config: Dict[str, Any]) -> None:
+        """Hundreds of concurrent queries share a small pool on one event loop"""
+        results = await async_db.run_concurrently(
+            500, lambda conn, i: conn.fetchval("SELECT $1::int", i)
+        )
+
+        assert results == list(range(500))
+        assert async_db.pool.get_size() <= config.get("async_db_pool_size", 20)
+
+    async def test_async_database_transactions(self, async_db_connection: Any) -> None:
+        """Test async transaction handling"""
+        conn = async_db_connection
+        await conn.execute("""
+            CREATE TEMP TABLE test_transactions (
+                id SERIAL PRIMARY KEY,
+                name VARCHAR(100),
+                value INTEGER
+            )
+        """)
+
+        transaction = conn.transaction()
+        await transaction.start()
+        await conn.execute("""
+            INSERT INTO test_transactions (name, value)
+            VALUES ($1, $2)
+        """, "test_item", 42)
+
+        # Verify data was inserted
+        assert await conn.fetchval("SELECT COUNT(*) FROM test_transactions") == 1
+
+        # Rollback transaction
+        await transaction.rollback()
+
+        # Verify data was rolled back
+        assert await conn.fetchval("SELECT COUNT(*) FROM test_transactions") == 0
+
+    async def test_async_concurrent_transactions(self, async_db: AsyncDatabase) -> None:
+        """Concurrent transactions commit or roll back independently"""
+        table = f"test_async_tx_{uuid.uuid4().hex[:12]}"
+        await async_db.pool.execute(f"""
+            CREATE TABLE {table} (
+                id SERIAL PRIMARY KEY,
+                client INTEGER NOT NULL
+            )
+        """)
+
+        async def client(conn: Any, i: int) -> None:
+            async with conn.transaction():
+                await conn.execute(f"INSERT INTO {table} (client) VALUES ($1)", i)
+                if i % 2:
+                    raise RuntimeError("roll back odd clients")
+
+        try:
+            results = await async_db.run_concurrently(200, client)
+
+            assert all(r is None for r in results[::2])
+            assert all(isinstance(r, RuntimeError) for r in results[1::2])
+            clients = await async_db.pool.fetch(f"SELECT client FROM {table} ORDER BY client")
+            assert [row["client"] for row in clients] == list(range(0, 200, 2))
+        finally:
+            await async_db.pool.execute(f"DROP TABLE IF EXISTS {table}")
+
+    async def test_async_database_constraints(self, async_db_connection: Any) -> None:
+        """Test async constraint enforcement"""
+        conn = async_db_connection
+        await conn.execute("""
+            CREATE TEMP TABLE test_constraints (
+                id SERIAL PRIMARY KEY,
+                email VARCHAR(255) UNIQUE NOT NULL,
+                age INTEGER CHECK (age >= 0 AND age <= 150)
+            )
+        """)
+
+        insert = """
+            INSERT INTO test_constraints (email, age)
+            VALUES ($1, $2)
+        """
+        await conn.execute(insert, "test@example.com", 25)
+
+        # Try to insert duplicate email
+        with pytest.raises(asyncpg.UniqueViolationError):
+            await conn.execute(insert, "test@example.com", 30)
+
+        # Test check constraint
+        with pytest.raises(asyncpg.CheckViolationError):
+            await conn.execute(insert, "another@example.com", -5)
+
+        with pytest.raises(asyncpg.CheckViolationError):
+            await conn.execute(insert, "another@example.com", 200)
+
+        with pytest.raises(asyncpg.NotNullViolationError):
+            await conn.execute(insert, None, 30)
+
+    async def test_async_concurrent_unique_inserts(self, async_db: AsyncDatabase) -> None:
+        """Racing inserts of one unique value: exactly one wins"""
+        table = f"test_async_unique_{uuid.uuid4().hex[:12]}"
+        await async_db.pool.execute(f"""
+            CREATE TABLE {table} (
+                id SERIAL PRIMARY KEY,
+                email VARCHAR(255) UNIQUE NOT NULL
+            )
+        """)
+
+        try:
+            results = await async_db.run_concurrently(
+                100,
+                lambda conn, i: conn.execute(f"INSERT INTO {table} (email) VALUES ($1)", "race@example.com"),
+            )
+
+            errors = [r for r in results if isinstance(r, BaseException)]
+            assert len(results) - len(errors) == 1
+            assert all(isinstance(e, asyncpg.UniqueViolationError) for e in errors)
+            assert await async_db.pool.fetchval(f"SELECT COUNT(*) FROM {table}") == 1
+        finally:
+            await async_db.pool.execute(f"DROP TABLE IF EXISTS {table}")
+
+@pytest.mark.slow
+class TestAsyncDatabaseLoad:
+    """Test database load driven from a single event loop"""
+
+    def test_async_concurrent_connections(self, db_connection: Any, config: Dict[str, Any],
+                                         load_harness: LoadHarness) -> None:
+        """Many simulated clients on one event loop over a shared asyncpg pool"""
+        # db_connection skips the test when no database is reachable
+        target = AsyncPostgresQueryTarget(
+            config["db_uri"], "SELECT %s::int", params=(42,), expect=(42,),
+            pool_size=config.get("async_db_pool_size", 20),
+        )
+        result = load_harness.run(target, engine="asyncio", concurrency=200)
+
+        assert result.count > 0
+        assert result.error_rate == 0, f"Errors under load: {dict(result.errors)}"
\ No newline at end of file
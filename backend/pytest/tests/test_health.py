@@ -4,17 +4,19 @@ Health check tests for acme-banking-qa backend services
 
 import pytest
 import requests
-import time
 from typing import Dict, Any
 
+from plugins.schemas import SchemaRegistry
+
 @pytest.mark.smoke
 class TestHealthChecks:
     """Test health endpoints for all services"""
     
-    def test_api_health(self, api_client: requests.Session):
+    def test_api_health(self, api_client: requests.Session, schema_registry: SchemaRegistry):
         """Test API health endpoint"""
         response = api_client.get("/health")
         assert response.status_code == 200
+        schema_registry.validate_response(response)
         data = response.json()
         assert data["status"] == "UP"
         assert "timestamp" in data
@@ -34,15 +36,13 @@ class TestHealthChecks:
         data = response.json()
         assert data["alive"] is True
     
-    def test_health_response_time(self, api_client: requests.Session):
-        """Test health endpoint response time"""
-        start_time = time.time()
-        response = api_client.get("/health")
-        end_time = time.time()
+    def test_health_response_time(self, api_client: requests.Session, latency):
+        """Test health endpoint response time distribution"""
+        def probe():
+            response = api_client.get("/health")
+            assert response.status_code == 200
         
-        assert response.status_code == 200
-        response_time = end_time - start_time
-        assert response_time < 1.0, f"Health check took {response_time:.2f}s, expected < 1.0s"
+        latency.measure("/health", probe)
     
     @pytest.mark.parametrize("endpoint", ["/health", "/ready", "/live"])
     def test_health_endpoints_content_type(self, api_client: requests.Session, endpoint: str):
@@ -63,12 +63,14 @@ class TestServiceHealth:
         assert result[0] == 1
         cursor.close()
     
-    def test_redis_health(self, redis_connection):
+    def test_redis_health(self, redis_server, redis_ns):
         """Test Redis connectivity"""
-        redis_connection.set("test_key", "test_value")
-        value = redis_connection.get("test_key")
+        assert redis_server.ping()
+        redis_ns.set_many({"test_key": "test_value", "test_counter": 1})
+        value, counter = redis_ns.get_many(["test_key", "test_counter"])
         assert value.decode() == "test_value"
-        redis_connection.delete("test_key")
+        assert int(counter) == 1
+        assert redis_ns.delete_many(["test_key"]) == 1
     
     def test_external_service_health(self, api_client: requests.Session):
         """Test external service dependencies"""
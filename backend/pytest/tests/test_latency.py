@@ -0,0 +1,87 @@
+"""
+Latency plugin tests for acme-banking-qa backend services
+
+The histogram and the recorder run on synthetic samples and local
+callables, so these need no live services.
+"""
+
+import math
+import time
+from typing import Any, Dict, List
+
+import pytest
+
+from plugins.latency import LatencyHistogram, LatencyRecorder
+
+
+def exact_percentile(samples: List[int], pct: float) -> int:
+    ordered = sorted(samples)
+    return ordered[max(1, math.ceil(pct / 100.0 * len(ordered))) - 1]
+
+
+class TestLatencyHistogram:
+    """Log-linear buckets keep every percentile within the configured precision"""
+
+    def test_small_values_are_exact(self) -> None:
+        histogram = LatencyHistogram()
+        for value in range(1, 101):
+            histogram.record(value)
+
+        assert [histogram.percentile(p) for p in (50.0, 95.0, 99.0, 100.0)] == [50, 95, 99, 100]
+        assert (histogram.count, histogram.min, histogram.max, histogram.mean) == (100, 1, 100, 50.5)
+
+    def test_large_values_share_buckets(self) -> None:
+        histogram = LatencyHistogram()
+        histogram.record(1_000_000)
+        histogram.record(1_000_500)
+
+        # Same bucket: both report its highest value, capped at the largest sample
+        assert histogram.percentile(50.0) == histogram.percentile(100.0) == 1_000_500
+
+    @pytest.mark.parametrize("significant_digits", [1, 2, 3])
+    def test_relative_error_is_bounded(self, significant_digits: int) -> None:
+        samples = [int(1_000 * 1.37 ** i) + i for i in range(60)]
+        histogram = LatencyHistogram(significant_digits)
+        for value in samples:
+            histogram.record(value)
+
+        for pct in (1.0, 50.0, 90.0, 95.0, 99.0, 99.9):
+            exact = exact_percentile(samples, pct)
+            assert histogram.percentile(pct) >= exact
+            assert (histogram.percentile(pct) - exact) / exact <= 10.0 ** -significant_digits
+
+    def test_empty_and_negative(self) -> None:
+        histogram = LatencyHistogram()
+        assert (histogram.percentile(99.0), histogram.mean) == (0, 0.0)
+
+        histogram.record(-5)
+        assert (histogram.min, histogram.percentile(50.0)) == (0, 0)
+
+
+class TestLatencyRecorder:
+    """Measured blocks are recorded for the report and checked against their budgets"""
+
+    def test_warmup_is_not_recorded(self) -> None:
+        calls: List[None] = []
+        results: List[Dict[str, Any]] = []
+        recorder = LatencyRecorder({"latency_iterations": 7, "latency_warmup": 3}, results, "test-id")
+        result = recorder.measure("noop", lambda: calls.append(None))
+
+        assert (len(calls), result.histogram.count, result.warmup) == (10, 7, 3)
+        assert results == [{**result.to_dict(), "test": "test-id", "budget_ms": {}}]
+
+    def test_budgets_merge_over_default(self) -> None:
+        budgets = {"default": {"p95": 100.0, "p99": 200.0}, "login": {"p99": 50.0}}
+        recorder = LatencyRecorder({"latency_budgets": budgets}, [], "test-id")
+
+        assert recorder.budget_for("login") == {"p95": 100.0, "p99": 50.0}
+        assert recorder.budget_for("health") == {"p95": 100.0, "p99": 200.0}
+
+    def test_over_budget_fails(self) -> None:
+        recorder = LatencyRecorder({"latency_budgets": {"sleep": {"p50": 0.5}}}, [], "test-id")
+
+        with pytest.raises(AssertionError, match=r"sleep latency over budget: p50="):
+            recorder.measure("sleep", lambda: time.sleep(0.001), iterations=3, warmup=0)
+        result = recorder.measure("sleep", lambda: time.sleep(0.001), iterations=3, warmup=0,
+                                  check_budget=False)
+        assert result.p50 >= 1.0
\ No newline at end of file
@@ -0,0 +1,155 @@
+"""
+Load harness tests for acme-banking-qa backend services
+
+Every engine and target runs against local stand-ins (the in-process Redis
+and a stub API server built from a spec), so these need no live services.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Type, Union
+
+import pytest
+import yaml
+
+from plugins.load import (AsyncioEngine, ConstantProfile, HttpOperationTarget, LoadHarness,
+                          RedisOpTarget, StubApiServer, ThreadPoolEngine, find_operation,
+                          parse_profile)
+from plugins.redis_store import InProcessRedis
+
+Engine = Union[Type[ThreadPoolEngine], Type[AsyncioEngine]]
+
+ENGINES: List[Engine] = [ThreadPoolEngine, AsyncioEngine]
+
+SPEC = {
+    "openapi": "3.0.0",
+    "paths": {
+        "/accounts": {
+            "get": {"operationId": "listAccounts", "responses": {"200": {"description": "OK"}}},
+            "post": {"operationId": "createAccount",
+                     "responses": {"default": {"description": "Error"}, "201": {"description": "Created"}}},
+        },
+        "/accounts/{id}": {
+            "get": {"operationId": "getAccount", "responses": {"default": {"description": "Any"}}},
+            "delete": {"operationId": "deleteAccount", "responses": {"204": {"description": "Gone"}}},
+        },
+    },
+}
+
+
+@pytest.fixture
+def spec_path(tmp_path: Path) -> Path:
+    path = tmp_path / "api.yaml"
+    path.write_text(yaml.safe_dump(SPEC, sort_keys=False), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def stub_api(spec_path: Path) -> Iterator[StubApiServer]:
+    with StubApiServer(spec_path) as server:
+        yield server
+
+
+class TestProfiles:
+    """Arrival profiles parsed from their config strings"""
+
+    def test_parse_profiles(self) -> None:
+        assert parse_profile("constant").rate_at(1.0, 10.0) is None
+        assert parse_profile("constant:50").rate_at(1.0, 10.0) == 50.0
+        assert parse_profile("ramp:10-30").rate_at(5.0, 10.0) == 20.0
+        step = parse_profile("step:10x1,40x2")
+        assert [step.rate_at(t, 3.0) for t in (0.5, 1.5, 5.0)] == [10.0, 40.0, 40.0]
+
+    def test_unknown_profile(self) -> None:
+        with pytest.raises(ValueError):
+            parse_profile("burst:5")
+
+
+class TestStubApiServer:
+    """The stub answers each operation with its first numeric documented status"""
+
+    def test_statuses_skip_default(self, spec_path: Path) -> None:
+        server = StubApiServer(spec_path)
+        try:
+            statuses = {(method, pattern.pattern): status for method, pattern, status in server.routes}
+        finally:
+            server._server.server_close()
+        assert statuses == {
+            ("GET", "^/accounts$"): 200,
+            ("POST", "^/accounts$"): 201,
+            ("GET", "^/accounts/[^/]+$"): 200,
+            ("DELETE", "^/accounts/[^/]+$"): 204,
+        }
+
+    @pytest.mark.parametrize("operation_id, status", [
+        ("createAccount", 201),
+        ("getAccount", 200),
+        ("deleteAccount", 204),
+    ])
+    def test_serves_operation(self, stub_api: StubApiServer, spec_path: Path,
+                              operation_id: str, status: int) -> None:
+        target = HttpOperationTarget.from_openapi(stub_api.url, operation_id, spec_path,
+                                                  path_params={"id": "42"}, expected_status=[status])
+        assert target.call() == status
+
+    def test_unknown_operation(self, spec_path: Path) -> None:
+        with pytest.raises(KeyError):
+            find_operation("transferFunds", spec_path)
+
+
+@pytest.mark.parametrize("engine", ENGINES, ids=lambda e: e.name)
+class TestEngines:
+    """Both engines drive every target kind without errors"""
+
+    def test_redis_target(self, engine: Engine) -> None:
+        client = InProcessRedis()
+        target = RedisOpTarget(client, key_prefix="load-test:")
+        result = engine().run(target, ConstantProfile(), concurrency=4, duration=0.3)
+
+        assert result.count > 0
+        assert result.errors == {}
+        assert result.throughput > 0
+        assert list(client.scan_iter(match="load-test:*")) == []
+
+    def test_http_target(self, engine: Engine, stub_api: StubApiServer, spec_path: Path) -> None:
+        target = HttpOperationTarget.from_openapi(stub_api.url, "listAccounts", spec_path,
+                                                  expected_status=[200])
+        result = engine().run(target, ConstantProfile(), concurrency=4, duration=0.3)
+
+        assert result.count > 0
+        assert result.errors == {}
+        assert result.percentile_ms(99.0) > 0
+
+    def test_errors_are_counted(self, engine: Engine, stub_api: StubApiServer, spec_path: Path) -> None:
+        target = HttpOperationTarget.from_openapi(stub_api.url, "deleteAccount", spec_path,
+                                                  path_params={"id": "42"}, expected_status=[200])
+        result = engine().run(target, ConstantProfile(), concurrency=2, duration=0.2)
+
+        assert result.count > 0
+        assert result.errors == {"AssertionError": result.count}
+        assert result.error_rate == 1.0
+
+    def test_rate_limited(self, engine: Engine) -> None:
+        target = RedisOpTarget(InProcessRedis(), op="ping")
+        result = engine().run(target, ConstantProfile(20), concurrency=4, duration=0.5)
+
+        # 20 ops/s for half a second, with slack for a slow scheduler
+        assert 5 <= result.count <= 12
+
+
+class TestLoadHarness:
+    """The harness applies config defaults and records results for the session report"""
+
+    def test_defaults_from_config(self) -> None:
+        results: List[Dict[str, Any]] = []
+        harness = LoadHarness({"load_engine": "asyncio", "load_profile": "constant:40",
+                               "load_concurrency": 2, "load_duration": 0.25}, results, "test-id")
+        result = harness.run(RedisOpTarget(InProcessRedis()))
+
+        assert (result.engine, result.profile, result.concurrency) == ("asyncio", "constant:40.0", 2)
+        assert results == [{**result.to_dict(), "test": "test-id"}]
+
+    def test_fixture(self, load_harness: LoadHarness) -> None:
+        result = load_harness.run(RedisOpTarget(InProcessRedis()), engine="thread", duration=0.1)
+
+        assert result.count > 0
+        assert result.engine == "thread"
\ No newline at end of file
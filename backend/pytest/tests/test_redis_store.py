@@ -0,0 +1,82 @@
+"""
+Redis fixture tests for acme-banking-qa backend services
+
+Namespacing and cleanup run against the in-process Redis stand-in, so
+these need no Redis server.
+"""
+
+import time
+
+import pytest
+
+from plugins.redis_store import InProcessRedis, NamespacedRedis
+
+
+@pytest.fixture
+def client() -> InProcessRedis:
+    return InProcessRedis()
+
+
+@pytest.fixture
+def ns(client: InProcessRedis) -> NamespacedRedis:
+    return NamespacedRedis(client, "test:main:abc:", scan_count=2)
+
+
+class TestNamespacedRedis:
+    """Every key is prefixed, and cleanup only touches the namespace"""
+
+    def test_keys_are_prefixed(self, client: InProcessRedis, ns: NamespacedRedis) -> None:
+        ns.set("balance", 100)
+
+        assert ns.key("balance") == "test:main:abc:balance"
+        assert client.get("test:main:abc:balance") == b"100"
+        assert client.get("balance") is None
+        assert ns.get("balance") == b"100"
+        assert ns.delete("balance", "missing") == 1
+
+    def test_batches(self, client: InProcessRedis, ns: NamespacedRedis) -> None:
+        assert ns.set_many({"a": 1, "b": "two"}) == [True, True]
+
+        assert ns.get_many(["a", "b", "c"]) == [b"1", b"two", None]
+        assert ns.get_many([]) == []
+        assert sorted(client.scan_iter(match="test:main:abc:*")) == [b"test:main:abc:a", b"test:main:abc:b"]
+        assert ns.delete_many(["a", "c"]) == 1
+        assert ns.delete_many([]) == 0
+
+    def test_cleanup_leaves_other_namespaces(self, client: InProcessRedis, ns: NamespacedRedis) -> None:
+        ns.set_many({f"key{i}": i for i in range(5)})
+        other = NamespacedRedis(client, "test:main:def:")
+        other.set("key0", "kept")
+        client.set("shared", "kept")
+
+        # Five keys in batches of two
+        assert ns.cleanup() == 5
+        assert list(client.scan_iter(match="test:main:abc:*")) == []
+        assert other.get("key0") == b"kept"
+        assert client.get("shared") == b"kept"
+        assert ns.cleanup() == 0
+
+
+class TestInProcessRedis:
+    """The stand-in follows the redis-py calls the fixtures and load targets use"""
+
+    def test_pipeline_replays_in_order(self, client: InProcessRedis) -> None:
+        with client.pipeline() as pipe:
+            pipe.set("n", 1).incr("n", 4).get("n")
+            assert client.get("n") is None
+            assert pipe.execute() == [True, 5, b"5"]
+
+    def test_set_conditions(self, client: InProcessRedis) -> None:
+        assert client.set("k", "a", xx=True) is None
+        assert client.set("k", "a", nx=True) is True
+        assert client.set("k", "b", nx=True) is None
+        assert client.get("k") == b"a"
+
+    def test_expiry(self, client: InProcessRedis) -> None:
+        client.set("short", "x", px=10)
+        client.set("long", "y", ex=60)
+        time.sleep(0.02)
+
+        assert client.get("short") is None
+        assert client.exists("short", "long") == 1
+        assert list(client.scan_iter()) == [b"long"]
\ No newline at end of file
@@ -0,0 +1,134 @@
+"""
+Response schema tests for acme-banking-qa backend services
+
+The registry is built from an in-memory spec and checked against canned
+responses, so these need no live API.
+"""
+
+from types import SimpleNamespace
+from typing import Any, Dict
+
+import pytest
+
+from plugins.schemas import SchemaMismatch, SchemaRegistry, to_json_schema
+
+
+def json_response(schema: Dict[str, Any], description: str = "OK") -> Dict[str, Any]:
+    return {"description": description, "content": {"application/json": {"schema": schema}}}
+
+
+SPEC: Dict[str, Any] = {
+    "openapi": "3.0.0",
+    "paths": {
+        # Declared before /accounts/me: the literal route must still win
+        "/accounts/{id}": {
+            "get": {"responses": {
+                "200": json_response({"$ref": "#/components/schemas/Account"}),
+                "404": {"description": "Not found"},
+                "default": json_response({"$ref": "#/components/schemas/Error"}),
+            }},
+        },
+        "/accounts/me": {
+            "get": {"responses": {"200": json_response({"$ref": "#/components/schemas/Profile"})}},
+        },
+    },
+    "components": {"schemas": {
+        "Account": {
+            "type": "object",
+            "required": ["id", "closedAt"],
+            "properties": {
+                "id": {"type": "string"},
+                "closedAt": {"type": "string", "format": "date-time", "nullable": True},
+                "status": {"type": "string", "enum": ["open", "closed"], "nullable": True},
+            },
+        },
+        "Profile": {"type": "object", "required": ["username"], "properties": {"username": {"type": "string"}}},
+        "Error": {"type": "object", "required": ["message"], "properties": {"message": {"type": "string"}}},
+    }},
+}
+
+
+@pytest.fixture
+def registry() -> SchemaRegistry:
+    return SchemaRegistry(SPEC)
+
+
+def response(method: str, url: str, status: int, body: Any) -> SimpleNamespace:
+    return SimpleNamespace(request=SimpleNamespace(method=method, url=url), status_code=status,
+                           json=lambda: body)
+
+
+class TestToJsonSchema:
+    """OpenAPI 3.0 schema objects become draft-07 JSON Schema"""
+
+    def test_nullable(self) -> None:
+        assert to_json_schema({"type": "integer", "nullable": True, "example": 3}) == {
+            "type": ["integer", "null"]}
+        assert to_json_schema({"type": "string", "enum": ["a"], "nullable": True}) == {
+            "type": ["string", "null"], "enum": ["a", None]}
+        assert to_json_schema({"type": "string", "nullable": False}) == {"type": "string"}
+
+    def test_property_names_are_not_keywords(self) -> None:
+        schema = {"type": "object", "properties": {"example": {"type": "string", "nullable": True}}}
+
+        assert to_json_schema(schema) == {
+            "type": "object", "properties": {"example": {"type": ["string", "null"]}}}
+
+
+class TestResponseValidator:
+    """Each concrete request finds its operation's schema for the returned status"""
+
+    def test_literal_route_wins(self, registry: SchemaRegistry) -> None:
+        me = registry.response_validator("GET", "/accounts/me", 200)
+        account = registry.response_validator("get", "/accounts/42", 200)
+
+        assert me is not None and account is not None
+        assert me.is_valid({"username": "alice"})
+        assert not me.is_valid({"id": "me", "closedAt": None})
+        assert account.is_valid({"id": "42", "closedAt": None})
+
+    def test_base_path_and_trailing_slash(self, registry: SchemaRegistry) -> None:
+        me = SPEC["paths"]["/accounts/me"]["get"]
+
+        assert registry.operation("GET", "/api/v1/accounts/me/") == ("/accounts/me", me)
+        assert registry.operation("GET", "/accounts/42/transactions") is None
+        assert registry.operation("DELETE", "/accounts/42") is None
+
+    def test_status_falls_back_to_default(self, registry: SchemaRegistry) -> None:
+        error = registry.response_validator("GET", "/accounts/42", 500)
+
+        assert error is not None and error.is_valid({"message": "boom"})
+        # A declared status without a JSON body has nothing to check
+        assert registry.response_validator("GET", "/accounts/42", 404) is None
+        assert registry.response_validator("GET", "/accounts/me", 500) is None
+
+    def test_validators_are_compiled_once(self, registry: SchemaRegistry) -> None:
+        first = registry.response_validator("GET", "/accounts/1", 200)
+
+        assert registry.response_validator("GET", "/accounts/2", 200) is first
+        assert registry.validator("Account") is registry.validator("Account")
+        with pytest.raises(KeyError):
+            registry.validator("Transfer")
+
+
+class TestValidation:
+    """Mismatches list every violation; nullable fields accept null"""
+
+    def test_nullable_fields(self, registry: SchemaRegistry) -> None:
+        registry.validate({"id": "1", "closedAt": None, "status": None}, "Account")
+        registry.validate({"id": "1", "closedAt": "2024-01-31T10:00:00Z", "status": "closed"}, "Account")
+
+    def test_mismatch_lists_violations(self, registry: SchemaRegistry) -> None:
+        with pytest.raises(SchemaMismatch) as excinfo:
+            registry.validate({"id": 1, "status": "frozen"}, "Account")
+
+        message = str(excinfo.value)
+        assert "Account does not match its schema (3 violations)" in message
+        assert "  <root>: 'closedAt' is a required property" in message
+        assert "  id: 1 is not of type 'string'" in message
+
+    def test_validate_response(self, registry: SchemaRegistry) -> None:
+        assert registry.validate_response(response("GET", "https://api.test/accounts/me", 200, {"username": "a"}))
+        assert not registry.validate_response(response("GET", "https://api.test/accounts/1", 404, None))
+        with pytest.raises(SchemaMismatch, match=r"GET /accounts/me -> 200"):
+            registry.validate_response(response("GET", "https://api.test/accounts/me", 200, {}))
\ No newline at end of file
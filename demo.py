@@ -16,24 +16,24 @@ import sys
 from pathlib import Path
 
 def run_command(cmd, cwd=None):
-    """Run a command and return the result"""
-    try:
-        result = subprocess.run(
-            cmd, 
-            cwd=cwd, 
-            shell=True, 
-            capture_output=True, 
-            text=True, 
-            check=True
-        )
-        print(f"✅ Command successful: {' '.join(cmd) if isinstance(cmd, list) else cmd}")
-        if result.stdout:
-            print(result.stdout)
-        return result
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Command failed: {' '.join(cmd) if isinstance(cmd, list) else cmd}")
-        print(f"Error: {e.stderr}")
+    """Run a command, streaming its output as it arrives; returns None on failure"""
+    label = ' '.join(cmd) if isinstance(cmd, list) else cmd
+    process = subprocess.Popen(
+        cmd, 
+        cwd=cwd, 
+        shell=True, 
+        stdout=subprocess.PIPE, 
+        stderr=subprocess.STDOUT, 
+        text=True
+    )
+    for line in process.stdout:
+        print(f"   {line}", end="", flush=True)
+    returncode = process.wait()
+    if returncode != 0:
+        print(f"❌ Command failed (exit code {returncode}): {label}")
         return None
+    print(f"✅ Command successful: {label}")
+    return returncode
 
 def main():
     """Main demo function"""
@@ -0,0 +1,4 @@
+"""
+Generator Benchmarks
+Times the story and OpenAPI generators on synthetic inputs and checks for regressions
+"""
@@ -0,0 +1,186 @@
+"""
+Benchmark Runner
+Measures wall time and peak memory per case and compares them with a stored baseline
+"""
+
+import contextlib
+import io
+import json
+import platform
+import shutil
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import yaml
+
+from benchmarks import synthetic
+from generators.utils import jenv
+from orchestrator.cache import FILES
+from generators.openapi_to_tests import generate_from_openapi
+from generators.story_to_tests import generate_from_stories, gherkin_to_playwright_steps, parse_stories_md
+
+BASELINE_FILE = Path(".agent") / "benchmarks.json"
+
+# Input sizes per tier: OpenAPI operations and story scenarios
+SIZES = {
+    "small": {"operations": 10, "scenarios": 10},
+    "medium": {"operations": 1000, "scenarios": 1000},
+    "large": {"operations": 10000, "scenarios": 50000},
+}
+
+# Relative slowdown (or memory growth) over the baseline that counts as a regression
+DEFAULT_THRESHOLD = 0.2
+
+# Cases faster than this are too noisy to fail a run on time alone
+MIN_COMPARABLE_SECONDS = 0.02
+
+@dataclass
+class Measurement:
+    name: str
+    seconds: float
+    peak_bytes: int
+
+@dataclass
+class Comparison:
+    current: Measurement
+    baseline: Optional[Measurement]
+    time_ratio: Optional[float]
+    memory_ratio: Optional[float]
+    regressed: bool
+
+class Workspace:
+    """Temporary project root holding synthetic inputs; generated files land here too"""
+
+    def __init__(self, templates: Path):
+        self.templates = templates
+        self.root: Optional[Path] = None
+
+    def __enter__(self) -> "Workspace":
+        self.root = Path(tempfile.mkdtemp(prefix="agent-bench-"))
+        # Generators look for templates under <root>/tools/agent/templates
+        target = self.root / "tools" / "agent" / "templates"
+        target.parent.mkdir(parents=True)
+        target.symlink_to(self.templates, target_is_directory=True)
+        return self
+
+    def __exit__(self, *exc):
+        shutil.rmtree(self.root, ignore_errors=True)
+        return False
+
+    def write_inputs(self, operations: int, scenarios: int) -> Tuple[Path, Path]:
+        openapi_path = self.root / "specs" / f"api-{operations}.yaml"
+        openapi_path.parent.mkdir(parents=True, exist_ok=True)
+        openapi_path.write_text(yaml.safe_dump(synthetic.openapi_spec(operations), sort_keys=False),
+                                encoding="utf-8")
+        stories_path = self.root / "docs" / f"stories-{scenarios}.md"
+        stories_path.parent.mkdir(parents=True, exist_ok=True)
+        stories_path.write_text(synthetic.stories_md(scenarios), encoding="utf-8")
+        return openapi_path, stories_path
+
+def cases(workspace: Workspace, sol: dict, operations: int,
+          scenarios: int) -> List[Tuple[str, Callable[[], object]]]:
+    """(name, callable) for each benchmark at one input size"""
+    openapi_path, stories_path = workspace.write_inputs(operations, scenarios)
+    markdown = stories_path.read_text(encoding="utf-8")
+    gherkin = [block["gherkin"] for block in parse_stories_md(markdown)]
+    no_features = workspace.root / "docs" / "features"
+
+    return [
+        (f"parse_stories_md[{scenarios}]", lambda: parse_stories_md(markdown)),
+        (f"gherkin_to_playwright_steps[{scenarios}]",
+         lambda: [gherkin_to_playwright_steps(g) for g in gherkin]),
+        (f"generate_from_stories[{scenarios}]",
+         lambda: generate_from_stories(workspace.root, sol, stories_path, no_features)),
+        (f"generate_from_openapi[{operations}]",
+         lambda: generate_from_openapi(workspace.root, sol, openapi_path)),
+    ]
+
+def cold_caches():
+    """Drop parsed inputs and compiled templates so every run costs what a one-shot CLI call does"""
+    FILES.clear()
+    jenv.cache_clear()
+
+def measure(name: str, fn: Callable[[], object], repeats: int) -> Measurement:
+    """Best wall time of ``repeats`` runs, then peak memory from one traced run"""
+    times = []
+    # Generators report every file they write; keep that out of the benchmark output
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeats):
+            cold_caches()
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+
+        # tracemalloc slows allocation-heavy code down, so it never overlaps the timed runs
+        cold_caches()
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return Measurement(name, min(times), peak)
+
+def run_benchmarks(templates: Path, sol: dict, sizes: List[str], repeats: int = 3,
+                   on_result: Optional[Callable[[Measurement], None]] = None) -> List[Measurement]:
+    measurements = []
+    with Workspace(templates) as workspace:
+        for size in sizes:
+            tier = SIZES[size]
+            for name, fn in cases(workspace, sol, tier["operations"], tier["scenarios"]):
+                result = measure(name, fn, repeats)
+                measurements.append(result)
+                if on_result:
+                    on_result(result)
+    return measurements
+
+def load_baseline(path: Path) -> Dict[str, Measurement]:
+    if not path.exists():
+        return {}
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return {name: Measurement(name, entry["seconds"], entry["peak_bytes"])
+            for name, entry in data.get("cases", {}).items()}
+
+def save_baseline(path: Path, measurements: List[Measurement]):
+    """Merge measurements into the baseline, keeping cases that were not rerun"""
+    cases_by_name = {name: asdict(m) for name, m in load_baseline(path).items()}
+    cases_by_name.update({m.name: asdict(m) for m in measurements})
+    for entry in cases_by_name.values():
+        entry.pop("name", None)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cases": cases_by_name,
+    }, indent=2, sort_keys=True), encoding="utf-8")
+
+def compare(measurements: List[Measurement], baseline: Dict[str, Measurement],
+            threshold: float = DEFAULT_THRESHOLD) -> List[Comparison]:
+    comparisons = []
+    for m in measurements:
+        base = baseline.get(m.name)
+        if base is None:
+            comparisons.append(Comparison(m, None, None, None, False))
+            continue
+        time_ratio = m.seconds / base.seconds if base.seconds else None
+        memory_ratio = m.peak_bytes / base.peak_bytes if base.peak_bytes else None
+        slower = (time_ratio is not None and time_ratio > 1 + threshold
+                  and m.seconds >= MIN_COMPARABLE_SECONDS)
+        bigger = memory_ratio is not None and memory_ratio > 1 + threshold
+        comparisons.append(Comparison(m, base, time_ratio, memory_ratio, slower or bigger))
+    return comparisons
+
+def format_report(comparisons: List[Comparison]) -> str:
+    lines = [f"{'Case':<40} {'Time':>10} {'vs base':>8} {'Peak mem':>10} {'vs base':>8}"]
+    for c in comparisons:
+        m = c.current
+        time_delta = f"{(c.time_ratio - 1) * 100:+.0f}%" if c.time_ratio is not None else "new"
+        memory_delta = f"{(c.memory_ratio - 1) * 100:+.0f}%" if c.memory_ratio is not None else "new"
+        flag = "  REGRESSION" if c.regressed else ""
+        lines.append(f"{m.name:<40} {m.seconds * 1000:>8.1f}ms {time_delta:>8} "
+                     f"{m.peak_bytes / 1e6:>8.1f}MB {memory_delta:>8}{flag}")
+    return "\n".join(lines)
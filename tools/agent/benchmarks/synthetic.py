@@ -0,0 +1,90 @@
+"""
+Synthetic Inputs
+Deterministic OpenAPI specs and story files of a given size
+"""
+
+from typing import Dict, List
+
+HTTP_VERBS = ["get", "post", "put", "patch", "delete"]
+
+# Each line exercises a different branch of gherkin_to_playwright_steps; the last one is unmatched
+STEP_TEMPLATES = [
+    "Given I am on the login page",
+    "When I login as 'user{n}'/'secret{n}'",
+    "Then I should see the dashboard",
+    "When I click on 'Account {n}'",
+    "When I fill 'Amount' with '{n}.00'",
+    "Then I should see 'Transfer {n} complete'",
+    "And my balance for account {n} is updated",
+]
+
+LABEL_SETS = [["ui", "smoke"], ["ui", "regression"], ["ui", "functional"], ["api", "e2e"]]
+
+def _schema(n: int) -> dict:
+    return {
+        "type": "object",
+        "required": ["id", "name"],
+        "properties": {
+            "id": {"type": "string", "format": "uuid"},
+            "name": {"type": "string", "maxLength": 64},
+            "amount": {"type": "number", "minimum": 0},
+            "tags": {"type": "array", "items": {"type": "string"}},
+            "group": {"type": "integer", "example": n % 97},
+        },
+    }
+
+def openapi_spec(operations: int) -> dict:
+    """OpenAPI 3 spec with ``operations`` operations spread over five verbs per path"""
+    paths: Dict[str, dict] = {}
+    schemas = {}
+    for n in range(operations):
+        resource, verb = divmod(n, len(HTTP_VERBS))
+        method = HTTP_VERBS[verb]
+        schema_name = f"Resource{resource}"
+        schemas.setdefault(schema_name, _schema(resource))
+        operation = {
+            "operationId": f"{method}Resource{resource}",
+            "summary": f"{method.upper()} resource {resource}",
+            "tags": [f"group{resource % 20}"],
+            "parameters": [
+                {"name": "id", "in": "path", "required": True, "schema": {"type": "string"}},
+                {"name": "limit", "in": "query", "schema": {"type": "integer"}},
+            ],
+            "responses": {
+                "200" if method != "post" else "201": {
+                    "description": "OK",
+                    "content": {"application/json": {"schema": {"$ref": f"#/components/schemas/{schema_name}"}}},
+                },
+                "404": {"description": "Not found"},
+            },
+        }
+        if method in ("post", "put", "patch"):
+            operation["requestBody"] = {
+                "content": {"application/json": {"schema": {"$ref": f"#/components/schemas/{schema_name}"}}},
+            }
+        paths.setdefault(f"/resources{resource}/{{id}}", {})[method] = operation
+
+    return {
+        "openapi": "3.0.3",
+        "info": {"title": "Synthetic API", "version": "1.0.0"},
+        "security": [{"bearerAuth": []}],
+        "paths": paths,
+        "components": {
+            "schemas": schemas,
+            "securitySchemes": {"bearerAuth": {"type": "http", "scheme": "bearer"}},
+        },
+    }
+
+def stories_md(scenarios: int) -> str:
+    """Markdown in the format parse_stories_md reads, with ``scenarios`` stories"""
+    lines: List[str] = ["# Synthetic Stories", ""]
+    for n in range(scenarios):
+        labels = LABEL_SETS[n % len(LABEL_SETS)]
+        lines.append(f"### Story: Synthetic scenario {n}")
+        lines.append("Labels: " + ", ".join(f"@{label}" for label in labels))
+        lines.append("Gherkin:")
+        lines.append(f"Scenario: Synthetic scenario {n}")
+        lines.extend("  " + step.format(n=n) for step in STEP_TEMPLATES)
+        lines.append("```")
+        lines.append("")
+    return "\n".join(lines)
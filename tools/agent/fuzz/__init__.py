@@ -0,0 +1,4 @@
+"""
+Schema-Driven Fuzzing
+Generates boundary and invalid requests from OpenAPI schemas, runs them concurrently and keeps minimized failures
+"""
@@ -0,0 +1,388 @@
+"""
+Fuzz Cases
+Valid examples and boundary/invalid variants of each operation's request, from its resolved schemas
+"""
+
+import copy
+import json
+import random
+import re
+import string
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+from generators.openapi_to_tests import is_secured
+from generators.traceability import openapi_operations
+
+# Strings longer than any sane field, for servers that never cap input
+OVERSIZED_LENGTH = 64 * 1024
+
+# Parameters travel in the URL, which clients and servers cap far below the body size
+OVERSIZED_PARAM_LENGTH = 8 * 1024
+
+# Formats both the mutations and the local mock check, so the two always agree
+FORMAT_PATTERNS = {
+    "uuid": r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$",
+    "date": r"^\d{4}-\d{2}-\d{2}$",
+    "date-time": r"^\d{4}-\d{2}-\d{2}[Tt ]\d{2}:\d{2}:\d{2}(\.\d+)?([Zz]|[+-]\d{2}:\d{2})$",
+    "email": r"^[^@\s]+@[^@\s]+\.[^@\s]+$",
+}
+
+FORMAT_EXAMPLES = {
+    "uuid": "123e4567-e89b-12d3-a456-426614174000",
+    "date": "2024-01-31",
+    "date-time": "2024-01-31T12:00:00Z",
+    "email": "fuzz@example.com",
+}
+
+# Tried in order as examples for a string with a pattern; the first match wins
+PATTERN_CANDIDATES = ["12345", "abcde", "ABCDE", "abc123", "ABC123", "A1", "1", "a", *FORMAT_EXAMPLES.values()]
+
+# A value of the wrong JSON type for each declared type
+TYPE_MISMATCHES = {
+    "string": 12345,
+    "integer": "not-a-number",
+    "number": "not-a-number",
+    "boolean": "true",
+    "object": ["not", "an", "object"],
+    "array": {"not": "an array"},
+}
+
+# Repeated combinations drawn in a row before an operation counts as exhausted
+STACK_ATTEMPTS = 200
+
+# Expected outcomes: a 4xx rejection, not a validation error, or merely no server error
+REJECT, ACCEPT, ANY = "reject", "accept", "any"
+
+# Replacement markers: remove the node, or shrink/grow an array past its item limits
+MISSING = object()
+MISSING_ITEMS = object()
+EXTRA_ITEMS = object()
+
+@dataclass
+class FuzzCase:
+    case_id: str
+    operation_id: str
+    method: str
+    path: str
+    kind: str
+    target: str
+    expect: str
+    body: Any = None
+    has_body: bool = False
+    raw_body: Optional[str] = None
+    path_params: Dict[str, str] = field(default_factory=dict)
+    query: Dict[str, Any] = field(default_factory=dict)
+    secured: bool = False
+
+    @property
+    def url(self) -> str:
+        """Path with its parameters filled in"""
+        return re.sub(r"\{([^/}]+)\}", lambda m: quote(str(self.path_params.get(m.group(1), m.group(0))), safe="{}"), self.path)
+
+    @property
+    def signature(self) -> Tuple[str, str, str]:
+        """Cases failing for the same reason share a signature; only one per signature is kept"""
+        return self.operation_id, self.kind, self.target
+
+    @property
+    def payload(self) -> Optional[bytes]:
+        """Request body as sent: the raw text for malformed cases, otherwise the JSON document"""
+        if self.raw_body is not None:
+            return self.raw_body.encode("utf-8")
+        if not self.has_body:
+            return None
+        return json.dumps(self.body, ensure_ascii=False).encode("utf-8")
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FuzzCase":
+        return cls(**data)
+
+def resolve(spec: dict, schema: Any, seen: Tuple[str, ...] = ()) -> Any:
+    """Schema with every local $ref inlined and allOf merged; recursive refs become {}"""
+    if isinstance(schema, list):
+        return [resolve(spec, item, seen) for item in schema]
+    if not isinstance(schema, dict):
+        return schema
+    ref = schema.get("$ref")
+    if isinstance(ref, str) and ref.startswith("#/"):
+        if ref in seen:
+            return {}
+        node = spec
+        for part in ref[2:].split("/"):
+            node = node.get(part, {}) if isinstance(node, dict) else {}
+        return resolve(spec, node, seen + (ref,))
+    out = {key: resolve(spec, value, seen) for key, value in schema.items()}
+    if "allOf" in out:
+        merged: Dict[str, Any] = {"type": "object", "properties": {}, "required": []}
+        for part in [*out.pop("allOf"), out]:
+            merged["properties"].update(part.get("properties", {}))
+            merged["required"] += [r for r in part.get("required", []) if r not in merged["required"]]
+            merged.update({k: v for k, v in part.items() if k not in ("properties", "required", "type")})
+        out = merged
+    return out
+
+def schema_type(schema: dict) -> str:
+    if "type" in schema:
+        return schema["type"]
+    if "properties" in schema:
+        return "object"
+    if "items" in schema:
+        return "array"
+    return "string"
+
+def example(schema: dict, rng: random.Random) -> Any:
+    """A value the schema accepts, preferring the spec's own examples"""
+    if "example" in schema:
+        return copy.deepcopy(schema["example"])
+    if schema.get("enum"):
+        return schema["enum"][0]
+    kind = schema_type(schema)
+    if kind == "object":
+        return {name: example(sub, rng) for name, sub in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [example(schema.get("items", {}), rng) for _ in range(max(1, schema.get("minItems", 1)))]
+    if kind == "integer":
+        return int(schema.get("minimum", 0)) + (1 if schema.get("exclusiveMinimum") else 0)
+    if kind == "number":
+        return float(schema.get("minimum", 0)) + (1.0 if schema.get("exclusiveMinimum") else 0.0)
+    if kind == "boolean":
+        return True
+    if schema.get("format") in FORMAT_EXAMPLES:
+        return FORMAT_EXAMPLES[schema["format"]]
+    if schema.get("pattern"):
+        matching = [c for c in PATTERN_CANDIDATES if re.search(schema["pattern"], c)]
+        if matching:
+            return matching[0]
+    length = max(schema.get("minLength", 0), min(8, schema.get("maxLength", 8)))
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(length))
+
+def mutations(schema: dict, pointer: str = "") -> Iterator[Tuple[str, str, Any, str]]:
+    """(kind, pointer, replacement, expect) for one schema node and, recursively, its children.
+
+    A replacement of MISSING removes the node from its parent object.
+    """
+    kind = schema_type(schema)
+    yield "type-mismatch", pointer, TYPE_MISMATCHES[kind], REJECT
+    if not schema.get("nullable"):
+        yield "null", pointer, None, REJECT
+
+    if schema.get("enum"):
+        yield "not-in-enum", pointer, "__fuzz_not_in_enum__", REJECT
+    elif kind == "string":
+        min_length, max_length = schema.get("minLength"), schema.get("maxLength")
+        if min_length:
+            yield "below-min-length", pointer, "a" * (min_length - 1), REJECT
+            yield "min-length", pointer, "a" * min_length, ACCEPT
+        if max_length is not None:
+            yield "max-length", pointer, "a" * max_length, ACCEPT
+            yield "above-max-length", pointer, "a" * (max_length + 1), REJECT
+        yield "oversized-string", pointer, "a" * OVERSIZED_LENGTH, REJECT if max_length is not None else ANY
+        if schema.get("format") in FORMAT_PATTERNS:
+            yield "invalid-format", pointer, f"not-a-{schema['format']}", REJECT
+        if schema.get("pattern") and not re.search(schema["pattern"], "~!"):
+            yield "pattern-mismatch", pointer, "~!", REJECT
+        if not min_length:
+            yield "empty-string", pointer, "", ANY
+        yield "unicode", pointer, "ü💥‮'\"<>%00", ANY
+    elif kind in ("integer", "number"):
+        step = 1 if kind == "integer" else 0.01
+        if "minimum" in schema:
+            low = schema["minimum"]
+            yield "below-minimum", pointer, low - step, REJECT
+            yield "minimum", pointer, low, REJECT if schema.get("exclusiveMinimum") else ACCEPT
+        if "maximum" in schema:
+            high = schema["maximum"]
+            yield "above-maximum", pointer, high + step, REJECT
+            yield "maximum", pointer, high, REJECT if schema.get("exclusiveMaximum") else ACCEPT
+        yield "huge-number", pointer, 2 ** 63 if kind == "integer" else 1e308, ANY
+        if kind == "integer":
+            yield "fractional", pointer, 1.5, REJECT
+    elif kind == "array":
+        if schema.get("minItems"):
+            yield "below-min-items", pointer, MISSING_ITEMS, REJECT
+        if "maxItems" in schema:
+            yield "above-max-items", pointer, EXTRA_ITEMS, REJECT
+        yield from mutations(schema.get("items", {}), f"{pointer}/0")
+    elif kind == "object":
+        required = set(schema.get("required", []))
+        for name, sub in schema.get("properties", {}).items():
+            child = f"{pointer}/{name}"
+            if name in required:
+                yield "missing-required", child, MISSING, REJECT
+            yield from mutations(sub, child)
+        if schema.get("additionalProperties") is False:
+            yield "unexpected-property", f"{pointer}/__fuzz_extra__", "unexpected", REJECT
+
+def _parts(pointer: str) -> List[str]:
+    return [p for p in pointer.split("/") if p]
+
+def schema_at(schema: dict, pointer: str) -> dict:
+    for part in _parts(pointer):
+        schema = schema.get("items", {}) if schema_type(schema) == "array" else schema.get("properties", {}).get(part, {})
+    return schema
+
+def _child(node: Any, part: str) -> Tuple[bool, Any]:
+    """(True, key) when ``part`` addresses a slot of ``node``; an earlier mutation may have replaced it"""
+    if isinstance(node, dict):
+        return True, part
+    if isinstance(node, list) and part.isdigit() and int(part) < len(node):
+        return True, int(part)
+    return False, None
+
+def apply(document: Any, pointer: str, replacement: Any, schema: dict) -> Any:
+    """Copy of ``document`` with the node at ``pointer`` replaced (or removed for MISSING).
+
+    Pointers into a node that no longer has that shape leave the document unchanged.
+    """
+    parts = _parts(pointer)
+    if not parts:
+        return _replacement(document, replacement, schema)
+    root = copy.deepcopy(document)
+    parent = root
+    for part in parts[:-1]:
+        ok, key = _child(parent, part)
+        if not ok:
+            return root
+        parent = parent.setdefault(key, {}) if isinstance(parent, dict) else parent[key]
+    ok, key = _child(parent, parts[-1])
+    if not ok:
+        return root
+    if replacement is MISSING:
+        if isinstance(parent, dict):
+            parent.pop(key, None)
+    else:
+        current = parent.get(key) if isinstance(parent, dict) else parent[key]
+        parent[key] = _replacement(current, replacement, schema_at(schema, pointer))
+    return root
+
+def _replacement(current: Any, replacement: Any, schema: dict) -> Any:
+    if replacement is MISSING_ITEMS:
+        return list(current or [])[: max(0, schema.get("minItems", 1) - 1)]
+    if replacement is EXTRA_ITEMS:
+        items = list(current or [None])
+        return (items * (schema.get("maxItems", 0) + 1))[: schema.get("maxItems", 0) + 1]
+    return copy.deepcopy(replacement)
+
+@dataclass
+class Operation:
+    operation_id: str
+    method: str
+    path: str
+    body_schema: Optional[dict]
+    parameters: List[dict]
+    secured: bool
+
+def operations(spec: dict) -> List[Operation]:
+    """Every operation with its request body and parameter schemas resolved"""
+    found = []
+    for op_id, path, method, operation in openapi_operations(spec):
+        content = (operation.get("requestBody") or {}).get("content", {}).get("application/json") or {}
+        body = resolve(spec, content.get("schema")) if content.get("schema") else None
+        parameters = [resolve(spec, p) for p in operation.get("parameters", [])]
+        found.append(Operation(op_id, method.upper(), path, body,
+                               [p for p in parameters if p.get("in") in ("path", "query")],
+                               is_secured(spec, operation)))
+    return found
+
+def disjoint(candidates: list, count: int) -> list:
+    """Up to ``count`` mutations whose targets neither repeat nor contain one another"""
+    picked: list = []
+    for candidate in candidates:
+        target = candidate[1]
+        if all(not (target + "/").startswith(t + "/") and not (t + "/").startswith(target + "/")
+               for _, t, _, _ in picked):
+            picked.append(candidate)
+            if len(picked) == count:
+                break
+    return picked
+
+def generate_cases(spec: dict, seed: int = 0, per_operation: int = 200,
+                   only: Optional[List[str]] = None) -> List[FuzzCase]:
+    """Single mutations first, then random combinations of them, up to ``per_operation`` each.
+
+    The same spec and seed always give the same cases.
+    """
+    cases = []
+    for op in operations(spec):
+        if only and op.operation_id not in only:
+            continue
+        rng = random.Random(f"{seed}:{op.operation_id}")
+        body = example(op.body_schema, rng) if op.body_schema else None
+        path_params = {p["name"]: str(example(p.get("schema", {}), rng))
+                       for p in op.parameters if p["in"] == "path"}
+        query = {p["name"]: example(p.get("schema", {}), rng)
+                 for p in op.parameters if p["in"] == "query" and p.get("required")}
+
+        def case(kind: str, target: str, expect: str, **changes) -> FuzzCase:
+            fields = dict(body=body, has_body=op.body_schema is not None, path_params=path_params, query=query)
+            fields.update(changes)
+            return FuzzCase(f"{op.operation_id}-{len(op_cases):05d}", op.operation_id, op.method, op.path,
+                            kind, target, expect, secured=op.secured, **fields)
+
+        op_cases: List[FuzzCase] = []
+        op_cases.append(case("valid", "", ACCEPT))
+        singles = []
+        if op.body_schema:
+            op_cases.append(case("malformed-json", "", REJECT, raw_body='{"unterminated'))
+            for kind, pointer, replacement, expect in mutations(op.body_schema):
+                singles.append((kind, f"body{pointer}", replacement, expect))
+        for param in op.parameters:
+            param_type = schema_type(param.get("schema", {}))
+            for kind, _, replacement, expect in mutations(param.get("schema", {})):
+                # Parameters travel as text, so only scalar values that stay wrong once stringified apply
+                if replacement is None or isinstance(replacement, (dict, list)) or replacement in (
+                        MISSING, MISSING_ITEMS, EXTRA_ITEMS):
+                    continue
+                if kind == "type-mismatch" and param_type in ("string", "boolean"):
+                    continue
+                if kind == "oversized-string":
+                    replacement = replacement[:OVERSIZED_PARAM_LENGTH]
+                singles.append((kind, f"{param['in']}/{param['name']}", replacement, expect))
+            if param["in"] == "query" and param.get("required"):
+                singles.append(("missing-required", f"query/{param['name']}", MISSING, REJECT))
+
+        def mutate(fields: dict, target: str, replacement: Any) -> dict:
+            """``fields`` (body, path_params, query) with one mutation applied"""
+            area, _, pointer = target.partition("/")
+            if area == "body":
+                return {**fields, "body": apply(fields["body"], pointer, replacement, op.body_schema)}
+            key = "path_params" if area == "path" else "query"
+            values = dict(fields[key])
+            if replacement is MISSING:
+                values.pop(pointer, None)
+            else:
+                value = _replacement(values.get(pointer), replacement, {})
+                values[pointer] = str(value) if area == "path" else value
+            return {**fields, key: values}
+
+        base = {"body": body, "path_params": path_params, "query": query}
+        for kind, target, replacement, expect in singles:
+            if len(op_cases) >= per_operation:
+                break
+            op_cases.append(case(kind, target, expect, **mutate(base, target, replacement)))
+
+        # Stacked mutations: a request with several problems must still be rejected cleanly
+        seen = set()
+        misses = 0
+        while singles and len(op_cases) < per_operation and misses < STACK_ATTEMPTS:
+            misses += 1
+            picked = disjoint(rng.sample(singles, k=len(singles)), rng.randint(2, 3))
+            combination = frozenset((kind, target) for kind, target, _, _ in picked)
+            if len(picked) < 2 or combination in seen:
+                continue
+            seen.add(combination)
+            misses = 0
+            fields = base
+            for _, target, replacement, _ in picked:
+                fields = mutate(fields, target, replacement)
+            expects = {expect for _, _, _, expect in picked}
+            expect = REJECT if REJECT in expects else ACCEPT if expects == {ACCEPT} else ANY
+            op_cases.append(case("+".join(sorted({k for k, _, _, _ in picked})),
+                                 ",".join(t for _, t, _, _ in picked), expect, **fields))
+        cases.extend(op_cases)
+    return cases
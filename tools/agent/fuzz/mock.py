@@ -0,0 +1,153 @@
+"""
+Fuzz Mock
+A local HTTP/1.1 stand-in for the API that enforces the spec's request schemas, for fuzzing without a deployment
+"""
+
+import asyncio
+import json
+import random
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Pattern, Tuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from jsonschema import Draft7Validator, FormatChecker
+
+from fuzz.cases import FORMAT_PATTERNS, Operation, example, operations, resolve, schema_type
+from generators.openapi_to_tests import to_json_schema
+
+# Request lines and headers longer than this are refused, as a real server would
+MAX_HEADER_BYTES = 1024 * 1024
+
+FORMAT_CHECKER = FormatChecker(formats=())
+for _name, _pattern in FORMAT_PATTERNS.items():
+    FORMAT_CHECKER.checks(_name)(lambda value, pattern=re.compile(_pattern): not isinstance(value, str)
+                                 or bool(pattern.match(value)))
+
+@dataclass
+class Route:
+    operation: Operation
+    pattern: Pattern
+    body: Optional[Draft7Validator]
+    parameters: Dict[str, Tuple[dict, Draft7Validator]]
+    status: int
+    response: bytes
+
+def _route(template: str) -> Pattern:
+    parts = re.split(r"\{([^/}]+)\}", template)
+    regex = "".join(re.escape(part) if i % 2 == 0 else f"(?P<{part}>[^/]+)" for i, part in enumerate(parts))
+    return re.compile(f"^{regex}/?$")
+
+def _validator(schema: dict) -> Draft7Validator:
+    return Draft7Validator(to_json_schema(schema), format_checker=FORMAT_CHECKER)
+
+def coerce(value: str, schema: dict) -> Any:
+    """A path or query string as the type its schema declares, or the string itself if it is not one"""
+    kind = schema_type(schema)
+    try:
+        if kind == "integer":
+            return int(value)
+        if kind == "number":
+            return float(value)
+    except ValueError:
+        return value
+    if kind == "boolean" and value in ("true", "false"):
+        return value == "true"
+    return value
+
+class MockApi:
+    """Routes built from the spec, with every schema compiled once up front"""
+
+    def __init__(self, spec: dict, seed: int = 0):
+        rng = random.Random(seed)
+        self.routes: List[Route] = []
+        for op in operations(spec):
+            raw = spec["paths"][op.path][op.method.lower()]
+            status, response = self._response(spec, raw, rng)
+            self.routes.append(Route(
+                op, _route(op.path),
+                _validator(op.body_schema) if op.body_schema else None,
+                {p["name"]: (p, _validator(p.get("schema", {}))) for p in op.parameters},
+                status, response))
+        # Literal segments win over parameters: /accounts/me before /accounts/{id}
+        self.routes.sort(key=lambda route: route.operation.path.count("{"))
+
+    @staticmethod
+    def _response(spec: dict, operation: dict, rng: random.Random) -> Tuple[int, bytes]:
+        """The first declared 2xx status and a pre-serialized example of its body"""
+        for code, response in operation.get("responses", {}).items():
+            if str(code).startswith("2"):
+                schema = ((response or {}).get("content", {}).get("application/json") or {}).get("schema")
+                body = example(resolve(spec, schema), rng) if schema else None
+                return int(code), json.dumps(body).encode("utf-8") if schema else b""
+        return 200, b""
+
+    def handle(self, method: str, target: str, body: bytes) -> Tuple[int, bytes]:
+        url = urlsplit(target)
+        path = unquote(url.path)
+        allowed = False
+        for route in self.routes:
+            match = route.pattern.match(path)
+            if not match:
+                continue
+            if route.operation.method != method:
+                allowed = True
+                continue
+            errors = self._errors(route, match.groupdict(), parse_qsl(url.query, keep_blank_values=True), body)
+            if errors:
+                return 400, json.dumps({"error": "Bad Request", "details": errors[:5]}).encode("utf-8")
+            return route.status, route.response
+        if allowed:
+            return 405, b'{"error": "Method Not Allowed"}'
+        return 404, b'{"error": "Not Found"}'
+
+    @staticmethod
+    def _errors(route: Route, path_values: Dict[str, str], query: List[Tuple[str, str]], body: bytes) -> List[str]:
+        errors = []
+        values = dict(query)
+        values.update(path_values)
+        for name, (param, validator) in route.parameters.items():
+            if name not in values:
+                if param.get("required"):
+                    errors.append(f"{name}: required")
+                continue
+            errors += [f"{name}: {e.message}" for e in validator.iter_errors(coerce(values[name], param.get("schema", {})))]
+        if route.body:
+            try:
+                document = json.loads(body) if body else None
+            except ValueError as e:
+                return errors + [f"body: {e}"]
+            errors += [f"body/{'/'.join(map(str, e.absolute_path))}: {e.message}"
+                       for e in route.body.iter_errors(document)]
+        return errors
+
+    async def serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                method, target, _ = (lines[0].split(" ", 2) + ["", ""])[:3]
+                headers = {k.strip().lower(): v.strip() for k, _, v in (line.partition(":") for line in lines[1:] if line)}
+                body = await reader.readexactly(int(headers.get("content-length") or 0))
+                status, payload = self.handle(method.upper(), target, body)
+                if status in (204, 304) or method.upper() == "HEAD":
+                    payload = b""
+                writer.write(f"HTTP/1.1 {status} {'OK' if status < 400 else 'Error'}\r\n"
+                             f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n"
+                             .encode("latin-1") + payload)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> Tuple[asyncio.AbstractServer, str]:
+        """Start listening; returns the server and its base URL"""
+        server = await asyncio.start_server(self.serve, host, port, limit=MAX_HEADER_BYTES)
+        bound_port = server.sockets[0].getsockname()[1]
+        return server, f"http://{host}:{bound_port}"
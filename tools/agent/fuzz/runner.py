@@ -0,0 +1,349 @@
+"""
+Fuzz Runner
+Sends fuzz cases concurrently over pooled keep-alive connections, judges the responses and minimizes failures
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import time
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from fuzz.cases import ACCEPT, REJECT, FuzzCase
+
+REGRESSION_FILE = Path("api") / "restassured" / "src" / "test" / "resources" / "fuzz-regressions.json"
+REGRESSION_TEST = Path("api") / "restassured" / "src" / "test" / "java" / "specs" / "FuzzRegressionTest.java"
+
+# Distinct failures kept per run; the rest are counted but not minimized
+MAX_FAILURES = 50
+
+# Requests spent shrinking one failing case
+MINIMIZE_BUDGET = 200
+
+# Longest response status line and headers accepted
+MAX_RESPONSE_HEAD = 64 * 1024
+
+# Statuses that mean "this request is invalid"
+VALIDATION_STATUSES = (400, 422)
+
+# Final statuses that never carry a body, whatever their headers say (RFC 9112 section 6.3)
+BODILESS_STATUSES = (204, 304)
+
+@dataclass
+class Failure:
+    case: FuzzCase
+    reason: str
+    status: Optional[int]
+    detail: str = ""
+
+    @property
+    def key(self) -> str:
+        """Failures that minimize to the same request are the same bug"""
+        case = self.case
+        return json.dumps([case.operation_id, self.reason, case.raw_body, case.body, case.path_params, case.query],
+                          sort_keys=True)
+
+    def to_dict(self) -> dict:
+        return {**self.case.to_dict(), "reason": self.reason, "status": self.status}
+
+@dataclass
+class FuzzReport:
+    sent: int = 0
+    seconds: float = 0.0
+    statuses: Dict[str, int] = field(default_factory=dict)
+    failures: List[Failure] = field(default_factory=list)
+    duplicates: int = 0
+
+    @property
+    def rate(self) -> float:
+        return self.sent / self.seconds if self.seconds else 0.0
+
+def judge(case: FuzzCase, status: Optional[int]) -> Optional[str]:
+    """Why the response to ``case`` is wrong, or None if it is acceptable"""
+    if status is None:
+        return "no-response"
+    if status >= 500:
+        return "server-error"
+    if case.expect == REJECT and status < 300:
+        return "accepted-invalid"
+    if case.expect == ACCEPT and status in VALIDATION_STATUSES:
+        return "rejected-valid"
+    return None
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection, reopened after errors or a server-side close"""
+
+    def __init__(self, host: str, port: int, tls: bool):
+        self.host, self.port, self.tls = host, port, tls
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(self, data: bytes, method: str = "GET") -> Tuple[int, bytes]:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(
+                self.host, self.port, ssl=self.tls or None, limit=MAX_RESPONSE_HEAD)
+        self.writer.write(data)
+        await self.writer.drain()
+        status, headers = await self._head()
+        while 100 <= status < 200 and status != 101:
+            # Interim responses (100 Continue, 103 Early Hints) come before the real one
+            status, headers = await self._head()
+        if status < 200 or status in BODILESS_STATUSES or method.upper() == "HEAD":
+            # Reading to EOF here would wait for the keep-alive timeout
+            body = b""
+            if status == 101:
+                headers["connection"] = "close"
+        elif "content-length" in headers:
+            body = await self.reader.readexactly(int(headers["content-length"]))
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            body = await self._chunked()
+        else:
+            body = await self.reader.read()
+            headers["connection"] = "close"
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return status, body
+
+    async def _head(self) -> Tuple[int, Dict[str, str]]:
+        head = (await self.reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        status = int(head[0].split(" ", 2)[1])
+        return status, {k.strip().lower(): v.strip() for k, _, v in (line.partition(":") for line in head[1:] if line)}
+
+    async def _chunked(self) -> bytes:
+        chunks = []
+        while True:
+            size = int((await self.reader.readline()).split(b";")[0].strip() or b"0", 16)
+            if size == 0:
+                await self.reader.readuntil(b"\r\n")
+                return b"".join(chunks)
+            chunks.append(await self.reader.readexactly(size))
+            await self.reader.readexactly(2)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+    async def aclose(self):
+        writer = self.writer
+        self.close()
+        if writer is not None:
+            with contextlib.suppress(OSError):
+                await writer.wait_closed()
+
+class FuzzClient:
+    """A fixed pool of keep-alive connections shared by every worker.
+
+    Requests are serialized by hand: with thousands of tiny requests per second, a general
+    purpose client's per-request bookkeeping costs more than the request itself.
+    """
+
+    def __init__(self, base_url: str, concurrency: int, timeout: float, token: Optional[str] = None):
+        url = urlsplit(base_url)
+        if url.scheme not in ("http", "https") or not url.hostname:
+            raise ValueError(f"Not an http(s) base URL: {base_url}")
+        tls = url.scheme == "https"
+        self.base_path = url.path.rstrip("/")
+        self.host_header = url.netloc
+        self.timeout = timeout
+        self.token = token
+        self.pool: asyncio.Queue = asyncio.Queue()
+        for _ in range(max(1, concurrency)):
+            self.pool.put_nowait(Connection(url.hostname, url.port or (443 if tls else 80), tls))
+
+    def encode(self, case: FuzzCase) -> bytes:
+        target = self.base_path + case.url
+        if case.query:
+            target += "?" + urlencode({k: query_value(v) for k, v in case.query.items()})
+        payload = case.payload
+        lines = [f"{case.method} {target} HTTP/1.1", f"Host: {self.host_header}", "Accept: application/json"]
+        if case.secured and self.token:
+            lines.append(f"Authorization: Bearer {self.token}")
+        if payload is not None:
+            lines.append("Content-Type: application/json")
+        lines.append(f"Content-Length: {len(payload or b'')}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("utf-8") + (payload or b"")
+
+    async def send(self, case: FuzzCase) -> Tuple[Optional[int], str]:
+        data = self.encode(case)
+        connection = await self.pool.get()
+        try:
+            status, body = await asyncio.wait_for(connection.request(data, case.method), self.timeout)
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                ValueError, IndexError) as e:
+            connection.close()
+            return None, f"{type(e).__name__}: {e}"
+        finally:
+            self.pool.put_nowait(connection)
+        return status, body[:500].decode("utf-8", "replace")
+
+    async def close(self):
+        while not self.pool.empty():
+            await self.pool.get_nowait().aclose()
+
+def query_value(value: Any) -> str:
+    """How a query value is written in the URL; JSON spelling for non-strings (true, 1.5)"""
+    return value if isinstance(value, str) else json.dumps(value)
+
+async def run_cases(client: FuzzClient, cases: List[FuzzCase], concurrency: int,
+                    on_progress: Optional[Callable[[FuzzReport], None]] = None) -> FuzzReport:
+    """Send every case from a fixed pool of workers; only the first failure per signature is kept"""
+    report = FuzzReport()
+    seen = set()
+    pending: Iterator[FuzzCase] = iter(cases)
+    started = time.perf_counter()
+
+    async def worker():
+        # Workers share one iterator; the event loop never switches inside next()
+        for case in pending:
+            status, detail = await client.send(case)
+            report.sent += 1
+            bucket = f"{status // 100}xx" if status else "error"
+            report.statuses[bucket] = report.statuses.get(bucket, 0) + 1
+            reason = judge(case, status)
+            if reason:
+                key = (*case.signature, reason)
+                if key in seen or len(report.failures) >= MAX_FAILURES:
+                    report.duplicates += 1
+                else:
+                    seen.add(key)
+                    report.failures.append(Failure(case, reason, status, detail))
+            if on_progress and report.sent % 1000 == 0:
+                report.seconds = time.perf_counter() - started
+                on_progress(report)
+
+    await asyncio.gather(*(worker() for _ in range(max(1, concurrency))))
+    report.seconds = time.perf_counter() - started
+    return report
+
+def _targets(case: FuzzCase) -> List[str]:
+    return [t for t in case.target.split(",") if t]
+
+def _on_target(case: FuzzCase, area: str, pointer: List[str]) -> bool:
+    """True when a body/query/path location is, contains or lies under a mutated one"""
+    here = "/".join([area, *pointer]) + "/"
+    return any(here.startswith(t + "/") or (t + "/").startswith(here) for t in _targets(case))
+
+def shrink_candidates(case: FuzzCase) -> Iterator[FuzzCase]:
+    """Smaller variants of a case: fields dropped, untargeted ones first, then long strings halved"""
+    for targeted in (False, True):
+        for name in list(case.query):
+            if _on_target(case, "query", [name]) == targeted:
+                yield replace(case, query={k: v for k, v in case.query.items() if k != name})
+        if case.raw_body is None and case.body is not None:
+            for pointer, value in _walk(case.body, []):
+                if pointer and _on_target(case, "body", [str(p) for p in pointer]) == targeted:
+                    yield replace(case, body=_without(case.body, pointer))
+    if case.raw_body is None and case.body is not None:
+        for pointer, value in _walk(case.body, []):
+            if isinstance(value, str) and len(value) > 1:
+                yield replace(case, body=_with(case.body, pointer, value[: len(value) // 2]))
+    for name, value in case.query.items():
+        if isinstance(value, str) and len(value) > 1:
+            yield replace(case, query={**case.query, name: value[: len(value) // 2]})
+
+def _walk(node: Any, pointer: list) -> Iterator[Tuple[list, Any]]:
+    yield pointer, node
+    if isinstance(node, dict):
+        for key, value in node.items():
+            yield from _walk(value, pointer + [key])
+    elif isinstance(node, list):
+        for index, value in enumerate(node):
+            yield from _walk(value, pointer + [index])
+
+def _with(document: Any, pointer: list, value: Any) -> Any:
+    if not pointer:
+        return value
+    head, rest = pointer[0], pointer[1:]
+    if isinstance(document, list):
+        return [_with(item, rest, value) if i == head else item for i, item in enumerate(document)]
+    return {k: _with(v, rest, value) if k == head else v for k, v in document.items()}
+
+def _without(document: Any, pointer: list) -> Any:
+    head, rest = pointer[0], pointer[1:]
+    if rest:
+        return _with(document, [head], _without(document[head], rest))
+    if isinstance(document, list):
+        return [item for i, item in enumerate(document) if i != head]
+    return {k: v for k, v in document.items() if k != head}
+
+async def minimize(client: FuzzClient, failure: Failure) -> Failure:
+    """Greedily shrink a failing case while it keeps failing for the same reason"""
+    current = failure
+    budget = MINIMIZE_BUDGET
+    progressed = True
+    while progressed and budget > 0:
+        progressed = False
+        for candidate in shrink_candidates(current.case):
+            if budget <= 0:
+                break
+            budget -= 1
+            status, detail = await client.send(candidate)
+            if judge(candidate, status) == failure.reason:
+                current = Failure(candidate, failure.reason, status, detail)
+                progressed = True
+                break
+    return current
+
+async def fuzz(base_url: str, cases: List[FuzzCase], concurrency: int, timeout: float,
+               token: Optional[str] = None,
+               on_progress: Optional[Callable[[FuzzReport], None]] = None) -> FuzzReport:
+    client = FuzzClient(base_url, concurrency, timeout, token or os.getenv("API_TOKEN"))
+    try:
+        report = await run_cases(client, cases, concurrency, on_progress)
+        minimized = await asyncio.gather(*(minimize(client, f) for f in report.failures))
+        unique: Dict[str, Failure] = {}
+        for failure in minimized:
+            unique.setdefault(failure.key, failure)
+        report.duplicates += len(minimized) - len(unique)
+        report.failures = list(unique.values())
+    finally:
+        await client.close()
+    return report
+
+def format_report(report: FuzzReport) -> str:
+    statuses = ", ".join(f"{bucket}: {count}" for bucket, count in sorted(report.statuses.items()))
+    lines = [f"{report.sent} requests in {report.seconds:.2f}s ({report.rate:.0f}/s); {statuses}"]
+    for failure in report.failures:
+        case = failure.case
+        lines.append(f"  {failure.reason} {failure.status or '-'} {case.method} {case.url} "
+                     f"[{case.kind} {case.target}] {case.case_id}")
+    if report.duplicates:
+        lines.append(f"  ({report.duplicates} more failures that repeat a reported one)")
+    return "\n".join(lines)
+
+def load_regressions(path: Path) -> List[dict]:
+    if not path.exists():
+        return []
+    return json.loads(path.read_text(encoding="utf-8"))
+
+def save_regressions(path: Path, failures: List[Failure]) -> List[dict]:
+    """Merge minimized failures into the regression corpus, one entry per distinct request and reason"""
+    corpus = {}
+    for entry in load_regressions(path):
+        case = FuzzCase.from_dict({k: v for k, v in entry.items() if k not in ("reason", "status")})
+        corpus[Failure(case, entry["reason"], entry.get("status")).key] = entry
+    for failure in failures:
+        corpus[failure.key] = failure.to_dict()
+    entries = sorted(corpus.values(), key=lambda e: (e["operation_id"], e["case_id"]))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(entries, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    return entries
+
+async def run_fuzz(spec: dict, cases: List[FuzzCase], base_url: Optional[str], concurrency: int,
+                   timeout: float, token: Optional[str] = None, seed: int = 0,
+                   on_progress: Optional[Callable[[FuzzReport], None]] = None) -> FuzzReport:
+    """Fuzz ``base_url``, or an in-process mock of the spec when it is None"""
+    if base_url:
+        return await fuzz(base_url, cases, concurrency, timeout, token, on_progress)
+    from fuzz.mock import MockApi
+    server, mock_url = await MockApi(spec, seed).start()
+    try:
+        return await fuzz(mock_url, cases, concurrency, timeout, token, on_progress)
+    finally:
+        server.close()
+        await server.wait_closed()
@@ -1,9 +1,10 @@
 """
 Test Generation Agents
-Converts requirements (stories, Gherkin, OpenAPI) into executable tests
+Converts requirements (stories, Gherkin, OpenAPI, Postman) into executable tests
 """
 
 from .story_to_tests import generate_from_stories
 from .openapi_to_tests import generate_from_openapi
+from .postman_to_tests import generate_from_postman
 
-__all__ = ['generate_from_stories', 'generate_from_openapi']
+__all__ = ['generate_from_stories', 'generate_from_openapi', 'generate_from_postman']
@@ -3,9 +3,14 @@ OpenAPI to Test Generator
 Converts OpenAPI specifications into executable API tests
 """
 
+import json
 from pathlib import Path
+from typing import Optional
 import yaml
-from .utils import jenv, write, slug
+from orchestrator.cache import FILES
+from orchestrator.profiling import span
+from .utils import jenv, render, write, slug
+from .traceability import SHARED_KEY, TraceabilityIndex, openapi_fingerprints, openapi_operations
 
 DEFAULT_STATUS_CODES = {
     "get": 200,
@@ -17,18 +22,146 @@ DEFAULT_STATUS_CODES = {
     "options": 200
 }
 
-def generate_from_openapi(root: Path, sol: dict, openapi_path: Path):
-    """Generate API tests from OpenAPI specification"""
+LOGIN_HINTS = ("login", "signin", "sign_in", "authenticate")
+
+TOKEN_FIELDS = ("token", "access_token", "accessToken", "jwt", "id_token")
+
+DEFAULT_AUTH = {
+    "operation_id": "login",
+    "path": "/auth/login",
+    "token_field": "token",
+    "username_field": "username",
+    "password_field": "password",
+}
+
+SCHEMA_REF_PREFIX = "#/components/schemas/"
+
+JSON_SCHEMA_DRAFT = "http://json-schema.org/draft-07/schema#"
+
+# OpenAPI annotations that are not JSON Schema keywords; validators would warn about each one
+OPENAPI_ONLY_KEYWORDS = ("nullable", "example", "xml", "externalDocs", "discriminator", "deprecated")
+
+# Keywords whose value maps names to subschemas, so its keys are never keywords themselves
+SCHEMA_MAPS = ("properties", "patternProperties", "definitions")
+
+def _resolve(spec: dict, schema: Optional[dict]) -> dict:
+    """Follow a local $ref to its schema"""
+    schema = schema or {}
+    ref = schema.get("$ref", "")
+    if ref.startswith("#/"):
+        node = spec
+        for part in ref[2:].split("/"):
+            node = node.get(part, {})
+        return node
+    return schema
+
+def load_spec(path: Path):
+    """Parsed OpenAPI document, shared until the file changes; treat it as read-only"""
+    return FILES.get(path, "openapi", lambda p: yaml.safe_load(p.read_text(encoding="utf-8")))
+
+def spec_fingerprints(path: Path) -> dict:
+    return FILES.get(path, "openapi-fingerprints", lambda p: openapi_fingerprints(load_spec(p) or {}))
+
+def find_auth_operation(spec: dict) -> dict:
+    """The spec's login operation and the request/response fields the tests need"""
+    for op_id, path, method, operation in openapi_operations(spec):
+        if method != "post" or not any(h in f"{op_id} {path}".lower() for h in LOGIN_HINTS):
+            continue
+        auth = dict(DEFAULT_AUTH, operation_id=op_id, path=path)
+        
+        content = operation.get("requestBody", {}).get("content", {}).get("application/json", {})
+        request = _resolve(spec, content.get("schema")).get("properties", {})
+        auth["username_field"] = next((f for f in request if f in ("username", "email", "login")),
+                                      auth["username_field"])
+        auth["password_field"] = next((f for f in request if "password" in f), auth["password_field"])
+        
+        for code, response in operation.get("responses", {}).items():
+            if str(code).startswith("2"):
+                schema = response.get("content", {}).get("application/json", {}).get("schema")
+                fields = _resolve(spec, schema).get("properties", {})
+                auth["token_field"] = next((f for f in TOKEN_FIELDS if f in fields), auth["token_field"])
+                break
+        return auth
+    return dict(DEFAULT_AUTH)
+
+def load_auth_operation(root: Path, sol: dict) -> dict:
+    """find_auth_operation for the solution's OpenAPI input, with defaults if it is missing"""
+    candidates = [sol.get("api", {}).get("inputs", {}).get("openapi"), "specs/api.yaml"]
+    for candidate in filter(None, candidates):
+        path = root / candidate
+        if path.exists():
+            try:
+                return find_auth_operation(load_spec(path) or {})
+            except yaml.YAMLError:
+                break
+    return dict(DEFAULT_AUTH)
+
+def to_json_schema(node):
+    """OpenAPI 3.0 schema object as draft-07 JSON Schema; component $refs point at sibling files"""
+    if isinstance(node, list):
+        return [to_json_schema(item) for item in node]
+    if not isinstance(node, dict):
+        return node
+    out = {}
+    for key, value in node.items():
+        if key == "$ref" and isinstance(value, str) and value.startswith(SCHEMA_REF_PREFIX):
+            out[key] = f"{value[len(SCHEMA_REF_PREFIX):]}.json"
+        elif key in SCHEMA_MAPS and isinstance(value, dict):
+            out[key] = {name: to_json_schema(sub) for name, sub in value.items()}
+        elif key not in OPENAPI_ONLY_KEYWORDS:
+            out[key] = to_json_schema(value)
+    if node.get("nullable") is True:
+        if isinstance(out.get("type"), str):
+            out["type"] = [out["type"], "null"]
+        if isinstance(out.get("enum"), list) and None not in out["enum"]:
+            out["enum"] = [*out["enum"], None]
+    return out
+
+def schema_document(schema: dict) -> str:
+    return json.dumps({"$schema": JSON_SCHEMA_DRAFT, **to_json_schema(schema)}, indent=2)
+
+def response_schema(operation: dict, status: str) -> Optional[dict]:
+    """JSON body schema of one response; YAML may key the responses by int or str"""
+    response = next((r for code, r in operation.get("responses", {}).items() if str(code) == status), None)
+    return ((response or {}).get("content", {}).get("application/json") or {}).get("schema")
+
+def schema_name(op_id: str, status: str, schema: Optional[dict]) -> Optional[str]:
+    """Name of the schema file validating a response: the component, or one per inline schema"""
+    if not schema:
+        return None
+    ref = schema.get("$ref", "")
+    if ref.startswith(SCHEMA_REF_PREFIX) and len(schema) == 1:
+        return ref[len(SCHEMA_REF_PREFIX):]
+    return f"{op_id}-{status}"
+
+def write_schemas(spec: dict, out: Path):
+    """One JSON Schema file per component schema, compiled once per run by the tests' validator"""
+    for name, schema in spec.get("components", {}).get("schemas", {}).items():
+        write(out / f"{name}.json", schema_document(schema))
+
+def is_secured(spec: dict, operation: dict) -> bool:
+    """Operation-level security overrides the spec's global requirement"""
+    return bool(operation.get("security", spec.get("security")))
+
+def generate_from_openapi(root: Path, sol: dict, openapi_path: Path, templates: Optional[Path] = None):
+    """Generate API tests from OpenAPI specification; templates default to <root>/tools/agent/templates"""
     try:
-        spec = yaml.safe_load(openapi_path.read_text(encoding="utf-8"))
+        with span(f"parse {openapi_path.name}", "spec"):
+            spec = load_spec(openapi_path)
     except Exception as e:
         print(f"Error loading OpenAPI spec: {e}")
         return
     
-    tpl = jenv(root / "tools" / "agent" / "templates")
+    tpl = jenv(templates or root / "tools" / "agent" / "templates")
+    index = TraceabilityIndex(root)
+    prints = spec_fingerprints(openapi_path)
+    index.start(openapi_path, "openapi", shared=prints[SHARED_KEY])
+    auth = find_auth_operation(spec)
     
     if sol["api"]["framework"] == "restassured":
         out = root / "api" / sol["api"]["framework"] / "src" / "test" / "java" / "specs"
+        schemas_out = root / "api" / sol["api"]["framework"] / "src" / "test" / "resources" / "schemas"
+        write_schemas(spec, schemas_out)
         
         # Generate tests for each path and operation
         paths = spec.get("paths", {})
@@ -52,8 +185,16 @@ def generate_from_openapi(root: Path, sol: dict, openapi_path: Path):
                     query_params = [p for p in parameters if p.get("in") == "query"]
                     path_params = [p for p in parameters if p.get("in") == "path"]
                     
+                    # Response bodies are checked against the schemas declared for their status
+                    validated = {}
+                    for code in (str(status), "400"):
+                        schema = response_schema(operation, code)
+                        validated[code] = schema_name(op_id, code, schema)
+                        if validated[code] == f"{op_id}-{code}":
+                            write(schemas_out / f"{validated[code]}.json", schema_document(schema))
+                    
                     # Generate test class
-                    java = tpl.get_template("restassured/OperationTest.java.j2").render(
+                    java = render(tpl, "restassured/OperationTest.java.j2",
                         sol=sol,
                         class_name=f"{slug(op_id).title().replace('_', '')}Test",
                         method=method.upper(),
@@ -65,11 +206,20 @@ def generate_from_openapi(root: Path, sol: dict, openapi_path: Path):
                         body_schema=body_schema,
                         query_params=query_params,
                         path_params=path_params,
-                        tags=operation.get("tags", [])
+                        response_schema=validated[str(status)],
+                        error_schema=validated["400"],
+                        tags=operation.get("tags", []),
+                        secured=is_secured(spec, operation) and op_id != auth["operation_id"]
                     )
                     
-                    filename = f"{slug(op_id).title().replace('_', '')}Test.java"
+                    class_name = f"{slug(op_id).title().replace('_', '')}Test"
+                    filename = f"{class_name}.java"
                     write(out / filename, java)
+                    index.add(openapi_path, op_id, prints[op_id], "api", out / filename, class_name, [
+                        f"{class_name}#test{class_name}",
+                        f"{class_name}#test{class_name}InvalidRequest",
+                        f"{class_name}#test{class_name}ResponseStructure",
+                    ])
                     print(f"  Generated {filename}")
     
     elif sol["api"]["framework"] == "playwright_api":
@@ -84,7 +234,7 @@ def generate_from_openapi(root: Path, sol: dict, openapi_path: Path):
                     responses = operation.get("responses", {})
                     status = next(iter(responses.keys()), str(DEFAULT_STATUS_CODES.get(method.lower(), 200)))
                     
-                    ts_test = tpl.get_template("playwright_api/api.spec.ts.j2").render(
+                    ts_test = render(tpl, "playwright_api/api.spec.ts.j2",
                         test_name=slug(op_id),
                         method=method.upper(),
                         path=path,
@@ -95,12 +245,16 @@ def generate_from_openapi(root: Path, sol: dict, openapi_path: Path):
                     
                     filename = f"{slug(op_id)}.spec.ts"
                     write(out / filename, ts_test)
+                    index.add(openapi_path, op_id, prints[op_id], "api", out / filename, filename,
+                              [slug(op_id)])
                     print(f"  Generated {filename}")
+    
+    index.save()
 
 def generate_test_data_from_schemas(root: Path, sol: dict, openapi_path: Path):
     """Generate test data from OpenAPI schemas"""
     try:
-        spec = yaml.safe_load(openapi_path.read_text(encoding="utf-8"))
+        spec = load_spec(openapi_path)
     except Exception as e:
         print(f"Error loading OpenAPI spec: {e}")
         return
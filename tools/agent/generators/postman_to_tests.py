@@ -0,0 +1,399 @@
+"""
+Postman to Test Generator
+Converts a Postman collection (v2.0/v2.1) into API tests, streaming the collection so large
+exports with saved responses never load whole
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import yaml
+from orchestrator.cache import FILES
+from orchestrator.coverage import Operation, OperationMatcher
+from orchestrator.jsonstream import iter_json_tree
+from orchestrator.profiling import span
+from .openapi_to_tests import DEFAULT_STATUS_CODES, find_auth_operation, is_secured, load_spec
+from .utils import jenv, render, write, slug
+from .traceability import TraceabilityIndex, fingerprint, openapi_operations
+
+VARIABLE = re.compile(r"\{\{\s*([^{}]+?)\s*\}\}")
+
+# Variables may refer to other variables; deeper chains are left partly unresolved
+MAX_VARIABLE_DEPTH = 10
+
+# Members the generator never reads; saved example responses are most of a large export
+SKIPPED_MEMBERS = ("response", "protocolProfileBehavior")
+
+# Headers the base test class already sets, or that the generated request sets itself
+MANAGED_HEADERS = {"authorization", "content-type", "accept", "user-agent", "content-length", "host"}
+
+SCRIPT_STATUS = re.compile(r"to\.have\.status\(\s*(\d{3})\s*\)|response\.code\)\s*\.to\.(?:eql|equal|be)\(\s*(\d{3})"
+                           r"|responseCode\.code\s*===?\s*(\d{3})")
+
+@dataclass
+class PostmanRequest:
+    """One request as exported, variables unresolved"""
+    name: str
+    folder: str
+    method: str
+    url: str
+    query: List[Tuple[str, str]] = field(default_factory=list)
+    # Values of ``:name`` path segments
+    path_variables: Dict[str, str] = field(default_factory=dict)
+    headers: List[Tuple[str, str]] = field(default_factory=list)
+    body: Optional[str] = None
+    form: List[Tuple[str, str]] = field(default_factory=list)
+    content_type: str = ""
+    # Nearest request/folder auth type; None inherits the collection's
+    auth: Optional[str] = None
+    statuses: List[int] = field(default_factory=list)
+
+@dataclass
+class PostmanCollection:
+    name: str
+    requests: List[PostmanRequest]
+    variables: Dict[str, str]
+    auth: Optional[str] = None
+
+def _enabled(entries) -> List[dict]:
+    return [e for e in entries or [] if isinstance(e, dict) and not e.get("disabled") and e.get("enabled", True)]
+
+def variable_map(entries) -> Dict[str, str]:
+    """Postman variable list (collection ``variable`` or environment ``values``) as a dict"""
+    return {e["key"]: "" if e.get("value") is None else str(e["value"]) for e in _enabled(entries) if e.get("key")}
+
+def resolve_variables(collection: Dict[str, str], environment: Dict[str, str]) -> Dict[str, str]:
+    """Collection and environment variables merged (environment wins), with references expanded"""
+    resolved = {**collection, **environment}
+    for _ in range(MAX_VARIABLE_DEPTH):
+        expanded = {k: VARIABLE.sub(lambda m: resolved.get(m.group(1), m.group(0)), v) for k, v in resolved.items()}
+        if expanded == resolved:
+            break
+        resolved = expanded
+    return resolved
+
+def substitute(text: str, variables: Dict[str, str]) -> str:
+    """One pass is enough: ``variables`` come from resolve_variables"""
+    return VARIABLE.sub(lambda m: variables.get(m.group(1), m.group(0)), text)
+
+def _raw_url(url) -> str:
+    if isinstance(url, str):
+        return url
+    if not isinstance(url, dict):
+        return ""
+    if url.get("raw"):
+        return url["raw"]
+    host = url.get("host") or ""
+    path = url.get("path") or ""
+    host = ".".join(host) if isinstance(host, list) else host
+    path = "/".join(str(p) for p in path) if isinstance(path, list) else path
+    return f"{host}/{path.lstrip('/')}"
+
+def _script_statuses(events) -> List[int]:
+    codes = []
+    for event in events or []:
+        if not isinstance(event, dict) or event.get("listen") != "test":
+            continue
+        source = (event.get("script") or {}).get("exec") or ""
+        source = "\n".join(source) if isinstance(source, list) else source
+        codes += [int(next(filter(None, m))) for m in SCRIPT_STATUS.findall(source)]
+    return list(dict.fromkeys(codes))
+
+def _auth_type(node: dict) -> Optional[str]:
+    auth = node.get("auth")
+    return auth.get("type") if isinstance(auth, dict) else None
+
+def _request(ancestors, item: dict) -> Optional[PostmanRequest]:
+    request = item.get("request")
+    if isinstance(request, str):
+        request = {"url": request}
+    if not isinstance(request, dict):
+        return None
+    url = request.get("url")
+    query, path_variables = [], {}
+    if isinstance(url, dict):
+        query = [(q["key"], "" if q.get("value") is None else str(q["value"]))
+                 for q in _enabled(url.get("query")) if q.get("key")]
+        path_variables = {v["key"]: str(v["value"]) for v in _enabled(url.get("variable"))
+                          if v.get("key") and v.get("value") not in (None, "")}
+    headers = [(h["key"], str(h.get("value") or "")) for h in _enabled(request.get("header")) if h.get("key")]
+    content_type = next((v for k, v in headers if k.lower() == "content-type"), "")
+
+    body, form = None, []
+    payload = request.get("body") or {}
+    mode = payload.get("mode")
+    if mode == "raw" and payload.get("raw"):
+        body = payload["raw"]
+        language = ((payload.get("options") or {}).get("raw") or {}).get("language")
+        content_type = content_type or ("application/json" if language == "json" else "")
+    elif mode == "urlencoded":
+        form = [(p["key"], str(p.get("value") or "")) for p in _enabled(payload.get("urlencoded")) if p.get("key")]
+        content_type = content_type or "application/x-www-form-urlencoded"
+    elif mode == "graphql":
+        graphql = payload.get("graphql") or {}
+        body = json.dumps({"query": graphql.get("query", ""), "variables": graphql.get("variables") or {}})
+        content_type = content_type or "application/json"
+
+    return PostmanRequest(
+        name=str(item.get("name") or ""),
+        folder=str(ancestors[0].get("name") or "") if ancestors else "",
+        method=str(request.get("method") or "GET").upper(),
+        url=_raw_url(url),
+        query=query,
+        path_variables=path_variables,
+        headers=headers,
+        body=body,
+        form=form,
+        content_type=content_type,
+        auth=_auth_type(request),
+        statuses=_script_statuses(item.get("event")),
+    )
+
+def read_collection(path: Path) -> PostmanCollection:
+    """Stream the collection's requests; only one request is decoded at a time"""
+    meta: dict = {}
+    requests, folders = [], []
+    for ancestors, item in iter_json_tree(path, "item", skip=SKIPPED_MEMBERS, meta=meta):
+        request = _request(ancestors, item)
+        if request is not None:
+            requests.append(request)
+            folders.append(ancestors)
+    # Folder auth, collection variables and auth are exported after the items, so the
+    # ancestors only hold them once the stream ends
+    for request, ancestors in zip(requests, folders):
+        for ancestor in reversed(ancestors):
+            request.auth = request.auth or _auth_type(ancestor)
+    name = (meta.get("info") or {}).get("name") or path.stem
+    return PostmanCollection(str(name), requests, variable_map(meta.get("variable")), _auth_type(meta))
+
+def load_collection(path: Path) -> PostmanCollection:
+    """Parsed collection, shared until the file changes; treat it as read-only"""
+    return FILES.get(path, "postman", read_collection)
+
+def load_environment(path: Optional[Path]) -> Dict[str, str]:
+    if path is None or not path.exists():
+        return {}
+    return FILES.get(path, "postman-environment",
+                     lambda p: variable_map(json.loads(p.read_text(encoding="utf-8-sig")).get("values")))
+
+def request_target(url: str, base_path: str = "", path_variables: Optional[Dict[str, str]] = None
+                   ) -> Tuple[str, List[Tuple[str, str]]]:
+    """Path (``:name`` segments without a value and unresolved ``{{name}}`` as ``{name}``) and query of a URL"""
+    url = re.sub(r"^\{\{[^{}]*\}\}", "", url.strip())
+    if re.match(r"^[a-z][\w+.-]*://", url, re.I):
+        parts = urlsplit(url)
+        path, query = parts.path, parts.query
+    else:
+        path, _, query = url.partition("?")
+        path = path.split("#", 1)[0]
+        if not path.startswith("/"):
+            # Host without a scheme
+            path = "/" + path.split("/", 1)[1] if "/" in path else "/"
+    if base_path and (path == base_path or path.startswith(base_path + "/")):
+        path = path[len(base_path):]
+    path = re.sub(r"/:(\w+)", lambda m: "/" + (path_variables or {}).get(m.group(1), "{%s}" % m.group(1)), path)
+    path = VARIABLE.sub(lambda m: "{" + slug(m.group(1)) + "}", path)
+    return path.rstrip("/") or "/", parse_qsl(query, keep_blank_values=True)
+
+def server_base_path(spec: dict) -> str:
+    """Path part of the spec's first server URL, which Postman URLs include and spec paths do not"""
+    url = ((spec.get("servers") or [{}])[0] or {}).get("url") or ""
+    return urlsplit(url).path.rstrip("/") if "://" in url else url.rstrip("/")
+
+def _pascal(text: str) -> str:
+    return "".join(w[:1].upper() + w[1:] for w in re.findall(r"[A-Za-z0-9]+", text))
+
+def _camel(text: str) -> str:
+    pascal = _pascal(text)
+    return pascal[:1].lower() + pascal[1:]
+
+def literal(value: str) -> str:
+    """Double-quoted string literal, valid in both Java and TypeScript"""
+    return json.dumps(value)
+
+@dataclass
+class PlannedTest:
+    """A request after variable resolution and operation matching, ready for a template"""
+    request: PostmanRequest
+    method: str
+    path: str
+    concrete_path: str
+    path_params: List[Tuple[str, str]]
+    query: List[Tuple[str, str]]
+    headers: List[Tuple[str, str]]
+    body: Optional[str]
+    form: List[Tuple[str, str]]
+    expected_status: int
+    operation_id: Optional[str]
+    secured: bool
+
+    @property
+    def key(self) -> Tuple[str, int]:
+        return (self.operation_id or f"{self.method} {self.path}", self.expected_status)
+
+def _path_params(template: str, concrete: str) -> List[Tuple[str, str]]:
+    """(name, value) for each template parameter; unresolved placeholders get a test value"""
+    params = []
+    for t, c in zip(template.strip("/").split("/"), concrete.strip("/").split("/")):
+        name = re.fullmatch(r"\{([^}]+)\}", t)
+        if name:
+            value = f"test_{name.group(1)}" if re.fullmatch(r"\{[^}]*\}", c) else c
+            params.append((name.group(1), value))
+    return params
+
+def plan_tests(collection: PostmanCollection, variables: Dict[str, str], spec: Optional[dict]
+               ) -> Tuple[List[PlannedTest], int]:
+    """Resolve each request once and drop repeats: requests that map to the same OpenAPI operation
+    and expect the same status (or, outside the spec, the same method and path) become one test.
+    """
+    operations, matcher, secured_ops, base_path = {}, None, set(), ""
+    if spec:
+        auth_id = find_auth_operation(spec)["operation_id"]
+        for op_id, path, method, operation in openapi_operations(spec):
+            operations[op_id] = (operation, Operation(op_id, method.upper(), path,
+                                                      [str(c) for c in operation.get("responses") or {}]))
+            if is_secured(spec, operation) and op_id != auth_id:
+                secured_ops.add(op_id)
+        matcher = OperationMatcher([op for _, op in operations.values()])
+        base_path = server_base_path(spec)
+
+    planned: Dict[Tuple[str, int], PlannedTest] = {}
+    duplicates = 0
+    for request in collection.requests:
+        path_variables = {k: substitute(v, variables) for k, v in request.path_variables.items()}
+        path, query = request_target(substitute(request.url, variables), base_path, path_variables)
+        query = [(k, substitute(v, variables)) for k, v in request.query] or query
+        method = request.method
+        op = matcher.match(method, path) if matcher else None
+        if op is not None:
+            operation = operations[op.operation_id][0]
+            first = next(iter(operation.get("responses") or {}), DEFAULT_STATUS_CODES.get(method.lower(), 200))
+            status = request.statuses[0] if request.statuses else int(str(first)) if str(first).isdigit() else 200
+            template, secured = op.path, op.operation_id in secured_ops
+        else:
+            status = request.statuses[0] if request.statuses else DEFAULT_STATUS_CODES.get(method.lower(), 200)
+            auth = request.auth or collection.auth
+            secured = auth not in (None, "noauth") or any(k.lower() == "authorization" for k, _ in request.headers)
+            template = path
+        test = PlannedTest(
+            request=request,
+            method=method,
+            path=template,
+            concrete_path=path,
+            path_params=_path_params(template, path),
+            query=query,
+            headers=[(k, substitute(v, variables)) for k, v in request.headers if k.lower() not in MANAGED_HEADERS],
+            body=substitute(request.body, variables) if request.body is not None else None,
+            form=[(k, substitute(v, variables)) for k, v in request.form],
+            expected_status=status,
+            operation_id=op.operation_id if op else None,
+            secured=secured,
+        )
+        if test.key in planned:
+            duplicates += 1
+        else:
+            planned[test.key] = test
+    return list(planned.values()), duplicates
+
+def _group(tests: List[PlannedTest], collection_name: str) -> Dict[str, List[PlannedTest]]:
+    """Tests by top-level folder; requests outside any folder are grouped under the collection"""
+    groups: Dict[str, List[PlannedTest]] = {}
+    for test in tests:
+        groups.setdefault(test.request.folder or collection_name, []).append(test)
+    return groups
+
+def _unique(name: str, taken: set, separator: str = "") -> str:
+    candidate, n = name, 2
+    while candidate in taken:
+        candidate, n = f"{name}{separator}{n}", n + 1
+    taken.add(candidate)
+    return candidate
+
+def _context(test: PlannedTest, test_name: str, title: str) -> dict:
+    """Template values; strings are pre-quoted literals"""
+    filled = test.path
+    for name, value in test.path_params:
+        filled = filled.replace("{" + name + "}", value, 1)
+    return {
+        "test_name": test_name,
+        "title": literal(title),
+        "description": literal(f"Imported from Postman: {test.method} {test.path}"),
+        "story": literal(test.operation_id or f"{test.method} {test.path}"),
+        "method": test.method,
+        "path": literal(test.path),
+        "url": literal(filled),
+        "path_params": [(literal(k), literal(v)) for k, v in test.path_params],
+        "query_params": [(literal(k), literal(v)) for k, v in test.query],
+        "headers": [(literal(k), literal(v)) for k, v in test.headers],
+        "content_type": literal(test.request.content_type) if test.request.content_type else None,
+        "body": literal(test.body) if test.body is not None else None,
+        "form_params": [(literal(k), literal(v)) for k, v in test.form],
+        "expected_status": test.expected_status,
+        "secured": test.secured,
+    }
+
+def generate_from_postman(root: Path, sol: dict, postman_path: Path, openapi_path: Optional[Path] = None,
+                          environment_path: Optional[Path] = None, templates: Optional[Path] = None):
+    """Generate API tests from a Postman collection; templates default to <root>/tools/agent/templates"""
+    try:
+        with span(f"parse {postman_path.name}", "spec"):
+            collection = load_collection(postman_path)
+            environment = load_environment(environment_path)
+    except (OSError, ValueError) as e:
+        print(f"Error loading Postman collection: {e}")
+        return
+    spec = None
+    if openapi_path is not None and openapi_path.exists():
+        try:
+            spec = load_spec(openapi_path) or {}
+        except yaml.YAMLError as e:
+            print(f"Warning: not matching Postman requests to OpenAPI operations: {e}")
+
+    variables = resolve_variables(collection.variables, environment)
+    tests, duplicates = plan_tests(collection, variables, spec)
+    tpl = jenv(templates or root / "tools" / "agent" / "templates")
+    index = TraceabilityIndex(root)
+    index.start(postman_path, "postman", shared=fingerprint(variables))
+
+    framework = sol["api"]["framework"]
+    if framework == "restassured":
+        out = root / "api" / framework / "src" / "test" / "java" / "specs"
+    elif framework == "playwright_api":
+        out = root / "api" / framework / "tests"
+    else:
+        print(f"  Postman import does not support the {framework} framework")
+        return
+
+    class_names: set = set()
+    for group, group_tests in _group(tests, collection.name).items():
+        method_names: set = set()
+        titles: set = set()
+        names = [t.request.name or f"{t.method} {t.path}" for t in group_tests]
+        cases = [_context(t, _unique(_camel(f"test {name}"), method_names), _unique(name, titles, " #"))
+                 for t, name in zip(group_tests, names)]
+        if framework == "restassured":
+            unit = _unique(f"Postman{_pascal(group) or 'Collection'}Test", class_names)
+            filename = f"{unit}.java"
+            content = render(tpl, "restassured/PostmanTest.java.j2", sol=sol, class_name=unit,
+                             feature=literal(group), tests=cases)
+            test_ids = [f"{unit}#{case['test_name']}" for case in cases]
+        else:
+            unit = _unique(f"postman_{slug(group) or 'collection'}.spec.ts", class_names)
+            filename = unit
+            content = render(tpl, "playwright_api/postman.spec.ts.j2", sol=sol, feature=literal(group),
+                             tests=cases)
+            test_ids = [json.loads(case["title"]) for case in cases]
+        write(out / filename, content)
+        for test, case, test_id in zip(group_tests, cases, test_ids):
+            entry = test.operation_id or f"{test.method} {test.path}"
+            index.add(postman_path, entry, fingerprint(case), "api", out / filename, unit, [test_id])
+        print(f"  Generated {filename}")
+
+    matched = sum(1 for t in tests if t.operation_id)
+    print(f"  Postman: {len(collection.requests)} requests, {len(tests)} tests "
+          f"({duplicates} duplicates dropped, {len(tests) - matched} outside the OpenAPI spec)")
+    index.save()
@@ -4,9 +4,12 @@ Converts user stories and Gherkin scenarios into executable tests
 """
 
 from pathlib import Path
+from typing import Optional
 import re
 import typer
-from .utils import jenv, slug, write, extract_test_type, extract_layer
+from orchestrator.cache import FILES
+from .utils import jenv, render, slug, write, extract_test_type, extract_layer
+from .traceability import TraceabilityIndex, fingerprint, playwright_test_ids, story_fingerprints
 
 GHERKIN_RE = re.compile(r"^(Feature:|Scenario:|Given |When |Then |And )", re.I)
 
@@ -37,6 +40,10 @@ def parse_stories_md(md: str):
     
     return blocks
 
+def load_stories(path: Path):
+    """Parsed story blocks, shared until the file changes; treat them as read-only"""
+    return FILES.get(path, "stories", lambda p: parse_stories_md(p.read_text(encoding="utf-8")))
+
 def gherkin_to_playwright_steps(gherkin: str):
     """Convert Gherkin steps to Playwright code"""
     steps = []
@@ -99,22 +106,26 @@ def gherkin_to_playwright_steps(gherkin: str):
     
     return steps
 
-def generate_from_stories(root: Path, sol: dict, stories_path: Path, features_dir: Path):
-    """Generate tests from stories and features"""
-    tpl = jenv(root / "tools" / "agent" / "templates")
+def generate_from_stories(root: Path, sol: dict, stories_path: Path, features_dir: Path,
+                          templates: Optional[Path] = None):
+    """Generate tests from stories and features; templates default to <root>/tools/agent/templates"""
+    tpl = jenv(templates or root / "tools" / "agent" / "templates")
     ui_out = root / "ui" / sol['ui']['framework'] / "tests"
+    index = TraceabilityIndex(root)
     
     # 1) Markdown stories
     if stories_path.exists():
         typer.echo(f"Parsing stories from {stories_path}")
-        blocks = parse_stories_md(stories_path.read_text(encoding="utf-8"))
+        blocks = load_stories(stories_path)
+        prints = FILES.get(stories_path, "story-fingerprints", lambda p: story_fingerprints(load_stories(p)))
+        index.start(stories_path, "stories")
         
         for b in blocks:
             if sol['ui']['framework'] == "playwright":
                 steps = gherkin_to_playwright_steps(b["gherkin"])
                 name = slug(b["title"]) or "story"
                 
-                spec = tpl.get_template("playwright/spec.spec.ts.j2").render(
+                spec = render(tpl, "playwright/spec.spec.ts.j2",
                     name=name,
                     labels=b["labels"],
                     steps=steps,
@@ -124,6 +135,9 @@ def generate_from_stories(root: Path, sol: dict, stories_path: Path, features_di
                 )
                 
                 write(ui_out / f"{name}.spec.ts", spec)
+                index.add(stories_path, b["title"], prints[b["title"]], "ui",
+                          ui_out / f"{name}.spec.ts", f"{name}.spec.ts",
+                          playwright_test_ids(f"{name}.spec.ts", spec))
                 typer.echo(f"  Generated {name}.spec.ts")
     
     # 2) Raw .feature files
@@ -138,7 +152,7 @@ def generate_from_stories(root: Path, sol: dict, stories_path: Path, features_di
             if sol['ui']['framework'] == "playwright":
                 steps = gherkin_to_playwright_steps(g)
                 
-                spec = tpl.get_template("playwright/spec.spec.ts.j2").render(
+                spec = render(tpl, "playwright/spec.spec.ts.j2",
                     name=name,
                     labels=["ui", "regression"],
                     steps=steps,
@@ -148,7 +162,13 @@ def generate_from_stories(root: Path, sol: dict, stories_path: Path, features_di
                 )
                 
                 write(ui_out / f"{name}.spec.ts", spec)
+                index.start(feat, "feature")
+                index.add(feat, name, fingerprint(g), "ui",
+                          ui_out / f"{name}.spec.ts", f"{name}.spec.ts",
+                          playwright_test_ids(f"{name}.spec.ts", spec))
                 typer.echo(f"  Generated {name}.spec.ts from {feat.name}")
+    
+    index.save()
 
 if __name__ == "__main__":
     # For testing
@@ -0,0 +1,87 @@
+"""
+Traceability Index
+Records which generated test files and test IDs come from which input block
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Dict, List
+
+from .utils import slug
+
+INDEX_FILE = "traceability.json"
+
+# Spec sections outside `paths` that operations can reference (schemas, security, ...)
+SHARED_KEY = "__shared__"
+
+HTTP_METHODS = ["get", "post", "put", "patch", "delete", "head", "options"]
+
+# A test() call at the start of a line; Playwright reports each test as file:line of this call
+PLAYWRIGHT_TEST = re.compile(r"[ \t]*test\(")
+
+def fingerprint(value) -> str:
+    """Stable hash of a block of input (text or parsed YAML/JSON)"""
+    if not isinstance(value, str):
+        value = json.dumps(value, sort_keys=True, default=str)
+    return hashlib.sha1(value.encode("utf-8")).hexdigest()
+
+def story_fingerprints(blocks: List[dict]) -> Dict[str, str]:
+    """Story title -> fingerprint of its labels and Gherkin"""
+    return {b["title"]: fingerprint({"labels": b["labels"], "gherkin": b["gherkin"]}) for b in blocks}
+
+def playwright_test_ids(unit: str, source: str) -> List[str]:
+    """``file:line`` ids of the tests in a generated spec, as Playwright results name them"""
+    return [f"{unit}:{number}" for number, line in enumerate(source.splitlines(), 1) if PLAYWRIGHT_TEST.match(line)]
+
+def openapi_operations(spec: dict):
+    """Yield (operationId, path, method, operation) as the OpenAPI generator names them"""
+    for path, operations in (spec.get("paths") or {}).items():
+        for method, operation in (operations or {}).items():
+            if method.lower() in HTTP_METHODS and isinstance(operation, dict):
+                op_id = operation.get("operationId") or f"{method}_{slug(path)}"
+                yield op_id, path, method.lower(), operation
+
+def openapi_fingerprints(spec: dict) -> Dict[str, str]:
+    """operationId -> fingerprint of the operation, plus one for shared sections"""
+    prints = {
+        op_id: fingerprint({"path": path, "method": method, "operation": operation})
+        for op_id, path, method, operation in openapi_operations(spec)
+    }
+    prints[SHARED_KEY] = fingerprint({k: v for k, v in spec.items() if k != "paths"})
+    return prints
+
+class TraceabilityIndex:
+    """Input file -> entry (story, feature, operationId) -> generated tests"""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.path = root / INDEX_FILE
+        self.inputs: Dict[str, dict] = {}
+        if self.path.exists():
+            try:
+                self.inputs = json.loads(self.path.read_text(encoding="utf-8")).get("inputs", {})
+            except ValueError:
+                self.inputs = {}
+
+    def rel(self, path: Path) -> str:
+        return path.resolve().relative_to(self.root.resolve()).as_posix()
+
+    def start(self, source: Path, kind: str, shared: str = ""):
+        """Begin recording an input file, replacing what was recorded for it before"""
+        self.inputs[self.rel(source)] = {"kind": kind, "shared": shared, "entries": {}}
+
+    def add(self, source: Path, entry: str, digest: str, suite: str, file: Path,
+            unit: str, tests: List[str]):
+        """Link one input entry to a generated file, its shard unit and test IDs"""
+        entries = self.inputs[self.rel(source)]["entries"]
+        record = entries.setdefault(entry, {"fingerprint": digest, "suite": suite,
+                                            "files": [], "units": [], "tests": []})
+        record["files"] = sorted(set(record["files"]) | {self.rel(file)})
+        record["units"] = sorted(set(record["units"]) | {unit})
+        record["tests"] = sorted(set(record["tests"]) | set(tests))
+
+    def save(self):
+        self.path.write_text(json.dumps({"version": 1, "inputs": self.inputs}, indent=2, sort_keys=True) + "\n",
+                             encoding="utf-8")
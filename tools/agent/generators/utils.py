@@ -2,12 +2,15 @@
 Utility functions for test generators
 """
 
+import functools
 from pathlib import Path
 from jinja2 import Environment, FileSystemLoader
 import re
+from orchestrator.profiling import span
 
+@functools.lru_cache(maxsize=None)
 def jenv(base: Path):
-    """Get Jinja2 environment for templates"""
+    """Get Jinja2 environment for templates, shared so compiled templates stay warm"""
     return Environment(
         loader=FileSystemLoader(str(base)),
         trim_blocks=True,
@@ -18,10 +21,18 @@ def slug(s: str):
     """Convert string to slug format for filenames"""
     return re.sub(r"[^a-z0-9_]+", "_", s.lower()).strip("_")
 
+def render(env: Environment, template_name: str, **context) -> str:
+    """Load (compiling on first use) and render a template, timing each step"""
+    with span(f"compile {template_name}", "template"):
+        template = env.get_template(template_name)
+    with span(f"render {template_name}", "template"):
+        return template.render(**context)
+
 def write(path: Path, content: str):
     """Write content to file, creating directories as needed"""
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(content, encoding="utf-8")
+    with span(f"write {path.name}", "io", path=path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
 
 def sanitize_filename(s: str):
     """Sanitize string for use as filename"""
@@ -4,18 +4,62 @@ Test Automation Agent - Main Orchestrator
 Builds, scaffolds, and runs complete test automation solutions
 """
 
+import copy
+import functools
 import json
+import os
 import shutil
+import sqlite3
 import subprocess
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
+
+from orchestrator import daemon
+
+# Hand routable commands to a running agent daemon before paying for the imports below
+if __name__ == "__main__":
+    _exit_code = daemon.forward(sys.argv[1:], Path(__file__).resolve().parents[2])
+    if _exit_code is not None:
+        sys.exit(_exit_code)
 
 import typer
 from pydantic import BaseModel
 from ruamel.yaml import YAML
 from jinja2 import Environment, FileSystemLoader
 
+from generators.utils import render
+from orchestrator.readiness import build_probes, format_report, load_target_config, wait_until_ready
+from orchestrator import artifacts as artifact_store
+from orchestrator import profiling, results_db
+from orchestrator.cache import FILES
+from orchestrator.impact import compute_impact
+from orchestrator.matrix import (
+    MatrixCell,
+    default_parallelism,
+    environment_overrides,
+    format_matrix,
+    merge_report,
+    parse_envs,
+    run_matrix,
+    write_report,
+)
+from orchestrator.process import LOG_DIR, report_failure, run_streamed
+from orchestrator.profiling import span
+from orchestrator.retry import (
+    Quarantine,
+    RunOutcome,
+    fold_reruns,
+    format_outcome,
+    run_quarantine_lane,
+    run_with_retries,
+)
+from orchestrator.scheduler import Allocation, Job, ResourceHistory, Scheduler, measure_capacity
+from orchestrator.sharding import DurationHistory, parse_shard, select_shard
+from orchestrator.suites import SUITES, Suite, get_suite
+
 app = typer.Typer()
 yaml = YAML()
 
@@ -25,6 +69,7 @@ AGENTS = {
     "scaffolder": "main.py:scaffold",
     "req2test_ui": "generators/story_to_tests.py:generate_from_stories",
     "req2test_api": "generators/openapi_to_tests.py:generate_from_openapi",
+    "req2test_postman": "generators/postman_to_tests.py:generate_from_postman",
     "ci_writer": "main.py:scaffold (CI section)",
     "runner_ui": "main.py:run_ui",
     "runner_api": "main.py:run_api",
@@ -36,20 +81,257 @@ class Solution(BaseModel):
 
 ROOT = Path(__file__).resolve().parents[2]
 
+TEMPLATE_DIR = Path(__file__).resolve().parent / "templates"
+
+# Guards the duration history and quarantine files when environments run concurrently
+STATE_LOCK = threading.Lock()
+
 def write(path: Path, content: str):
     """Write content to file, creating directories as needed"""
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(content, encoding="utf-8")
+    with span(f"write {path.name}", "io", path=path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+
+def run_step(cmd: List[str], cwd: Path, log_path: Path):
+    """Run a setup command such as a dependency install, failing on a non-zero exit"""
+    typer.echo(f"  $ {' '.join(cmd)}")
+    with span(" ".join(cmd), "subprocess", cwd=cwd):
+        result = run_streamed(cmd, cwd, dict(os.environ), log_path)
+    if result.returncode != 0:
+        report_failure(" ".join(cmd), result, log_path)
+        raise subprocess.CalledProcessError(result.returncode, cmd)
+
+# Dependency installs run once per suite before any tests
+SETUP_STEPS = {
+    "ui": [["npm", "install"], ["npx", "playwright", "install", "--with-deps"]],
+    "backend": [["pip", "install", "-r", "requirements.txt"]],
+}
+
+def prepare_suite(suite: Suite):
+    log_path = ROOT / LOG_DIR / f"setup-{suite.name}.log"
+    log_path.unlink(missing_ok=True)
+    for cmd in SETUP_STEPS.get(suite.name, []):
+        run_step(cmd, suite.directory, log_path)
+
+def load_solution(spec: str) -> Solution:
+    """Load and validate solution.yaml, exiting if it does not exist"""
+    spec_path = ROOT / spec
+    if not spec_path.exists():
+        typer.echo(f"Error: {spec} not found", err=True)
+        raise typer.Exit(1)
+    
+    with span(f"load {spec}", "spec"):
+        return read_solution(spec_path)
+
+def read_solution(spec_path: Path) -> Solution:
+    data = FILES.get(spec_path, "solution", lambda p: yaml.load(p.read_text()))
+    # Commands adjust the plan (environment overrides), so each gets its own copy
+    return Solution(**copy.deepcopy(data))
+
+def ensure_dependencies_ready(sol: dict, timeout: float):
+    """Block until backend services and API health endpoints respond"""
+    probes = build_probes(sol, load_target_config(ROOT))
+    typer.echo(f"Waiting for {len(probes)} dependencies (deadline {timeout:.0f}s)...")
+    results = wait_until_ready(probes, timeout=timeout)
+    typer.echo(format_report(results))
+    if not all(r.ready for r in results):
+        typer.echo("Dependencies are not ready; not starting test suites.", err=True)
+        raise typer.Exit(1)
+
+def impact_inputs(sol: dict) -> dict:
+    """Generator inputs (path -> suite) used when the traceability index lacks them"""
+    inputs = {"docs/stories.md": "ui", "specs/api.yaml": "api"}
+    for key in ("openapi", "postman", "postman_environment"):
+        path = sol.get('api', {}).get('inputs', {}).get(key)
+        if path:
+            inputs[path] = "api"
+    return inputs
+
+def select_units(suite: Suite, shard: Optional[str] = None,
+                 changed_since: Optional[str] = None) -> Optional[List[str]]:
+    """Units to run: those affected by changes, then this shard's share; None runs everything"""
+    candidates = None
+    if changed_since:
+        try:
+            suites = {name: get_suite(name, ROOT, suite.sol) for name in SUITES if name in suite.sol}
+            impact = compute_impact(ROOT, changed_since, suites, impact_inputs(suite.sol))
+        except RuntimeError as e:
+            typer.echo(f"Error: cannot diff against {changed_since}: {e}", err=True)
+            raise typer.Exit(1)
+        for reason in impact.reasons_for(suite.name):
+            typer.echo(f"  {reason}")
+        candidates = impact.units_for(suite.name)
+        if candidates is None:
+            typer.echo(f"Changes since {changed_since} affect the whole {suite.name} suite")
+        else:
+            # Drop units whose tests were deleted since
+            candidates = sorted(set(candidates) & set(suite.discover_units()))
+            typer.echo(f"Changes since {changed_since} affect {len(candidates)} {suite.name} units")
+    
+    if not shard:
+        return candidates
+    try:
+        index, total = parse_shard(shard)
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+    
+    history = DurationHistory.load(ROOT)
+    if candidates is None and suite.native_sharding and not history.unit_durations(suite.name):
+        # Nothing to balance files by yet: the runner splits individual tests evenly itself
+        suite.native_shard = f"{index}/{total}"
+        typer.echo(f"Shard {index}/{total}: no {suite.name} duration history yet, "
+                   f"using the runner's own sharding")
+        return None
+    pool = suite.discover_units() if candidates is None else candidates
+    units, expected, overall = select_shard(history, suite.name, pool, index, total)
+    typer.echo(f"Shard {index}/{total}: {len(units)} {suite.name} units, "
+               f"expected {expected:.1f}s of {overall:.1f}s")
+    return units
 
+def update_duration_history(suite: Suite, result_files: List[Path]) -> int:
+    """Fold a run's result files into the duration history; never fails the run"""
+    try:
+        history = DurationHistory.load(ROOT)
+        recorded = history.record(suite.parse_files(result_files))
+        if recorded:
+            history.save()
+        return recorded
+    except Exception as e:
+        typer.echo(f"Warning: could not record {suite.name} durations: {e}")
+        return 0
+
+def collect_artifacts(suite: Suite, result_files: List[Path], sol: dict):
+    """Move the run's traces, videos and screenshots into the artifact store; never fails the run"""
+    attachments = list(suite.attachments(result_files))
+    if not attachments:
+        return
+    max_mb = float(sol.get('artifacts', {}).get('max_size_mb', artifact_store.DEFAULT_MAX_SIZE_MB))
+    try:
+        conn = results_db.connect(ROOT)
+        try:
+            stats = artifact_store.store_artifacts(conn, ROOT, attachments,
+                                                   suite.environment or os.getenv("TEST_ENV", "dev"),
+                                                   current_commit(), base=suite.directory)
+            evicted = artifact_store.evict(conn, ROOT, int(max_mb * 1024 * 1024))
+        finally:
+            conn.close()
+    except (OSError, sqlite3.Error) as e:
+        typer.echo(f"Warning: could not store {suite.label} artifacts: {e}")
+        return
+    typer.echo(f"  {suite.label}: stored {stats.files} artifacts ({stats.new_objects} new, "
+               f"{stats.bytes_added / 1e6:.1f} of {stats.bytes_in / 1e6:.1f} MB added)"
+               + (f"; evicted {evicted.objects} old ones" if evicted.objects else ""))
+
+def execute_suite(suite: Suite, units: Optional[List[str]], sol: dict,
+                  extra: Optional[List[str]] = None) -> RunOutcome:
+    """Run a suite, rerun only its failed tests, then run quarantined tests non-blocking"""
+    retries = int(sol.get('quality', {}).get('flaky_retries', 0) or 0)
+    quarantined = Quarantine.load(ROOT).quarantined(suite.name, units)
+    # One log per suite run: the main run, its reruns and the quarantine lane
+    suite.log_file.unlink(missing_ok=True)
+    
+    started = time.time()
+    outcome = run_with_retries(suite, units, retries, exclude=quarantined, extra=extra)
+    collect_artifacts(suite, suite.fresh_result_files(since=started), sol)
+    with STATE_LOCK:
+        update_duration_history(suite, suite.fresh_result_files(since=started))
+        typer.echo(format_outcome(suite.label, outcome))
+        quarantine = Quarantine.load(ROOT)
+        for test_id in quarantine.record(suite.name, outcome.verdicts):
+            typer.echo(f"  QUARANTINED {test_id} (repeatedly flaky)")
+        quarantine.save()
+    
+    if quarantined:
+        typer.echo(f"Running {len(quarantined)} quarantined {suite.label} tests (non-blocking)...")
+        lane = run_quarantine_lane(suite, sorted(quarantined), extra=extra)
+        with STATE_LOCK:
+            for verdict in sorted(lane.values(), key=lambda v: v.test_id):
+                typer.echo(f"  {verdict.status.upper():<7} {verdict.test_id}")
+            quarantine = Quarantine.load(ROOT)
+            for test_id in quarantine.record_lane(suite.name, lane):
+                typer.echo(f"  RELEASED {test_id} from quarantine")
+            quarantine.save()
+    
+    return outcome
+
+def select_environments(sol: dict, envs: Optional[str]) -> Optional[List[str]]:
+    """Validated --envs list, or None for a single run against TEST_ENV"""
+    if not envs:
+        return None
+    try:
+        return parse_envs(envs, list(sol.get('environments', [])))
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+
+def run_environment_matrix(selected: List[tuple], environments: List[str], sol: dict,
+                           max_parallel: int = 0, wait_ready: bool = False,
+                           ready_timeout: float = 120.0) -> bool:
+    """Run each (suite, units, extra) against every environment concurrently and merge the results"""
+    cells = [(suite.name, env) for env in environments for suite, _, _ in selected]
+    by_name = {suite.name: (suite, units, extra) for suite, units, extra in selected}
+    
+    not_ready = set()
+    if wait_ready:
+        for env in environments:
+            probes = build_probes(sol, load_target_config(ROOT, env))
+            results = wait_until_ready(probes, timeout=ready_timeout)
+            if not all(r.ready for r in results):
+                typer.echo(f"{env}: dependencies are not ready\n{format_report(results)}", err=True)
+                not_ready.add(env)
+    
+    def run_cell(name: str, env: str) -> MatrixCell:
+        base, units, extra = by_name[name]
+        if env in not_ready:
+            return MatrixCell(name, env, False, 0.0, error="dependencies not ready")
+        suite = base.for_environment(env, environment_overrides(ROOT, env))
+        # Concurrent runs would interleave on the terminal, so each cell logs to its own file
+        suite.log_path = ROOT / ".agent" / "matrix" / "logs" / f"{name}-{env}.log"
+        typer.echo(f"Started {suite.label} (log: {suite.log_path.relative_to(ROOT)})")
+        started = time.time()
+        outcome = execute_suite(suite, units, sol, extra)
+        return MatrixCell(name, env, outcome.ok, time.time() - started, outcome, log=suite.log_path)
+    
+    parallel = max_parallel or default_parallelism(len(cells))
+    typer.echo(f"Running {len(cells)} suite/environment combinations, {parallel} at a time...")
+    results = run_matrix(cells, run_cell, parallel)
+    
+    report = merge_report(results)
+    json_path, md_path = write_report(ROOT, report)
+    typer.echo("")
+    typer.echo(format_matrix(report))
+    typer.echo(f"Merged report: {md_path.relative_to(ROOT)} ({json_path.name})")
+    return all(cell.ok for cell in results)
+
+@functools.lru_cache(maxsize=None)
 def get_template_env():
-    """Get Jinja2 template environment"""
-    template_dir = Path(__file__).parent / "templates"
+    """Get Jinja2 template environment, shared so compiled templates stay warm"""
     return Environment(
-        loader=FileSystemLoader(str(template_dir)),
+        loader=FileSystemLoader(str(TEMPLATE_DIR)),
         trim_blocks=True,
         lstrip_blocks=True
     )
 
+@app.callback()
+def configure(ctx: typer.Context, profile: bool = False, profile_output: str = str(profiling.TRACE_FILE),
+              profile_top: int = 15):
+    """Test automation agent; --profile records a Chrome trace of the command that follows"""
+    if not profile:
+        return
+    profiler = profiling.enable()
+    
+    def report():
+        profiling.disable()
+        profiler.add(ctx.invoked_subcommand or "agent", "command", profiler.origin_ns, time.perf_counter_ns())
+        output = ROOT / profile_output
+        profiler.write_trace(output)
+        typer.echo(f"\nSlowest spans ({len(profiler.spans)} recorded):", err=True)
+        typer.echo(profiler.summary(profile_top), err=True)
+        typer.echo(f"Chrome trace written to {output} (open in chrome://tracing or ui.perfetto.dev)", err=True)
+    
+    ctx.call_on_close(report)
+
 @app.command()
 def list_agents():
     """Print registered agents and their entrypoints."""
@@ -61,33 +343,19 @@ def list_agents():
 @app.command()
 def plan(spec: str = "solution.yaml"):
     """Display the resolved plan from solution.yaml"""
-    spec_path = ROOT / spec
-    if not spec_path.exists():
-        typer.echo(f"Error: {spec} not found", err=True)
-        raise typer.Exit(1)
-    
-    data = yaml.load(spec_path.read_text())
-    s = Solution(**data)
+    s = load_solution(spec)
     typer.echo(json.dumps({"plan": s.solution}, indent=2))
 
-@app.command()
-def scaffold(spec: str = "solution.yaml"):
-    """Scaffold the complete test automation solution"""
-    spec_path = ROOT / spec
-    if not spec_path.exists():
-        typer.echo(f"Error: {spec} not found", err=True)
-        raise typer.Exit(1)
-    
-    data = yaml.load(spec_path.read_text())
-    s = Solution(**data)
+def scaffold_solution(root: Path, sol: dict):
+    """Render the framework, CI, environment and docs files for one solution under ``root``"""
     tpl = get_template_env()
     
     typer.echo("Scaffolding test automation solution...")
     
     # UI Framework
-    if s.solution['ui']['framework'] == 'playwright':
+    if sol['ui']['framework'] == 'playwright':
         typer.echo("Scaffolding Playwright UI tests...")
-        ui_dir = ROOT / "ui" / "playwright"
+        ui_dir = root / "ui" / "playwright"
         
         # Core Playwright files
         files_to_create = [
@@ -98,61 +366,79 @@ def scaffold(spec: str = "solution.yaml"):
             ("tests/login.spec.ts", "playwright/login.spec.ts.j2"),
             ("tests/smoke.spec.ts", "playwright/smoke.spec.ts.j2"),
             ("tests/utils/data.ts", "playwright/data.ts.j2"),
+            ("tests/utils/fixtures.ts", "playwright/fixtures.ts.j2"),
             ("tsconfig.json", "playwright/tsconfig.json.j2"),
         ]
         
         for file_path, template_name in files_to_create:
             try:
-                template = tpl.get_template(template_name)
-                content = template.render(sol=s.solution)
+                content = render(tpl, template_name, sol=sol)
                 write(ui_dir / file_path, content)
             except Exception as e:
                 typer.echo(f"Warning: Could not create {file_path}: {e}")
     
     # API Framework
-    if s.solution['api']['framework'] == 'restassured':
+    if sol['api']['framework'] == 'restassured':
         typer.echo("Scaffolding RestAssured API tests...")
-        api_dir = ROOT / "api" / "restassured"
+        api_dir = root / "api" / "restassured"
         
         files_to_create = [
             ("pom.xml", "restassured/pom.xml.j2"),
             ("src/test/java/base/ApiTest.java", "restassured/ApiTest.java.j2"),
+            ("src/test/java/base/SchemaValidator.java", "restassured/SchemaValidator.java.j2"),
+            ("src/test/java/specs/FuzzRegressionTest.java", "restassured/FuzzRegressionTest.java.j2"),
             ("src/test/java/specs/GeneratedTests.java", "restassured/GeneratedTests.java.j2"),
             ("src/test/resources/application.properties", "restassured/application.properties.j2"),
+            ("src/test/resources/junit-platform.properties", "restassured/junit-platform.properties.j2"),
         ]
         
+        # Login operation from the OpenAPI spec, for the shared auth token
+        from generators.openapi_to_tests import load_auth_operation
+        auth = load_auth_operation(root, sol)
+        
         for file_path, template_name in files_to_create:
             try:
-                template = tpl.get_template(template_name)
-                content = template.render(sol=s.solution)
+                content = render(tpl, template_name, sol=sol, auth=auth)
                 write(api_dir / file_path, content)
             except Exception as e:
                 typer.echo(f"Warning: Could not create {file_path}: {e}")
     
     # Backend Framework
-    if s.solution['backend']['framework'] == 'pytest':
+    if sol['backend']['framework'] == 'pytest':
         typer.echo("Scaffolding pytest backend tests...")
-        backend_dir = ROOT / "backend" / "pytest"
+        backend_dir = root / "backend" / "pytest"
         
         files_to_create = [
             ("pyproject.toml", "pytest/pyproject.toml.j2"),
             ("conftest.py", "pytest/conftest.py.j2"),
             ("tests/test_health.py", "pytest/test_health.py.j2"),
             ("tests/test_database.py", "pytest/test_database.py.j2"),
+            ("tests/test_database_async.py", "pytest/test_database_async.py.j2"),
+            ("tests/test_load.py", "pytest/test_load.py.j2"),
+            ("tests/test_latency.py", "pytest/test_latency.py.j2"),
+            ("tests/test_data_store.py", "pytest/test_data_store.py.j2"),
+            ("tests/test_redis_store.py", "pytest/test_redis_store.py.j2"),
+            ("tests/test_schemas.py", "pytest/test_schemas.py.j2"),
+            ("plugins/__init__.py", "pytest/plugins/__init__.py.j2"),
+            ("plugins/latency.py", "pytest/plugins/latency.py.j2"),
+            ("plugins/data_store.py", "pytest/plugins/data_store.py.j2"),
+            ("plugins/redis_store.py", "pytest/plugins/redis_store.py.j2"),
+            ("plugins/load.py", "pytest/plugins/load.py.j2"),
+            ("plugins/schemas.py", "pytest/plugins/schemas.py.j2"),
+            ("plugins/async_db.py", "pytest/plugins/async_db.py.j2"),
             ("requirements.txt", "pytest/requirements.txt.j2"),
         ]
         
         for file_path, template_name in files_to_create:
             try:
-                template = tpl.get_template(template_name)
-                content = template.render(sol=s.solution)
+                content = render(tpl, template_name, sol=sol)
                 write(backend_dir / file_path, content)
             except Exception as e:
                 typer.echo(f"Warning: Could not create {file_path}: {e}")
     
     # CI/CD Files
     typer.echo("Scaffolding CI/CD pipelines...")
-    ci_dir = ROOT / "ci"
+    ci_dir = root / "ci"
     
     cicd_files = [
         ("Jenkinsfile", "ci/Jenkinsfile.j2"),
@@ -163,38 +449,90 @@ def scaffold(spec: str = "solution.yaml"):
     
     for file_path, template_name in cicd_files:
         try:
-            template = tpl.get_template(template_name)
-            content = template.render(sol=s.solution)
+            content = render(tpl, template_name, sol=sol)
             write(ci_dir / file_path, content)
         except Exception as e:
             typer.echo(f"Warning: Could not create {file_path}: {e}")
     
     # Environment configs
     typer.echo("Scaffolding environment configurations...")
-    env_dir = ROOT / "env"
+    env_dir = root / "env"
     
-    for env in s.solution.get('environments', ['dev', 'qa', 'stage']):
+    for env in sol.get('environments', ['dev', 'qa', 'stage']):
         config_file = f"config.{env}.yaml"
         try:
-            template = tpl.get_template("env/config.yaml.j2")
-            content = template.render(sol=s.solution, environment=env)
+            content = render(tpl, "env/config.yaml.j2", sol=sol, environment=env)
             write(env_dir / config_file, content)
         except Exception as e:
             typer.echo(f"Warning: Could not create {config_file}: {e}")
     
     # Documentation
     typer.echo("Scaffolding documentation...")
-    docs_dir = ROOT / "docs"
+    docs_dir = root / "docs"
     
     try:
-        template = tpl.get_template("docs/README.md.j2")
-        content = template.render(sol=s.solution)
+        content = render(tpl, "docs/README.md.j2", sol=sol)
         write(docs_dir / "README.md", content)
     except Exception as e:
         typer.echo(f"Warning: Could not create README.md: {e}")
     
     typer.echo("Scaffold complete!")
 
+@app.command()
+def scaffold(spec: str = "solution.yaml"):
+    """Scaffold the complete test automation solution"""
+    s = load_solution(spec)
+    scaffold_solution(ROOT, s.solution)
+
+def generate_solution(root: Path, sol: dict, stories: str = "docs/stories.md",
+                      features: str = "docs/features", openapi: str = "specs/api.yaml"):
+    """Generate tests from one solution's stories, features and OpenAPI spec under ``root``"""
+    from generators.story_to_tests import generate_from_stories
+    from generators.openapi_to_tests import generate_from_openapi
+    from generators.postman_to_tests import generate_from_postman
+    
+    typer.echo("Generating tests from requirements...")
+    
+    # Generate UI tests from stories
+    stories_path = root / stories
+    features_dir = root / features
+    if stories_path.exists() or features_dir.exists():
+        with span("generate from stories", "generator"):
+            generate_from_stories(
+                root=root,
+                sol=sol,
+                stories_path=stories_path,
+                features_dir=features_dir,
+                templates=TEMPLATE_DIR
+            )
+    
+    # Generate API tests from OpenAPI
+    openapi_path = root / openapi
+    if openapi_path.exists():
+        with span("generate from OpenAPI", "generator"):
+            generate_from_openapi(
+                root=root,
+                sol=sol,
+                openapi_path=openapi_path,
+                templates=TEMPLATE_DIR
+            )
+    
+    # Generate API tests from a Postman collection, one test per OpenAPI operation it exercises
+    inputs = (sol.get("api") or {}).get("inputs") or {}
+    if inputs.get("postman") and (root / inputs["postman"]).exists():
+        environment = inputs.get("postman_environment")
+        with span("generate from Postman", "generator"):
+            generate_from_postman(
+                root=root,
+                sol=sol,
+                postman_path=root / inputs["postman"],
+                openapi_path=openapi_path,
+                environment_path=root / environment if environment else None,
+                templates=TEMPLATE_DIR
+            )
+    
+    typer.echo("Test generation complete!")
+
 @app.command()
 def generate_tests(
     spec: str = "solution.yaml",
@@ -204,75 +542,230 @@ def generate_tests(
 ):
     """Generate tests from requirements (stories/Gherkin/OpenAPI)"""
     try:
-        from generators.story_to_tests import generate_from_stories
-        from generators.openapi_to_tests import generate_from_openapi
-        
-        spec_path = ROOT / spec
-        if not spec_path.exists():
-            typer.echo(f"Error: {spec} not found", err=True)
-            raise typer.Exit(1)
-        
-        data = yaml.load(spec_path.read_text())
-        s = Solution(**data)
-        
-        typer.echo("Generating tests from requirements...")
-        
-        # Generate UI tests from stories
-        stories_path = ROOT / stories
-        features_dir = ROOT / features
-        if stories_path.exists() or features_dir.exists():
-            generate_from_stories(
-                root=ROOT,
-                sol=s.solution,
-                stories_path=stories_path,
-                features_dir=features_dir
-            )
-        
-        # Generate API tests from OpenAPI
-        openapi_path = ROOT / openapi
-        if openapi_path.exists():
-            generate_from_openapi(
-                root=ROOT,
-                sol=s.solution,
-                openapi_path=openapi_path
-            )
-        
-        typer.echo("Test generation complete!")
-        
+        s = load_solution(spec)
+        generate_solution(ROOT, s.solution, stories, features, openapi)
     except ImportError as e:
         typer.echo(f"Error: Could not import generators: {e}", err=True)
         typer.echo("Make sure to run 'scaffold' first to create the generator modules.")
         raise typer.Exit(1)
 
+def batch_openapi(root: Path, sol: dict) -> str:
+    """The solution's declared OpenAPI input when it exists, else the default spec"""
+    declared = ((sol.get("api") or {}).get("inputs") or {}).get("openapi")
+    return declared if declared and (root / declared).exists() else "specs/api.yaml"
+
+BATCH_STEPS = {
+    "scaffold": scaffold_solution,
+    "generate-tests": lambda root, sol: generate_solution(root, sol, openapi=batch_openapi(root, sol)),
+}
+
 @app.command()
-def run_ui(headed: bool = False, spec: str = "solution.yaml"):
-    """Run UI tests"""
-    spec_path = ROOT / spec
-    if not spec_path.exists():
-        typer.echo(f"Error: {spec} not found", err=True)
+def batch(specs: str = "", spec_list: Optional[str] = None, steps: str = "scaffold,generate-tests",
+          max_parallel: int = 0):
+    """Scaffold and generate tests for many solutions at once, sharing template and spec caches.
+    
+    --specs takes comma-separated solution.yaml paths, directories or globs ('teams/*/solution.yaml');
+    --spec-list names a file with one per line. Relative paths are taken from the repository root.
+    """
+    from orchestrator.batch import REPORT_DIR, default_parallelism, expand_specs, format_batch, run_batch, \
+        write_batch_report
+    
+    patterns = [p for p in specs.split(",") if p.strip()]
+    if spec_list:
+        patterns += (ROOT / spec_list).read_text(encoding="utf-8").splitlines()
+    spec_paths = expand_specs(patterns, ROOT)
+    selected = [s.strip() for s in steps.split(",") if s.strip()]
+    unknown = [s for s in selected if s not in BATCH_STEPS]
+    if not spec_paths or not selected or unknown:
+        typer.echo(f"Error: {'unknown step ' + ', '.join(unknown) if unknown else 'no solutions or steps given'}; "
+                   f"steps are {', '.join(BATCH_STEPS)}", err=True)
+        raise typer.Exit(1)
+    
+    def prepare(spec_path: Path):
+        if not spec_path.is_file():
+            raise FileNotFoundError(f"{spec_path} not found")
+        sol = read_solution(spec_path).solution
+        return str(sol.get("name") or spec_path.parent.name), sol
+    
+    def finished(result):
+        state = "ok" if result.ok else f"FAILED ({result.headline})"
+        typer.echo(f"  {result.name or result.spec}: {state} in {result.seconds:.2f}s")
+    
+    parallel = max_parallel or default_parallelism(len(spec_paths))
+    typer.echo(f"Running {', '.join(selected)} for {len(spec_paths)} solutions, {parallel} at a time...")
+    started = time.perf_counter()
+    results = run_batch(spec_paths, prepare, [(name, BATCH_STEPS[name]) for name in selected], parallel,
+                        ROOT / REPORT_DIR / "logs", finished)
+    elapsed = time.perf_counter() - started
+    
+    from generators.utils import jenv
+    cache = {
+        "files_hits": FILES.stats.hits,
+        "files_shared": FILES.stats.shared,
+        "files_parsed": FILES.stats.misses,
+        "templates_compiled": sum(len(env.cache) for env in (get_template_env(), jenv(TEMPLATE_DIR))),
+    }
+    report = write_batch_report(ROOT, results, elapsed, parallel, cache)
+    typer.echo("")
+    typer.echo(format_batch(results, selected))
+    typer.echo(f"\n{sum(r.ok for r in results)}/{len(results)} solutions ok in {elapsed:.2f}s; "
+               f"{cache['files_parsed']} input files parsed, {cache['files_shared']} reused from identical "
+               f"copies. Report: {report.relative_to(ROOT)}")
+    if not all(r.ok for r in results):
+        raise typer.Exit(1)
+
+@app.command()
+def benchmark(sizes: str = "small,medium", repeats: int = 3, baseline: Optional[str] = None,
+              threshold: float = 0.2, save_baseline: bool = False, spec: str = "solution.yaml"):
+    """Benchmark the generators on synthetic inputs and compare with a stored baseline"""
+    from benchmarks.runner import BASELINE_FILE, SIZES, compare, format_report, load_baseline, run_benchmarks
+    from benchmarks.runner import save_baseline as store_baseline
+    
+    s = load_solution(spec)
+    tiers = [t.strip() for t in sizes.split(",") if t.strip()]
+    unknown = [t for t in tiers if t not in SIZES]
+    if unknown:
+        typer.echo(f"Error: unknown size {', '.join(unknown)}; expected {', '.join(SIZES)}", err=True)
         raise typer.Exit(1)
     
-    data = yaml.load(spec_path.read_text())
-    s = Solution(**data)
+    baseline_path = ROOT / (baseline or BASELINE_FILE)
+    typer.echo(f"Benchmarking generators ({', '.join(tiers)}, {repeats} repeats)...")
+    measurements = run_benchmarks(Path(__file__).parent / "templates", s.solution, tiers, repeats,
+                                  on_result=lambda m: typer.echo(f"  {m.name}: {m.seconds * 1000:.1f}ms"))
     
-    ui_dir = ROOT / "ui" / s.solution['ui']['framework']
+    comparisons = compare(measurements, load_baseline(baseline_path), threshold)
+    typer.echo("")
+    typer.echo(format_report(comparisons))
+    
+    if save_baseline:
+        store_baseline(baseline_path, measurements)
+        typer.echo(f"Baseline saved to {baseline_path}")
+        return
+    regressions = [c for c in comparisons if c.regressed]
+    if regressions:
+        typer.echo(f"{len(regressions)} cases regressed by more than {threshold:.0%} against {baseline_path}",
+                   err=True)
+        raise typer.Exit(1)
+
+@app.command()
+def fuzz(target: str = "mock", seed: int = 0, cases: int = 200, concurrency: int = 64,
+         operations: Optional[str] = None, timeout: float = 5.0, save: bool = True,
+         token: Optional[str] = None, spec: str = "solution.yaml"):
+    """Fuzz the API with boundary and invalid requests derived from the OpenAPI schemas.
+
+    TARGET is "mock" (a local server enforcing the spec), a base URL, or an environment name.
+    """
+    import asyncio
+    import yaml
+    from fuzz.cases import generate_cases
+    from fuzz.runner import REGRESSION_FILE, REGRESSION_TEST, format_report, run_fuzz, save_regressions
+
+    s = load_solution(spec)
+    openapi_path = ROOT / ((s.solution.get("api") or {}).get("inputs") or {}).get("openapi", "specs/api.yaml")
+    if not openapi_path.exists():
+        openapi_path = ROOT / "specs" / "api.yaml"
+    if not openapi_path.exists():
+        typer.echo(f"Error: OpenAPI spec not found: {openapi_path}", err=True)
+        raise typer.Exit(1)
+    openapi = yaml.safe_load(openapi_path.read_text(encoding="utf-8")) or {}
+
+    only = [o.strip() for o in operations.split(",") if o.strip()] if operations else None
+    fuzz_cases = generate_cases(openapi, seed, cases, only)
+    if target == "mock":
+        base_url = None
+    elif target.startswith(("http://", "https://")):
+        base_url = target
+    else:
+        base_url = load_target_config(ROOT, target)["base_url"]
+    typer.echo(f"Fuzzing {len(fuzz_cases)} cases (seed {seed}) against {base_url or 'the local mock'} "
+               f"with {concurrency} concurrent requests...")
+
+    try:
+        report = asyncio.run(run_fuzz(openapi, fuzz_cases, base_url, concurrency, timeout, token, seed,
+                                      on_progress=lambda r: typer.echo(f"  {r.sent} sent ({r.rate:.0f}/s)")))
+    except ValueError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+    typer.echo(format_report(report))
+
+    if not report.failures:
+        return
+    if save:
+        entries = save_regressions(ROOT / REGRESSION_FILE, report.failures)
+        tpl = get_template_env()
+        write(ROOT / REGRESSION_TEST, render(tpl, "restassured/FuzzRegressionTest.java.j2", sol=s.solution))
+        typer.echo(f"Saved {len(report.failures)} minimized cases to {REGRESSION_FILE} "
+                   f"({len(entries)} regression cases in total)")
+    raise typer.Exit(1)
+
+@app.command()
+def api_coverage(openapi: Optional[str] = None, output: Optional[str] = None, show_tests: bool = False,
+                 spec: str = "solution.yaml"):
+    """Report OpenAPI operations and response codes that no API, UI or backend test exercises.
+
+    Test sources are indexed once and cached in .agent/coverage.json; re-runs only re-read files
+    whose content changed.
+    """
+    from orchestrator.coverage import CACHE_FILE, build_coverage, format_coverage
+
+    if openapi:
+        openapi_path = ROOT / openapi
+    else:
+        s = load_solution(spec)
+        openapi_path = ROOT / batch_openapi(ROOT, s.solution)
+    if not openapi_path.exists():
+        typer.echo(f"Error: OpenAPI spec not found: {openapi_path}", err=True)
+        raise typer.Exit(1)
+
+    started = time.perf_counter()
+    with span("coverage.index"):
+        report = build_coverage(ROOT, openapi_path)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    typer.echo(format_coverage(report, show_tests))
+    typer.echo(f"\nIndexed {report.files} test files ({report.parsed} re-read) in {elapsed_ms:.0f} ms; "
+               f"cache: {CACHE_FILE}")
+    if output:
+        write(ROOT / output, json.dumps(report.to_dict(), indent=2))
+        typer.echo(f"Coverage written to {output}")
+
+@app.command()
+def run_ui(headed: bool = False, spec: str = "solution.yaml", shard: Optional[str] = None,
+           changed_since: Optional[str] = None, har: Optional[str] = None,
+           envs: Optional[str] = None, max_parallel: int = 0):
+    """Run UI tests, optionally only shard i/N of them, or against several environments at once"""
+    s = load_solution(spec)
+    environments = select_environments(s.solution, envs)
+    if har:
+        if har not in ("off", "record", "replay"):
+            typer.echo(f"Error: --har must be off, record or replay, not '{har}'", err=True)
+            raise typer.Exit(1)
+        # Read by tests/utils/fixtures.ts; overrides ui.network.har.mode
+        os.environ["PW_HAR_MODE"] = har
+    suite = get_suite("ui", ROOT, s.solution)
+    
+    ui_dir = suite.directory
     if not ui_dir.exists():
         typer.echo(f"Error: UI directory {ui_dir} not found. Run 'scaffold' first.", err=True)
         raise typer.Exit(1)
     
+    units = select_units(suite, shard, changed_since)
+    if units == []:
+        typer.echo("No UI tests selected for this run.")
+        return
+    
     typer.echo("Running UI tests...")
     
     try:
-        # Install dependencies
-        subprocess.check_call(["npm", "install"], cwd=ui_dir)
-        subprocess.check_call(["npx", "playwright", "install", "--with-deps"], cwd=ui_dir)
-        
-        # Run tests
-        cmd = ["npx", "playwright", "test"]
-        if headed:
-            cmd.append("--headed")
+        prepare_suite(suite)
         
-        subprocess.check_call(cmd, cwd=ui_dir)
+        extra = ["--headed"] if headed else None
+        if environments:
+            ok = run_environment_matrix([(suite, units, extra)], environments, s.solution, max_parallel)
+        else:
+            ok = execute_suite(suite, units, s.solution, extra=extra).ok
+        if not ok:
+            typer.echo("UI tests failed", err=True)
+            raise typer.Exit(1)
         typer.echo("UI tests completed successfully!")
         
     except subprocess.CalledProcessError as e:
@@ -280,52 +773,67 @@ def run_ui(headed: bool = False, spec: str = "solution.yaml"):
         raise typer.Exit(1)
 
 @app.command()
-def run_api(spec: str = "solution.yaml"):
-    """Run API tests"""
-    spec_path = ROOT / spec
-    if not spec_path.exists():
-        typer.echo(f"Error: {spec} not found", err=True)
-        raise typer.Exit(1)
-    
-    data = yaml.load(spec_path.read_text())
-    s = Solution(**data)
+def run_api(spec: str = "solution.yaml", shard: Optional[str] = None,
+            changed_since: Optional[str] = None, envs: Optional[str] = None, max_parallel: int = 0):
+    """Run API tests, optionally only shard i/N of them, or against several environments at once"""
+    s = load_solution(spec)
+    environments = select_environments(s.solution, envs)
+    suite = get_suite("api", ROOT, s.solution)
     
-    api_dir = ROOT / "api" / s.solution['api']['framework']
+    api_dir = suite.directory
     if not api_dir.exists():
         typer.echo(f"Error: API directory {api_dir} not found. Run 'scaffold' first.", err=True)
         raise typer.Exit(1)
     
+    units = select_units(suite, shard, changed_since)
+    if units == []:
+        typer.echo("No API tests selected for this run.")
+        return
+    
     typer.echo("Running API tests...")
     
-    try:
-        subprocess.check_call(["mvn", "-B", "test"], cwd=api_dir)
-        typer.echo("API tests completed successfully!")
-        
-    except subprocess.CalledProcessError as e:
-        typer.echo(f"API tests failed: {e}", err=True)
+    if environments:
+        ok = run_environment_matrix([(suite, units, None)], environments, s.solution, max_parallel)
+    else:
+        ok = execute_suite(suite, units, s.solution).ok
+    if not ok:
+        typer.echo("API tests failed", err=True)
         raise typer.Exit(1)
+    typer.echo("API tests completed successfully!")
 
 @app.command()
-def run_backend(spec: str = "solution.yaml"):
-    """Run backend tests"""
-    spec_path = ROOT / spec
-    if not spec_path.exists():
-        typer.echo(f"Error: {spec} not found", err=True)
-        raise typer.Exit(1)
+def run_backend(spec: str = "solution.yaml", wait_ready: bool = True, ready_timeout: float = 120.0,
+                shard: Optional[str] = None, changed_since: Optional[str] = None,
+                envs: Optional[str] = None, max_parallel: int = 0):
+    """Run backend tests, optionally only shard i/N of them, or against several environments at once"""
+    s = load_solution(spec)
+    environments = select_environments(s.solution, envs)
+    suite = get_suite("backend", ROOT, s.solution)
     
-    data = yaml.load(spec_path.read_text())
-    s = Solution(**data)
-    
-    backend_dir = ROOT / "backend" / s.solution['backend']['framework']
+    backend_dir = suite.directory
     if not backend_dir.exists():
         typer.echo(f"Error: Backend directory {backend_dir} not found. Run 'scaffold' first.", err=True)
         raise typer.Exit(1)
     
+    units = select_units(suite, shard, changed_since)
+    if units == []:
+        typer.echo("No backend tests selected for this run.")
+        return
+    
     typer.echo("Running backend tests...")
     
     try:
-        subprocess.check_call(["pip", "install", "-r", "requirements.txt"], cwd=backend_dir)
-        subprocess.check_call(["python", "-m", "pytest", "-v"], cwd=backend_dir)
+        prepare_suite(suite)
+        if environments:
+            ok = run_environment_matrix([(suite, units, None)], environments, s.solution, max_parallel,
+                                        wait_ready=wait_ready, ready_timeout=ready_timeout)
+        else:
+            if wait_ready:
+                ensure_dependencies_ready(s.solution, ready_timeout)
+            ok = execute_suite(suite, units, s.solution).ok
+        if not ok:
+            typer.echo("Backend tests failed", err=True)
+            raise typer.Exit(1)
         typer.echo("Backend tests completed successfully!")
         
     except subprocess.CalledProcessError as e:
@@ -333,19 +841,370 @@ def run_backend(spec: str = "solution.yaml"):
         raise typer.Exit(1)
 
 @app.command()
-def run_all(spec: str = "solution.yaml"):
-    """Run all test suites"""
+def run_all(spec: str = "solution.yaml", wait_ready: bool = True, ready_timeout: float = 120.0,
+            changed_since: Optional[str] = None, envs: Optional[str] = None, max_parallel: int = 0,
+            schedule: bool = True, max_cores: float = 0, max_memory_mb: float = 0):
+    """Run all test suites, concurrently within the machine's budget, or against several environments"""
     typer.echo("Running all test suites...")
     
+    if envs:
+        run_all_environments(spec, envs, max_parallel, wait_ready, ready_timeout, changed_since)
+        return
+    if schedule:
+        run_all_scheduled(spec, wait_ready, ready_timeout, changed_since, max_cores, max_memory_mb)
+        return
+    
     try:
-        run_ui(spec=spec)
-        run_api(spec=spec)
-        run_backend(spec=spec)
+        if wait_ready:
+            ensure_dependencies_ready(load_solution(spec).solution, ready_timeout)
+        run_ui(spec=spec, changed_since=changed_since)
+        run_api(spec=spec, changed_since=changed_since)
+        run_backend(spec=spec, wait_ready=False, changed_since=changed_since)
         typer.echo("All test suites completed successfully!")
         
     except typer.Exit:
         typer.echo("Some test suites failed. Check the output above.", err=True)
         raise
 
+def select_all_suites(sol: dict, changed_since: Optional[str]) -> List[tuple]:
+    """(suite, units, extra) for every suite with tests to run, each prepared for running"""
+    selected = []
+    try:
+        for name in SUITES:
+            if name not in sol:
+                continue
+            suite = get_suite(name, ROOT, sol)
+            if not suite.directory.exists():
+                typer.echo(f"Error: {name} directory {suite.directory} not found. Run 'scaffold' first.", err=True)
+                raise typer.Exit(1)
+            units = select_units(suite, changed_since=changed_since)
+            if units == []:
+                typer.echo(f"No {name} tests selected for this run.")
+                continue
+            prepare_suite(suite)
+            selected.append((suite, units, None))
+    except subprocess.CalledProcessError as e:
+        typer.echo(f"Setup failed: {e}", err=True)
+        raise typer.Exit(1)
+    return selected
+
+def run_all_scheduled(spec: str, wait_ready: bool, ready_timeout: float, changed_since: Optional[str],
+                      max_cores: float, max_memory_mb: float):
+    """Run the suites side by side, each with as many workers as the free cores and memory allow"""
+    s = load_solution(spec)
+    selected = select_all_suites(s.solution, changed_since)
+    if wait_ready and selected:
+        ensure_dependencies_ready(s.solution, ready_timeout)
+    
+    capacity = measure_capacity(max_cores, max_memory_mb)
+    scheduler = Scheduler(capacity)
+    resources = ResourceHistory.load(ROOT)
+    durations = DurationHistory.load(ROOT)
+    by_name = {suite.name: (suite, units, extra) for suite, units, extra in selected}
+    jobs = []
+    for suite, units, _ in selected:
+        cost = resources.cost(suite.name)
+        expected = sum(durations.estimate(suite.name, units or suite.discover_units()).values())
+        jobs.append(Job(suite.name, cost, max(expected, 1.0), scheduler.max_workers(cost)))
+    typer.echo(f"Budget: {capacity.cores:g} cores, {capacity.memory_mb / 1024:.1f} GB")
+    
+    def started(allocation: Allocation):
+        suite = by_name[allocation.job.name][0]
+        typer.echo(f"Started {suite.name} with {allocation.workers} workers "
+                   f"(~{allocation.cores:.1f} cores, ~{allocation.memory_mb:.0f} MB; "
+                   f"log: {suite.log_path.relative_to(ROOT)})")
+    
+    def run_job(job: Job, workers: int) -> bool:
+        suite, units, extra = by_name[job.name]
+        suite.workers = workers
+        try:
+            return execute_suite(suite, units, s.solution, extra).ok
+        except (OSError, subprocess.CalledProcessError) as e:
+            typer.echo(f"{suite.name} tests could not run: {e}", err=True)
+            return False
+    
+    for suite, _, _ in selected:
+        # Concurrent suites would interleave on the terminal, so each logs to its own file
+        suite.log_path = ROOT / LOG_DIR / f"{suite.name}.log"
+    results = scheduler.run(jobs, run_job, on_start=started)
+    
+    failed = sorted(name for name, ok in results.items() if not ok)
+    if failed:
+        typer.echo(f"Some test suites failed ({', '.join(failed)}). Check the logs under .agent/logs.", err=True)
+        raise typer.Exit(1)
+    typer.echo("All test suites completed successfully!")
+
+def run_all_environments(spec: str, envs: str, max_parallel: int, wait_ready: bool,
+                         ready_timeout: float, changed_since: Optional[str]):
+    """One matrix over every suite and environment, sharing a single concurrency limit"""
+    s = load_solution(spec)
+    environments = select_environments(s.solution, envs)
+    selected = select_all_suites(s.solution, changed_since)
+    
+    if selected and not run_environment_matrix(selected, environments, s.solution, max_parallel,
+                                               wait_ready=wait_ready, ready_timeout=ready_timeout):
+        typer.echo("Some test suites failed. Check the merged report above.", err=True)
+        raise typer.Exit(1)
+    typer.echo("All test suites completed successfully!")
+
+@app.command()
+def record_durations(results_dir: str = ".agent/shard-results", spec: str = "solution.yaml"):
+    """Merge result files collected from CI shards (<suite>-<i>/ folders) into the duration history"""
+    s = load_solution(spec)
+    base = ROOT / results_dir
+    if not base.exists():
+        typer.echo(f"No shard results found in {results_dir}")
+        return
+    
+    for folder in sorted(p for p in base.iterdir() if p.is_dir()):
+        name = folder.name.split("-", 1)[0]
+        if name not in SUITES:
+            continue
+        suite = get_suite(name, ROOT, s.solution)
+        recorded = update_duration_history(suite, sorted(folder.rglob(suite.result_glob)))
+        typer.echo(f"{folder.name}: recorded {recorded} test durations")
+
+def current_commit() -> str:
+    """Commit under test: CI-provided GIT_COMMIT, else the local HEAD"""
+    if os.getenv("GIT_COMMIT"):
+        return os.environ["GIT_COMMIT"]
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+@app.command()
+def ingest_results(spec: str = "solution.yaml", env: Optional[str] = None, commit: Optional[str] = None):
+    """Stream the suites' result files into the local SQLite results database"""
+    s = load_solution(spec)
+    env = env or os.getenv("TEST_ENV", "dev")
+    commit = commit if commit is not None else current_commit()
+    
+    conn = results_db.connect(ROOT)
+    try:
+        for name in SUITES:
+            if name not in s.solution:
+                continue
+            suite = get_suite(name, ROOT, s.solution)
+            # Plain runs, then the per-environment folders of --envs matrix runs
+            targets = [(suite, env)] + [(suite.for_environment(e), e) for e in s.solution.get('environments', [])]
+            for target, target_env in targets:
+                for path in target.result_files():
+                    if not path.exists():
+                        continue
+                    if results_db.already_ingested(conn, path):
+                        typer.echo(f"{path.relative_to(ROOT)}: already ingested")
+                        continue
+                    # Failures that passed in a later rerun-N lane are stored as flaky, as the run reported them
+                    results = fold_reruns(suite.parse(path), target.rerun_results(since=path.stat().st_mtime))
+                    count = results_db.ingest(conn, suite.name, path, results, target_env, commit)
+                    typer.echo(f"{path.relative_to(ROOT)}: {count} results")
+    finally:
+        conn.close()
+
+@app.command()
+def query_results(report: str = "trend", suite: Optional[str] = None, limit: int = 20):
+    """Query the results database: trend, slowest or flaky"""
+    queries = {"trend": results_db.trend, "slowest": results_db.slowest, "flaky": results_db.flakiest}
+    if report not in queries:
+        typer.echo(f"Error: unknown report '{report}', expected one of {', '.join(queries)}", err=True)
+        raise typer.Exit(1)
+    
+    conn = results_db.connect(ROOT)
+    try:
+        rows = queries[report](conn, suite=suite, limit=limit)
+    finally:
+        conn.close()
+    
+    if not rows:
+        typer.echo("No results recorded yet. Run 'ingest-results' after a test run.")
+        return
+    
+    if report == "trend":
+        typer.echo(f"{'Recorded':<25} {'Suite':<8} {'Env':<6} {'Commit':<8} {'Total':>6} "
+                   f"{'Pass':>6} {'Flaky':>6} {'Fail':>6} {'Time':>9}")
+        for r in rows:
+            typer.echo(f"{r['recorded_at']:<25} {r['suite']:<8} {r['env']:<6} {r['commit_sha'][:8]:<8} "
+                       f"{r['total']:>6} {r['passed']:>6} {r['flaky']:>6} {r['failed']:>6} "
+                       f"{r['duration']:>8.1f}s")
+    elif report == "slowest":
+        typer.echo(f"{'Avg':>9} {'Max':>9} {'Runs':>5}  Test")
+        for r in rows:
+            typer.echo(f"{r['avg_duration']:>8.2f}s {r['max_duration']:>8.2f}s {r['samples']:>5}  "
+                       f"{r['suite']}: {r['test_id']}")
+    else:
+        typer.echo(f"{'Runs':>5} {'Flaky':>6} {'Fail':>5} {'Pass':>5} {'Retries':>8}  Test")
+        for r in rows:
+            typer.echo(f"{r['runs']:>5} {r['flaky']:>6} {r['failed']:>5} {r['passed']:>5} "
+                       f"{r['retries']:>8}  {r['suite']}: {r['test_id']}")
+
+@app.command()
+def store_artifacts(spec: str = "solution.yaml", env: Optional[str] = None, commit: Optional[str] = None):
+    """Add the traces, videos and screenshots of the latest runs to the artifact store"""
+    s = load_solution(spec)
+    env = env or os.getenv("TEST_ENV", "dev")
+    commit = commit if commit is not None else current_commit()
+    max_mb = float(s.solution.get('artifacts', {}).get('max_size_mb', artifact_store.DEFAULT_MAX_SIZE_MB))
+    
+    conn = results_db.connect(ROOT)
+    try:
+        for name in SUITES:
+            if name not in s.solution:
+                continue
+            suite = get_suite(name, ROOT, s.solution)
+            targets = [(suite, env)] + [(suite.for_environment(e), e) for e in s.solution.get('environments', [])]
+            for target, target_env in targets:
+                files = [p for p in target.result_files() if p.exists()]
+                stats = artifact_store.store_artifacts(conn, ROOT, target.attachments(files), target_env, commit,
+                                                       base=target.directory)
+                if stats.files or stats.missing:
+                    typer.echo(f"{target.label}: {stats.files} artifacts, {stats.new_objects} new "
+                               f"({stats.bytes_added / 1e6:.1f} of {stats.bytes_in / 1e6:.1f} MB added)"
+                               + (f", {stats.missing} missing" if stats.missing else ""))
+        evicted = artifact_store.evict(conn, ROOT, int(max_mb * 1024 * 1024))
+    finally:
+        conn.close()
+    if evicted.objects:
+        typer.echo(f"Evicted {evicted.objects} objects ({evicted.bytes / 1e6:.1f} MB) to stay under {max_mb:.0f} MB")
+    typer.echo(f"Artifact store: {evicted.remaining / 1e6:.1f} MB")
+
+@app.command()
+def export_artifacts(dest: str = "artifacts-export", suite: Optional[str] = None, env: Optional[str] = None,
+                     commit: Optional[str] = None, test: Optional[str] = None, layout: str = "tests"):
+    """Hard-link stored artifacts into a directory for CI upload (defaults to the current commit)"""
+    if layout not in ("tests", "objects"):
+        typer.echo(f"Error: --layout must be tests or objects, not '{layout}'", err=True)
+        raise typer.Exit(1)
+    commit = commit if commit is not None else current_commit()
+    
+    conn = results_db.connect(ROOT)
+    try:
+        links = artifact_store.select_links(conn, suite=suite, env=env, commit=commit or None, test=test)
+        if not links:
+            typer.echo("No stored artifacts match. Run 'store-artifacts' after a test run.")
+            return
+        target = Path(dest) if Path(dest).is_absolute() else ROOT / dest
+        stats = artifact_store.export_artifacts(conn, ROOT, target, links, layout)
+    finally:
+        conn.close()
+    typer.echo(f"Exported {stats.linked + stats.copied} files ({stats.bytes / 1e6:.1f} MB) to {target}: "
+               f"{stats.linked} hard-linked, {stats.copied} copied")
+
+@app.command()
+def prune_artifacts(max_size_mb: Optional[float] = None, spec: str = "solution.yaml"):
+    """Evict least recently used artifacts until the store fits its size limit"""
+    s = load_solution(spec)
+    if max_size_mb is None:
+        max_size_mb = float(s.solution.get('artifacts', {}).get('max_size_mb', artifact_store.DEFAULT_MAX_SIZE_MB))
+    
+    conn = results_db.connect(ROOT)
+    try:
+        evicted = artifact_store.evict(conn, ROOT, int(max_size_mb * 1024 * 1024))
+    finally:
+        conn.close()
+    typer.echo(f"Evicted {evicted.objects} objects ({evicted.bytes / 1e6:.1f} MB); "
+               f"{evicted.remaining / 1e6:.1f} MB remain")
+
+@functools.lru_cache(maxsize=None)
+def cli_command():
+    return typer.main.get_command(app)
+
+def run_command(argv: List[str]) -> int:
+    """Run one CLI invocation in this process, as the daemon does per request; returns its exit code"""
+    try:
+        cli_command().main(args=argv, prog_name="main.py", standalone_mode=True)
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        typer.echo(e.code, err=True)
+        return 1
+    return 0
+
+def warm_caches(spec: str):
+    """Compile every template and parse the solution and its specs ahead of the first request"""
+    from generators.openapi_to_tests import load_spec, spec_fingerprints
+    from generators.postman_to_tests import load_collection
+    from generators.story_to_tests import load_stories
+    from generators.utils import jenv
+    
+    for env in (get_template_env(), jenv(TEMPLATE_DIR)):
+        for name in env.list_templates(extensions=["j2"]):
+            env.get_template(name)
+    if not (ROOT / spec).exists():
+        return
+    sol = load_solution(spec).solution
+    inputs = (sol.get("api") or {}).get("inputs") or {}
+    openapi = ROOT / inputs.get("openapi", "specs/api.yaml")
+    for path in {openapi, ROOT / "specs" / "api.yaml"}:
+        if path.exists():
+            load_spec(path)
+            spec_fingerprints(path)
+    if inputs.get("postman") and (ROOT / inputs["postman"]).exists():
+        load_collection(ROOT / inputs["postman"])
+    if (ROOT / "docs" / "stories.md").exists():
+        load_stories(ROOT / "docs" / "stories.md")
+
+def daemon_cache_status() -> dict:
+    env = get_template_env()
+    return {"compiled_templates": len(env.cache) if env.cache is not None else 0}
+
+@app.command()
+def serve(background: bool = False, idle_timeout: float = daemon.DEFAULT_IDLE_TIMEOUT,
+          spec: str = "solution.yaml"):
+    """Run the agent daemon on .agent/agent.sock; scaffold, generate-tests and plan are routed to it.
+    
+    Caches stay warm between requests and are revalidated against file mtimes; the daemon exits
+    after --idle-timeout seconds without requests (0 = never) or when its own code changes.
+    """
+    if daemon.request(ROOT, {"op": "status"}) is not None:
+        typer.echo(f"Agent daemon already running on {daemon.SOCKET_FILE}")
+        return
+    if background:
+        log_path = ROOT / LOG_DIR / "daemon.log"
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(log_path, "ab") as log:
+            subprocess.Popen([sys.executable, str(Path(__file__).resolve()), "serve",
+                              "--idle-timeout", str(idle_timeout), "--spec", spec],
+                             stdin=subprocess.DEVNULL, stdout=log, stderr=subprocess.STDOUT,
+                             cwd=ROOT, start_new_session=True)
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            status = daemon.request(ROOT, {"op": "status"})
+            if status is not None:
+                typer.echo(f"Agent daemon started (pid {status['pid']}) on {daemon.SOCKET_FILE}")
+                return
+            time.sleep(0.1)
+        typer.echo(f"Error: agent daemon did not start; see {log_path.relative_to(ROOT)}", err=True)
+        raise typer.Exit(1)
+    
+    started = time.perf_counter()
+    warm_caches(spec)
+    typer.echo(f"Caches warm in {time.perf_counter() - started:.2f}s; "
+               f"listening on {daemon.SOCKET_FILE} (commands: {', '.join(sorted(daemon.ROUTED_COMMANDS))})")
+    try:
+        daemon.AgentDaemon(ROOT, run_command, daemon_cache_status, idle_timeout).serve()
+    except RuntimeError as e:
+        typer.echo(f"Error: {e}", err=True)
+        raise typer.Exit(1)
+    typer.echo("Agent daemon stopped")
+
+@app.command()
+def daemon_status():
+    """Show whether the agent daemon is running, with its request count and cache statistics"""
+    status = daemon.request(ROOT, {"op": "status"})
+    if status is None:
+        typer.echo("Agent daemon is not running")
+        raise typer.Exit(1)
+    typer.echo(json.dumps(status, indent=2))
+
+@app.command()
+def daemon_stop():
+    """Stop the agent daemon once its current request finishes"""
+    if daemon.request(ROOT, {"op": "stop"}) is None:
+        typer.echo("Agent daemon is not running")
+        return
+    typer.echo("Agent daemon stopping")
+
 if __name__ == "__main__":
     app()
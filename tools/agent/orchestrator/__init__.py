@@ -0,0 +1,4 @@
+"""
+Orchestration helpers for the runner agents
+Readiness checks, result handling and scheduling used by main.py run_* commands
+"""
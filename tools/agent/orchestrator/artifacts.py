@@ -0,0 +1,217 @@
+"""
+Artifact Store
+Deduplicates traces, videos and screenshots by content hash into a local store indexed by test,
+with size-based eviction and hard-link export for CI upload
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from orchestrator.results import Attachment
+
+STORE_DIR = Path(".agent") / "artifacts"
+
+DEFAULT_MAX_SIZE_MB = 2048
+
+CHUNK_SIZE = 1024 * 1024
+
+# Already compressed formats; gzip would cost time and save nothing, and stored raw they
+# can be hard-linked on export instead of copied
+COMPRESSED_SUFFIXES = {".zip", ".webm", ".mp4", ".png", ".jpg", ".jpeg", ".gif", ".webp", ".gz", ".br", ".zst"}
+
+@dataclass
+class StoreStats:
+    files: int = 0
+    new_objects: int = 0
+    bytes_in: int = 0
+    bytes_added: int = 0
+    missing: int = 0
+
+@dataclass
+class ExportStats:
+    linked: int = 0
+    copied: int = 0
+    bytes: int = 0
+
+@dataclass
+class EvictionStats:
+    objects: int = 0
+    bytes: int = 0
+    remaining: int = 0
+
+def now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def object_path(root: Path, digest: str, compression: str) -> Path:
+    """Objects fan out by the first two hex digits so no directory grows too large"""
+    suffix = ".gz" if compression == "gzip" else ""
+    return root / STORE_DIR / "objects" / digest[:2] / f"{digest}{suffix}"
+
+def compression_for(path: Path) -> str:
+    return "none" if path.suffix.lower() in COMPRESSED_SUFFIXES else "gzip"
+
+def _write_object(source: Path, target: Path, compression: str) -> int:
+    """Write an object atomically and read-only (exports hard-link it); returns its stored size"""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as out, open(source, "rb") as src:
+            if compression == "gzip":
+                with gzip.GzipFile(fileobj=out, mode="wb", compresslevel=6, mtime=0) as gz:
+                    shutil.copyfileobj(src, gz, CHUNK_SIZE)
+            else:
+                shutil.copyfileobj(src, out, CHUNK_SIZE)
+        os.chmod(tmp, 0o444)
+        os.replace(tmp, target)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return target.stat().st_size
+
+def store_artifacts(conn: sqlite3.Connection, root: Path, attachments: Iterable[Attachment], env: str,
+                    commit: str, base: Optional[Path] = None) -> StoreStats:
+    """Add each attachment's file to the store once per distinct content and link it to its test"""
+    stats = StoreStats()
+    recorded_at = now()
+    for attachment in attachments:
+        path = attachment.path if attachment.path.is_absolute() else (base or root) / attachment.path
+        if not path.is_file():
+            stats.missing += 1
+            continue
+        stats.files += 1
+        size = path.stat().st_size
+        stats.bytes_in += size
+        digest = file_digest(path)
+        with conn:
+            row = conn.execute("SELECT compression FROM artifacts WHERE digest = ?", (digest,)).fetchone()
+            stored = row is not None and object_path(root, digest, row[0]).exists()
+            if not stored:
+                compression = compression_for(path)
+                stored_size = _write_object(path, object_path(root, digest, compression), compression)
+                conn.execute(
+                    "INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (digest, size, stored_size, compression, attachment.content_type, recorded_at, recorded_at),
+                )
+                stats.new_objects += 1
+                stats.bytes_added += stored_size
+            else:
+                conn.execute("UPDATE artifacts SET last_used = ? WHERE digest = ?", (recorded_at, digest))
+            conn.execute(
+                "INSERT OR IGNORE INTO artifact_links VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (digest, attachment.suite, env, commit, attachment.test_id, attachment.project,
+                 attachment.retry, attachment.name, path.name, recorded_at),
+            )
+    return stats
+
+def store_size(conn: sqlite3.Connection) -> int:
+    return conn.execute("SELECT COALESCE(SUM(stored_size), 0) FROM artifacts").fetchone()[0]
+
+def evict(conn: sqlite3.Connection, root: Path, max_bytes: int) -> EvictionStats:
+    """Drop least recently used objects, and their links, until the store fits in ``max_bytes``"""
+    stats = EvictionStats()
+    total = store_size(conn)
+    if total <= max_bytes:
+        stats.remaining = total
+        return stats
+    rows = conn.execute(
+        "SELECT digest, stored_size, compression FROM artifacts ORDER BY last_used, created_at"
+    ).fetchall()
+    with conn:
+        for digest, stored_size, compression in rows:
+            if total <= max_bytes:
+                break
+            object_path(root, digest, compression).unlink(missing_ok=True)
+            conn.execute("DELETE FROM artifact_links WHERE digest = ?", (digest,))
+            conn.execute("DELETE FROM artifacts WHERE digest = ?", (digest,))
+            total -= stored_size
+            stats.objects += 1
+            stats.bytes += stored_size
+    stats.remaining = total
+    return stats
+
+def select_links(conn: sqlite3.Connection, suite: Optional[str] = None, env: Optional[str] = None,
+                 commit: Optional[str] = None, test: Optional[str] = None) -> List[sqlite3.Row]:
+    conn.row_factory = sqlite3.Row
+    return conn.execute(
+        """
+        SELECT artifact_links.*, artifacts.compression, artifacts.size, artifacts.content_type
+        FROM artifact_links JOIN artifacts ON artifacts.digest = artifact_links.digest
+        WHERE (:suite IS NULL OR suite = :suite)
+          AND (:env IS NULL OR env = :env)
+          AND (:commit IS NULL OR commit_sha = :commit)
+          AND (:test IS NULL OR instr(test_id, :test) > 0)
+        ORDER BY suite, env, test_id, project, retry, name
+        """,
+        {"suite": suite, "env": env, "commit": commit, "test": test},
+    ).fetchall()
+
+def _safe(part: str) -> str:
+    return re.sub(r"[^\w.\-]+", "_", part).strip("_") or "_"
+
+def _place(source: Path, target: Path, compression: str, stats: ExportStats):
+    """Hard-link a raw object into place, or copy it when linking is impossible or it is compressed"""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.unlink(missing_ok=True)
+    if compression == "gzip":
+        with gzip.open(source, "rb") as src, open(target, "wb") as out:
+            shutil.copyfileobj(src, out, CHUNK_SIZE)
+        stats.copied += 1
+    else:
+        try:
+            os.link(source, target)
+            stats.linked += 1
+        except OSError:
+            # Another filesystem, or links not permitted
+            shutil.copyfile(source, target)
+            stats.copied += 1
+    stats.bytes += target.stat().st_size
+
+def export_artifacts(conn: sqlite3.Connection, root: Path, dest: Path, links: List[sqlite3.Row],
+                     layout: str = "tests") -> ExportStats:
+    """Lay out stored artifacts under ``dest`` for upload.
+
+    "tests" mirrors suite/env/test/attempt so the files can be browsed directly; "objects" writes
+    each distinct file once plus an index.json mapping tests to them, so duplicates upload once.
+    """
+    stats = ExportStats()
+    placed = set()
+    index = []
+    for link in links:
+        source = object_path(root, link["digest"], link["compression"])
+        if not source.exists():
+            continue
+        suffix = Path(link["file_name"]).suffix
+        if layout == "objects":
+            relative = Path("objects") / f"{link['digest']}{suffix}"
+            index.append({**{key: link[key] for key in ("suite", "env", "commit_sha", "test_id", "project",
+                                                     "retry", "name", "digest", "content_type")},
+                          "file": relative.as_posix()})
+        else:
+            attempt = f"{_safe(link['project']) + '-' if link['project'] else ''}retry{link['retry']}"
+            relative = (Path(_safe(link["suite"])) / _safe(link["env"]) / _safe(link["test_id"]) / attempt
+                        / f"{_safe(link['name'])}{suffix}")
+        if relative in placed:
+            continue
+        placed.add(relative)
+        _place(source, dest / relative, link["compression"], stats)
+    if layout == "objects":
+        dest.mkdir(parents=True, exist_ok=True)
+        (dest / "index.json").write_text(json.dumps(index, indent=2), encoding="utf-8")
+    return stats
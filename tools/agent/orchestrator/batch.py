@@ -0,0 +1,178 @@
+"""
+Batch Runs
+Scaffolds and generates tests for many solutions in one process, so templates compile once and
+identical specs parse once, with a timing and outcome report per solution
+"""
+
+import glob
+import io
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+REPORT_DIR = Path(".agent") / "batch"
+
+@dataclass
+class BatchResult:
+    spec: str
+    name: str = ""
+    ok: bool = False
+    seconds: float = 0.0
+    steps: Dict[str, float] = field(default_factory=dict)
+    error: str = ""
+    log: str = ""
+
+    @property
+    def headline(self) -> str:
+        """First line of the error; the full text is in the report and the log"""
+        return self.error.splitlines()[0] if self.error else ""
+
+def expand_specs(patterns: Iterable[str], base: Path) -> List[Path]:
+    """solution.yaml paths from paths or globs (``**`` allowed), relative to ``base``, in order"""
+    specs: Dict[Path, None] = {}
+    for pattern in patterns:
+        pattern = os.path.expanduser(pattern.strip())
+        if not pattern or pattern.startswith("#"):
+            continue
+        full = pattern if os.path.isabs(pattern) else str(base / pattern)
+        matches = sorted(glob.glob(full, recursive=True)) if glob.has_magic(full) else [full]
+        for match in matches:
+            path = Path(match)
+            if path.is_dir():
+                path = path / "solution.yaml"
+            specs.setdefault(path.resolve(), None)
+    return list(specs)
+
+def default_parallelism(solutions: int) -> int:
+    return max(1, min(solutions, os.cpu_count() or 2, 8))
+
+class ThreadOutput(io.TextIOBase):
+    """sys.stdout/stderr stand-in that sends each batch worker's output to that worker's log"""
+
+    def __init__(self, fallback):
+        self.fallback = fallback
+        self._local = threading.local()
+
+    @property
+    def encoding(self) -> str:
+        return "utf-8"
+
+    def writable(self) -> bool:
+        return True
+
+    def target(self):
+        return getattr(self._local, "target", None) or self.fallback
+
+    def route(self, target):
+        self._local.target = target
+
+    def write(self, text: str) -> int:
+        return self.target().write(text)
+
+    def flush(self):
+        self.target().flush()
+
+    def isatty(self) -> bool:
+        return False
+
+@contextmanager
+def routed_output():
+    """Install per-thread stdout/stderr routing for the duration of a batch"""
+    out, err = ThreadOutput(sys.stdout), ThreadOutput(sys.stderr)
+    sys.stdout, sys.stderr = out, err
+    try:
+        yield out, err
+    finally:
+        sys.stdout, sys.stderr = out.fallback, err.fallback
+
+def run_batch(specs: List[Path], prepare: Callable[[Path], Tuple[str, dict]],
+              steps: List[Tuple[str, Callable[[Path, dict], None]]], max_parallel: int, log_dir: Path,
+              on_result: Optional[Callable[[BatchResult], None]] = None) -> List[BatchResult]:
+    """Run every step for each solution, at most ``max_parallel`` solutions at a time, in input order.
+
+    ``prepare`` loads a spec into (name, solution) and runs first, sequentially; the steps then
+    run on worker threads with output captured into one log file per solution.
+    """
+    prepared: Dict[Path, Tuple[str, dict]] = {}
+    results: Dict[Path, BatchResult] = {}
+    for spec in specs:
+        try:
+            prepared[spec] = prepare(spec)
+        except Exception as e:
+            results[spec] = BatchResult(str(spec), error=f"{type(e).__name__}: {e}")
+            if on_result:
+                on_result(results[spec])
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    def run(position: int, spec: Path, out: ThreadOutput, err: ThreadOutput) -> BatchResult:
+        name, sol = prepared[spec]
+        log = log_dir / f"{position:03d}-{_safe(name)}.log"
+        result = BatchResult(str(spec), name, log=str(log))
+        started = time.perf_counter()
+        with open(log, "w", encoding="utf-8") as f:
+            out.route(f)
+            err.route(f)
+            try:
+                for step, func in steps:
+                    step_started = time.perf_counter()
+                    func(spec.parent, sol)
+                    result.steps[step] = round(time.perf_counter() - step_started, 3)
+                result.ok = True
+            except (Exception, SystemExit) as e:
+                # typer.Exit and sys.exit too: one solution must not end the batch
+                traceback.print_exc()
+                result.error = f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+            finally:
+                out.route(None)
+                err.route(None)
+        result.seconds = round(time.perf_counter() - started, 3)
+        if on_result:
+            on_result(result)
+        return result
+
+    with routed_output() as (out, err):
+        with ThreadPoolExecutor(max_workers=max(1, max_parallel)) as pool:
+            futures = {spec: pool.submit(run, position, spec, out, err)
+                       for position, spec in enumerate(specs) if spec in prepared}
+            for spec, future in futures.items():
+                results[spec] = future.result()
+    return [results[spec] for spec in specs]
+
+def _safe(name: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in name) or "solution"
+
+def format_batch(results: List[BatchResult], step_names: List[str]) -> str:
+    """One row per solution: outcome, total and per-step seconds"""
+    width = max([len("Solution")] + [len(r.name or r.spec) for r in results])
+    lines = [f"{'Solution':<{width}}  {'Result':<6}  {'Total':>7}" + "".join(f"  {s:>14}" for s in step_names)]
+    for r in results:
+        steps = "".join(f"  {r.steps[s]:>13.2f}s" if s in r.steps else f"  {'-':>14}" for s in step_names)
+        lines.append(f"{r.name or r.spec:<{width}}  {'ok' if r.ok else 'FAIL':<6}  {r.seconds:>6.2f}s{steps}")
+    for r in results:
+        if r.error:
+            lines.append(f"  {r.name or r.spec}: {r.headline}" + (f" (log: {r.log})" if r.log else ""))
+    return "\n".join(lines)
+
+def write_batch_report(root: Path, results: List[BatchResult], seconds: float, parallel: int,
+                       cache: dict) -> Path:
+    path = root / REPORT_DIR / "report.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "seconds": round(seconds, 3),
+        "parallel": parallel,
+        "ok": sum(r.ok for r in results),
+        "failed": sum(not r.ok for r in results),
+        "cache": cache,
+        "solutions": [asdict(r) for r in results],
+    }, indent=2), encoding="utf-8")
+    return path
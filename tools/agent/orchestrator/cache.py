@@ -0,0 +1,88 @@
+"""
+Warm Caches
+Parsed input files reused until they change on disk, so a long-lived agent process parses each
+spec once instead of once per command, and identical files in different repos are parsed once
+"""
+
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Tuple
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    shared: int = 0
+    misses: int = 0
+
+def file_stamp(path: Path) -> Tuple[int, int, int]:
+    """Changes whenever the file is rewritten or atomically replaced"""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+def content_digest(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+class FileCache:
+    """(path, kind) -> value derived from the file, revalidated with one stat per lookup.
+
+    Values are also indexed by content digest, so the same spec copied into several repos is
+    parsed once; concurrent lookups of one file wait for a single load instead of repeating it.
+    """
+
+    def __init__(self):
+        # (path, kind) -> (stamp, content key, value)
+        self._entries: Dict[Tuple[str, str], Tuple[Tuple[int, int, int], Tuple[str, str], Any]] = {}
+        self._by_content: Dict[Tuple[str, str], Any] = {}
+        self._loading: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.stats = CacheStats()
+
+    def get(self, path: Path, kind: str, loader: Callable[[Path], Any]) -> Any:
+        """``loader(path)``, reused while the file is unchanged; callers must not mutate the result"""
+        stamp = file_stamp(path)
+        key = (os.path.abspath(path), kind)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == stamp:
+            with self._lock:
+                self.stats.hits += 1
+            return entry[2]
+        content_key = (content_digest(path), kind)
+        with self._lock:
+            loading = self._loading.setdefault(content_key, threading.Lock())
+        with loading:
+            if content_key in self._by_content:
+                value = self._by_content[content_key]
+                with self._lock:
+                    self.stats.shared += 1
+            else:
+                value = loader(path)
+                with self._lock:
+                    self.stats.misses += 1
+                    self._by_content[content_key] = value
+        with self._lock:
+            previous = self._entries.get(key)
+            self._entries[key] = (stamp, content_key, value)
+            if previous is not None and previous[1] != content_key:
+                self._release(previous[1])
+        return value
+
+    def _release(self, content_key: Tuple[str, str]):
+        """Forget an edited file's old content once no path refers to it"""
+        if not any(entry[1] == content_key for entry in self._entries.values()):
+            self._by_content.pop(content_key, None)
+            self._loading.pop(content_key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_content.clear()
+            self._loading.clear()
+
+FILES = FileCache()
@@ -0,0 +1,352 @@
+"""
+OpenAPI Coverage Index
+Which spec operations and response codes the Java, TypeScript and pytest tests exercise, from an
+inverted index of METHOD path -> tests that is cached per file by content hash
+"""
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import yaml
+
+CACHE_FILE = Path(".agent") / "coverage.json"
+
+CACHE_VERSION = 1
+
+# Directories holding test sources, relative to the repository root
+SOURCE_DIRS = ("api", "ui", "backend")
+
+HTTP_METHODS = ("get", "post", "put", "patch", "delete", "head", "options")
+
+# Build output, reports and dependencies; hidden directories are skipped as well
+SKIPPED_DIRS = {"node_modules", "target", "build", "dist", "venv", "__pycache__", "test-results",
+                "playwright-report", "allure-results"}
+
+# --- Test units: one per test function, with the text that belongs to it --------------------
+
+JAVA_TEST = re.compile(r"@(?:Test|ParameterizedTest|TestFactory|RepeatedTest)\b")
+JAVA_METHOD = re.compile(r"\b(\w+)\s*\([^)]*\)\s*(?:throws [\w.,\s]+)?\{")
+JAVA_CLASS = re.compile(r"\bclass\s+(\w+)")
+TS_TEST = re.compile(r"\b(?:test|it)(?:\.(?:only|skip|fixme|fail|slow))?\(\s*([`'\"])(.*?)\1", re.S)
+PY_TEST = re.compile(r"^(\s*)(?:async\s+)?def\s+(test\w*)\s*\(|^class\s+(\w+)", re.M)
+
+# --- References inside a unit ---------------------------------------------------------------
+
+# String literal that looks like a URL path, optionally behind a base URL placeholder
+_PATH = r"(?:\$\{[^}]+\}|\{[^}]+\}|https?://[^/'\"`]+)?/[^'\"`]*"
+CALL = re.compile(r"\.(get|post|put|patch|delete|head|options)\(\s*f?([`'\"])(" + _PATH + r")\2")
+REQUEST_CALL = re.compile(r"\.(?:request|fetch)\(\s*(?:Method\.)?[\"']?(GET|POST|PUT|PATCH|DELETE|HEAD|OPTIONS)"
+                          r"[\"']?\s*,\s*f?([`'\"])(" + _PATH + r")\2", re.I)
+TS_FETCH = re.compile(r"\.fetch\(\s*([`'\"])(" + _PATH + r")\1[^)]*?method:\s*['\"](\w+)['\"]", re.S)
+OPERATION_REF = re.compile(r"(?:@(?:Story|Feature|Tag)\(\s*|operation_?[iI]d\s*[=:]\s*)[\"']([\w.-]+)[\"']")
+
+JAVA_STATUS = re.compile(r"statusCode\(")
+TS_STATUS = re.compile(r"status\(\)\s*\)\s*\.\s*(?:not\.)?to(?:Be|Equal|StrictEqual)\(\s*(\d{3})"
+                       r"|\[([\d,\s]+)\]\s*\)\s*\.\s*toContain\(\s*\w+\.status\(\)")
+TS_OK = re.compile(r"\)\s*\.\s*toBeOK\(\)")
+PY_STATUS = re.compile(r"status(?:_code)?\s*(?:==|!=)\s*(\d{3})|status(?:_code)?\s+in\s+[\[({]([\d,\s]+)[\])}]"
+                       r"|(\d{3})\s*==\s*\w+\.status(?:_code)?\b")
+CODE = re.compile(r"\b([1-5]\d\d)\b")
+
+def _balanced(text: str, start: int) -> str:
+    """Text of the call whose opening parenthesis is just before ``start``"""
+    depth = 1
+    for i in range(start, min(len(text), start + 500)):
+        if text[i] == "(":
+            depth += 1
+        elif text[i] == ")":
+            depth -= 1
+            if depth == 0:
+                return text[start:i]
+    return text[start:start + 500]
+
+def _statuses(text: str, language: str) -> Set[str]:
+    codes: Set[str] = set()
+    if language == "java":
+        for match in JAVA_STATUS.finditer(text):
+            codes.update(CODE.findall(_balanced(text, match.end())))
+    elif language == "ts":
+        for single, many in TS_STATUS.findall(text):
+            codes.update([single] if single else CODE.findall(many))
+        if TS_OK.search(text):
+            codes.add("2XX")
+    else:
+        for single, many, reversed_ in PY_STATUS.findall(text):
+            codes.update([single or reversed_] if single or reversed_ else CODE.findall(many))
+    return codes
+
+def normalize_path(raw: str) -> str:
+    """Path part of a URL literal, without base URL, query or fragment; placeholders become {}"""
+    path = re.sub(r"^(?:\$\{[^}]+\}|\{[^}]+\}|https?://[^/]+)", "", raw)
+    path = re.split(r"[?#]", path, 1)[0]
+    path = re.sub(r"\$\{[^}]*\}|\{[^}]*\}", "{}", path)
+    return path.rstrip("/") or "/"
+
+def _calls(text: str) -> List[Tuple[str, str]]:
+    calls = [(m.group(1).upper(), normalize_path(m.group(3))) for m in CALL.finditer(text)]
+    calls += [(m.group(1).upper(), normalize_path(m.group(3))) for m in REQUEST_CALL.finditer(text)]
+    calls += [(m.group(3).upper(), normalize_path(m.group(2))) for m in TS_FETCH.finditer(text)]
+    return sorted(set(calls))
+
+def _units(text: str, language: str, rel: str) -> Iterator[Tuple[str, int, str]]:
+    """(test id, line, text) for each test in a source file"""
+    if language == "java":
+        owner = JAVA_CLASS.search(text)
+        owner_name = owner.group(1) if owner else Path(rel).stem
+        starts = [m.start() for m in JAVA_TEST.finditer(text)]
+        for start, end in zip(starts, starts[1:] + [len(text)]):
+            method = JAVA_METHOD.search(text, start, end)
+            name = method.group(1) if method else f"line{text.count(chr(10), 0, start) + 1}"
+            yield f"{owner_name}#{name}", text.count("\n", 0, start) + 1, text[start:end]
+    elif language == "ts":
+        matches = list(TS_TEST.finditer(text))
+        for match, following in zip(matches, matches[1:] + [None]):
+            end = following.start() if following else len(text)
+            yield f"{rel} > {match.group(2)}", text.count("\n", 0, match.start()) + 1, text[match.start():end]
+    else:
+        matches = list(PY_TEST.finditer(text))
+        owner = None
+        for match, following in zip(matches, matches[1:] + [None]):
+            if match.group(3):
+                owner = match.group(3)
+                continue
+            if not match.group(1):
+                owner = None
+            end = following.start() if following else len(text)
+            test_id = "::".join(filter(None, [rel, owner, match.group(2)]))
+            yield test_id, text.count("\n", 0, match.start()) + 1, text[match.start():end]
+
+def language_of(path: str) -> Optional[str]:
+    name = os.path.basename(path)
+    if name.endswith(".java"):
+        return "java"
+    if name.endswith(".ts") and not name.endswith(".d.ts"):
+        return "ts"
+    if name.endswith(".py") and (name.startswith("test_") or name.endswith("_test.py")):
+        return "py"
+    return None
+
+def scan_source(text: str, language: str, rel: str) -> List[dict]:
+    """Spec-independent references of every test in one file; this is what the cache stores"""
+    tests = []
+    for test_id, line, body in _units(text, language, rel):
+        calls = _calls(body)
+        operations = sorted(set(OPERATION_REF.findall(body)))
+        if calls or operations:
+            tests.append({"id": test_id, "line": line, "calls": calls, "operations": operations,
+                          "statuses": sorted(_statuses(body, language))})
+    return tests
+
+def source_files(root: Path, dirs=SOURCE_DIRS) -> Iterator[Tuple[str, os.stat_result]]:
+    """(path relative to root, stat) of every candidate test source"""
+    stack = [root / d for d in dirs if (root / d).is_dir()]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIPPED_DIRS and not entry.name.startswith("."):
+                        stack.append(Path(entry.path))
+                elif language_of(entry.name):
+                    yield os.path.relpath(entry.path, root).replace(os.sep, "/"), entry.stat()
+
+# --- Spec side --------------------------------------------------------------------------------
+
+@dataclass(eq=False)
+class Operation:
+    operation_id: str
+    method: str
+    path: str
+    responses: List[str]
+    tests: Dict[str, Set[str]] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        return f"{self.method} {self.path}"
+
+    @property
+    def covered_responses(self) -> List[str]:
+        """Declared responses some test asserts; 2XX-style ranges and default match any fitting code"""
+        asserted = set().union(*self.tests.values()) if self.tests else set()
+        covered = []
+        for code in self.responses:
+            if code in asserted:
+                covered.append(code)
+            elif code.upper().endswith("XX") and any(a[0] == code[0] for a in asserted):
+                covered.append(code)
+            elif code == "default" and asserted - set(self.responses):
+                covered.append(code)
+            elif code.startswith("2") and "2XX" in asserted:
+                covered.append(code)
+        return covered
+
+def spec_operations(spec: dict) -> List[list]:
+    ops = []
+    for path, item in (spec.get("paths") or {}).items():
+        for method, operation in (item or {}).items():
+            if method.lower() in HTTP_METHODS and isinstance(operation, dict):
+                op_id = operation.get("operationId") or f"{method.lower()} {path}"
+                ops.append([op_id, method.upper(), path, [str(c) for c in (operation.get("responses") or {})]])
+    return ops
+
+def _segments(path: str) -> Tuple[str, ...]:
+    return tuple(re.sub(r"\{[^}]*\}", "{}", path).strip("/").split("/")) if path.strip("/") else ()
+
+class OperationMatcher:
+    """METHOD + concrete or templated path -> spec operation, literal segments winning over parameters"""
+
+    def __init__(self, operations: List[Operation]):
+        self._by_shape: Dict[Tuple[str, int], List[Tuple[int, Tuple[str, ...], Operation]]] = {}
+        for op in operations:
+            segments = _segments(op.path)
+            literal = sum(s != "{}" for s in segments)
+            self._by_shape.setdefault((op.method, len(segments)), []).append((literal, segments, op))
+        for candidates in self._by_shape.values():
+            candidates.sort(key=lambda c: -c[0])
+
+    def match(self, method: str, path: str) -> Optional[Operation]:
+        segments = _segments(path)
+        for _, template, op in self._by_shape.get((method, len(segments)), []):
+            if all(t == s or (t == "{}" and s) for t, s in zip(template, segments)):
+                return op
+        return None
+
+# --- Index and cache --------------------------------------------------------------------------
+
+@dataclass
+class CoverageReport:
+    spec: str
+    operations: List[Operation]
+    undocumented: Dict[str, Set[str]]
+    files: int
+    parsed: int
+
+    @property
+    def covered(self) -> List[Operation]:
+        return [op for op in self.operations if op.tests]
+
+    @property
+    def responses(self) -> Tuple[int, int]:
+        return (sum(len(op.covered_responses) for op in self.operations),
+                sum(len(op.responses) for op in self.operations))
+
+    def to_dict(self) -> dict:
+        return {
+            "spec": self.spec,
+            "operations": [{
+                "operation_id": op.operation_id, "method": op.method, "path": op.path,
+                "responses": op.responses, "covered_responses": op.covered_responses,
+                "tests": {test: sorted(codes) for test, codes in sorted(op.tests.items())},
+            } for op in self.operations],
+            "undocumented": {key: sorted(tests) for key, tests in sorted(self.undocumented.items())},
+        }
+
+def _digest(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+def _load_cache(path: Path) -> dict:
+    try:
+        cache = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return cache if cache.get("version") == CACHE_VERSION else {}
+
+def _cached(entry: Optional[dict], path: Path, stat: os.stat_result) -> Tuple[Optional[dict], bool]:
+    """(entry, changed): reuse on an unchanged stat, or on unchanged content after a touch"""
+    stamp = [stat.st_mtime_ns, stat.st_size]
+    if entry and entry["stamp"] == stamp:
+        return entry, False
+    digest = _digest(path)
+    if entry and entry["sha1"] == digest:
+        return dict(entry, stamp=stamp), True
+    return {"stamp": stamp, "sha1": digest}, True
+
+def build_coverage(root: Path, openapi_path: Path, cache_path: Optional[Path] = None) -> CoverageReport:
+    """Index the test sources against the spec, re-reading only files whose content changed"""
+    cache_path = cache_path or root / CACHE_FILE
+    cache = _load_cache(cache_path)
+    dirty = not cache
+
+    spec_entry, changed = _cached(cache.get("spec"), openapi_path, os.stat(openapi_path))
+    if "operations" not in spec_entry:
+        spec_entry["operations"] = spec_operations(yaml.safe_load(openapi_path.read_text(encoding="utf-8")) or {})
+    dirty |= changed
+
+    files: Dict[str, dict] = {}
+    parsed = 0
+    old_files = cache.get("files", {})
+    for rel, stat in source_files(root):
+        entry, changed = _cached(old_files.get(rel), root / rel, stat)
+        if "tests" not in entry:
+            text = (root / rel).read_text(encoding="utf-8", errors="replace")
+            entry["tests"] = scan_source(text, language_of(rel), rel)
+            parsed += 1
+        files[rel] = entry
+        dirty |= changed
+    dirty |= files.keys() != old_files.keys()
+
+    if dirty:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"version": CACHE_VERSION, "spec": spec_entry, "files": files}),
+                       encoding="utf-8")
+        os.replace(tmp, cache_path)
+
+    operations = [Operation(*op) for op in spec_entry["operations"]]
+    by_id = {op.operation_id: op for op in operations}
+    matcher = OperationMatcher(operations)
+    undocumented: Dict[str, Set[str]] = {}
+    for entry in files.values():
+        for test in entry["tests"]:
+            statuses = set(test["statuses"])
+            hits = {by_id[op_id] for op_id in test["operations"] if op_id in by_id}
+            for method, path in test["calls"]:
+                op = matcher.match(method, path)
+                if op is None:
+                    undocumented.setdefault(f"{method} {path}", set()).add(test["id"])
+                else:
+                    hits.add(op)
+            # Asserted codes are credited to every operation the test calls
+            for op in hits:
+                op.tests.setdefault(test["id"], set()).update(statuses)
+    spec_name = os.path.relpath(openapi_path, root).replace(os.sep, "/")
+    return CoverageReport(spec_name, operations, undocumented, len(files), parsed)
+
+def format_coverage(report: CoverageReport, show_tests: bool = False) -> str:
+    covered_responses, total_responses = report.responses
+    total = len(report.operations)
+    lines = [
+        f"Operations: {len(report.covered)}/{total} covered ({100 * len(report.covered) / max(total, 1):.0f}%)",
+        f"Responses:  {covered_responses}/{total_responses} covered "
+        f"({100 * covered_responses / max(total_responses, 1):.0f}%)",
+    ]
+    uncovered = [op for op in report.operations if not op.tests]
+    if uncovered:
+        lines.append("")
+        lines.append(f"Uncovered operations ({len(uncovered)}):")
+        lines += [f"  {op.key} ({op.operation_id})" for op in uncovered]
+    partial = [(op, [c for c in op.responses if c not in op.covered_responses])
+               for op in report.operations if op.tests]
+    partial = [(op, missing) for op, missing in partial if missing]
+    if partial:
+        lines.append("")
+        lines.append(f"Uncovered responses ({sum(len(m) for _, m in partial)}):")
+        lines += [f"  {op.key} ({op.operation_id}): {', '.join(missing)}" for op, missing in partial]
+    if show_tests:
+        lines.append("")
+        lines.append("Tests per operation:")
+        for op in report.covered:
+            lines.append(f"  {op.key} ({op.operation_id})")
+            lines += [f"    {test} [{', '.join(sorted(codes)) or 'no status asserted'}]"
+                      for test, codes in sorted(op.tests.items())]
+    if report.undocumented:
+        lines.append("")
+        lines.append(f"Calls to endpoints not in the spec ({len(report.undocumented)}):")
+        for key, tests in sorted(report.undocumented.items()):
+            lines.append(f"  {key}: {', '.join(sorted(tests)[:3])}{' ...' if len(tests) > 3 else ''}")
+    return "\n".join(lines)
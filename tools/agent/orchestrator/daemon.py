@@ -0,0 +1,249 @@
+"""
+Agent Daemon
+A long-lived agent process on a local Unix socket that keeps solution plans, parsed specs and
+compiled templates warm; main.py hands scaffold/generate-tests/plan to it when it is running.
+
+Only the standard library is imported here: the client side runs before main.py's own imports.
+"""
+
+import io
+import json
+import os
+import signal
+import socket
+import struct
+import sys
+import time
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from orchestrator.cache import FILES, file_stamp
+
+SOCKET_FILE = Path(".agent") / "agent.sock"
+
+# Commands the CLI forwards; everything else (runners, benchmarks, fuzzing) stays in-process
+ROUTED_COMMANDS = {"scaffold", "generate-tests", "plan"}
+
+# Set to any value to always run locally
+DISABLE_ENV = "AGENT_NO_DAEMON"
+
+DEFAULT_IDLE_TIMEOUT = 3600.0
+
+CONNECT_TIMEOUT = 0.5
+
+# Response frames: one channel byte, a 4-byte big-endian length, then the payload
+FRAME_HEADER = struct.Struct(">cI")
+STDOUT, STDERR, EXIT, STALE, REPLY = b"o", b"e", b"x", b"s", b"j"
+
+def socket_path(root: Path) -> Path:
+    return root / SOCKET_FILE
+
+def available() -> bool:
+    return hasattr(socket, "AF_UNIX") and not os.environ.get(DISABLE_ENV)
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            return None
+        data += chunk
+    return bytes(data)
+
+def _frames(sock: socket.socket) -> Iterator[Tuple[bytes, bytes]]:
+    while True:
+        header = _recv_exact(sock, FRAME_HEADER.size)
+        if header is None:
+            return
+        channel, size = FRAME_HEADER.unpack(header)
+        payload = _recv_exact(sock, size)
+        if payload is None:
+            return
+        yield channel, payload
+
+def _send_frame(sock: socket.socket, channel: bytes, payload: bytes):
+    sock.sendall(FRAME_HEADER.pack(channel, len(payload)) + payload)
+
+def _connect(root: Path) -> Optional[socket.socket]:
+    path = socket_path(root)
+    if not available() or not path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(CONNECT_TIMEOUT)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    sock.settimeout(None)
+    return sock
+
+def request(root: Path, message: dict) -> Optional[dict]:
+    """Send a control message (status, stop) and return the reply, or None if no daemon answers"""
+    sock = _connect(root)
+    if sock is None:
+        return None
+    with sock:
+        sock.sendall(json.dumps(message).encode("utf-8") + b"\n")
+        for channel, payload in _frames(sock):
+            if channel == REPLY:
+                return json.loads(payload)
+    return None
+
+def forward(argv: List[str], root: Path) -> Optional[int]:
+    """Run a routable command on the daemon, streaming its output; None means run it locally"""
+    if not argv or argv[0] not in ROUTED_COMMANDS:
+        return None
+    sock = _connect(root)
+    if sock is None:
+        return None
+    with sock:
+        try:
+            sock.sendall(json.dumps({"op": "run", "argv": argv}).encode("utf-8") + b"\n")
+            for channel, payload in _frames(sock):
+                if channel == STDOUT:
+                    sys.stdout.buffer.write(payload)
+                    sys.stdout.flush()
+                elif channel == STDERR:
+                    sys.stderr.buffer.write(payload)
+                    sys.stderr.flush()
+                elif channel == EXIT:
+                    return int(payload)
+                elif channel == STALE:
+                    # The daemon runs older agent code and is shutting down; nothing has run yet
+                    return None
+        except OSError as e:
+            sys.stderr.write(f"Agent daemon connection failed: {e}\n")
+            return 1
+    sys.stderr.write("Agent daemon closed the connection before the command finished\n")
+    return 1
+
+class _FrameWriter(io.RawIOBase):
+    """Raw stream sending each write to the client as one frame on ``channel``"""
+
+    def __init__(self, sock: socket.socket, channel: bytes):
+        self.sock = sock
+        self.channel = channel
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        if data:
+            _send_frame(self.sock, self.channel, bytes(data))
+        return len(data)
+
+def _text_stream(sock: socket.socket, channel: bytes) -> io.TextIOWrapper:
+    return io.TextIOWrapper(io.BufferedWriter(_FrameWriter(sock, channel)), encoding="utf-8",
+                            line_buffering=True)
+
+class AgentDaemon:
+    """Serves one request at a time: commands share stdout redirection and write to the same tree"""
+
+    def __init__(self, root: Path, run: Callable[[List[str]], int],
+                 status: Optional[Callable[[], Dict]] = None, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.root = root
+        self.run = run
+        self.status = status
+        self.idle_timeout = idle_timeout
+        self.agent_dir = Path(__file__).resolve().parents[1]
+        self.started = time.time()
+        self.requests = 0
+        self.stopping = False
+        self._sources: Dict[str, Tuple[int, int, int]] = {}
+
+    def stale_sources(self) -> List[str]:
+        """Agent modules changed on disk since this process imported them"""
+        changed = []
+        for module in list(sys.modules.values()):
+            path = getattr(module, "__file__", None)
+            if not path or not path.startswith(str(self.agent_dir)):
+                continue
+            try:
+                stamp = file_stamp(Path(path))
+            except OSError:
+                continue
+            if self._sources.setdefault(path, stamp) != stamp:
+                changed.append(path)
+        return changed
+
+    def serve(self):
+        path = socket_path(self.root)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if request(self.root, {"op": "status"}) is not None:
+            raise RuntimeError(f"An agent daemon is already listening on {path}")
+        path.unlink(missing_ok=True)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # SIGTERM unwinds through the finally below so the socket file is removed
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        try:
+            server.bind(str(path))
+            os.chmod(path, 0o600)
+            server.listen(16)
+            server.settimeout(self.idle_timeout or None)
+            self.stale_sources()
+            while not self.stopping:
+                try:
+                    conn, _ = server.accept()
+                except socket.timeout:
+                    break
+                with conn:
+                    try:
+                        self.handle(conn)
+                    except OSError:
+                        # Client went away mid-request
+                        pass
+        finally:
+            server.close()
+            path.unlink(missing_ok=True)
+
+    def handle(self, conn: socket.socket):
+        line = b""
+        while not line.endswith(b"\n"):
+            chunk = conn.recv(65536)
+            if not chunk:
+                return
+            line += chunk
+        message = json.loads(line)
+        op = message.get("op")
+        if op == "status":
+            _send_frame(conn, REPLY, json.dumps(self.describe()).encode("utf-8"))
+        elif op == "stop":
+            self.stopping = True
+            _send_frame(conn, REPLY, json.dumps({"stopping": True}).encode("utf-8"))
+        elif op == "run":
+            if self.stale_sources():
+                self.stopping = True
+                _send_frame(conn, STALE, b"")
+                return
+            self.requests += 1
+            _send_frame(conn, EXIT, str(self.execute(conn, message["argv"])).encode("ascii"))
+
+    def execute(self, conn: socket.socket, argv: List[str]) -> int:
+        out, err = _text_stream(conn, STDOUT), _text_stream(conn, STDERR)
+        try:
+            with redirect_stdout(out), redirect_stderr(err):
+                try:
+                    return self.run(argv)
+                except Exception:
+                    traceback.print_exc()
+                    return 1
+        finally:
+            out.flush()
+            err.flush()
+
+    def describe(self) -> dict:
+        info = {
+            "pid": os.getpid(),
+            "uptime_s": round(time.time() - self.started, 1),
+            "requests": self.requests,
+            "cached_files": len(FILES),
+            "cache_hits": FILES.stats.hits,
+            "cache_shared": FILES.stats.shared,
+            "cache_misses": FILES.stats.misses,
+        }
+        if self.status:
+            info.update(self.status())
+        return info
@@ -0,0 +1,147 @@
+"""
+Change-Impact Test Selection
+Maps a git diff of stories, features, specs and tests to the test units it affects
+"""
+
+import subprocess
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+import yaml
+
+from generators.story_to_tests import parse_stories_md
+from generators.traceability import SHARED_KEY, TraceabilityIndex, openapi_fingerprints, story_fingerprints
+from orchestrator.profiling import span
+from orchestrator.suites import Suite
+
+# Changes here can alter every generated test, so they force a full run
+FULL_RUN_PREFIXES = ["solution.yaml", "tools/agent/templates/", "tools/agent/generators/"]
+
+# Build output that may show up as untracked files inside a suite directory
+IGNORED_PARTS = {"test-results", "playwright-report", "target", "node_modules", "allure-results", "__pycache__"}
+
+# Suite that tests generated from each kind of input belong to
+KIND_SUITE = {"stories": "ui", "feature": "ui", "openapi": "api", "postman": "api"}
+
+@dataclass
+class Impact:
+    full: bool = False
+    # (suite, reason); suite is None for changes that affect every suite
+    reasons: List[Tuple[Optional[str], str]] = field(default_factory=list)
+    # suite -> affected units; None means the whole suite
+    units: Dict[str, Optional[Set[str]]] = field(default_factory=dict)
+
+    def whole_suite(self, suite: str, reason: str):
+        self.units[suite] = None
+        self.reasons.append((suite, reason))
+
+    def add(self, suite: str, units: List[str], reason: str):
+        if suite in self.units and self.units[suite] is None:
+            return
+        self.units.setdefault(suite, set()).update(units)
+        self.reasons.append((suite, reason))
+
+    def reasons_for(self, suite: str) -> List[str]:
+        return [reason for owner, reason in self.reasons if owner in (None, suite)]
+
+    def units_for(self, suite: str) -> Optional[List[str]]:
+        """Units to run for a suite: None for all of them, [] for none"""
+        if self.full or (suite in self.units and self.units[suite] is None):
+            return None
+        return sorted(self.units.get(suite, set()))
+
+def git(root: Path, *args: str) -> str:
+    with span(f"git {args[0]}", "subprocess", args=" ".join(args)):
+        result = subprocess.run(["git", *args], cwd=root, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or f"git {' '.join(args)} failed")
+    return result.stdout
+
+def changed_files(root: Path, ref: str) -> List[str]:
+    """Files differing from ``ref`` in the working tree, plus untracked files"""
+    changed = set(git(root, "diff", "--name-only", ref, "--").splitlines())
+    changed |= set(git(root, "ls-files", "--others", "--exclude-standard").splitlines())
+    return sorted(f for f in changed if f)
+
+def file_at(root: Path, ref: str, path: str) -> Optional[str]:
+    """Contents of ``path`` at ``ref``, or None if it did not exist there"""
+    try:
+        return git(root, "show", f"{ref}:{path}")
+    except RuntimeError:
+        return None
+
+def _current(root: Path, path: str) -> Optional[str]:
+    file = root / path
+    return file.read_text(encoding="utf-8") if file.exists() else None
+
+def _changed_keys(old: Dict[str, str], new: Dict[str, str]) -> Set[str]:
+    return {key for key in set(old) | set(new) if old.get(key) != new.get(key)}
+
+def changed_entries(kind: str, old: Optional[str], new: Optional[str]) -> Optional[Set[str]]:
+    """Entries of an indexed input that changed; None when every entry may be affected"""
+    if old is None or new is None or kind == "feature":
+        return None
+    if kind == "stories":
+        return _changed_keys(story_fingerprints(parse_stories_md(old)),
+                             story_fingerprints(parse_stories_md(new)))
+    if kind == "openapi":
+        try:
+            before = openapi_fingerprints(yaml.safe_load(old) or {})
+            after = openapi_fingerprints(yaml.safe_load(new) or {})
+        except yaml.YAMLError:
+            return None
+        if before.pop(SHARED_KEY, None) != after.pop(SHARED_KEY, None):
+            return None
+        return _changed_keys(before, after)
+    return None
+
+def compute_impact(root: Path, ref: str, suites: Dict[str, Suite],
+                   inputs: Optional[Dict[str, str]] = None) -> Impact:
+    """Work out which suites and units a change since ``ref`` affects
+
+    ``inputs`` maps generator input files (stories, OpenAPI specs) to the suite
+    their tests belong to, for inputs the traceability index does not cover yet.
+    """
+    impact = Impact()
+    index = TraceabilityIndex(root)
+    inputs = inputs or {}
+
+    for rel in changed_files(root, ref):
+        if any(rel == p or rel.startswith(p) for p in FULL_RUN_PREFIXES):
+            impact.full = True
+            impact.reasons.append((None, f"{rel} changed: running everything"))
+            return impact
+
+        if rel in index.inputs:
+            recorded = index.inputs[rel]
+            suite = KIND_SUITE.get(recorded["kind"], "ui")
+            entries = changed_entries(recorded["kind"], file_at(root, ref, rel), _current(root, rel))
+            if entries is None:
+                entries = set(recorded["entries"])
+            for entry in sorted(entries):
+                if entry not in recorded["entries"]:
+                    impact.whole_suite(suite, f"{rel}: '{entry}' is not in {index.path.name}; regenerate tests")
+                    continue
+                linked = recorded["entries"][entry]
+                impact.add(linked["suite"], linked["units"], f"{rel}: '{entry}' changed")
+            continue
+
+        if rel in inputs or rel.endswith(".feature"):
+            impact.whole_suite(inputs.get(rel, "ui"), f"{rel} has no traceability entries yet")
+            continue
+
+        path = root / rel
+        if IGNORED_PARTS.intersection(Path(rel).parts):
+            continue
+        for name, suite in suites.items():
+            try:
+                path.relative_to(suite.directory)
+            except ValueError:
+                continue
+            unit = suite.unit_for_path(path)
+            if unit is None:
+                impact.whole_suite(name, f"{rel} is shared by the {name} suite")
+            else:
+                impact.add(name, [unit], f"{rel} changed")
+    return impact
@@ -0,0 +1,211 @@
+"""
+Incremental JSON Reader
+Yields the items of one top-level array, or the leaves of a nested tree of arrays, without
+loading the whole document
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, Optional, Tuple
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+CHUNK_SIZE = 1 << 16
+
+WHITESPACE = " \t\n\r"
+
+DELIMITERS = WHITESPACE + ",:]}"
+
+STRUCTURAL = re.compile(r'["\[\]{}]')
+
+STRING_END = re.compile(r'["\\]')
+
+class _Buffer:
+    """Text window over a file that grows on demand and drops consumed input"""
+
+    def __init__(self, fp: IO[str], chunk_size: int):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        if self.eof:
+            return False
+        # Grow geometrically so re-decoding a large pending value stays linear overall
+        chunk = self.fp.read(max(self.chunk_size, len(self.text) - self.pos))
+        if not chunk:
+            self.eof = True
+            return False
+        self.text = self.text[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of input)"""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected '{char}' in JSON input, got '{self.peek()}'")
+        self.pos += 1
+
+    def value(self, decoder: json.JSONDecoder) -> Any:
+        """Decode the next complete JSON value, reading more input as needed"""
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.text, self.pos)
+                # A value is only complete once a delimiter follows it ("12" may be "12.5")
+                if self.eof or (end < len(self.text) and self.text[end] in DELIMITERS):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+    def skip(self, decoder: json.JSONDecoder):
+        """Move past the next JSON value without building it"""
+        char = self.peek()
+        if char == '"':
+            self._skip_string()
+            return
+        if char not in "[{":
+            self.value(decoder)
+            return
+        depth = 0
+        while True:
+            match = STRUCTURAL.search(self.text, self.pos)
+            if match is None:
+                self.pos = len(self.text)
+                if not self.fill():
+                    raise ValueError("Unterminated JSON value")
+                continue
+            if match.group() == '"':
+                self.pos = match.start()
+                self._skip_string()
+                continue
+            self.pos = match.end()
+            depth += 1 if match.group() in "[{" else -1
+            if depth == 0:
+                return
+
+    def _skip_string(self):
+        self.pos += 1
+        while True:
+            match = STRING_END.search(self.text, self.pos)
+            if match is None or match.end() == len(self.text) and match.group() == "\\":
+                # Keep a trailing backslash: its escaped character is in the next chunk
+                self.pos = match.start() if match else len(self.text)
+                if not self.fill():
+                    raise ValueError("Unterminated string in JSON input")
+                continue
+            if match.group() == "\\":
+                self.pos = match.end() + 1
+                continue
+            self.pos = match.end()
+            return
+
+def _iter_stdlib(fp: IO[str], key: str, chunk_size: int) -> Iterator[Any]:
+    buf = _Buffer(fp, chunk_size)
+    decoder = json.JSONDecoder()
+    buf.expect("{")
+    while buf.peek() not in ("}", ""):
+        name = buf.value(decoder)
+        buf.expect(":")
+        if name != key:
+            buf.value(decoder)  # other members (config, stats) are small
+        elif buf.peek() != "[":
+            return
+        else:
+            buf.expect("[")
+            while buf.peek() not in ("]", ""):
+                yield buf.value(decoder)
+                if buf.peek() == ",":
+                    buf.pos += 1
+            return
+        if buf.peek() == ",":
+            buf.pos += 1
+
+def iter_json_array(path: Path, key: str, chunk_size: int = CHUNK_SIZE) -> Iterator[Any]:
+    """Yield ``document[key][i]`` one at a time from a top-level JSON object"""
+    if ijson is not None:
+        with open(path, "rb") as fp:
+            yield from ijson.items(fp, f"{key}.item", use_float=True)
+        return
+    with open(path, encoding="utf-8") as fp:
+        yield from _iter_stdlib(fp, key, chunk_size)
+
+Ancestors = Tuple[Dict[str, Any], ...]
+
+def _walk_array(buf: _Buffer, decoder: json.JSONDecoder, key: str, skip: Iterable[str],
+                ancestors: Ancestors) -> Iterator[Tuple[Ancestors, Dict[str, Any]]]:
+    buf.expect("[")
+    while buf.peek() not in ("]", ""):
+        if buf.peek() == "{":
+            yield from _walk_object(buf, decoder, key, skip, ancestors)
+        else:
+            buf.skip(decoder)
+        if buf.peek() == ",":
+            buf.pos += 1
+    buf.expect("]")
+
+def _walk_object(buf: _Buffer, decoder: json.JSONDecoder, key: str, skip: Iterable[str],
+                 ancestors: Ancestors) -> Iterator[Tuple[Ancestors, Dict[str, Any]]]:
+    buf.expect("{")
+    node: Dict[str, Any] = {}
+    branch = False
+    while buf.peek() not in ("}", ""):
+        name = buf.value(decoder)
+        buf.expect(":")
+        if name == key and buf.peek() == "[":
+            branch = True
+            yield from _walk_array(buf, decoder, key, skip, ancestors + (node,))
+        elif name in skip:
+            buf.skip(decoder)
+        else:
+            node[name] = buf.value(decoder)
+        if buf.peek() == ",":
+            buf.pos += 1
+    buf.expect("}")
+    if not branch:
+        yield ancestors, node
+
+def iter_json_tree(path: Path, key: str, skip: Iterable[str] = (), meta: Optional[Dict[str, Any]] = None,
+                   chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[Ancestors, Dict[str, Any]]]:
+    """Yield (ancestors, leaf) for every object under ``document[key]``, descending into nested ``key`` arrays.
+
+    Ancestors are the enclosing branch objects with the members that precede their ``key`` array.
+    Members named in ``skip`` are passed over without being decoded, at any depth; the document's
+    other top-level members are stored in ``meta`` as they are read.
+    """
+    skip = frozenset(skip)
+    with open(path, encoding="utf-8-sig") as fp:
+        buf = _Buffer(fp, chunk_size)
+        decoder = json.JSONDecoder()
+        buf.expect("{")
+        while buf.peek() not in ("}", ""):
+            name = buf.value(decoder)
+            buf.expect(":")
+            if name == key and buf.peek() == "[":
+                yield from _walk_array(buf, decoder, key, skip, ())
+            elif name in skip:
+                buf.skip(decoder)
+            else:
+                value = buf.value(decoder)
+                if meta is not None:
+                    meta[name] = value
+            if buf.peek() == ",":
+                buf.pos += 1
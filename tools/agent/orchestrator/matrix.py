@@ -0,0 +1,170 @@
+"""
+Environment Matrix
+Runs suites against several environments concurrently and merges their results into one report
+"""
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from orchestrator.readiness import load_env_file
+from orchestrator.retry import RunOutcome
+
+REPORT_DIR = Path(".agent") / "matrix"
+
+# env/config.<env>.yaml keys handed to the suites as environment variables
+ENV_OVERRIDES = {
+    "base_url": "BASE_URL",
+    "db_uri": "DB_URI",
+    "redis_uri": "REDIS_URI",
+    "mongo_uri": "MONGO_URI",
+}
+
+STATUSES = ("passed", "flaky", "failed", "skipped")
+
+@dataclass
+class MatrixCell:
+    suite: str
+    environment: str
+    ok: bool
+    seconds: float
+    outcome: Optional[RunOutcome] = None
+    error: str = ""
+    log: Optional[Path] = None
+
+def parse_envs(value: str, declared: List[str]) -> List[str]:
+    """'dev,qa' or 'all' (every environment in solution.yaml) into a list of environments"""
+    if value.strip() == "all":
+        return list(declared)
+    envs = list(dict.fromkeys(e.strip() for e in value.split(",") if e.strip()))
+    unknown = [e for e in envs if declared and e not in declared]
+    if not envs or unknown:
+        raise ValueError(f"Unknown environment {', '.join(unknown) or value!r}; "
+                         f"solution.yaml declares {', '.join(declared)}")
+    return envs
+
+def environment_overrides(root: Path, environment: str) -> Dict[str, str]:
+    """Endpoints from env/config.<environment>.yaml as environment variables for the suites"""
+    config = load_env_file(root, environment)
+    return {var: config[key] for key, var in ENV_OVERRIDES.items() if isinstance(config.get(key), str)}
+
+def default_parallelism(cells: int) -> int:
+    """Environments share the machine with each runner's own workers, so use half the cores"""
+    return max(1, min(cells, (os.cpu_count() or 2) // 2))
+
+def run_matrix(cells: List[Tuple[str, str]], run: Callable[[str, str], MatrixCell],
+               max_parallel: int) -> List[MatrixCell]:
+    """Run (suite, environment) cells, at most ``max_parallel`` at a time, in input order"""
+    results: Dict[Tuple[str, str], MatrixCell] = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_parallel)) as pool:
+        futures = {pool.submit(run, suite, env): (suite, env) for suite, env in cells}
+        for future in as_completed(futures):
+            suite, env = futures[future]
+            try:
+                results[(suite, env)] = future.result()
+            except Exception as e:
+                results[(suite, env)] = MatrixCell(suite, env, False, 0.0, error=str(e))
+    return [results[cell] for cell in cells]
+
+def merge_report(cells: List[MatrixCell]) -> dict:
+    """Per-cell counts plus each test's status in every environment"""
+    environments = list(dict.fromkeys(c.environment for c in cells))
+    tests: Dict[str, Dict[str, str]] = {}
+    summary = []
+    for c in cells:
+        counts = {status: c.outcome.count(status) if c.outcome else 0 for status in STATUSES}
+        summary.append({
+            "suite": c.suite,
+            "environment": c.environment,
+            "ok": c.ok,
+            "seconds": round(c.seconds, 2),
+            "error": c.error,
+            "log": str(c.log) if c.log else "",
+            **counts,
+        })
+        for verdict in (c.outcome.verdicts.values() if c.outcome else []):
+            tests.setdefault(f"{c.suite}: {verdict.test_id}", {})[c.environment] = verdict.status
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environments": environments,
+        "cells": summary,
+        "tests": dict(sorted(tests.items())),
+    }
+
+def divergent_tests(report: dict) -> Dict[str, Dict[str, str]]:
+    """Tests that did not pass everywhere, or were missing from some environment"""
+    environments = report["environments"]
+    return {
+        test: statuses for test, statuses in report["tests"].items()
+        if len({statuses.get(env, "missing") for env in environments}) > 1
+        or any(statuses.get(env) in ("failed", "flaky") for env in environments)
+    }
+
+def format_matrix(report: dict) -> str:
+    """Suite x environment table of passed/flaky/failed counts, then the divergent tests"""
+    environments = report["environments"]
+    suites = list(dict.fromkeys(c["suite"] for c in report["cells"]))
+    cells = {(c["suite"], c["environment"]): c for c in report["cells"]}
+
+    def cell_text(cell: Optional[dict]) -> str:
+        if cell is None:
+            return "-"
+        if cell["error"]:
+            return "ERROR"
+        return f"{cell['passed']}/{cell['flaky']}/{cell['failed']}{'' if cell['ok'] else ' FAIL'}"
+
+    lines = [f"{'Suite':<10}" + "".join(f"{env:>18}" for env in environments) + "   (passed/flaky/failed)"]
+    for suite in suites:
+        lines.append(f"{suite:<10}" + "".join(f"{cell_text(cells.get((suite, env))):>18}" for env in environments))
+    for c in report["cells"]:
+        if c["error"]:
+            lines.append(f"  {c['suite']}@{c['environment']}: {c['error']}")
+
+    divergent = divergent_tests(report)
+    if divergent:
+        lines.append("")
+        lines.append(f"Tests that failed or differ between environments ({len(divergent)}):")
+        for test, statuses in divergent.items():
+            states = ", ".join(f"{env}={statuses.get(env, 'missing')}" for env in environments)
+            lines.append(f"  {test}: {states}")
+    return "\n".join(lines)
+
+def write_report(root: Path, report: dict) -> Tuple[Path, Path]:
+    """Merged report as JSON and Markdown under .agent/matrix"""
+    out = root / REPORT_DIR
+    out.mkdir(parents=True, exist_ok=True)
+    json_path = out / "report.json"
+    json_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    environments = report["environments"]
+    md = ["# Environment Matrix", "", f"Generated {report['generated_at']}", "",
+          "| Suite | " + " | ".join(environments) + " |",
+          "|---|" + "---|" * len(environments)]
+    cells = {(c["suite"], c["environment"]): c for c in report["cells"]}
+    for suite in dict.fromkeys(c["suite"] for c in report["cells"]):
+        row = []
+        for env in environments:
+            c = cells.get((suite, env))
+            if c is None:
+                row.append("-")
+            elif c["error"]:
+                row.append(f"error: {c['error']}")
+            else:
+                row.append(f"{'✅' if c['ok'] else '❌'} {c['passed']} passed, {c['flaky']} flaky, "
+                           f"{c['failed']} failed ({c['seconds']:.0f}s)")
+        md.append(f"| {suite} | " + " | ".join(row) + " |")
+
+    divergent = divergent_tests(report)
+    if divergent:
+        md += ["", "## Tests that failed or differ between environments", "",
+               "| Test | " + " | ".join(environments) + " |",
+               "|---|" + "---|" * len(environments)]
+        for test, statuses in divergent.items():
+            md.append(f"| `{test}` | " + " | ".join(statuses.get(env, "missing") for env in environments) + " |")
+    md_path = out / "report.md"
+    md_path.write_text("\n".join(md) + "\n", encoding="utf-8")
+    return json_path, md_path
@@ -0,0 +1,205 @@
+"""
+Runner Processes
+Streams child output line by line into a bounded tail and a log file, and parses it into live progress
+"""
+
+import re
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Deque, Dict, List, Optional
+
+from orchestrator.scheduler import Usage, UsageMonitor
+
+LOG_DIR = Path(".agent") / "logs"
+
+# Lines of child output kept in memory; everything else is only in the log file
+TAIL_LINES = 200
+
+# Lines shown when a command fails
+FAILURE_TAIL = 40
+
+# Longer lines are split, so one runaway line cannot grow the buffer
+MAX_LINE_CHARS = 4000
+
+# Seconds between progress lines when output is not a terminal, or suites run side by side
+PROGRESS_INTERVAL = 10.0
+
+# Where runner failure details start: pytest sections, Maven errors, Playwright's failure list
+FAILURE_MARKERS = re.compile(r"^=+ (FAILURES|ERRORS|short test summary info) =+$|^\[ERROR\]|^\s+\d+\) \[")
+
+# Serializes progress and failure output of concurrently running suites
+OUTPUT_LOCK = threading.Lock()
+
+@dataclass
+class Progress:
+    total: Optional[int] = None
+    passed: int = 0
+    failed: int = 0
+    skipped: int = 0
+
+    @property
+    def finished(self) -> int:
+        return self.passed + self.failed + self.skipped
+
+    def summary(self) -> str:
+        done = f"{self.finished}/{self.total}" if self.total else str(self.finished)
+        return f"{done} tests: {self.passed} passed, {self.failed} failed, {self.skipped} skipped"
+
+@dataclass
+class StreamResult:
+    returncode: int
+    tail: List[str]
+    progress: Progress
+    usage: Optional[Usage] = None
+
+class ProgressParser:
+    """Turns a runner's output lines into progress events"""
+
+    total_pattern: Optional[re.Pattern] = None
+
+    def feed(self, line: str, progress: Progress) -> bool:
+        """Update ``progress`` from one line; True when it changed"""
+        if self.total_pattern:
+            match = self.total_pattern.search(line)
+            if match:
+                # The last group that matched is the most specific count (selected over collected)
+                progress.total = int(next(g for g in reversed(match.groups()) if g))
+                return True
+        return self.result(line, progress)
+
+    def result(self, line: str, progress: Progress) -> bool:
+        return False
+
+class PytestProgress(ProgressParser):
+    # "collected 40 items / 5 deselected / 35 selected", or "4 workers [35 items]" under xdist
+    total_pattern = re.compile(r"collected (\d+) items?(?: / \d+ deselected / (\d+) selected)?|^\d+ workers \[(\d+) items?\]")
+    result_patterns = [
+        re.compile(r"^(?P<test>\S+::\S+) (?P<status>PASSED|FAILED|ERROR|SKIPPED|XFAIL|XPASS)\b"),
+        re.compile(r"^\[gw\d+\] \[\s*\d+%\] (?P<status>PASSED|FAILED|ERROR|SKIPPED|XFAIL|XPASS) (?P<test>\S+::\S+)"),
+    ]
+    statuses = {"PASSED": "passed", "XPASS": "passed", "FAILED": "failed", "ERROR": "failed",
+                "SKIPPED": "skipped", "XFAIL": "skipped"}
+
+    def result(self, line: str, progress: Progress) -> bool:
+        for pattern in self.result_patterns:
+            match = pattern.match(line)
+            if match:
+                return record(progress, self.statuses[match.group("status")])
+        return False
+
+class PlaywrightProgress(ProgressParser):
+    # Printed by the list reporter before the first test
+    total_pattern = re.compile(r"^Running (\d+) tests? using")
+    result_pattern = re.compile(r"^\s*(?P<mark>✓|✘|ok|x|-|°)\s+\d+\s+\S")
+    statuses = {"✓": "passed", "ok": "passed", "✘": "failed", "x": "failed", "-": "skipped", "°": "skipped"}
+
+    def result(self, line: str, progress: Progress) -> bool:
+        match = self.result_pattern.match(line)
+        if not match:
+            return False
+        return record(progress, self.statuses[match.group("mark")])
+
+class SurefireProgress(ProgressParser):
+    # One line per finished test class; the overall "Results:" total has no " - in "
+    result_pattern = re.compile(r"Tests run: (\d+), Failures: (\d+), Errors: (\d+), Skipped: (\d+).*? - in \S+")
+
+    def result(self, line: str, progress: Progress) -> bool:
+        match = self.result_pattern.search(line)
+        if not match:
+            return False
+        run, failures, errors, skipped = (int(g) for g in match.groups())
+        progress.passed += run - failures - errors - skipped
+        progress.failed += failures + errors
+        progress.skipped += skipped
+        return True
+
+def record(progress: Progress, status: str) -> bool:
+    setattr(progress, status, getattr(progress, status) + 1)
+    return True
+
+PARSERS = {
+    "ui": PlaywrightProgress,
+    "api": SurefireProgress,
+    "backend": PytestProgress,
+}
+
+def get_parser(suite_name: str) -> Optional[ProgressParser]:
+    parser = PARSERS.get(suite_name)
+    return parser() if parser else None
+
+class ProgressReporter:
+    """Live summary on one rewritten terminal line, or a progress line every few seconds"""
+
+    def __init__(self, label: str, live: bool):
+        self.label = label
+        self.live = live
+        self.last = 0.0
+        self.shown = ""
+
+    def update(self, progress: Progress):
+        now = time.monotonic()
+        if self.live:
+            with OUTPUT_LOCK:
+                self.shown = f"  {self.label}: {progress.summary()}"
+                sys.stdout.write("\r" + self.shown)
+                sys.stdout.flush()
+        elif now - self.last >= PROGRESS_INTERVAL:
+            self.last = now
+            with OUTPUT_LOCK:
+                print(f"  {self.label}: {progress.summary()}", flush=True)
+
+    def close(self, progress: Progress):
+        with OUTPUT_LOCK:
+            if self.shown:
+                sys.stdout.write("\n")
+                sys.stdout.flush()
+            elif self.last:
+                print(f"  {self.label}: {progress.summary()}", flush=True)
+
+def run_streamed(cmd: List[str], cwd: Path, env: Dict[str, str], log_path: Path,
+                 parser: Optional[ProgressParser] = None, label: str = "",
+                 live: bool = False) -> StreamResult:
+    """Run a command, appending its output to ``log_path`` and keeping only the last lines in memory"""
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    tail: Deque[str] = deque(maxlen=TAIL_LINES)
+    progress = Progress()
+    reporter = ProgressReporter(label or cmd[0], live and sys.stdout.isatty())
+    with open(log_path, "a", encoding="utf-8") as log:
+        proc = subprocess.Popen(cmd, cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                text=True, encoding="utf-8", errors="replace")
+        monitor = UsageMonitor(proc)
+        try:
+            for chunk in iter(lambda: proc.stdout.readline(MAX_LINE_CHARS), ""):
+                log.write(chunk)
+                line = chunk.rstrip("\n")
+                tail.append(line)
+                if parser and parser.feed(line, progress):
+                    reporter.update(progress)
+        finally:
+            proc.stdout.close()
+            code, usage = monitor.wait()
+            reporter.close(progress)
+    return StreamResult(code, list(tail), progress, usage)
+
+def relevant_tail(lines: List[str], limit: int = FAILURE_TAIL) -> List[str]:
+    """The last ``limit`` lines, starting at the runner's failure section when it is in view"""
+    window = lines[-limit:]
+    for i, line in enumerate(window):
+        if FAILURE_MARKERS.search(line):
+            return window[i:]
+    return window
+
+def format_failure(label: str, result: StreamResult, log_path: Path) -> str:
+    lines = [f"{label} exited with code {result.returncode} ({result.progress.summary()}); "
+             f"full output in {log_path}"]
+    lines += [f"  | {line}" for line in relevant_tail(result.tail)]
+    return "\n".join(lines)
+
+def report_failure(label: str, result: StreamResult, log_path: Path):
+    with OUTPUT_LOCK:
+        print(format_failure(label, result, log_path), flush=True)
@@ -0,0 +1,137 @@
+"""
+Profiling
+Records timed spans for orchestrator phases and exports them as Chrome trace events
+"""
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+TRACE_FILE = Path(".agent") / "trace.json"
+
+@dataclass
+class Span:
+    name: str
+    category: str
+    start_ns: int
+    duration_ns: int
+    thread: int
+    args: Dict[str, str] = field(default_factory=dict)
+    self_ns: int = 0
+
+class _NullSpan:
+    """Returned while profiling is off, so a span costs one global lookup"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class _ActiveSpan:
+    __slots__ = ("profiler", "name", "category", "args", "start_ns")
+
+    def __init__(self, profiler: "Profiler", name: str, category: str, args: Dict[str, str]):
+        self.profiler = profiler
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, self.category, self.start_ns, time.perf_counter_ns(), self.args)
+        return False
+
+class Profiler:
+    def __init__(self):
+        self.origin_ns = time.perf_counter_ns()
+        # list.append is atomic, so spans from worker threads need no lock
+        self.spans: List[Span] = []
+
+    def add(self, name: str, category: str, start_ns: int, end_ns: int,
+            args: Optional[Dict[str, str]] = None):
+        self.spans.append(Span(name, category, start_ns, end_ns - start_ns, threading.get_ident(), args or {}))
+
+    def compute_self_times(self):
+        """Duration of each span minus its direct children on the same thread"""
+        by_thread: Dict[int, List[Span]] = defaultdict(list)
+        for s in self.spans:
+            s.self_ns = s.duration_ns
+            by_thread[s.thread].append(s)
+        for spans in by_thread.values():
+            stack: List[Span] = []
+            for s in sorted(spans, key=lambda s: (s.start_ns, -s.duration_ns)):
+                while stack and s.start_ns >= stack[-1].start_ns + stack[-1].duration_ns:
+                    stack.pop()
+                if stack:
+                    stack[-1].self_ns -= s.duration_ns
+                stack.append(s)
+
+    def trace_events(self) -> dict:
+        """Chrome trace-event JSON, loadable in chrome://tracing or Perfetto"""
+        pid = os.getpid()
+        threads = {tid: n for n, tid in enumerate(dict.fromkeys(s.thread for s in self.spans), start=1)}
+        events = [
+            {
+                "name": s.name,
+                "cat": s.category,
+                "ph": "X",
+                "ts": (s.start_ns - self.origin_ns) / 1000,
+                "dur": s.duration_ns / 1000,
+                "pid": pid,
+                "tid": threads[s.thread],
+                "args": s.args,
+            }
+            for s in sorted(self.spans, key=lambda s: s.start_ns)
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_trace(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.trace_events()), encoding="utf-8")
+
+    def summary(self, top: int = 15) -> str:
+        """Table of the ``top`` slowest spans, then self time per category"""
+        self.compute_self_times()
+        lines = [f"{'Total':>9} {'Self':>9}  {'Category':<11} Span"]
+        for s in sorted(self.spans, key=lambda s: s.duration_ns, reverse=True)[:top]:
+            lines.append(f"{s.duration_ns / 1e6:>7.1f}ms {s.self_ns / 1e6:>7.1f}ms  {s.category:<11} {s.name}")
+
+        totals: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+        for s in self.spans:
+            totals[s.category][0] += s.self_ns
+            totals[s.category][1] += 1
+        lines.append("")
+        lines.append(f"{'Self':>9} {'Spans':>6}  Category")
+        for category, (self_ns, count) in sorted(totals.items(), key=lambda kv: kv[1][0], reverse=True):
+            lines.append(f"{self_ns / 1e6:>7.1f}ms {count:>6}  {category}")
+        return "\n".join(lines)
+
+_profiler: Optional[Profiler] = None
+
+def enable() -> Profiler:
+    global _profiler
+    _profiler = Profiler()
+    return _profiler
+
+def disable() -> Optional[Profiler]:
+    """Stop recording and return the profiler holding the recorded spans"""
+    global _profiler
+    profiler, _profiler = _profiler, None
+    return profiler
+
+def span(name: str, category: str = "phase", **args):
+    """Context manager timing one phase; a no-op unless profiling is enabled"""
+    if _profiler is None:
+        return _NULL_SPAN
+    return _ActiveSpan(_profiler, name, category, {k: str(v) for k, v in args.items()})
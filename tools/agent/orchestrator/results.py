@@ -0,0 +1,129 @@
+"""
+Test Result Parsers
+Normalizes Playwright JSON and JUnit XML (surefire, pytest) into TestResult records
+"""
+
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+from orchestrator.jsonstream import iter_json_array
+
+@dataclass
+class TestResult:
+    suite: str       # ui | api | backend
+    test_id: str     # id the runner can select again (file:line, Class#method, node id)
+    unit: str        # shard unit: spec file, test class or test module
+    name: str
+    status: str      # passed | failed | flaky | skipped
+    duration: float  # seconds, summed over attempts
+    retries: int = 0
+
+    __test__ = False
+
+@dataclass
+class Attachment:
+    suite: str
+    test_id: str       # same id as the TestResult it belongs to
+    name: str          # trace | video | screenshot | ...
+    content_type: str
+    path: Path
+    project: str = ""
+    retry: int = 0
+
+@dataclass
+class JUnitCase:
+    classname: str
+    name: str
+    status: str
+    duration: float
+    retries: int = 0
+
+PLAYWRIGHT_STATUS = {
+    "expected": "passed",
+    "unexpected": "failed",
+    "flaky": "flaky",
+    "skipped": "skipped",
+}
+
+def _playwright_specs(suite: dict) -> Iterator[dict]:
+    for spec in suite.get("specs", []):
+        yield spec
+    for child in suite.get("suites", []):
+        yield from _playwright_specs(child)
+
+def iter_playwright_suite(suite: dict, suite_name: str = "ui") -> Iterator[TestResult]:
+    """Flatten one top-level suite of a Playwright JSON report"""
+    for spec in _playwright_specs(suite):
+        test_id = f"{spec['file']}:{spec.get('line', 0)}"
+        for test in spec.get("tests", []):
+            results = test.get("results", [])
+            status = PLAYWRIGHT_STATUS.get(test.get("status"), "failed")
+            project = test.get("projectName", "")
+            yield TestResult(
+                suite=suite_name,
+                test_id=test_id,
+                unit=spec["file"],
+                name=f"{project} > {spec.get('title', '')}" if project else spec.get("title", ""),
+                status=status,
+                duration=sum(r.get("duration", 0) for r in results) / 1000.0,
+                retries=max(0, len(results) - 1),
+            )
+
+def parse_playwright_json(path: Path, suite_name: str = "ui") -> Iterator[TestResult]:
+    """Yield results from a Playwright JSON reporter file, one spec file at a time"""
+    for suite in iter_json_array(path, "suites"):
+        yield from iter_playwright_suite(suite, suite_name)
+
+def parse_playwright_attachments(path: Path, suite_name: str = "ui") -> Iterator[Attachment]:
+    """Yield the files (traces, videos, screenshots) attached to each test attempt in a JSON report"""
+    for suite in iter_json_array(path, "suites"):
+        for spec in _playwright_specs(suite):
+            test_id = f"{spec['file']}:{spec.get('line', 0)}"
+            for test in spec.get("tests", []):
+                for result in test.get("results", []):
+                    for attachment in result.get("attachments", []):
+                        # Inline bodies (console output, custom strings) have no file to store
+                        if not attachment.get("path"):
+                            continue
+                        yield Attachment(
+                            suite=suite_name,
+                            test_id=test_id,
+                            name=attachment.get("name", ""),
+                            content_type=attachment.get("contentType", ""),
+                            path=Path(attachment["path"]),
+                            project=test.get("projectName", ""),
+                            retry=result.get("retry", 0),
+                        )
+
+def iter_junit_cases(path: Path) -> Iterator[JUnitCase]:
+    """Stream <testcase> elements from a JUnit XML file"""
+    for _, elem in ET.iterparse(str(path), events=("end",)):
+        if elem.tag != "testcase":
+            continue
+        status = "passed"
+        retries = 0
+        for child in elem:
+            if child.tag in ("failure", "error"):
+                status = "failed"
+            elif child.tag == "skipped":
+                status = "skipped"
+            elif child.tag in ("flakyFailure", "flakyError"):
+                retries += 1
+            elif child.tag in ("rerunFailure", "rerunError"):
+                retries += 1
+        if status == "passed" and retries:
+            status = "flaky"
+        yield JUnitCase(
+            classname=elem.get("classname", ""),
+            name=elem.get("name", ""),
+            status=status,
+            duration=float(elem.get("time") or 0.0),
+            retries=retries,
+        )
+        elem.clear()
+
+def newer_than(path: Path, since: Optional[float]) -> bool:
+    """True when the file exists and was written at or after ``since``"""
+    return path.exists() and (since is None or path.stat().st_mtime >= since)
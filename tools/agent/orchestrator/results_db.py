@@ -0,0 +1,184 @@
+"""
+Results Database
+Normalized test results and the artifact index in a local, indexed SQLite database with trend queries
+"""
+
+import sqlite3
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from orchestrator.results import TestResult
+
+DB_FILE = Path(".agent") / "results.db"
+
+BATCH_SIZE = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id          INTEGER PRIMARY KEY,
+    suite       TEXT NOT NULL,
+    env         TEXT NOT NULL,
+    commit_sha  TEXT NOT NULL,
+    source      TEXT NOT NULL,
+    recorded_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sources (
+    path   TEXT NOT NULL,
+    mtime  REAL NOT NULL,
+    size   INTEGER NOT NULL,
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    PRIMARY KEY (path, mtime, size)
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id   INTEGER NOT NULL REFERENCES runs(id),
+    suite    TEXT NOT NULL,
+    test_id  TEXT NOT NULL,
+    unit     TEXT NOT NULL,
+    name     TEXT NOT NULL,
+    status   TEXT NOT NULL,
+    duration REAL NOT NULL,
+    retries  INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS artifacts (
+    digest       TEXT PRIMARY KEY,
+    size         INTEGER NOT NULL,
+    stored_size  INTEGER NOT NULL,
+    compression  TEXT NOT NULL,
+    content_type TEXT NOT NULL,
+    created_at   TEXT NOT NULL,
+    last_used    TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS artifact_links (
+    digest      TEXT NOT NULL REFERENCES artifacts(digest),
+    suite       TEXT NOT NULL,
+    env         TEXT NOT NULL,
+    commit_sha  TEXT NOT NULL,
+    test_id     TEXT NOT NULL,
+    project     TEXT NOT NULL,
+    retry       INTEGER NOT NULL,
+    name        TEXT NOT NULL,
+    file_name   TEXT NOT NULL,
+    recorded_at TEXT NOT NULL,
+    UNIQUE (digest, suite, env, commit_sha, test_id, project, retry, name)
+);
+CREATE INDEX IF NOT EXISTS idx_results_run ON results(run_id);
+CREATE INDEX IF NOT EXISTS idx_results_test ON results(suite, test_id);
+CREATE INDEX IF NOT EXISTS idx_results_status ON results(status);
+CREATE INDEX IF NOT EXISTS idx_runs_recorded ON runs(recorded_at);
+CREATE INDEX IF NOT EXISTS idx_artifacts_used ON artifacts(last_used);
+CREATE INDEX IF NOT EXISTS idx_artifact_links_test ON artifact_links(suite, test_id);
+CREATE INDEX IF NOT EXISTS idx_artifact_links_digest ON artifact_links(digest);
+"""
+
+def connect(root: Path) -> sqlite3.Connection:
+    """Open (and create if needed) the results database"""
+    path = root / DB_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path))
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+def already_ingested(conn: sqlite3.Connection, path: Path) -> bool:
+    stat = path.stat()
+    row = conn.execute(
+        "SELECT 1 FROM sources WHERE path = ? AND mtime = ? AND size = ?",
+        (str(path), stat.st_mtime, stat.st_size),
+    ).fetchone()
+    return row is not None
+
+def ingest(conn: sqlite3.Connection, suite: str, source: Path, results: Iterable[TestResult],
+           env: str, commit: str) -> int:
+    """Insert one result file as a run, in batches inside a single transaction"""
+    stat = source.stat()
+    inserted = 0
+    with conn:
+        run_id = conn.execute(
+            "INSERT INTO runs (suite, env, commit_sha, source, recorded_at) VALUES (?, ?, ?, ?, ?)",
+            (suite, env, commit, str(source),
+             datetime.fromtimestamp(stat.st_mtime, timezone.utc).isoformat(timespec="seconds")),
+        ).lastrowid
+        rows = (
+            (run_id, r.suite, r.test_id, r.unit, r.name, r.status, r.duration, r.retries)
+            for r in results
+        )
+        while True:
+            batch = list(islice(rows, BATCH_SIZE))
+            if not batch:
+                break
+            conn.executemany("INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)", batch)
+            inserted += len(batch)
+        conn.execute(
+            "INSERT INTO sources (path, mtime, size, run_id) VALUES (?, ?, ?, ?)",
+            (str(source), stat.st_mtime, stat.st_size, run_id),
+        )
+    return inserted
+
+def trend(conn: sqlite3.Connection, suite: Optional[str] = None, limit: int = 20) -> List[sqlite3.Row]:
+    """Pass/fail/flaky counts and total time for the most recent runs"""
+    conn.row_factory = sqlite3.Row
+    return conn.execute(
+        """
+        SELECT runs.id, runs.recorded_at, runs.suite, runs.env, runs.commit_sha,
+               COUNT(*) AS total,
+               SUM(status = 'passed') AS passed,
+               SUM(status = 'flaky') AS flaky,
+               SUM(status = 'failed') AS failed,
+               SUM(duration) AS duration
+        FROM runs JOIN results ON results.run_id = runs.id
+        WHERE (:suite IS NULL OR runs.suite = :suite)
+        GROUP BY runs.id
+        ORDER BY runs.recorded_at DESC, runs.id DESC
+        LIMIT :limit
+        """,
+        {"suite": suite, "limit": limit},
+    ).fetchall()
+
+def slowest(conn: sqlite3.Connection, suite: Optional[str] = None, limit: int = 20,
+            last_runs: int = 10) -> List[sqlite3.Row]:
+    """Tests with the highest average duration over the most recent runs"""
+    conn.row_factory = sqlite3.Row
+    return conn.execute(
+        """
+        WITH recent AS (
+            SELECT id FROM runs
+            WHERE (:suite IS NULL OR suite = :suite)
+            ORDER BY recorded_at DESC, id DESC LIMIT :runs
+        )
+        SELECT suite, test_id, COUNT(*) AS samples,
+               AVG(duration) AS avg_duration, MAX(duration) AS max_duration
+        FROM results WHERE run_id IN (SELECT id FROM recent) AND status != 'skipped'
+        GROUP BY suite, test_id
+        ORDER BY avg_duration DESC
+        LIMIT :limit
+        """,
+        {"suite": suite, "limit": limit, "runs": last_runs},
+    ).fetchall()
+
+def flakiest(conn: sqlite3.Connection, suite: Optional[str] = None, limit: int = 20,
+             last_runs: int = 50) -> List[sqlite3.Row]:
+    """Tests that were flaky, or both passed and failed, across the most recent runs"""
+    conn.row_factory = sqlite3.Row
+    return conn.execute(
+        """
+        WITH recent AS (
+            SELECT id FROM runs
+            WHERE (:suite IS NULL OR suite = :suite)
+            ORDER BY recorded_at DESC, id DESC LIMIT :runs
+        )
+        SELECT suite, test_id, COUNT(*) AS runs,
+               SUM(status = 'flaky') AS flaky,
+               SUM(status = 'failed') AS failed,
+               SUM(status = 'passed') AS passed,
+               SUM(retries) AS retries
+        FROM results WHERE run_id IN (SELECT id FROM recent)
+        GROUP BY suite, test_id
+        HAVING flaky > 0 OR (failed > 0 AND passed > 0)
+        ORDER BY 1.0 * (flaky + MIN(failed, passed)) / COUNT(*) DESC, flaky DESC
+        LIMIT :limit
+        """,
+        {"suite": suite, "limit": limit, "runs": last_runs},
+    ).fetchall()
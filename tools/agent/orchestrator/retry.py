@@ -0,0 +1,229 @@
+"""
+Smart Retry Engine
+Reruns only failed tests, classifies passed/flaky/failed, and keeps a local quarantine
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from orchestrator.profiling import span
+from orchestrator.results import TestResult
+from orchestrator.process import get_parser, report_failure, run_streamed
+from orchestrator.scheduler import ResourceHistory
+from orchestrator.suites import Suite
+
+QUARANTINE_FILE = Path(".agent") / "quarantine.json"
+
+# Outcomes remembered per test
+WINDOW = 10
+
+# Flaky outcomes within the window that send a test to quarantine
+QUARANTINE_AFTER = 3
+
+# Consecutive clean passes in the quarantine lane that release a test
+RELEASE_AFTER = 5
+
+@dataclass
+class TestVerdict:
+    test_id: str
+    unit: str
+    name: str
+    status: str     # passed | flaky | failed | skipped
+    attempts: int = 1
+
+    __test__ = False
+
+@dataclass
+class RunOutcome:
+    verdicts: Dict[str, TestVerdict] = field(default_factory=dict)
+    returncode: int = 0
+    reruns: int = 0
+    ok: bool = True
+
+    def count(self, status: str) -> int:
+        return sum(1 for v in self.verdicts.values() if v.status == status)
+
+    def ids(self, status: str) -> List[str]:
+        return sorted(v.test_id for v in self.verdicts.values() if v.status == status)
+
+def combine(results: List[TestResult]) -> Dict[str, TestVerdict]:
+    """One verdict per test id; Playwright reports each browser project separately"""
+    verdicts: Dict[str, TestVerdict] = {}
+    rank = {"skipped": 0, "passed": 1, "flaky": 2, "failed": 3}
+    for r in results:
+        current = verdicts.get(r.test_id)
+        if current is None or rank[r.status] > rank[current.status]:
+            verdicts[r.test_id] = TestVerdict(r.test_id, r.unit, r.name, r.status)
+    return verdicts
+
+def classify(attempts: List[List[TestResult]]) -> Dict[str, TestVerdict]:
+    """Fold the first run and its reruns into final verdicts"""
+    if not attempts:
+        return {}
+    verdicts = combine(attempts[0])
+    for number, results in enumerate(attempts[1:], start=2):
+        for test_id, rerun in combine(results).items():
+            verdict = verdicts.get(test_id)
+            if verdict is None or verdict.status not in ("failed", "flaky"):
+                continue
+            verdict.attempts = number
+            if rerun.status in ("passed", "flaky"):
+                verdict.status = "flaky"
+    return verdicts
+
+def fold_reruns(results: Iterable[TestResult], reruns: List[List[TestResult]]) -> Iterator[TestResult]:
+    """First-run results with the rerun lanes folded in, the way ``classify`` judges them
+
+    A failed result that passes on a rerun becomes flaky; each rerun it went through
+    counts as a retry and adds to its duration.
+    """
+    attempts = [{(r.test_id, r.name): r for r in rerun} for rerun in reruns]
+    for result in results:
+        if result.status == "failed":
+            for rerun in attempts:
+                again = rerun.get((result.test_id, result.name))
+                if again is None:
+                    break
+                result.retries += 1 + again.retries
+                result.duration += again.duration
+                if again.status in ("passed", "flaky"):
+                    result.status = "flaky"
+                    break
+        yield result
+
+def invoke(suite: Suite, cmd: List[str], env: Optional[Dict[str, str]] = None) -> int:
+    """Run a test command in the suite directory; test failures are not exceptions"""
+    merged = {**os.environ, **suite.env, **(env or {})}
+    with span(" ".join(cmd[:3]), "subprocess", suite=suite.label, cmd=" ".join(cmd)):
+        result = run_streamed(cmd, suite.directory, merged, suite.log_file, get_parser(suite.name),
+                              label=suite.label, live=suite.log_path is None)
+    if result.usage is not None:
+        # Teaches the scheduler what a worker of this suite costs
+        ResourceHistory.update(suite.root, suite.name, suite.effective_workers, result.usage)
+    if result.returncode not in suite.ok_codes:
+        report_failure(suite.label, result, suite.log_file)
+    return result.returncode
+
+def run_with_retries(suite: Suite, units: Optional[List[str]], retries: int,
+                     exclude: Optional[Dict[str, dict]] = None, extra: Optional[List[str]] = None,
+                     run: Callable[..., int] = invoke) -> RunOutcome:
+    """Run the suite once, then rerun only the failed test ids up to ``retries`` times"""
+    extra = extra or []
+    started = time.time()
+    code = run(suite, suite.command(units, exclude) + extra)
+    attempts = [suite.results(since=started)]
+    failed = [v.test_id for v in combine(attempts[0]).values() if v.status == "failed"]
+
+    reruns = 0
+    while failed and reruns < retries:
+        reruns += 1
+        output = suite.lane_output(f"rerun-{reruns}")
+        cmd, env = suite.select_command(failed, output)
+        lane_started = time.time()
+        code = run(suite, cmd + extra, env)
+        # Lane reports outlive the run; one left by an earlier run must not stand in for this one
+        results = suite.output_results(output, since=lane_started)
+        if not results:
+            break
+        attempts.append(results)
+        still_failing = {v.test_id for v in combine(results).values() if v.status == "failed"}
+        failed = [t for t in failed if t in still_failing]
+
+    verdicts = classify(attempts)
+    outcome = RunOutcome(verdicts, code, reruns)
+    # A non-zero exit with no failing test (collection or build error) still fails the run
+    outcome.ok = outcome.count("failed") == 0 and code in suite.ok_codes
+    return outcome
+
+def run_quarantine_lane(suite: Suite, test_ids: List[str], extra: Optional[List[str]] = None,
+                        run: Callable[..., int] = invoke) -> Dict[str, TestVerdict]:
+    """Run quarantined tests once; the result never affects the build"""
+    if not test_ids:
+        return {}
+    output = suite.lane_output("quarantine")
+    cmd, env = suite.select_command(test_ids, output)
+    started = time.time()
+    run(suite, cmd + (extra or []), env)
+    return combine(suite.output_results(output, since=started))
+
+class Quarantine:
+    """Tests that keep flaking, tracked per suite in .agent/quarantine.json"""
+
+    def __init__(self, path: Path, data: Optional[Dict[str, Dict[str, dict]]] = None):
+        self.path = path
+        self.data = data or {}
+
+    @classmethod
+    def load(cls, root: Path) -> "Quarantine":
+        path = root / QUARANTINE_FILE
+        data = {}
+        if path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except ValueError:
+                data = {}
+        return cls(path, data)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.data, indent=2, sort_keys=True), encoding="utf-8")
+        tmp.replace(self.path)
+
+    def quarantined(self, suite: str, units: Optional[List[str]] = None) -> Dict[str, dict]:
+        """Quarantined tests of a suite, limited to ``units`` when running a shard"""
+        return {
+            test_id: entry for test_id, entry in self.data.get(suite, {}).items()
+            if entry.get("quarantined") and (units is None or entry.get("unit") in units)
+        }
+
+    def record(self, suite: str, verdicts: Dict[str, TestVerdict]) -> List[str]:
+        """Track main-lane outcomes; returns ids newly put in quarantine"""
+        added = []
+        tests = self.data.setdefault(suite, {})
+        for v in verdicts.values():
+            entry = tests.get(v.test_id)
+            if entry is None and v.status != "flaky":
+                continue  # only tests that have flaked at least once are tracked
+            entry = entry or {"history": [], "quarantined": False}
+            entry.update(name=v.name, unit=v.unit)
+            entry["history"] = (entry["history"] + [v.status])[-WINDOW:]
+            if not entry["quarantined"] and entry["history"].count("flaky") >= QUARANTINE_AFTER:
+                entry["quarantined"] = True
+                entry["since"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+                added.append(v.test_id)
+            tests[v.test_id] = entry
+        return added
+
+    def record_lane(self, suite: str, verdicts: Dict[str, TestVerdict]) -> List[str]:
+        """Track quarantine-lane outcomes; returns ids released from quarantine"""
+        released = []
+        tests = self.data.get(suite, {})
+        for v in verdicts.values():
+            entry = tests.get(v.test_id)
+            if entry is None:
+                continue
+            entry.setdefault("lane", [])
+            entry["lane"] = (entry["lane"] + [v.status])[-RELEASE_AFTER:]
+            if len(entry["lane"]) == RELEASE_AFTER and set(entry["lane"]) == {"passed"}:
+                tests[v.test_id] = {"name": entry["name"], "unit": entry["unit"],
+                                    "history": [], "quarantined": False}
+                released.append(v.test_id)
+        return released
+
+def format_outcome(suite: str, outcome: RunOutcome) -> str:
+    """One-line summary plus the flaky and failed test ids"""
+    lines = [
+        f"{suite}: {outcome.count('passed')} passed, {outcome.count('flaky')} flaky, "
+        f"{outcome.count('failed')} failed, {outcome.count('skipped')} skipped "
+        f"({outcome.reruns} rerun{'s' if outcome.reruns != 1 else ''})"
+    ]
+    for status in ("flaky", "failed"):
+        for test_id in outcome.ids(status):
+            lines.append(f"  {status.upper():<7} {test_id}")
+    return "\n".join(lines)
@@ -0,0 +1,289 @@
+"""
+Resource-Aware Scheduler
+Admits suites against the machine's cores and memory and sizes each suite's worker count
+"""
+
+import json
+import math
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import IO, Callable, Dict, List, Optional, Tuple
+
+try:
+    import psutil
+except ImportError:  # optional: without it memory comes from rusage, which sees one process at a time
+    psutil = None
+
+RESOURCE_FILE = Path(".agent") / "resources.json"
+
+# Weight of the newest measurement in the learned costs
+SMOOTHING = 0.3
+
+# Share of currently available memory the scheduler hands out; the rest is headroom
+MEMORY_HEADROOM = 0.85
+
+# Runs shorter than this (single reruns, quarantine lanes) say little about a suite's cost
+MIN_SAMPLE_SECONDS = 10.0
+
+SAMPLE_INTERVAL = 0.5
+
+@dataclass
+class SuiteCost:
+    """Memory of the runner itself plus CPU and memory per worker"""
+    base_mb: float
+    mb_per_worker: float
+    cores_per_worker: float
+    # Upper bound on workers relative to the cores, above which more workers stop helping
+    workers_per_core: float = 1.0
+
+# Starting estimates until a suite has been measured
+DEFAULT_COSTS = {
+    # Node plus one browser per worker
+    "ui": SuiteCost(base_mb=400, mb_per_worker=500, cores_per_worker=1.0),
+    # Maven and the test JVM; test threads mostly wait on HTTP
+    "api": SuiteCost(base_mb=900, mb_per_worker=30, cores_per_worker=0.25, workers_per_core=4.0),
+    # One interpreter per xdist worker
+    "backend": SuiteCost(base_mb=150, mb_per_worker=120, cores_per_worker=0.5),
+}
+
+@dataclass
+class Capacity:
+    cores: float
+    memory_mb: float
+
+@dataclass
+class Usage:
+    seconds: float
+    cpu_seconds: float
+    peak_mb: float
+
+    @property
+    def cores(self) -> float:
+        return self.cpu_seconds / self.seconds if self.seconds else 0.0
+
+def available_cores() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+def available_memory_mb() -> float:
+    if psutil is not None:
+        return psutil.virtual_memory().available / 2**20
+    try:
+        with open("/proc/meminfo", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_AVPHYS_PAGES") / 2**20
+    except (AttributeError, ValueError, OSError):
+        return 4096.0
+
+def measure_capacity(max_cores: float = 0, max_memory_mb: float = 0) -> Capacity:
+    """Cores and memory the scheduler may use, optionally capped"""
+    cores = float(available_cores())
+    memory = available_memory_mb() * MEMORY_HEADROOM
+    return Capacity(min(cores, max_cores) if max_cores else cores,
+                    min(memory, max_memory_mb) if max_memory_mb else memory)
+
+def _tree_rss_mb(proc: "psutil.Process") -> float:
+    total = 0
+    for p in [proc, *proc.children(recursive=True)]:
+        try:
+            total += p.memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return total / 2**20
+
+class UsageMonitor:
+    """Tracks a started child's peak memory and, once reaped, its CPU time, children included"""
+
+    def __init__(self, proc: subprocess.Popen):
+        self.proc = proc
+        self.started = time.monotonic()
+        self.peak_mb = 0.0
+        self._done = threading.Event()
+        self._sampler = None
+        if psutil is not None:
+            self._sampler = threading.Thread(target=self._sample, daemon=True)
+            self._sampler.start()
+
+    def _sample(self):
+        try:
+            root = psutil.Process(self.proc.pid)
+        except psutil.NoSuchProcess:
+            return
+        while not self._done.wait(SAMPLE_INTERVAL):
+            self.peak_mb = max(self.peak_mb, _tree_rss_mb(root))
+
+    def wait(self) -> Tuple[int, Optional[Usage]]:
+        """Reap the child; usage is None where the platform cannot report it"""
+        if not hasattr(os, "wait4"):
+            code = self.proc.wait()
+            self._done.set()
+            return code, None
+
+        # wait4 reports the CPU time of the whole (reaped) process tree, unlike Popen.wait
+        _, status, rusage = os.wait4(self.proc.pid, 0)
+        self._done.set()
+        if self._sampler:
+            self._sampler.join()
+        self.proc.returncode = os.waitstatus_to_exitcode(status)
+        # ru_maxrss is in KiB on Linux and covers the largest single process only
+        peak_mb = max(self.peak_mb, rusage.ru_maxrss / 1024)
+        usage = Usage(time.monotonic() - self.started, rusage.ru_utime + rusage.ru_stime, peak_mb)
+        return self.proc.returncode, usage
+
+def run_measured(cmd: List[str], cwd: Path, env: Dict[str, str],
+                 stdout: Optional[IO] = None) -> Tuple[int, Optional[Usage]]:
+    """Run a command to completion and measure its CPU time and peak memory"""
+    proc = subprocess.Popen(cmd, cwd=cwd, env=env, stdout=stdout,
+                            stderr=subprocess.STDOUT if stdout else None)
+    return UsageMonitor(proc).wait()
+
+class ResourceHistory:
+    """Learned per-suite costs, folded in from measured runs"""
+
+    _lock = threading.Lock()
+
+    def __init__(self, path: Path, data: Optional[Dict[str, dict]] = None):
+        self.path = path
+        self.data = data or {}
+
+    @classmethod
+    def load(cls, root: Path) -> "ResourceHistory":
+        path = root / RESOURCE_FILE
+        data = {}
+        if path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except ValueError:
+                data = {}
+        return cls(path, data)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.data, indent=2, sort_keys=True), encoding="utf-8")
+        tmp.replace(self.path)
+
+    def cost(self, suite: str) -> SuiteCost:
+        default = DEFAULT_COSTS.get(suite, SuiteCost(200, 200, 1.0))
+        learned = self.data.get(suite)
+        if not learned:
+            return default
+        return SuiteCost(default.base_mb, learned["mb_per_worker"], learned["cores_per_worker"],
+                         default.workers_per_core)
+
+    def record(self, suite: str, workers: int, usage: Usage):
+        """Fold one run (with ``workers`` workers) into the suite's learned cost"""
+        current = self.cost(suite)
+        workers = max(1, workers)
+        observed_cores = usage.cores / workers
+        observed_mb = max(usage.peak_mb - current.base_mb, 0.0) / workers
+        entry = self.data.get(suite)
+        if entry is None:
+            entry = {"cores_per_worker": observed_cores, "mb_per_worker": observed_mb, "samples": 0}
+        else:
+            entry["cores_per_worker"] = SMOOTHING * observed_cores + (1 - SMOOTHING) * entry["cores_per_worker"]
+            entry["mb_per_worker"] = SMOOTHING * observed_mb + (1 - SMOOTHING) * entry["mb_per_worker"]
+        entry["samples"] += 1
+        entry["last"] = {"workers": workers, **asdict(usage)}
+        self.data[suite] = entry
+
+    @classmethod
+    def update(cls, root: Path, suite: str, workers: int, usage: Usage):
+        """Record a measurement; safe to call from concurrently running suites"""
+        if usage.seconds < MIN_SAMPLE_SECONDS:
+            return
+        with cls._lock:
+            history = cls.load(root)
+            history.record(suite, workers, usage)
+            history.save()
+
+@dataclass
+class Job:
+    name: str
+    cost: SuiteCost
+    # Expected run time at one worker; longer suites get a bigger share of the cores
+    weight: float
+    max_workers: int
+
+@dataclass
+class Allocation:
+    job: Job
+    workers: int
+
+    @property
+    def cores(self) -> float:
+        return self.workers * self.job.cost.cores_per_worker
+
+    @property
+    def memory_mb(self) -> float:
+        return self.job.cost.base_mb + self.workers * self.job.cost.mb_per_worker
+
+class Scheduler:
+    """Starts jobs as soon as their cost fits in what running jobs leave free"""
+
+    def __init__(self, capacity: Capacity):
+        self.capacity = capacity
+        self.running: Dict[Future, Allocation] = {}
+
+    def max_workers(self, cost: SuiteCost) -> int:
+        """Workers beyond this stop helping however much of the machine is free"""
+        return max(1, int(self.capacity.cores * cost.workers_per_core))
+
+    @property
+    def free_cores(self) -> float:
+        return self.capacity.cores - sum(a.cores for a in self.running.values())
+
+    @property
+    def free_memory_mb(self) -> float:
+        return self.capacity.memory_mb - sum(a.memory_mb for a in self.running.values())
+
+    def workers_for(self, job: Job, pending: List[Job]) -> int:
+        """Workers for ``job`` out of the free budget, leaving pending jobs their share; 0 to wait"""
+        total_weight = sum(j.weight for j in pending) or 1.0
+        core_share = self.free_cores * job.weight / total_weight
+        by_cpu = math.floor(core_share / job.cost.cores_per_worker) if job.cost.cores_per_worker else job.max_workers
+        by_memory = math.floor((self.free_memory_mb - job.cost.base_mb) / job.cost.mb_per_worker) \
+            if job.cost.mb_per_worker else job.max_workers
+        workers = min(job.max_workers, by_cpu, by_memory)
+        if workers >= 1:
+            return workers
+        # Nothing else is running, so waiting would never free anything: run it at minimum size
+        return 0 if self.running else 1
+
+    def run(self, jobs: List[Job], start: Callable[[Job, int], bool],
+            on_start: Optional[Callable[[Allocation], None]] = None) -> Dict[str, bool]:
+        """Run every job; returns job name -> success"""
+        pending = sorted(jobs, key=lambda j: (-j.weight, j.name))
+        results: Dict[str, bool] = {}
+        with ThreadPoolExecutor(max_workers=max(1, len(jobs))) as pool:
+            while pending or self.running:
+                for job in list(pending):
+                    workers = self.workers_for(job, pending)
+                    if not workers:
+                        continue
+                    allocation = Allocation(job, workers)
+                    if on_start:
+                        on_start(allocation)
+                    self.running[pool.submit(start, job, workers)] = allocation
+                    pending.remove(job)
+
+                finished, _ = wait(list(self.running), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    allocation = self.running.pop(future)
+                    try:
+                        results[allocation.job.name] = bool(future.result())
+                    except Exception:
+                        results[allocation.job.name] = False
+        return results
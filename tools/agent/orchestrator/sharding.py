@@ -0,0 +1,107 @@
+"""
+Duration History and Sharding
+Keeps per-test durations from past runs and splits suites into runtime-balanced shards
+"""
+
+import heapq
+import json
+import statistics
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from orchestrator.results import TestResult
+
+HISTORY_FILE = Path(".agent") / "durations.json"
+
+# Weight of the newest sample in the moving average
+SMOOTHING = 0.3
+
+# Expected seconds for a unit when there is no history at all
+DEFAULT_UNIT_SECONDS = 1.0
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Parse 'i/N' (1-based) into (i, N)"""
+    try:
+        index, total = (int(part) for part in value.split("/", 1))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{value}', expected i/N such as 1/4")
+    if total < 1 or not 1 <= index <= total:
+        raise ValueError(f"Invalid shard '{value}', index must be between 1 and {max(total, 1)}")
+    return index, total
+
+class DurationHistory:
+    """Exponentially weighted per-test durations, keyed by suite"""
+
+    def __init__(self, path: Path, data: Optional[Dict[str, Dict[str, dict]]] = None):
+        self.path = path
+        self.data = data or {}
+
+    @classmethod
+    def load(cls, root: Path) -> "DurationHistory":
+        path = root / HISTORY_FILE
+        data = {}
+        if path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except ValueError:
+                data = {}
+        return cls(path, data)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.data, indent=2, sort_keys=True), encoding="utf-8")
+        tmp.replace(self.path)
+
+    def record(self, results: Iterable[TestResult]) -> int:
+        """Fold a run's results into the history; skipped tests are ignored"""
+        # Playwright reports one result per browser project, so sum per test id first
+        runs: Dict[Tuple[str, str], float] = defaultdict(float)
+        units: Dict[Tuple[str, str], str] = {}
+        for r in results:
+            if r.status == "skipped":
+                continue
+            runs[(r.suite, r.test_id)] += r.duration
+            units[(r.suite, r.test_id)] = r.unit
+
+        for (suite, test_id), duration in runs.items():
+            entry = self.data.setdefault(suite, {}).get(test_id)
+            if entry is None:
+                entry = {"duration": duration, "samples": 0}
+            else:
+                entry["duration"] = SMOOTHING * duration + (1 - SMOOTHING) * entry["duration"]
+            entry["samples"] += 1
+            entry["unit"] = units[(suite, test_id)]
+            self.data[suite][test_id] = entry
+        return len(runs)
+
+    def unit_durations(self, suite: str) -> Dict[str, float]:
+        totals: Dict[str, float] = defaultdict(float)
+        for entry in self.data.get(suite, {}).values():
+            totals[entry["unit"]] += entry["duration"]
+        return dict(totals)
+
+    def estimate(self, suite: str, units: Iterable[str]) -> Dict[str, float]:
+        """Expected seconds per unit; unknown units get the median of known ones"""
+        known = self.unit_durations(suite)
+        fallback = statistics.median(known.values()) if known else DEFAULT_UNIT_SECONDS
+        return {unit: known.get(unit, fallback) for unit in units}
+
+def partition(costs: Dict[str, float], shards: int) -> List[List[str]]:
+    """Longest-processing-time first: each unit goes to the currently lightest shard"""
+    bins: List[List[str]] = [[] for _ in range(shards)]
+    heap = [(0.0, i) for i in range(shards)]
+    # Sort by name as a tie-breaker so every CI node computes the same split
+    for unit in sorted(costs, key=lambda u: (-costs[u], u)):
+        load, i = heapq.heappop(heap)
+        bins[i].append(unit)
+        heapq.heappush(heap, (load + costs[unit], i))
+    return bins
+
+def select_shard(history: DurationHistory, suite: str, units: List[str],
+                 index: int, total: int) -> Tuple[List[str], float, float]:
+    """Units for shard ``index`` of ``total``, its expected time and the suite total"""
+    costs = history.estimate(suite, units)
+    chosen = partition(costs, total)[index - 1]
+    return sorted(chosen), sum(costs[u] for u in chosen), sum(costs.values())
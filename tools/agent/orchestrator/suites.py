@@ -0,0 +1,413 @@
+"""
+Suite Definitions
+Where each suite lives, how to select a subset of its tests, and where its results land
+"""
+
+import importlib.util
+import json
+import os
+import subprocess
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from orchestrator.process import LOG_DIR
+from orchestrator.results import (
+    Attachment,
+    TestResult,
+    iter_junit_cases,
+    iter_playwright_suite,
+    newer_than,
+    parse_playwright_attachments,
+    parse_playwright_json,
+)
+
+# Rerun and quarantine lane reports, inside the suite directory
+LANE_DIR = Path(".agent") / "lanes"
+
+class Suite:
+    """One runnable test suite (ui, api or backend)"""
+
+    name = ""
+    kind = ""
+    result_glob = ""
+    ok_codes = {0}
+    # Whether the runner can split individual tests across shards itself
+    native_sharding = False
+
+    def __init__(self, root: Path, sol: dict, environment: Optional[str] = None,
+                 overrides: Optional[Dict[str, str]] = None):
+        self.root = root
+        self.sol = sol
+        self.directory = root / self.kind / sol[self.kind]["framework"]
+        # "i/N" handed to the runner's own sharding instead of a unit list
+        self.native_shard: Optional[str] = None
+        # Target environment of a matrix run; its build and report files are kept apart
+        self.environment = environment
+        self.overrides = overrides or {}
+        # Set when suites run side by side: output goes here and the terminal gets no live progress line
+        self.log_path: Optional[Path] = None
+        # Worker count chosen by the resource scheduler; None keeps the runner's own default
+        self.workers: Optional[int] = None
+
+    @property
+    def label(self) -> str:
+        return f"{self.name}@{self.environment}" if self.environment else self.name
+
+    @property
+    def log_file(self) -> Path:
+        """Full output of this suite's commands; only a bounded tail is kept in memory"""
+        return self.log_path or self.root / LOG_DIR / f"{self.label}.log"
+
+    def for_environment(self, environment: str, overrides: Optional[Dict[str, str]] = None) -> "Suite":
+        suite = type(self)(self.root, self.sol, environment, overrides)
+        suite.native_shard = self.native_shard
+        suite.workers = self.workers
+        return suite
+
+    @property
+    def env(self) -> Dict[str, str]:
+        """Extra environment variables for every command of this suite"""
+        if not self.environment:
+            return {}
+        return {"TEST_ENV": self.environment, "RESULTS_SUBDIR": self.environment, **self.overrides}
+
+    @property
+    def results_dir(self) -> Path:
+        """Directory holding this suite's (or this environment's) result files"""
+        raise NotImplementedError
+
+    def isolation_args(self) -> List[str]:
+        """Arguments keeping an environment's build files apart from concurrent runs"""
+        return []
+
+    def worker_args(self) -> List[str]:
+        """Arguments capping the runner at ``self.workers`` parallel workers"""
+        return []
+
+    def default_workers(self) -> int:
+        """Workers the runner starts when no count is passed, for measuring per-worker cost"""
+        return 1
+
+    @property
+    def effective_workers(self) -> int:
+        return self.workers or self.default_workers()
+
+    def discover_units(self) -> List[str]:
+        """Shardable units (spec files, test classes, test modules) present on disk"""
+        raise NotImplementedError
+
+    def command(self, units: Optional[List[str]] = None,
+                exclude: Optional[Dict[str, dict]] = None) -> List[str]:
+        """Test command, restricted to ``units`` and skipping ``exclude`` (test id -> info)"""
+        raise NotImplementedError
+
+    def select_command(self, test_ids: List[str], output: Path) -> Tuple[List[str], Dict[str, str]]:
+        """Command and extra environment running only ``test_ids``, reporting to ``output``"""
+        raise NotImplementedError
+
+    def lane_output(self, label: str) -> Path:
+        """Report location for a rerun or quarantine lane, kept apart from the main report"""
+        raise NotImplementedError
+
+    def unit_for_path(self, path: Path) -> Optional[str]:
+        """Unit a file inside the suite directory belongs to; None for shared code"""
+        raise NotImplementedError
+
+    def result_files(self) -> List[Path]:
+        raise NotImplementedError
+
+    def parse(self, path: Path) -> Iterator[TestResult]:
+        raise NotImplementedError
+
+    def attachments(self, files: Iterable[Path]) -> Iterator[Attachment]:
+        """Artifact files the result files point at; suites without artifacts yield nothing"""
+        return iter(())
+
+    def fresh_result_files(self, since: Optional[float] = None) -> List[Path]:
+        """Result files written at or after ``since`` (stale reports are ignored)"""
+        return [p for p in self.result_files() if newer_than(p, since)]
+
+    def results(self, since: Optional[float] = None) -> List[TestResult]:
+        return self.parse_files(self.fresh_result_files(since))
+
+    def rerun_results(self, since: Optional[float] = None) -> List[List[TestResult]]:
+        """Results of the rerun-N lanes written at or after ``since``, in rerun order"""
+        attempts = []
+        number = 1
+        while newer_than(self.lane_output(f"rerun-{number}"), since):
+            attempts.append(self.output_results(self.lane_output(f"rerun-{number}")))
+            number += 1
+        return attempts
+
+    def output_results(self, output: Path, since: Optional[float] = None) -> List[TestResult]:
+        """Results written to a lane output (a report file or a report directory) at or after ``since``"""
+        if output.is_dir():
+            return self.parse_files(p for p in sorted(output.glob(self.result_glob)) if newer_than(p, since))
+        return self.parse_files([output] if newer_than(output, since) else [])
+
+    def parse_files(self, paths: Iterable[Path]) -> List[TestResult]:
+        results = []
+        for path in paths:
+            results.extend(self.parse(path))
+        return results
+
+class PlaywrightSuite(Suite):
+    name = "ui"
+    kind = "ui"
+    result_glob = "results.json"
+    native_sharding = True
+
+    @property
+    def test_dir(self) -> Path:
+        return self.directory / "tests"
+
+    def discover_units(self) -> List[str]:
+        return sorted(p.relative_to(self.test_dir).as_posix() for p in self.test_dir.rglob("*.spec.ts"))
+
+    def command(self, units: Optional[List[str]] = None,
+                exclude: Optional[Dict[str, dict]] = None) -> List[str]:
+        targets = list(units or [])
+        if exclude:
+            # By file:line location, so same-titled tests in other files or projects still run
+            targets = self.locations_without(targets, set(exclude))
+            if not targets:
+                # An empty filter would run every test
+                targets = ["--grep=(?!)", "--pass-with-no-tests"]
+        cmd = ["npx", "playwright", "test", *targets, *self.retry_args(), *self.worker_args()]
+        if self.native_shard:
+            cmd.append(f"--shard={self.native_shard}")
+        return cmd
+
+    def retry_args(self) -> List[str]:
+        # Retries are driven by the orchestrator, not the config's blanket retries. Its trace mode,
+        # on-first-retry, would then never record, so every failing attempt keeps its trace instead.
+        return ["--retries=0", "--trace=retain-on-failure"]
+
+    def locations_without(self, units: List[str], exclude: Set[str]) -> List[str]:
+        """Filters running ``units`` (all spec files if empty) except the ``file:line`` ids in ``exclude``
+
+        Files without an excluded test stay whole; the others are replaced by their remaining locations.
+        """
+        units = units or self.discover_units()
+        affected = sorted({test_id.rsplit(":", 1)[0] for test_id in exclude} & set(units))
+        if not affected:
+            return units
+        # File arguments are regexes, so the listing can include other files that match them
+        kept = [location for location in self.list_locations(affected)
+                if location not in exclude and location.rsplit(":", 1)[0] in affected]
+        return [unit for unit in units if unit not in affected] + kept
+
+    def list_locations(self, files: List[str]) -> List[str]:
+        """``file:line`` ids of the tests in ``files``, as listed by Playwright without running them"""
+        proc = subprocess.run(["npx", "playwright", "test", "--list", "--reporter=json", *files],
+                              cwd=self.directory, env={**os.environ, **self.env},
+                              capture_output=True, text=True)
+        try:
+            report = json.loads(proc.stdout)
+        except ValueError:
+            raise RuntimeError(f"Could not list Playwright tests in {', '.join(files)}:\n{proc.stderr.strip()}")
+        locations = {}
+        for suite in report.get("suites", []):
+            for result in iter_playwright_suite(suite, self.name):
+                locations[result.test_id] = None
+        return list(locations)
+
+    def select_command(self, test_ids: List[str], output: Path) -> Tuple[List[str], Dict[str, str]]:
+        env = {
+            "PLAYWRIGHT_JSON_OUTPUT_NAME": str(output),
+            "PLAYWRIGHT_JUNIT_OUTPUT_NAME": str(output.with_suffix(".xml")),
+        }
+        # Playwright empties its output folder first; the lane's own keeps the main run's artifacts intact
+        return ["npx", "playwright", "test", *test_ids, *self.retry_args(), "--reporter=json,junit",
+                f"--output={output.with_suffix('')}", *self.worker_args()], env
+
+    @property
+    def results_dir(self) -> Path:
+        base = self.directory / "test-results"
+        return base / self.environment if self.environment else base
+
+    def worker_args(self) -> List[str]:
+        return [f"--workers={self.workers}"] if self.workers else []
+
+    def default_workers(self) -> int:
+        # playwright.config.ts defaults to '50%' of the cores
+        return max(1, (os.cpu_count() or 2) // 2)
+
+    def lane_output(self, label: str) -> Path:
+        # Not under test-results: every run empties it, which would delete the main report and earlier lanes
+        base = self.directory / LANE_DIR
+        return (base / self.environment if self.environment else base) / f"{label}.json"
+
+    def unit_for_path(self, path: Path) -> Optional[str]:
+        if path.name.endswith(".spec.ts") and self.test_dir in path.parents:
+            return path.relative_to(self.test_dir).as_posix()
+        return None
+
+    def result_files(self) -> List[Path]:
+        return [self.results_dir / "results.json"]
+
+    def parse(self, path: Path) -> Iterator[TestResult]:
+        if path.suffix == ".json":
+            yield from parse_playwright_json(path, self.name)
+
+    def attachments(self, files: Iterable[Path]) -> Iterator[Attachment]:
+        for path in files:
+            if path.suffix == ".json":
+                yield from parse_playwright_attachments(path, self.name)
+
+class RestAssuredSuite(Suite):
+    name = "api"
+    kind = "api"
+    result_glob = "TEST-*.xml"
+
+    def discover_units(self) -> List[str]:
+        # Surefire skips abstract base classes such as ApiTest, so do the same
+        return sorted({
+            p.stem for p in (self.directory / "src" / "test" / "java").rglob("*Test.java")
+            if "abstract class" not in p.read_text(encoding="utf-8")
+        })
+
+    def command(self, units: Optional[List[str]] = None,
+                exclude: Optional[Dict[str, dict]] = None) -> List[str]:
+        patterns = list(units or [])
+        if exclude:
+            patterns = (patterns or ["*Test"]) + [f"!{test_id}" for test_id in sorted(exclude)]
+        cmd = ["mvn", "-B", "test", *self.isolation_args(), *self.worker_args()]
+        if patterns:
+            cmd += [f"-Dtest={','.join(patterns)}", "-Dsurefire.failIfNoSpecifiedTests=false"]
+        return cmd
+
+    def select_command(self, test_ids: List[str], output: Path) -> Tuple[List[str], Dict[str, str]]:
+        # Class#method ids; surefire writes this lane's reports to its own directory
+        return [
+            "mvn", "-B", "test", *self.isolation_args(), *self.worker_args(),
+            f"-Dtest={','.join(test_ids)}",
+            "-Dsurefire.failIfNoSpecifiedTests=false",
+            f"-Dsurefire.reportsDirectory={output}",
+        ], {}
+
+    @property
+    def build_dir(self) -> Path:
+        base = self.directory / "target"
+        return base / self.environment if self.environment else base
+
+    @property
+    def results_dir(self) -> Path:
+        return self.build_dir / "surefire-reports"
+
+    def isolation_args(self) -> List[str]:
+        # pom.xml builds into ${build.dir}, so concurrent environments never share classes or reports
+        return [f"-Dbuild.dir={self.build_dir}"] if self.environment else []
+
+    def worker_args(self) -> List[str]:
+        # Replaces the dynamic strategy from junit-platform.properties with a fixed pool
+        if not self.workers:
+            return []
+        prefix = "-Djunit.jupiter.execution.parallel.config"
+        return [f"{prefix}.strategy=fixed",
+                f"{prefix}.fixed.parallelism={self.workers}",
+                f"{prefix}.fixed.max-pool-size={self.workers}"]
+
+    def default_workers(self) -> int:
+        # dynamic strategy, factor 2
+        return 2 * (os.cpu_count() or 1)
+
+    def lane_output(self, label: str) -> Path:
+        return self.results_dir / label
+
+    def unit_for_path(self, path: Path) -> Optional[str]:
+        if path.name.endswith("Test.java") and path.stem in self.discover_units():
+            return path.stem
+        return None
+
+    def result_files(self) -> List[Path]:
+        return sorted(self.results_dir.glob("TEST-*.xml"))
+
+    def parse(self, path: Path) -> Iterator[TestResult]:
+        for case in iter_junit_cases(path):
+            unit = case.classname.rsplit(".", 1)[-1]
+            # JUnit 5 parameterized names look like "method(String)[1]"
+            method = case.name.split("(", 1)[0].split("[", 1)[0]
+            yield TestResult(self.name, f"{unit}#{method}", unit, case.name,
+                             case.status, case.duration, case.retries)
+
+class PytestSuite(Suite):
+    name = "backend"
+    kind = "backend"
+    result_glob = "results.xml"
+    ok_codes = {0, 5}  # 5: nothing collected, e.g. every test of a shard is quarantined
+
+    def discover_units(self) -> List[str]:
+        tests = self.directory / "tests"
+        files = set(tests.rglob("test_*.py")) | set(tests.rglob("*_test.py"))
+        return sorted(p.relative_to(self.directory).as_posix() for p in files)
+
+    def command(self, units: Optional[List[str]] = None,
+                exclude: Optional[Dict[str, dict]] = None) -> List[str]:
+        cmd = ["python", "-m", "pytest", "-v", *(units or []), *self.isolation_args(), *self.worker_args()]
+        if self.environment:
+            # Later options win over the --junitxml/--html in pyproject.toml's addopts
+            cmd += [f"--junitxml={self.results_dir / 'results.xml'}",
+                    f"--html={self.results_dir / 'report.html'}"]
+        for test_id in sorted(exclude or {}):
+            cmd += ["--deselect", test_id]
+        return cmd
+
+    def select_command(self, test_ids: List[str], output: Path) -> Tuple[List[str], Dict[str, str]]:
+        return [
+            "python", "-m", "pytest", "-v", *test_ids, *self.isolation_args(), *self.worker_args(),
+            f"--junitxml={output}",
+            f"--html={output.with_suffix('.html')}",
+        ], {}
+
+    @property
+    def results_dir(self) -> Path:
+        base = self.directory / "test-results"
+        return base / self.environment if self.environment else base
+
+    def isolation_args(self) -> List[str]:
+        return ["-o", f"cache_dir=.pytest_cache/{self.environment}"] if self.environment else []
+
+    def worker_args(self) -> List[str]:
+        # One worker runs in-process; more need pytest-xdist (in requirements.txt)
+        if not self.workers or self.workers < 2 or importlib.util.find_spec("xdist") is None:
+            return []
+        return ["-n", str(self.workers)]
+
+    def lane_output(self, label: str) -> Path:
+        return self.results_dir / f"{label}.xml"
+
+    def unit_for_path(self, path: Path) -> Optional[str]:
+        if (self.directory / "tests") in path.parents and (
+                path.name.startswith("test_") or path.name.endswith("_test.py")) and path.suffix == ".py":
+            return path.relative_to(self.directory).as_posix()
+        return None
+
+    def result_files(self) -> List[Path]:
+        return [self.results_dir / "results.xml"]
+
+    def node_id(self, classname: str, name: str) -> str:
+        """Map a JUnit classname (tests.test_x.TestY) back to a pytest node id"""
+        parts = classname.split(".")
+        for i in range(len(parts), 0, -1):
+            module = "/".join(parts[:i]) + ".py"
+            if (self.directory / module).exists():
+                return "::".join([module, *parts[i:], name])
+        # Module no longer on disk: assume a trailing Test* part is the class
+        split = len(parts) - 1 if len(parts) > 1 and parts[-1].startswith("Test") else len(parts)
+        return "::".join(["/".join(parts[:split]) + ".py", *parts[split:], name])
+
+    def parse(self, path: Path) -> Iterator[TestResult]:
+        for case in iter_junit_cases(path):
+            test_id = self.node_id(case.classname, case.name)
+            yield TestResult(self.name, test_id, test_id.split("::", 1)[0], case.name,
+                             case.status, case.duration, case.retries)
+
+SUITES = {
+    "ui": PlaywrightSuite,
+    "api": RestAssuredSuite,
+    "backend": PytestSuite,
+}
+
+def get_suite(name: str, root: Path, sol: dict, environment: Optional[str] = None) -> Suite:
+    return SUITES[name](root, sol, environment)
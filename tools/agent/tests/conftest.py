@@ -0,0 +1,11 @@
+"""
+Shared setup for the orchestrator and generator unit tests
+"""
+
+import sys
+from pathlib import Path
+
+# The tools import each other as top-level packages (orchestrator, generators, fuzz), as main.py does
+AGENT_DIR = Path(__file__).resolve().parents[1]
+if str(AGENT_DIR) not in sys.path:
+    sys.path.insert(0, str(AGENT_DIR))
@@ -0,0 +1,120 @@
+"""
+Tests for the fuzz runner's keep-alive client against a server with bodiless responses
+"""
+
+import asyncio
+
+import pytest
+
+from fuzz.cases import ACCEPT, FuzzCase
+from fuzz.mock import MockApi
+from fuzz.runner import FuzzClient, run_cases
+
+# Raw responses by request path; none of the bodiless ones sends Content-Length
+RESPONSES = {
+    "/no-content": b"HTTP/1.1 204 No Content\r\n\r\n",
+    "/not-modified": b'HTTP/1.1 304 Not Modified\r\nETag: "v1"\r\n\r\n',
+    "/head": b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: 12\r\n\r\n",
+    "/continue": b"HTTP/1.1 100 Continue\r\n\r\nHTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}",
+    "/chunked": b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n2\r\n[1\r\n1\r\n]\r\n0\r\n\r\n",
+    "/length": b"HTTP/1.1 201 Created\r\nContent-Length: 7\r\n\r\n{\"a\":1}",
+}
+
+def case(method: str, path: str) -> FuzzCase:
+    return FuzzCase(f"{method} {path}", path.strip("/"), method, path, "valid", "", ACCEPT)
+
+@pytest.fixture
+def server():
+    """Start the raw server inside the test's event loop; yields (start, connection count)"""
+    connections = []
+
+    async def serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        connections.append(writer)
+        try:
+            while True:
+                head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+                path = head.split(" ", 2)[1]
+                writer.write(RESPONSES[path])
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start():
+        srv = await asyncio.start_server(serve, "127.0.0.1", 0)
+        host, port = srv.sockets[0].getsockname()[:2]
+        return srv, f"http://{host}:{port}"
+
+    return start, connections
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, 10))
+
+@pytest.mark.parametrize("method, path, status, body", [
+    ("DELETE", "/no-content", 204, ""),
+    ("GET", "/not-modified", 304, ""),
+    ("HEAD", "/head", 200, ""),
+    ("POST", "/continue", 200, "{}"),
+    ("GET", "/chunked", 200, "[1]"),
+    ("PUT", "/length", 201, '{"a":1}'),
+])
+def test_response_framing(server, method, path, status, body):
+    start, connections = server
+
+    async def scenario():
+        srv, url = await start()
+        client = FuzzClient(url, concurrency=1, timeout=1.0)
+        try:
+            # Twice over one connection: a misread body would break the second response
+            return [await client.send(case(method, path)) for _ in range(2)]
+        finally:
+            await client.close()
+            srv.close()
+
+    assert run(scenario()) == [(status, body), (status, body)]
+    assert len(connections) == 1
+
+def test_bodiless_responses_are_not_failures(server):
+    start, connections = server
+    cases = [case(m, p) for m, p in [("DELETE", "/no-content"), ("GET", "/not-modified"),
+                                      ("HEAD", "/head")] * 20]
+
+    async def scenario():
+        srv, url = await start()
+        client = FuzzClient(url, concurrency=4, timeout=1.0)
+        try:
+            return await run_cases(client, cases, concurrency=4)
+        finally:
+            await client.close()
+            srv.close()
+
+    report = run(scenario())
+    assert report.sent == 60
+    assert report.failures == []
+    assert report.statuses == {"2xx": 40, "3xx": 20}
+    assert len(connections) == 4
+
+def test_mock_sends_no_body_for_bodiless_responses():
+    parameters = [{"name": "id", "in": "path", "required": True, "schema": {"type": "string"}}]
+    spec = {"paths": {"/accounts/{id}": {
+        "head": {"operationId": "accountExists", "parameters": parameters, "responses": {"200": {
+            "description": "Exists", "content": {"application/json": {"schema": {
+                "type": "object", "required": ["name", "owner"],
+                "properties": {"name": {"type": "string"}, "owner": {"type": "string"}}}}}}}},
+        "delete": {"operationId": "deleteAccount", "parameters": parameters,
+                   "responses": {"204": {"description": "Deleted"}}},
+    }}}
+
+    async def scenario():
+        srv, url = await MockApi(spec).start()
+        client = FuzzClient(url, concurrency=1, timeout=1.0)
+        try:
+            return [await client.send(FuzzCase("c", op, method, "/accounts/{id}", "valid", "", ACCEPT,
+                                               path_params={"id": "42"}))
+                    for op, method in [("accountExists", "HEAD"), ("deleteAccount", "DELETE")] * 2]
+        finally:
+            await client.close()
+            srv.close()
+
+    assert run(scenario()) == [(200, ""), (204, "")] * 2
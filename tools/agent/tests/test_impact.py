@@ -0,0 +1,131 @@
+"""
+Tests for change-impact test selection against a scratch git repository
+"""
+
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+import yaml
+
+from orchestrator.impact import Impact, changed_entries, compute_impact
+from orchestrator.suites import PytestSuite
+
+SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Accounts", "version": "1"},
+    "paths": {
+        "/accounts": {"get": {"operationId": "listAccounts", "responses": {"200": {"description": "OK"}}}},
+        "/accounts/{id}": {"get": {"operationId": "getAccount", "responses": {"200": {"description": "OK"}}}},
+    },
+}
+
+def git(root: Path, *args: str):
+    subprocess.run(["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+                   cwd=root, check=True, capture_output=True)
+
+def write(root: Path, rel: str, text: str):
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    write(tmp_path, "specs/api.yaml", yaml.safe_dump(SPEC))
+    write(tmp_path, "backend/pytest/tests/test_accounts.py", "def test_list(): pass\n")
+    write(tmp_path, "backend/pytest/conftest.py", "")
+    entries = {
+        op: {"suite": "api", "units": [unit], "files": [], "tests": [], "fingerprint": ""}
+        for op, unit in (("listAccounts", "ListAccountsTest"), ("getAccount", "GetAccountTest"))
+    }
+    write(tmp_path, "traceability.json", json.dumps({
+        "version": 1, "inputs": {"specs/api.yaml": {"kind": "openapi", "shared": "", "entries": entries}}}))
+    git(tmp_path, "init", "-q")
+    git(tmp_path, "add", "-A")
+    git(tmp_path, "commit", "-q", "-m", "base")
+    return tmp_path
+
+@pytest.fixture
+def suites(repo: Path):
+    return {"backend": PytestSuite(repo, {"backend": {"framework": "pytest"}})}
+
+def test_no_changes(repo, suites):
+    impact = compute_impact(repo, "HEAD", suites)
+    assert (impact.full, impact.units_for("api"), impact.units_for("backend")) == (False, [], [])
+
+def test_changed_operation_selects_its_tests(repo, suites):
+    spec = yaml.safe_load((repo / "specs/api.yaml").read_text())
+    spec["paths"]["/accounts/{id}"]["get"]["summary"] = "Fetch one account"
+    write(repo, "specs/api.yaml", yaml.safe_dump(spec))
+    impact = compute_impact(repo, "HEAD", suites)
+    assert impact.units_for("api") == ["GetAccountTest"]
+    assert impact.reasons_for("api") == ["specs/api.yaml: 'getAccount' changed"]
+
+def test_shared_section_change_selects_every_operation(repo, suites):
+    spec = yaml.safe_load((repo / "specs/api.yaml").read_text())
+    spec["info"]["version"] = "2"
+    write(repo, "specs/api.yaml", yaml.safe_dump(spec))
+    assert compute_impact(repo, "HEAD", suites).units_for("api") == ["GetAccountTest", "ListAccountsTest"]
+
+def test_new_operation_runs_the_whole_suite(repo, suites):
+    spec = yaml.safe_load((repo / "specs/api.yaml").read_text())
+    spec["paths"]["/transfers"] = {"post": {"operationId": "createTransfer", "responses": {}}}
+    write(repo, "specs/api.yaml", yaml.safe_dump(spec))
+    assert compute_impact(repo, "HEAD", suites).units_for("api") is None
+
+def test_test_file_and_shared_code(repo, suites):
+    write(repo, "backend/pytest/tests/test_accounts.py", "def test_list(): assert True\n")
+    assert compute_impact(repo, "HEAD", suites).units_for("backend") == ["tests/test_accounts.py"]
+    write(repo, "backend/pytest/conftest.py", "# shared\n")
+    assert compute_impact(repo, "HEAD", suites).units_for("backend") is None
+
+def test_build_output_is_ignored(repo, suites):
+    write(repo, "backend/pytest/test-results/results.xml", "<testsuites/>")
+    assert compute_impact(repo, "HEAD", suites).units_for("backend") == []
+
+def test_full_run_prefix(repo, suites):
+    write(repo, "solution.yaml", "name: demo\n")
+    impact = compute_impact(repo, "HEAD", suites)
+    assert impact.full
+    assert impact.units_for("api") is None
+
+def test_unknown_ref(repo, suites):
+    with pytest.raises(RuntimeError):
+        compute_impact(repo, "no-such-ref", suites)
+
+class TestImpact:
+    def test_whole_suite_absorbs_units(self):
+        impact = Impact()
+        impact.whole_suite("ui", "shared helper changed")
+        impact.add("ui", ["a.spec.ts"], "a changed")
+        assert impact.units_for("ui") is None
+        assert impact.reasons_for("ui") == ["shared helper changed"]
+
+    def test_global_reasons_apply_to_every_suite(self):
+        impact = Impact(reasons=[(None, "everything")])
+        impact.add("api", ["B", "A"], "two classes")
+        assert impact.units_for("api") == ["A", "B"]
+        assert impact.reasons_for("api") == ["everything", "two classes"]
+
+# The layout parse_stories_md reads (as benchmarks/synthetic.py writes it)
+STORIES = """### Story: Login
+Labels: @smoke
+Gherkin:
+Given I am on the login page
+```
+
+### Story: Logout
+Gherkin:
+Given I am signed in
+```
+"""
+
+def test_changed_entries_for_stories():
+    edited = STORIES.replace("Given I am signed in", "Given my session expired")
+    assert changed_entries("stories", STORIES, edited) == {"Logout"}
+    assert changed_entries("stories", STORIES, STORIES.replace("@smoke", "@regression")) == {"Login"}
+
+def test_changed_entries_without_history():
+    assert changed_entries("stories", None, STORIES) is None
+    assert changed_entries("feature", STORIES, STORIES) is None
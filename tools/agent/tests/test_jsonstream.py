@@ -0,0 +1,89 @@
+"""
+Tests for the incremental JSON reader, at chunk sizes that split every token
+"""
+
+import json
+
+import pytest
+
+from orchestrator import jsonstream
+from orchestrator.jsonstream import iter_json_array, iter_json_tree
+
+CHUNK_SIZES = [1, 2, 7, jsonstream.CHUNK_SIZE]
+
+REPORT = {
+    "config": {"workers": 2, "note": "brackets ] } in a \"string\" \\"},
+    "suites": [
+        {"file": "a.spec.ts", "line": 12, "duration": 12.5, "tags": []},
+        {"file": "b\\c.spec.ts", "specs": [{"title": "ünïcode ✓", "ok": True, "x": None}]},
+        {"numbers": [1, -2.5e3, 0]},
+    ],
+    "stats": {"expected": 3},
+}
+
+@pytest.fixture(autouse=True)
+def stdlib_only(monkeypatch):
+    # Exercise the fallback reader even where ijson is installed
+    monkeypatch.setattr(jsonstream, "ijson", None)
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_array_items(tmp_path, chunk_size):
+    path = tmp_path / "report.json"
+    path.write_text(json.dumps(REPORT, indent=2, ensure_ascii=False), encoding="utf-8")
+    assert list(iter_json_array(path, "suites", chunk_size=chunk_size)) == REPORT["suites"]
+
+def test_missing_or_non_array_key(tmp_path):
+    path = tmp_path / "report.json"
+    path.write_text(json.dumps({"suites": {"not": "a list"}, "other": []}), encoding="utf-8")
+    assert list(iter_json_array(path, "suites")) == []
+    assert list(iter_json_array(path, "missing")) == []
+
+def test_malformed_input(tmp_path):
+    path = tmp_path / "report.json"
+    path.write_text('{"suites": [{"file": "a.spec.ts"', encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(iter_json_array(path, "suites", chunk_size=4))
+
+COLLECTION = {
+    "info": {"name": "Bank"},
+    "item": [
+        {"name": "Accounts", "item": [
+            {"name": "List", "request": {"method": "GET", "body": {"raw": "[{\"}\": 1}]"}}},
+            {"name": "Nested", "item": [{"name": "Get", "request": {"method": "GET"}}]},
+        ]},
+        {"name": "Health", "request": {"method": "GET"}, "response": [{"body": "{huge}"}]},
+        "not an object",
+    ],
+    "variable": [{"key": "baseUrl", "value": "http://localhost"}],
+}
+
+@pytest.mark.parametrize("chunk_size", CHUNK_SIZES)
+def test_tree_leaves_and_ancestors(tmp_path, chunk_size):
+    path = tmp_path / "collection.json"
+    path.write_text(json.dumps(COLLECTION), encoding="utf-8")
+    meta = {}
+    leaves = [([a["name"] for a in ancestors], leaf)
+              for ancestors, leaf in iter_json_tree(path, "item", skip={"response"}, meta=meta,
+                                                    chunk_size=chunk_size)]
+    assert leaves == [
+        (["Accounts"], COLLECTION["item"][0]["item"][0]),
+        (["Accounts", "Nested"], {"name": "Get", "request": {"method": "GET"}}),
+        ([], {"name": "Health", "request": {"method": "GET"}}),
+    ]
+    assert meta == {"info": {"name": "Bank"}, "variable": COLLECTION["variable"]}
+
+def test_tree_ancestors_fill_in_after_the_branch(tmp_path):
+    path = tmp_path / "collection.json"
+    path.write_text(json.dumps({"item": [{"name": "Folder", "item": [{"name": "Leaf"}], "auth": {"type": "noauth"}}]}),
+                    encoding="utf-8")
+    seen = []
+    for ancestors, leaf in iter_json_tree(path, "item"):
+        seen.append((dict(ancestors[0]), ancestors))
+    # At yield time only the members before "item" are known; the same dict is completed later
+    assert seen[0][0] == {"name": "Folder"}
+    assert seen[0][1][0] == {"name": "Folder", "auth": {"type": "noauth"}}
+
+def test_utf8_bom(tmp_path):
+    path = tmp_path / "collection.json"
+    path.write_bytes(b"\xef\xbb\xbf" + json.dumps({"item": [{"name": "x"}]}).encode())
+    assert [leaf for _, leaf in iter_json_tree(path, "item")] == [{"name": "x"}]
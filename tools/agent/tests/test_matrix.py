@@ -0,0 +1,113 @@
+"""
+Tests for environment-matrix runs and the merged report
+"""
+
+import json
+import threading
+
+import pytest
+
+from orchestrator.matrix import (
+    MatrixCell,
+    divergent_tests,
+    environment_overrides,
+    format_matrix,
+    merge_report,
+    parse_envs,
+    run_matrix,
+    write_report,
+)
+from orchestrator.retry import RunOutcome, TestVerdict
+
+def outcome(**statuses: str) -> RunOutcome:
+    return RunOutcome({t: TestVerdict(t, "unit", t, s) for t, s in statuses.items()})
+
+@pytest.fixture
+def report():
+    return merge_report([
+        MatrixCell("api", "dev", True, 12.3, outcome(a="passed", b="passed", c="passed")),
+        MatrixCell("api", "qa", False, 15.0, outcome(a="passed", b="failed", c="flaky")),
+        MatrixCell("ui", "dev", True, 30.0, outcome(d="passed")),
+        MatrixCell("ui", "qa", False, 0.0, error="Environment not ready"),
+    ])
+
+class TestParseEnvs:
+    def test_list_is_deduplicated_in_order(self):
+        assert parse_envs(" qa, dev ,qa", ["dev", "qa", "stage"]) == ["qa", "dev"]
+
+    def test_all(self):
+        assert parse_envs("all", ["dev", "qa"]) == ["dev", "qa"]
+
+    def test_undeclared_environments_accepted_without_declarations(self):
+        assert parse_envs("perf", []) == ["perf"]
+
+    @pytest.mark.parametrize("value", ["prod", "dev,prod", " , "])
+    def test_unknown(self, value):
+        with pytest.raises(ValueError):
+            parse_envs(value, ["dev", "qa"])
+
+def test_environment_overrides(tmp_path):
+    (tmp_path / "env").mkdir()
+    (tmp_path / "env" / "config.qa.yaml").write_text(
+        "base_url: https://qa.example.com\ndb_uri: postgresql://qa/db\ntimeout: 30\nredis_uri: 6379\n",
+        encoding="utf-8")
+    assert environment_overrides(tmp_path, "qa") == {"BASE_URL": "https://qa.example.com",
+                                                     "DB_URI": "postgresql://qa/db"}
+    assert environment_overrides(tmp_path, "stage") == {}
+
+class TestRunMatrix:
+    def test_input_order_and_errors(self):
+        def run(suite, env):
+            if env == "qa":
+                raise RuntimeError("boom")
+            return MatrixCell(suite, env, True, 1.0)
+
+        cells = run_matrix([("api", "qa"), ("api", "dev"), ("ui", "dev")], run, max_parallel=2)
+        assert [(c.suite, c.environment, c.ok, c.error) for c in cells] == [
+            ("api", "qa", False, "boom"), ("api", "dev", True, ""), ("ui", "dev", True, "")]
+
+    def test_parallelism_is_capped(self):
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def run(suite, env):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            threading.Event().wait(0.02)
+            with lock:
+                active[0] -= 1
+            return MatrixCell(suite, env, True, 0.02)
+
+        run_matrix([("api", e) for e in ("a", "b", "c", "d", "e")], run, max_parallel=2)
+        assert peak[0] <= 2
+
+class TestReport:
+    def test_merge(self, report):
+        assert report["environments"] == ["dev", "qa"]
+        assert report["cells"][1] == {"suite": "api", "environment": "qa", "ok": False, "seconds": 15.0,
+                                      "error": "", "log": "", "passed": 1, "flaky": 1, "failed": 1,
+                                      "skipped": 0}
+        assert report["tests"]["api: b"] == {"dev": "passed", "qa": "failed"}
+
+    def test_divergent(self, report):
+        assert divergent_tests(report) == {
+            "api: b": {"dev": "passed", "qa": "failed"},
+            "api: c": {"dev": "passed", "qa": "flaky"},
+            "ui: d": {"dev": "passed"},
+        }
+
+    def test_format(self, report):
+        lines = format_matrix(report).splitlines()
+        assert lines[1].split() == ["api", "3/0/0", "1/1/1", "FAIL"]
+        assert lines[2].split() == ["ui", "1/0/0", "ERROR"]
+        assert "  ui@qa: Environment not ready" in lines
+        assert "  ui: d: dev=passed, qa=missing" in lines
+
+    def test_write(self, tmp_path, report):
+        json_path, md_path = write_report(tmp_path, report)
+        assert json.loads(json_path.read_text(encoding="utf-8")) == report
+        markdown = md_path.read_text(encoding="utf-8")
+        assert "| api | ✅ 3 passed, 0 flaky, 0 failed (12s) | ❌ 1 passed, 1 flaky, 1 failed (15s) |" in markdown
+        assert "| ui | ✅ 1 passed, 0 flaky, 0 failed (30s) | error: Environment not ready |" in markdown
+        assert "| `ui: d` | passed | missing |" in markdown
@@ -0,0 +1,66 @@
+"""
+Tests for reading Postman collections, in the member order Postman exports them
+"""
+
+import json
+
+import pytest
+
+from generators.postman_to_tests import plan_tests, read_collection
+
+# Postman writes each folder's auth and the collection's auth and variables after ``item``
+COLLECTION = {
+    "info": {"name": "Accounts", "schema": "https://schema.getpostman.com/json/collection/v2.1.0/collection.json"},
+    "item": [
+        {
+            "name": "Public",
+            "item": [
+                {"name": "Health", "request": {"method": "GET", "url": {"raw": "{{baseUrl}}/health"}},
+                 "response": []},
+                {
+                    "name": "Signed",
+                    "item": [
+                        {"name": "Sign", "request": {"method": "POST", "url": "{{baseUrl}}/sign"}, "response": []},
+                    ],
+                    "auth": {"type": "apikey"},
+                },
+            ],
+            "auth": {"type": "noauth"},
+        },
+        {
+            "name": "Accounts",
+            "item": [
+                {"name": "List", "request": {"method": "GET", "url": "{{baseUrl}}/accounts"}, "response": []},
+                {"name": "Open", "request": {"auth": {"type": "basic"}, "method": "GET",
+                                             "url": "{{baseUrl}}/accounts/open"}, "response": []},
+            ],
+        },
+    ],
+    "auth": {"type": "bearer", "bearer": [{"key": "token", "value": "{{token}}", "type": "string"}]},
+    "variable": [{"key": "baseUrl", "value": "https://api.example.test"}],
+}
+
+@pytest.fixture
+def collection_path(tmp_path):
+    path = tmp_path / "accounts.postman_collection.json"
+    path.write_text(json.dumps(COLLECTION, indent=2), encoding="utf-8")
+    return path
+
+def test_folder_auth_after_items(collection_path):
+    collection = read_collection(collection_path)
+
+    assert collection.auth == "bearer"
+    assert collection.variables == {"baseUrl": "https://api.example.test"}
+    assert {r.name: (r.folder, r.auth) for r in collection.requests} == {
+        "Health": ("Public", "noauth"),
+        "Sign": ("Public", "apikey"),
+        "List": ("Accounts", None),
+        "Open": ("Accounts", "basic"),
+    }
+
+def test_noauth_folder_is_not_secured(collection_path):
+    collection = read_collection(collection_path)
+    tests, duplicates = plan_tests(collection, collection.variables, None)
+
+    assert duplicates == 0
+    assert {t.request.name: t.secured for t in tests} == {"Health": False, "Sign": True, "List": True, "Open": True}
@@ -0,0 +1,122 @@
+"""
+Tests for runner output streaming and progress parsing
+"""
+
+import os
+import sys
+
+import pytest
+
+from orchestrator import process
+from orchestrator.process import (
+    Progress,
+    StreamResult,
+    format_failure,
+    get_parser,
+    relevant_tail,
+    run_streamed,
+)
+
+def feed(suite: str, lines):
+    parser = get_parser(suite)
+    progress = Progress()
+    changed = [parser.feed(line, progress) for line in lines]
+    return progress, changed
+
+class TestPytestProgress:
+    def test_verbose_lines(self):
+        progress, changed = feed("backend", [
+            "collected 5 items",
+            "tests/test_a.py::test_one PASSED                      [ 20%]",
+            "tests/test_a.py::TestB::test_two[param-1] FAILED     [ 40%]",
+            "tests/test_a.py::test_three SKIPPED (no db)           [ 60%]",
+            "tests/test_a.py::test_four XFAIL                      [ 80%]",
+            "tests/test_a.py::test_five ERROR                      [100%]",
+            "FAILED tests/test_a.py::TestB::test_two[param-1] - assert 1 == 2",
+        ])
+        assert (progress.total, progress.passed, progress.failed, progress.skipped) == (5, 1, 2, 2)
+        assert changed[-1] is False
+
+    def test_selected_count_wins(self):
+        progress, _ = feed("backend", ["collected 40 items / 5 deselected / 35 selected"])
+        assert progress.total == 35
+
+    def test_xdist_lines(self):
+        progress, _ = feed("backend", [
+            "4 workers [12 items]",
+            "[gw0] [  8%] PASSED tests/test_a.py::test_one",
+            "[gw3] [ 16%] FAILED tests/test_a.py::test_two",
+        ])
+        assert (progress.total, progress.passed, progress.failed) == (12, 1, 1)
+
+class TestPlaywrightProgress:
+    def test_list_reporter(self):
+        progress, _ = feed("ui", [
+            "Running 4 tests using 2 workers",
+            "  ✓  1 [chromium] › login.spec.ts:3:5 › logs in (1.2s)",
+            "  ✘  2 [chromium] › login.spec.ts:9:5 › rejects bad password (3.0s)",
+            "  -  3 [firefox] › smoke.spec.ts:4:5 › skipped",
+            "  ok 4 [firefox] › login.spec.ts:3:5 › logs in (1.1s)",
+            "  1) [chromium] › login.spec.ts:9:5 › rejects bad password",
+        ])
+        assert (progress.total, progress.passed, progress.failed, progress.skipped) == (4, 2, 1, 1)
+        assert progress.summary() == "4/4 tests: 2 passed, 1 failed, 1 skipped"
+
+class TestSurefireProgress:
+    def test_per_class_lines_only(self):
+        progress, _ = feed("api", [
+            "[INFO] Tests run: 5, Failures: 1, Errors: 1, Skipped: 1, Time elapsed: 1.2 s - in com.acme.AccountsTest",
+            "[INFO] Tests run: 3, Failures: 0, Errors: 0, Skipped: 0, Time elapsed: 0.4 s - in com.acme.HealthTest",
+            "[ERROR] Tests run: 8, Failures: 1, Errors: 1, Skipped: 1",
+        ])
+        assert (progress.total, progress.passed, progress.failed, progress.skipped) == (None, 5, 2, 1)
+        assert progress.summary() == "8 tests: 5 passed, 2 failed, 1 skipped"
+
+def test_unknown_suite_has_no_parser():
+    assert get_parser("perf") is None
+
+class TestFailureOutput:
+    def test_tail_starts_at_failure_section(self):
+        lines = ["collecting", "test output", "=== FAILURES ===", "assert 1 == 2", "1 failed"]
+        assert relevant_tail(lines) == ["=== FAILURES ===", "assert 1 == 2", "1 failed"]
+
+    def test_tail_is_bounded(self):
+        lines = [f"line {i}" for i in range(100)]
+        assert relevant_tail(lines, limit=3) == ["line 97", "line 98", "line 99"]
+
+    def test_format_failure(self, tmp_path):
+        result = StreamResult(1, ["[ERROR] BUILD FAILURE"], Progress(passed=2, failed=1))
+        assert format_failure("api", result, tmp_path / "api.log").splitlines() == [
+            f"api exited with code 1 (3 tests: 2 passed, 1 failed, 0 skipped); full output in {tmp_path / 'api.log'}",
+            "  | [ERROR] BUILD FAILURE",
+        ]
+
+class TestRunStreamed:
+    def test_streams_to_log_and_bounded_tail(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(process, "TAIL_LINES", 3)
+        log = tmp_path / "logs" / "backend.log"
+        script = ("import sys\n"
+                  "print('collected 2 items')\n"
+                  "for i in range(5): print(f'noise {i}')\n"
+                  "print('tests/test_a.py::test_one PASSED')\n"
+                  "print('tests/test_a.py::test_two FAILED')\n"
+                  "sys.exit(1)\n")
+        result = run_streamed([sys.executable, "-c", script], tmp_path, dict(os.environ), log,
+                              get_parser("backend"))
+        assert result.returncode == 1
+        assert result.tail == ["noise 4", "tests/test_a.py::test_one PASSED", "tests/test_a.py::test_two FAILED"]
+        assert (result.progress.total, result.progress.passed, result.progress.failed) == (2, 1, 1)
+        assert log.read_text(encoding="utf-8").count("\n") == 8
+
+    def test_long_lines_are_split(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(process, "MAX_LINE_CHARS", 10)
+        result = run_streamed([sys.executable, "-c", "print('x' * 25)"], tmp_path, dict(os.environ),
+                              tmp_path / "out.log")
+        assert result.tail == ["x" * 10, "x" * 10, "x" * 5]
+
+    @pytest.mark.skipif(not hasattr(os, "wait4"), reason="usage needs os.wait4")
+    def test_reports_usage(self, tmp_path):
+        result = run_streamed([sys.executable, "-c", "sum(range(10 ** 5))"], tmp_path, dict(os.environ),
+                              tmp_path / "out.log")
+        assert result.usage is not None
+        assert result.usage.peak_mb > 0
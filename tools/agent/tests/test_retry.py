@@ -0,0 +1,162 @@
+"""
+Tests for rerun classification, the retry loop and the quarantine
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from orchestrator.results import TestResult
+from orchestrator.retry import (
+    QUARANTINE_AFTER,
+    RELEASE_AFTER,
+    WINDOW,
+    Quarantine,
+    RunOutcome,
+    TestVerdict,
+    classify,
+    combine,
+    fold_reruns,
+    format_outcome,
+    run_with_retries,
+)
+
+def result(test_id: str, status: str, name: str = "", duration: float = 1.0) -> TestResult:
+    return TestResult("backend", test_id, test_id.split("::", 1)[0], name or test_id, status, duration)
+
+def verdicts(**statuses: str) -> Dict[str, TestVerdict]:
+    return {t: TestVerdict(t, "unit", t, s) for t, s in statuses.items()}
+
+class FakeSuite:
+    """Replays canned results: the first run, then one list per rerun lane"""
+
+    ok_codes = {0}
+
+    def __init__(self, first: List[TestResult], reruns: List[List[TestResult]]):
+        self.first = first
+        self.reruns = reruns
+        self.selected: List[List[str]] = []
+
+    def command(self, units: Optional[List[str]], exclude: Optional[Dict[str, dict]]) -> List[str]:
+        return ["run", *(units or []), *(f"!{t}" for t in sorted(exclude or {}))]
+
+    def results(self, since: Optional[float] = None) -> List[TestResult]:
+        return self.first
+
+    def lane_output(self, label: str) -> Path:
+        return Path(label)
+
+    def select_command(self, test_ids: List[str], output: Path):
+        self.selected.append(list(test_ids))
+        return ["rerun", str(output)], {}
+
+    def output_results(self, output: Path, since: Optional[float] = None) -> List[TestResult]:
+        number = int(output.name.rsplit("-", 1)[1])
+        return self.reruns[number - 1] if number <= len(self.reruns) else []
+
+class TestClassify:
+    def test_combine_keeps_worst_project(self):
+        combined = combine([result("a", "passed", "chromium > a"), result("a", "failed", "firefox > a"),
+                            result("b", "skipped")])
+        assert {t: v.status for t, v in combined.items()} == {"a": "failed", "b": "skipped"}
+
+    def test_failure_passing_on_rerun_is_flaky(self):
+        final = classify([
+            [result("a", "failed"), result("b", "failed"), result("c", "passed")],
+            [result("a", "passed"), result("b", "failed")],
+            [result("b", "failed")],
+        ])
+        assert {t: (v.status, v.attempts) for t, v in final.items()} == {
+            "a": ("flaky", 2), "b": ("failed", 3), "c": ("passed", 1)}
+
+    def test_no_attempts(self):
+        assert classify([]) == {}
+
+class TestRunWithRetries:
+    def test_reruns_only_failures(self):
+        suite = FakeSuite(
+            [result("a", "failed"), result("b", "failed"), result("c", "passed")],
+            [[result("a", "passed"), result("b", "failed")], [result("b", "failed")]],
+        )
+        commands = []
+        outcome = run_with_retries(suite, ["u"], retries=3, exclude={"q": {}},
+                                   run=lambda s, cmd, env=None: commands.append(cmd) or 1)
+        assert commands[0] == ["run", "u", "!q"]
+        assert suite.selected == [["a", "b"], ["b"], ["b"]]
+        assert outcome.reruns == 3
+        assert (outcome.ids("flaky"), outcome.ids("failed")) == (["a"], ["b"])
+        assert not outcome.ok
+
+    def test_clean_run_is_ok(self):
+        suite = FakeSuite([result("a", "passed")], [])
+        outcome = run_with_retries(suite, None, retries=2, run=lambda s, cmd, env=None: 0)
+        assert (outcome.ok, outcome.reruns, suite.selected) == (True, 0, [])
+
+    def test_bad_exit_without_failures_fails(self):
+        suite = FakeSuite([result("a", "passed")], [])
+        assert not run_with_retries(suite, None, retries=2, run=lambda s, cmd, env=None: 2).ok
+
+    def test_empty_rerun_stops(self):
+        suite = FakeSuite([result("a", "failed")], [])
+        outcome = run_with_retries(suite, None, retries=3, run=lambda s, cmd, env=None: 1)
+        assert (outcome.reruns, outcome.ids("failed")) == (1, ["a"])
+
+def test_fold_reruns_matches_classify():
+    first = [result("a", "failed", "chromium > a"), result("a", "failed", "firefox > a"),
+             result("b", "failed"), result("c", "passed")]
+    reruns = [[result("a", "passed", "chromium > a", 0.5), result("a", "failed", "firefox > a", 0.5),
+               result("b", "failed", duration=0.5)],
+              [result("a", "passed", "firefox > a", 0.5), result("b", "failed", duration=0.5)]]
+    folded = [(r.name, r.status, r.retries, r.duration) for r in fold_reruns(first, reruns)]
+    assert folded == [("chromium > a", "flaky", 1, 1.5), ("firefox > a", "flaky", 2, 2.0),
+                      ("b", "failed", 2, 2.0), ("c", "passed", 0, 1.0)]
+
+class TestQuarantine:
+    def test_enters_after_repeated_flakes(self, tmp_path):
+        quarantine = Quarantine(tmp_path / "quarantine.json")
+        added = []
+        for _ in range(QUARANTINE_AFTER):
+            assert quarantine.quarantined("backend") == {}
+            added += quarantine.record("backend", verdicts(a="flaky", b="passed"))
+        assert added == ["a"]
+        assert list(quarantine.quarantined("backend")) == ["a"]
+        assert "b" not in quarantine.data["backend"]
+
+    def test_flakes_age_out_of_the_window(self, tmp_path):
+        quarantine = Quarantine(tmp_path / "quarantine.json")
+        quarantine.record("backend", verdicts(a="flaky"))
+        for _ in range(WINDOW):
+            quarantine.record("backend", verdicts(a="passed"))
+        for _ in range(QUARANTINE_AFTER - 1):
+            quarantine.record("backend", verdicts(a="flaky"))
+        assert quarantine.quarantined("backend") == {}
+
+    def test_filtered_by_unit(self, tmp_path):
+        quarantine = Quarantine(tmp_path / "quarantine.json",
+                                {"ui": {"x.spec.ts:1": {"quarantined": True, "unit": "x.spec.ts"}}})
+        assert quarantine.quarantined("ui", ["y.spec.ts"]) == {}
+        assert list(quarantine.quarantined("ui", ["x.spec.ts"])) == ["x.spec.ts:1"]
+
+    def test_released_after_clean_lane_runs(self, tmp_path):
+        quarantine = Quarantine(tmp_path / "quarantine.json")
+        for _ in range(QUARANTINE_AFTER):
+            quarantine.record("backend", verdicts(a="flaky"))
+        quarantine.record_lane("backend", verdicts(a="failed"))
+        released = []
+        for _ in range(RELEASE_AFTER):
+            released += quarantine.record_lane("backend", verdicts(a="passed", unknown="passed"))
+        assert released == ["a"]
+        assert quarantine.quarantined("backend") == {}
+
+    def test_round_trip(self, tmp_path):
+        quarantine = Quarantine.load(tmp_path)
+        quarantine.record("api", verdicts(**{"C#m": "flaky"}))
+        quarantine.save()
+        assert Quarantine.load(tmp_path).data["api"]["C#m"]["history"] == ["flaky"]
+
+def test_format_outcome():
+    outcome = RunOutcome(verdicts(a="passed", b="flaky", c="failed"), returncode=1, reruns=1)
+    assert format_outcome("backend", outcome).splitlines() == [
+        "backend: 1 passed, 1 flaky, 1 failed, 0 skipped (1 rerun)",
+        "  FLAKY   b",
+        "  FAILED  c",
+    ]
@@ -0,0 +1,109 @@
+"""
+Tests for the resource-aware scheduler
+"""
+
+import threading
+
+from orchestrator.scheduler import (
+    MIN_SAMPLE_SECONDS,
+    Allocation,
+    Capacity,
+    Job,
+    ResourceHistory,
+    Scheduler,
+    SuiteCost,
+    Usage,
+)
+
+def job(name: str, weight: float = 1.0, max_workers: int = 16, cores: float = 1.0, mb: float = 100,
+        base_mb: float = 0) -> Job:
+    return Job(name, SuiteCost(base_mb=base_mb, mb_per_worker=mb, cores_per_worker=cores), weight, max_workers)
+
+class TestWorkersFor:
+    def test_cores_split_by_weight(self):
+        scheduler = Scheduler(Capacity(cores=8, memory_mb=100_000))
+        heavy, light = job("heavy", weight=3), job("light", weight=1)
+        assert scheduler.workers_for(heavy, [heavy, light]) == 6
+        assert scheduler.workers_for(light, [heavy, light]) == 2
+
+    def test_memory_bound(self):
+        scheduler = Scheduler(Capacity(cores=16, memory_mb=1000))
+        assert scheduler.workers_for(job("ui", mb=300, base_mb=100), []) == 3
+
+    def test_capped_by_max_workers(self):
+        scheduler = Scheduler(Capacity(cores=64, memory_mb=100_000))
+        assert scheduler.workers_for(job("api", max_workers=4), []) == 4
+
+    def test_waits_while_others_run(self):
+        scheduler = Scheduler(Capacity(cores=4, memory_mb=100_000))
+        scheduler.running[object()] = Allocation(job("busy"), 4)
+        assert scheduler.workers_for(job("next"), []) == 0
+
+    def test_runs_at_minimum_size_when_idle(self):
+        scheduler = Scheduler(Capacity(cores=1, memory_mb=50))
+        assert scheduler.workers_for(job("big", cores=2, mb=500), []) == 1
+
+    def test_max_workers_per_core(self):
+        scheduler = Scheduler(Capacity(cores=4, memory_mb=1000))
+        cost = SuiteCost(base_mb=0, mb_per_worker=1, cores_per_worker=0.25, workers_per_core=4.0)
+        assert scheduler.max_workers(cost) == 16
+
+class TestRun:
+    def test_every_job_reports(self):
+        scheduler = Scheduler(Capacity(cores=4, memory_mb=100_000))
+        started = []
+
+        def start(j: Job, workers: int) -> bool:
+            if j.name == "boom":
+                raise RuntimeError("runner crashed")
+            return j.name != "fail"
+
+        results = scheduler.run([job("ok"), job("fail"), job("boom")], start,
+                                on_start=lambda a: started.append((a.job.name, a.workers)))
+        assert results == {"ok": True, "fail": False, "boom": False}
+        assert sorted(name for name, _ in started) == ["boom", "fail", "ok"]
+        assert scheduler.running == {}
+
+    def test_later_job_waits_for_memory(self):
+        scheduler = Scheduler(Capacity(cores=4, memory_mb=250))
+        finished = []
+
+        def start(j: Job, workers: int) -> bool:
+            if j.name == "first":
+                threading.Event().wait(0.05)
+            finished.append(j.name)
+            return True
+
+        def on_start(allocation: Allocation):
+            if allocation.job.name == "second":
+                # Admitted only once the first job has given its memory back
+                assert finished == ["first"]
+
+        jobs = [job("first", weight=2, base_mb=200, mb=10), job("second", base_mb=200, mb=10)]
+        assert scheduler.run(jobs, start, on_start) == {"first": True, "second": True}
+        assert finished == ["first", "second"]
+
+class TestResourceHistory:
+    def test_first_sample_is_taken_as_is(self, tmp_path):
+        history = ResourceHistory(tmp_path / "resources.json")
+        history.record("backend", 2, Usage(seconds=20, cpu_seconds=20, peak_mb=550))
+        cost = history.cost("backend")
+        assert cost.cores_per_worker == 0.5
+        assert cost.mb_per_worker == 200  # (550 - 150 base) / 2 workers
+        assert history.data["backend"]["samples"] == 1
+
+    def test_later_samples_are_smoothed(self, tmp_path):
+        history = ResourceHistory(tmp_path / "resources.json")
+        history.record("backend", 1, Usage(seconds=10, cpu_seconds=10, peak_mb=150))
+        history.record("backend", 1, Usage(seconds=10, cpu_seconds=0, peak_mb=150))
+        assert round(history.cost("backend").cores_per_worker, 6) == 0.7
+        assert history.data["backend"]["last"]["workers"] == 1
+
+    def test_unknown_suite_uses_defaults(self, tmp_path):
+        assert ResourceHistory(tmp_path / "resources.json").cost("ui").mb_per_worker == 500
+
+    def test_update_skips_short_runs(self, tmp_path):
+        ResourceHistory.update(tmp_path, "api", 2, Usage(MIN_SAMPLE_SECONDS - 1, 5, 900))
+        assert ResourceHistory.load(tmp_path).data == {}
+        ResourceHistory.update(tmp_path, "api", 2, Usage(MIN_SAMPLE_SECONDS, 5, 900))
+        assert ResourceHistory.load(tmp_path).data["api"]["samples"] == 1
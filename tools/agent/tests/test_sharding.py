@@ -0,0 +1,77 @@
+"""
+Tests for duration history and shard selection
+"""
+
+import pytest
+
+from orchestrator.results import TestResult
+from orchestrator.sharding import DEFAULT_UNIT_SECONDS, DurationHistory, parse_shard, partition, select_shard
+
+def result(test_id: str, unit: str, duration: float, status: str = "passed", suite: str = "ui") -> TestResult:
+    return TestResult(suite, test_id, unit, test_id, status, duration)
+
+class TestParseShard:
+    def test_valid(self):
+        assert parse_shard("2/4") == (2, 4)
+
+    @pytest.mark.parametrize("value", ["0/4", "5/4", "1/0", "two/4", "3"])
+    def test_invalid(self, value):
+        with pytest.raises(ValueError):
+            parse_shard(value)
+
+class TestPartition:
+    def test_longest_first_balances(self):
+        bins = partition({"a": 7, "b": 5, "c": 4, "d": 3, "e": 1}, 2)
+        loads = sorted(sum({"a": 7, "b": 5, "c": 4, "d": 3, "e": 1}[u] for u in b) for b in bins)
+        assert loads == [10, 10]
+
+    def test_deterministic_ties(self):
+        costs = {name: 1.0 for name in "dcba"}
+        assert partition(costs, 2) == [["a", "c"], ["b", "d"]]
+
+    def test_more_shards_than_units(self):
+        assert partition({"a": 1.0}, 3) == [["a"], [], []]
+
+class TestDurationHistory:
+    def test_projects_are_summed_and_skips_ignored(self, tmp_path):
+        history = DurationHistory(tmp_path / "durations.json")
+        recorded = history.record([
+            result("a.spec.ts:3", "a.spec.ts", 1.0),
+            result("a.spec.ts:3", "a.spec.ts", 2.0),
+            result("b.spec.ts:9", "b.spec.ts", 5.0, status="skipped"),
+        ])
+        assert recorded == 1
+        assert history.data["ui"]["a.spec.ts:3"] == {"duration": 3.0, "samples": 1, "unit": "a.spec.ts"}
+
+    def test_moving_average(self, tmp_path):
+        history = DurationHistory(tmp_path / "durations.json")
+        history.record([result("t", "u", 10.0)])
+        history.record([result("t", "u", 20.0)])
+        assert history.data["ui"]["t"]["duration"] == pytest.approx(13.0)
+
+    def test_estimate_falls_back_to_median(self, tmp_path):
+        history = DurationHistory(tmp_path / "durations.json")
+        history.record([result("1", "a", 1.0), result("2", "b", 3.0), result("3", "c", 8.0)])
+        assert history.estimate("ui", ["a", "new"]) == {"a": 1.0, "new": 3.0}
+        assert history.estimate("api", ["x"]) == {"x": DEFAULT_UNIT_SECONDS}
+
+    def test_round_trip(self, tmp_path):
+        history = DurationHistory.load(tmp_path)
+        history.record([result("t", "u", 2.0)])
+        history.save()
+        assert DurationHistory.load(tmp_path).unit_durations("ui") == {"u": 2.0}
+
+    def test_corrupt_file_is_ignored(self, tmp_path):
+        history = DurationHistory.load(tmp_path)
+        history.path.parent.mkdir(parents=True)
+        history.path.write_text("{not json", encoding="utf-8")
+        assert DurationHistory.load(tmp_path).data == {}
+
+def test_select_shard_covers_every_unit(tmp_path):
+    history = DurationHistory(tmp_path / "durations.json")
+    history.record([result(str(i), f"u{i}", float(i)) for i in range(1, 8)])
+    units = [f"u{i}" for i in range(1, 8)]
+    shards = [select_shard(history, "ui", units, i, 3) for i in range(1, 4)]
+    assert sorted(u for chosen, _, _ in shards for u in chosen) == sorted(units)
+    assert {total for _, _, total in shards} == {28.0}
+    assert max(expected for _, expected, _ in shards) <= 10.0
@@ -0,0 +1,65 @@
+"""
+Tests for the ids the story generator records in the traceability index
+"""
+
+import json
+from pathlib import Path
+
+from generators.story_to_tests import generate_from_stories
+from generators.traceability import INDEX_FILE, playwright_test_ids
+
+TEMPLATES = Path(__file__).resolve().parents[1] / "templates"
+
+SOL = {"ui": {"framework": "playwright"}}
+
+STORIES = """### Story: Login
+Labels: @smoke, @ui
+Gherkin:
+Given I am on the login page
+```
+
+### Story: Live balance
+Labels: @live
+Gherkin:
+Given I am on the login page
+```
+"""
+
+FEATURE = """Feature: Transfers
+  Scenario: Send money
+    Given I am on the login page
+"""
+
+def test_playwright_test_ids():
+    source = "\n".join([
+        "test.describe('x', () => {",
+        "  test.use({});",
+        "",
+        "  test('a', async () => {});",
+        "  test('b', async () => {});",
+        "});",
+    ])
+    assert playwright_test_ids("x.spec.ts", source) == ["x.spec.ts:4", "x.spec.ts:5"]
+
+def test_story_entries_use_playwright_result_ids(tmp_path):
+    (tmp_path / "stories.md").write_text(STORIES, encoding="utf-8")
+    (tmp_path / "features").mkdir()
+    (tmp_path / "features" / "transfers.feature").write_text(FEATURE, encoding="utf-8")
+
+    generate_from_stories(tmp_path, SOL, tmp_path / "stories.md", tmp_path / "features", TEMPLATES)
+
+    inputs = json.loads((tmp_path / INDEX_FILE).read_text(encoding="utf-8"))["inputs"]
+    entries = {**inputs["stories.md"]["entries"], **inputs["features/transfers.feature"]["entries"]}
+    tests_dir = tmp_path / "ui" / "playwright" / "tests"
+    for entry in entries.values():
+        (unit,) = entry["units"]
+        lines = (tests_dir / unit).read_text(encoding="utf-8").splitlines()
+        (test_id,) = entry["tests"]
+        file, line = test_id.rsplit(":", 1)
+        # Same file:line id a Playwright result for this test carries
+        assert file == unit
+        assert lines[int(line) - 1].lstrip().startswith("test(")
+    # @live stories add a test.use block, which moves the test down
+    assert sorted(entries) == ["Live balance", "Login", "transfers"]
+    assert entries["Login"]["tests"] == ["login.spec.ts:6"]
+    assert entries["Live balance"]["tests"] == ["live_balance.spec.ts:9"]
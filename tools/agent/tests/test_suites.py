@@ -0,0 +1,47 @@
+"""
+Tests for where suites put their rerun and quarantine lane reports
+"""
+
+import json
+import os
+
+from orchestrator.suites import PlaywrightSuite
+
+SOL = {"ui": {"framework": "playwright"}}
+
+REPORT = {"suites": [{"title": "login.spec.ts", "file": "login.spec.ts", "specs": [
+    {"title": "signs in", "file": "login.spec.ts", "line": 3, "column": 1, "tests": [
+        {"projectName": "chromium", "status": "expected", "results": [{"status": "passed", "duration": 10}]},
+    ]},
+]}]}
+
+def test_playwright_lanes_are_outside_the_output_folder(tmp_path):
+    for suite in (PlaywrightSuite(tmp_path, SOL), PlaywrightSuite(tmp_path, SOL, "qa")):
+        output = suite.lane_output("rerun-1")
+        assert suite.results_dir not in output.parents
+        assert output.parent.name == (suite.environment or "lanes")
+
+        cmd, env = suite.select_command(["login.spec.ts:3"], output)
+        assert env["PLAYWRIGHT_JSON_OUTPUT_NAME"] == str(output)
+        # Artifacts go to the lane's own folder, which Playwright may empty without touching the main run
+        (output_arg,) = [arg for arg in cmd if arg.startswith("--output=")]
+        assert output_arg == f"--output={output.with_suffix('')}"
+        assert suite.results_dir not in output.with_suffix("").parents
+
+def test_playwright_failures_keep_traces_without_runner_retries(tmp_path):
+    suite = PlaywrightSuite(tmp_path, SOL)
+    cmd, _ = suite.select_command(["login.spec.ts:3"], suite.lane_output("rerun-1"))
+    for args in (suite.command(["login.spec.ts"]), cmd):
+        assert "--retries=0" in args
+        assert "--trace=retain-on-failure" in args
+
+def test_lane_reports_from_an_earlier_run_are_ignored(tmp_path):
+    suite = PlaywrightSuite(tmp_path, SOL)
+    output = suite.lane_output("rerun-1")
+    output.parent.mkdir(parents=True)
+    output.write_text(json.dumps(REPORT), encoding="utf-8")
+    os.utime(output, (1000, 1000))
+
+    assert [r.test_id for r in suite.output_results(output)] == ["login.spec.ts:3"]
+    assert suite.output_results(output, since=2000) == []
+    assert suite.rerun_results(since=2000) == []
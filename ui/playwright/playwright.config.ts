@@ -1,21 +1,33 @@
 import { defineConfig, devices } from '@playwright/test';
 
+// Environment matrix runs set RESULTS_SUBDIR so concurrent runs never share output folders
+const subdir = process.env.RESULTS_SUBDIR ? `/${process.env.RESULTS_SUBDIR}` : '';
+
 export default defineConfig({
   testDir: './tests',
+  outputDir: `test-results${subdir}`,
   fullyParallel: true,
   forbidOnly: !!process.env.CI,
   retries: 2,
-  workers: process.env.CI ? 1 : undefined,
+  // quality.parallelism: auto; PW_WORKERS overrides it per machine (a count or a share of cores)
+  workers: process.env.PW_WORKERS || '50%',
   reporter: [
-    ['html'],
-    ['json', { outputFile: 'test-results/results.json' }],
-    ['junit', { outputFile: 'test-results/results.xml' }]
+    // One line per test on stdout; the agent turns these into live progress
+    ['list'],
+    ['html', { open: 'never', outputFolder: `playwright-report${subdir}` }],
+    ['json', { outputFile: `test-results${subdir}/results.json` }],
+    ['junit', { outputFile: `test-results${subdir}/results.xml` }],
+    // CI shards also write a blob report; `npx playwright merge-reports` joins them into one HTML report
+    ...(process.env.CI ? [['blob', { outputDir: `blob-report${subdir}` }] as const] : []),
   ],
   use: {
     baseURL: process.env.BASE_URL || 'https://example.com',
+    // Agent runs retry failures themselves and pass --trace=retain-on-failure instead
     trace: 'on-first-retry',
     screenshot: 'only-on-failure',
     video: 'retain-on-failure',
+    // Service workers would bypass the network policy in tests/utils/fixtures.ts
+    serviceWorkers: 'block',
   },
   projects: [
     {
@@ -25,12 +37,12 @@ export default defineConfig({
     },
     {
       name: 'firefox',
-      use: { ...devices['Desktop Chrome'] },
+      use: { ...devices['Desktop Firefox'] },
       testMatch: /.*\.spec\.ts/,
     },
     {
       name: 'webkit',
-      use: { ...devices['Desktop Chrome'] },
+      use: { ...devices['Desktop Safari'] },
       testMatch: /.*\.spec\.ts/,
     },
   ],
@@ -1,4 +1,4 @@
-import { test, expect } from '@playwright/test';
+import { test, expect } from './utils/fixtures';
 import { LoginPage } from '../src/pages/LoginPage';
 import { DashboardPage } from '../src/pages/DashboardPage';
 
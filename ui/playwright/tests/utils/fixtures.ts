@@ -0,0 +1,78 @@
+import { test as base, expect, BrowserContext, TestInfo } from '@playwright/test';
+import fs from 'fs';
+import path from 'path';
+
+export type HarMode = 'off' | 'record' | 'replay';
+
+// Network policy from solution.yaml (ui.network)
+export const networkPolicy = {
+  // URL globs aborted in every test: third-party scripts, fonts, analytics
+  block: ["**/*google-analytics.com/**", "**/*googletagmanager.com/**", "**/*doubleclick.net/**", "**/fonts.googleapis.com/**", "**/fonts.gstatic.com/**"] as string[],
+  // When non-empty, only these hosts (and the baseURL host) are reachable
+  allow: [] as string[],
+  har: {
+    // PW_HAR_MODE (set by `run-ui --har`) overrides the configured mode
+    mode: (process.env.PW_HAR_MODE || 'off') as HarMode,
+    dir: path.join(__dirname, '..', 'fixtures/har'),
+    // Only matching requests are recorded and replayed; everything else goes to the network
+    url: '**/api/**',
+  },
+};
+
+function harPath(testInfo: TestInfo): string {
+  const spec = path.basename(testInfo.file, '.spec.ts');
+  const title = testInfo.titlePath.slice(1).join(' ').toLowerCase().replace(/[^a-z0-9]+/g, '-').replace(/^-|-$/g, '');
+  // One file per browser project so parallel projects never write the same HAR
+  return path.join(networkPolicy.har.dir, testInfo.project.name, spec, `${title}.har`);
+}
+
+function isAllowed(url: string, baseURL?: string): boolean {
+  const { hostname, protocol } = new URL(url);
+  if (protocol === 'data:' || protocol === 'blob:') {
+    return true;
+  }
+  if (baseURL && new URL(baseURL).hostname === hostname) {
+    return true;
+  }
+  return networkPolicy.allow.some(host => hostname === host || hostname.endsWith(`.${host}`));
+}
+
+/**
+ * Apply the network policy to a browser context.
+ *
+ * Playwright runs the most recently registered route first, so handlers are added
+ * in reverse order of precedence: HAR replay, then the allow-list, then blocking.
+ */
+export async function applyNetworkPolicy(context: BrowserContext, testInfo: TestInfo,
+                                         harMode: HarMode, baseURL?: string) {
+  if (harMode !== 'off') {
+    const file = harPath(testInfo);
+    if (harMode === 'record') {
+      fs.mkdirSync(path.dirname(file), { recursive: true });
+      await context.routeFromHAR(file, { url: networkPolicy.har.url, update: true, updateMode: 'minimal' });
+    } else if (fs.existsSync(file)) {
+      await context.routeFromHAR(file, { url: networkPolicy.har.url, notFound: 'fallback' });
+    }
+  }
+
+  if (networkPolicy.allow.length) {
+    await context.route('**/*', route =>
+      isAllowed(route.request().url(), baseURL) ? route.fallback() : route.abort('blockedbyclient'));
+  }
+
+  for (const pattern of networkPolicy.block) {
+    await context.route(pattern, route => route.abort('blockedbyclient'));
+  }
+}
+
+export const test = base.extend<{ harMode: HarMode; network: void }>({
+  // Per-spec override, e.g. test.use({ harMode: 'off' }) for tests that need the live backend
+  harMode: [networkPolicy.har.mode, { option: true }],
+
+  network: [async ({ context, harMode, baseURL }, use, testInfo) => {
+    await applyNetworkPolicy(context, testInfo, harMode, baseURL);
+    await use();
+  }, { auto: true }],
+});
+
+export { expect };
\ No newline at end of file